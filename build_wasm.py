@@ -0,0 +1,500 @@
+#!/usr/bin/env python3
+"""Incremental, parallel build of the GTO WebAssembly modules and their wrappers.
+
+Reads description.json and builds the same targets as compile-all-gto.sh: the common
+objects, one module per tool and, with --bundle, the multi-call bundle, each also as a
+SIMD variant (built with -msimd128, installed as <module>.simd.wasm). A target is
+only rebuilt when the hash of its inputs (sources, gto/src headers, main_wrapper.c,
+wrapper template, emcc flags and version) changed since its last successful build.
+The emcc jobs run in parallel and the wrappers are rendered in this process.
+
+Usage:
+    python build_wasm.py [--tools fasta_complement,fasta_reverse] [--jobs N] [--force] [--bundle] [--no-simd]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from jinja2 import TemplateError
+
+import generate_wrapper
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+SRC_DIR = os.path.join(SCRIPT_DIR, 'gto', 'src')
+WASM_DIR = generate_wrapper.WASM_DIR
+DESCRIPTION_FILE = os.path.join(SCRIPT_DIR, 'description.json')
+
+# Objects, generated sources and the hashes of the last successful builds
+BUILD_DIR = os.path.join(SCRIPT_DIR, 'build', 'wasm')
+STATE_FILE = os.path.join(BUILD_DIR, 'state.json')
+
+COMMON_SOURCES = ['argparse.c', 'buffer.c', 'common.c', 'csmodel.c', 'dna.c', 'fcm.c', 'labels.c',
+                  'mem.c', 'misc.c', 'parser.c', 'phash.c', 'reads.c', 'simd.c', 'faidx.c']
+CMAP_SOURCES = ['common-cmap.c', 'mem-cmap.c', 'msg-cmap.c', 'paint-cmap.c', 'time-cmap.c']
+CMAP_TOOL = 'gto_comparative_map'
+
+OBJECT_FLAGS = ['-O3', '-Wall', '-ffast-math', '-DLINUX']
+MODULE_FLAGS = [
+    '-O3',
+    '-Wall',
+    '-ffast-math',
+    '-DPROGRESS',
+    '-DLINUX',
+    '-sWASM=1',
+    '-sALLOW_MEMORY_GROWTH=1',
+    '-sMODULARIZE=1',
+    '-sENVIRONMENT=web,worker',
+    '-sEXPORTED_FUNCTIONS=["_main","_real_main","_malloc","_free"]',
+    '-sEXPORTED_RUNTIME_METHODS=["ccall","cwrap","FS","setValue","stringToUTF8","callMain","stackSave","stackRestore"]',
+    '-sEXIT_RUNTIME=1',
+]
+
+# Added to the objects and modules of the SIMD variants. A variant reuses the JS glue of its
+# module, so it is only installed when its own glue is the same (see install_simd_variant)
+SIMD_FLAGS = ['-msimd128']
+SIMD_SUFFIX = '.simd'
+
+# Shared by all modules, see compile-all-gto.sh
+PRE_JS = "if (Module['reuseRuntime']) { Module['noExitRuntime'] = true; Module['runtimeReusable'] = true; }\n"
+PRE_JS_FILE = os.path.join(WASM_DIR, 'gto_pre.js')
+
+BUNDLE_NAME = 'gto_bundle'
+
+
+class Target:
+    """A build step: a command whose outputs are reused while its key does not change."""
+
+    def __init__(self, name, key, outputs, command=None, log=None, deps=(), prepare=None, finish=None):
+        self.name = name
+        self.key = key
+        self.outputs = outputs
+        self.command = command
+        self.log = log
+        self.deps = list(deps)
+        self.prepare = prepare  # Writes generated inputs before the command runs
+        self.finish = finish  # Writes extra outputs after the command succeeds
+        self.status = None
+        self.elapsed = 0.0
+        self.error = None
+
+
+_file_hashes = {}
+
+
+def file_hash(path):
+    """Hash of a file's contents, computed once per build."""
+    if path not in _file_hashes:
+        with open(path, 'rb') as f:
+            _file_hashes[path] = hashlib.sha256(f.read()).hexdigest()
+    return _file_hashes[path]
+
+
+def digest(*parts):
+    """Hash of a sequence of strings."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def emcc_version(emcc):
+    try:
+        result = subprocess.run([emcc, '--version'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        print(f"Error: could not run {emcc} ({e}). Source $EMSDK_PATH/emsdk_env.sh or pass --emcc.")
+        sys.exit(1)
+    return result.stdout.splitlines()[0] if result.stdout else ''
+
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    with open(STATE_FILE, 'w') as f:
+        json.dump(state, f, indent=2, sort_keys=True)
+
+
+def write_file(path, content):
+    """Write a generated file, leaving it untouched if its content did not change."""
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == content:
+                return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'w') as f:
+        f.write(content)
+
+
+def rename_main(source_path, new_name):
+    """Return the source of a tool with its main function renamed (as sed in compile-all-gto.sh)."""
+    with open(source_path) as f:
+        return re.sub(r'\bmain\b', new_name, f.read())
+
+
+class BuildError(Exception):
+    """A target whose command succeeded but whose outputs cannot be used."""
+
+
+def object_targets(emcc, version, headers, sources, simd=False):
+    targets = {}
+    flags = [*OBJECT_FLAGS, *SIMD_FLAGS] if simd else OBJECT_FLAGS
+    obj_dir = os.path.join(BUILD_DIR, 'obj-simd' if simd else 'obj')
+    for source in sources:
+        name = f"{source}{SIMD_SUFFIX}" if simd else source
+        obj = os.path.join(obj_dir, source.replace('.c', '.o'))
+        source_path = os.path.join(SRC_DIR, source)
+        targets[source] = Target(
+            name=name,
+            key=digest(file_hash(source_path), headers, flags, version),
+            outputs=[obj],
+            command=[emcc, '-c', source_path, '-o', obj, f'-I{SRC_DIR}', *flags],
+            log=os.path.join(BUILD_DIR, 'logs', f"{name}.log"),
+        )
+    return targets
+
+
+def simd_variant_path(module_name):
+    return os.path.join(WASM_DIR, f"{module_name}{SIMD_SUFFIX}.wasm")
+
+
+def install_simd_variant(module_name, build_dir):
+    """Install the SIMD binary of a module built in build_dir, if its JS glue is the module's."""
+    with open(os.path.join(build_dir, f"{module_name}.js"), 'rb') as f:
+        glue = f.read()
+    with open(os.path.join(WASM_DIR, f"{module_name}.js"), 'rb') as f:
+        if f.read() != glue:
+            raise BuildError(f"the JS glue of the SIMD build differs from {module_name}.js")
+    os.replace(os.path.join(build_dir, f"{module_name}.wasm"), simd_variant_path(module_name))
+
+
+def remove_simd_variant(module_name):
+    """Remove an installed SIMD binary, so a stale one is never served next to a rebuilt module."""
+    if os.path.exists(simd_variant_path(module_name)):
+        os.remove(simd_variant_path(module_name))
+
+
+def module_target(emcc, version, headers, tool, objects, scalar=None):
+    """The module of a tool or, given its scalar module target, its SIMD variant."""
+    module_name = tool['name'][len('gto_'):]
+    source_path = os.path.join(SCRIPT_DIR, tool['source'])
+    main_wrapper = os.path.join(SRC_DIR, 'main_wrapper.c')
+    generated_source = os.path.join(BUILD_DIR, 'src', f"{module_name}.c")
+    post_js_file = os.path.join(WASM_DIR, f"{module_name}_post.js")
+    post_js = f"window['{module_name}'] = {module_name};\n"
+    flags = [*MODULE_FLAGS, *(SIMD_FLAGS if scalar else []), f'-sEXPORT_NAME={module_name}']
+    out_dir = os.path.join(BUILD_DIR, 'simd') if scalar else WASM_DIR
+
+    def prepare():
+        if scalar:
+            remove_simd_variant(module_name)
+            os.makedirs(out_dir, exist_ok=True)
+        write_file(generated_source, rename_main(source_path, 'real_main'))
+        write_file(post_js_file, post_js)
+
+    return Target(
+        name=f"{module_name}{SIMD_SUFFIX}" if scalar else module_name,
+        key=digest(file_hash(source_path), file_hash(main_wrapper), headers, flags, PRE_JS, post_js, version,
+                   *(obj.key for obj in objects), *([scalar.key] if scalar else [])),
+        outputs=([simd_variant_path(module_name)] if scalar else
+                 [os.path.join(WASM_DIR, f"{module_name}.js"), os.path.join(WASM_DIR, f"{module_name}.wasm")]),
+        command=[emcc, *flags, f'-I{SRC_DIR}', generated_source, main_wrapper,
+                 *(obj.outputs[0] for obj in objects),
+                 '-o', os.path.join(out_dir, f"{module_name}.js"), '-lm',
+                 '--pre-js', PRE_JS_FILE, '--post-js', post_js_file],
+        log=os.path.join(WASM_DIR, f"{module_name}{SIMD_SUFFIX if scalar else ''}_compile.log"),
+        deps=[*objects, *([scalar] if scalar else [])],
+        prepare=prepare,
+        finish=(lambda: install_simd_variant(module_name, out_dir)) if scalar else None,
+    )
+
+
+def bundle_target(emcc, version, headers, tools, objects, scalar=None):
+    """The multi-call bundle of every tool except Comparative Mapping (see gto/src/multicall.c)
+    or, given its scalar target, its SIMD variant."""
+    bundle_dir = os.path.join(BUILD_DIR, 'bundle')
+    members = [(tool['name'][len('gto_'):], os.path.join(SCRIPT_DIR, tool['source'])) for tool in tools
+               if tool['name'] != CMAP_TOOL]
+    multicall = os.path.join(SRC_DIR, 'multicall.c')
+    main_wrapper = os.path.join(SRC_DIR, 'main_wrapper.c')
+    post_js_file = os.path.join(WASM_DIR, f"{BUNDLE_NAME}_post.js")
+    post_js = f"window['{BUNDLE_NAME}'] = {BUNDLE_NAME};\n"
+    flags = [*MODULE_FLAGS, *(SIMD_FLAGS if scalar else []), '-DGTO_MULTICALL', f'-sEXPORT_NAME={BUNDLE_NAME}']
+    out_dir = os.path.join(BUILD_DIR, 'simd') if scalar else WASM_DIR
+
+    def prepare():
+        if scalar:
+            remove_simd_variant(BUNDLE_NAME)
+            os.makedirs(out_dir, exist_ok=True)
+        for module_name, source_path in members:
+            write_file(os.path.join(bundle_dir, f"{module_name}.c"),
+                       rename_main(source_path, f"gto_{module_name}_main"))
+        write_file(os.path.join(bundle_dir, 'bundle_tools.h'),
+                   ''.join(f"GTO_TOOL({module_name})\n" for module_name, _ in members))
+        write_file(post_js_file, post_js)
+
+    def finish():
+        if scalar:
+            install_simd_variant(BUNDLE_NAME, out_dir)
+            return
+        # Manifest read by the wrappers to decide which tools run from the bundle
+        write_file(os.path.join(WASM_DIR, f"{BUNDLE_NAME}.json"),
+                   json.dumps({'tools': [module_name for module_name, _ in members]}, indent=2) + '\n')
+
+    return Target(
+        name=f"{BUNDLE_NAME}{SIMD_SUFFIX}" if scalar else BUNDLE_NAME,
+        key=digest(file_hash(multicall), file_hash(main_wrapper), headers, flags, PRE_JS, post_js, version,
+                   *(f"{name}={file_hash(path)}" for name, path in members),
+                   *(obj.key for obj in objects), *([scalar.key] if scalar else [])),
+        outputs=([simd_variant_path(BUNDLE_NAME)] if scalar else
+                 [os.path.join(WASM_DIR, f"{BUNDLE_NAME}{ext}") for ext in ('.js', '.wasm', '.json')]),
+        command=[emcc, *flags, f'-I{SRC_DIR}', f'-I{bundle_dir}', multicall, main_wrapper,
+                 *(os.path.join(bundle_dir, f"{module_name}.c") for module_name, _ in members),
+                 *(obj.outputs[0] for obj in objects),
+                 '-o', os.path.join(out_dir, f"{BUNDLE_NAME}.js"), '-lm',
+                 '--pre-js', PRE_JS_FILE, '--post-js', post_js_file],
+        log=os.path.join(WASM_DIR, f"{BUNDLE_NAME}{SIMD_SUFFIX if scalar else ''}_compile.log"),
+        deps=[*objects, *([scalar] if scalar else [])],
+        prepare=prepare,
+        finish=finish,
+    )
+
+
+def is_up_to_date(target, state):
+    return state.get(target.name) == target.key and all(os.path.exists(path) for path in target.outputs)
+
+
+def run_target(target):
+    """Run a target's command, recording its status and duration."""
+    start = time.perf_counter()
+    try:
+        if target.prepare:
+            target.prepare()
+        for path in target.outputs:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        os.makedirs(os.path.dirname(target.log), exist_ok=True)
+        with open(target.log, 'w') as log:
+            result = subprocess.run(target.command, stdout=log, stderr=subprocess.STDOUT)
+        if result.returncode == 0:
+            if target.finish:
+                target.finish()
+            target.status = 'built'
+        else:
+            target.status = 'failed'
+            target.error = first_errors(target.log)
+    except (OSError, BuildError) as e:
+        target.status = 'failed'
+        target.error = str(e)
+    target.elapsed = time.perf_counter() - start
+    return target
+
+
+def first_errors(log_path, limit=5):
+    """The first error lines of a compile log, as reported by compile-all-gto.sh."""
+    with open(log_path, errors='replace') as f:
+        lines = [line.rstrip() for line in f if 'error:' in line or 'undefined symbol' in line]
+    return '\n'.join(lines[:limit]) or f"see {log_path}"
+
+
+def report(target):
+    print(f"  {target.status:<8} {target.name:<40} {target.elapsed:7.2f}s")
+    if target.error:
+        for line in target.error.splitlines():
+            print(f"           {line}")
+
+
+def build(targets, state, force, jobs):
+    """Build targets whose key changed, in parallel, once their dependencies are built."""
+    pending = []
+    for target in targets:
+        if not force and is_up_to_date(target, state):
+            target.status = 'cached'
+            report(target)
+        else:
+            pending.append(target)
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        runnable = []
+        for target in pending:
+            failed = [dep.name for dep in target.deps if dep.status in ('failed', 'skipped')]
+            if failed:
+                target.status = 'skipped'
+                target.error = f"dependency failed: {', '.join(failed)}"
+                report(target)
+            else:
+                runnable.append(target)
+        for target in pool.map(run_target, runnable):
+            report(target)
+            if target.status == 'built':
+                state[target.name] = target.key
+            else:
+                state.pop(target.name, None)
+    save_state(state)
+
+
+def render_wrappers(tools, state, force):
+    """Render the wrappers of the tools with a single template environment."""
+    try:
+        template = generate_wrapper.load_template()
+    except TemplateError as e:
+        print(f"Error loading template: {e}")
+        return [tool['name'] for tool in tools]
+
+    template_hash = digest(file_hash(os.path.join(SCRIPT_DIR, generate_wrapper.TEMPLATE_NAME)),
+                           file_hash(generate_wrapper.__file__))
+    failed = []
+    for tool in tools:
+        module_name = tool['name'][len('gto_'):]
+        input_type = tool.get('input', {}).get('type', '').lower()
+        output_type = tool.get('output', {}).get('type', '').lower()
+        is_multi_output = bool(tool.get('is_multi_output', False))
+        target = Target(
+            name=f"{module_name}_wrapper",
+            key=digest(template_hash, input_type, output_type, is_multi_output),
+            outputs=[os.path.join(WASM_DIR, f"{module_name}_wrapper.js")],
+        )
+
+        error = generate_wrapper.validate_types(input_type, output_type)
+        if error:
+            # Tools without input (e.g. genomic_gen_random_dna) keep a hand-written wrapper
+            print(f"  {'skipped':<8} {target.name:<40} {error}")
+            continue
+        if not force and is_up_to_date(target, state):
+            target.status = 'cached'
+            report(target)
+            continue
+
+        start = time.perf_counter()
+        try:
+            generate_wrapper.write_wrapper(template, module_name, input_type, output_type, is_multi_output)
+            target.status = 'built'
+            state[target.name] = target.key
+        except (TemplateError, OSError) as e:
+            target.status = 'failed'
+            target.error = str(e)
+            failed.append(target.name)
+        target.elapsed = time.perf_counter() - start
+        report(target)
+    save_state(state)
+    return failed
+
+
+def select_tools(tools, names):
+    """Tools with a source file, restricted to the given names (with or without the 'gto_' prefix)."""
+    with_source = [tool for tool in tools if tool.get('source')]
+    if not names:
+        return with_source
+    wanted = {name if name.startswith('gto_') else f"gto_{name}" for name in names}
+    unknown = wanted - {tool['name'] for tool in with_source}
+    if unknown:
+        print(f"Error: unknown tools: {', '.join(sorted(unknown))}")
+        sys.exit(1)
+    return [tool for tool in with_source if tool['name'] in wanted]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Incrementally build the GTO WebAssembly modules and wrappers.")
+    parser.add_argument('--tools', help="Comma-separated tools to build (default: all)")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help="Parallel emcc jobs")
+    parser.add_argument('--force', action='store_true', help="Rebuild every selected target")
+    parser.add_argument('--bundle', action='store_true', help="Also link the multi-call bundle")
+    parser.add_argument('--no-simd', action='store_true', help="Do not build the SIMD variants")
+    parser.add_argument('--wrappers-only', action='store_true', help="Only render the wrappers")
+    parser.add_argument('--emcc', default=os.environ.get('EMCC', 'emcc'), help="emcc executable")
+    args = parser.parse_args()
+
+    with open(DESCRIPTION_FILE) as f:
+        description = json.load(f)
+    all_tools = [tool for tool in description['tools']
+                 if tool.get('source') and os.path.isfile(os.path.join(SCRIPT_DIR, tool['source']))]
+    tools = select_tools(description['tools'], args.tools.split(',') if args.tools else [])
+    missing = [tool['name'] for tool in tools if not os.path.isfile(os.path.join(SCRIPT_DIR, tool['source']))]
+    tools = [tool for tool in tools if tool['name'] not in missing]
+
+    state = load_state()
+    started = time.perf_counter()
+    failed = list(missing)
+    simd_failed = []
+    for name in missing:
+        print(f"Warning: source file not found for {name}.")
+
+    if not args.wrappers_only:
+        version = emcc_version(args.emcc)
+        headers = digest(*(file_hash(path) for path in sorted(glob.glob(os.path.join(SRC_DIR, '*.h')))))
+        write_file(PRE_JS_FILE, PRE_JS)
+
+        needs_common = args.bundle or any(tool['name'] != CMAP_TOOL for tool in tools)
+        needs_cmap = any(tool['name'] == CMAP_TOOL for tool in tools)
+        common = object_targets(args.emcc, version, headers, COMMON_SOURCES if needs_common else [])
+        cmap = object_targets(args.emcc, version, headers, CMAP_SOURCES if needs_cmap else [])
+        simd_common = object_targets(args.emcc, version, headers,
+                                     COMMON_SOURCES if needs_common and not args.no_simd else [], simd=True)
+
+        print("Objects:")
+        build([*common.values(), *cmap.values(), *simd_common.values()], state, args.force, args.jobs)
+
+        modules = [module_target(args.emcc, version, headers, tool,
+                                 list((cmap if tool['name'] == CMAP_TOOL else common).values()))
+                   for tool in tools]
+        if args.bundle:
+            modules.append(bundle_target(args.emcc, version, headers, all_tools, list(common.values())))
+
+        print("Modules:")
+        build(modules, state, args.force, args.jobs)
+        failed += [target.name for target in [*common.values(), *cmap.values(), *modules]
+                   if target.status in ('failed', 'skipped')]
+
+        # Comparative Mapping has no vectorized kernels, so it has no SIMD variant
+        with_variant = [tool for tool in tools if tool['name'] != CMAP_TOOL]
+        if args.no_simd:
+            for name in [tool['name'][len('gto_'):] for tool in with_variant] + ([BUNDLE_NAME] if args.bundle else []):
+                remove_simd_variant(name)
+                state.pop(f"{name}{SIMD_SUFFIX}", None)
+            save_state(state)
+        else:
+            scalar = {target.name: target for target in modules}
+            variants = [module_target(args.emcc, version, headers, tool, list(simd_common.values()),
+                                      scalar=scalar[tool['name'][len('gto_'):]])
+                        for tool in with_variant]
+            if args.bundle:
+                variants.append(bundle_target(args.emcc, version, headers, all_tools, list(simd_common.values()),
+                                              scalar=scalar[BUNDLE_NAME]))
+
+            print("SIMD variants:")
+            build(variants, state, args.force, args.jobs)
+            simd_failed = [target.name for target in [*simd_common.values(), *variants]
+                           if target.status in ('failed', 'skipped')]
+
+    print("Wrappers:")
+    failed += render_wrappers(tools, state, args.force)
+    # The bundle and registry cover every tool, not only the ones selected with --tools
+    generate_wrapper.write_bundle_and_registry(description['tools'])
+
+    print(f"\nBuild finished in {time.perf_counter() - started:.2f}s")
+    if simd_failed:
+        # The modules run without them, from their scalar binaries
+        print("SIMD variants not installed:")
+        for name in simd_failed:
+            print(f"- {name}")
+    if failed:
+        print("Failed targets:")
+        for name in failed:
+            print(f"- {name}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,6 +3,21 @@
 # Don't exit immediately on error
 set +e
 
+# Options:
+#   --bundle  Also link every tool into a single multi-call module (public/wasm/gto_bundle.*),
+#             dispatched by tool name. The per-tool modules remain the fallback.
+#   --no-simd Do not build the SIMD variants (<module>.simd.wasm), the binaries of the modules
+#             built with -msimd128 that src/wasmRuntime.js loads where WebAssembly SIMD is supported.
+BUILD_BUNDLE=false
+BUILD_SIMD=true
+for arg in "$@"; do
+    case "$arg" in
+        --bundle) BUILD_BUNDLE=true ;;
+        --no-simd) BUILD_SIMD=false ;;
+        *) echo "Unknown option: $arg"; exit 1 ;;
+    esac
+done
+
 # Get the directory of the script
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" &>/dev/null && pwd)"
 
@@ -33,6 +48,9 @@ MAIN_LOG_FILE="$WASM_DIR/compilation_log.txt"
 echo "Compilation Log" > "$MAIN_LOG_FILE"
 echo "=================" >> "$MAIN_LOG_FILE"
 
+# SIMD variants are rebuilt along with their modules, never left from an older build
+rm -f "$WASM_DIR"/*.simd.wasm
+
 # Create and activate a virtual environment
 VENV_DIR="$SCRIPT_DIR/venv"
 if [[ ! -d "$VENV_DIR" ]]; then
@@ -56,7 +74,7 @@ if [[ $? -ne 0 ]]; then
 fi
 
 # Compile common source files
-common_sources="argparse.c buffer.c common.c csmodel.c dna.c fcm.c labels.c mem.c misc.c parser.c phash.c reads.c"
+common_sources="argparse.c buffer.c common.c csmodel.c dna.c fcm.c labels.c mem.c misc.c parser.c phash.c reads.c simd.c faidx.c"
 common_objects=""
 
 echo "Compiling common source files..." | tee -a "$MAIN_LOG_FILE"
@@ -72,6 +90,34 @@ for file in $common_sources; do
     common_objects+=" $obj_file"
 done
 
+# The same objects with the vectorized kernels of simd.c, for the SIMD variants
+SIMD_DIR="$(mktemp -d)"
+simd_objects=""
+if [[ "$BUILD_SIMD" == true ]]; then
+    echo "Compiling common source files with SIMD..." | tee -a "$MAIN_LOG_FILE"
+    for file in $common_sources; do
+        obj_file="$SIMD_DIR/${file%.c}.o"
+        emcc -c "$SCRIPT_DIR/gto/src/$file" -o "$obj_file" -I"$SCRIPT_DIR/gto/src" -O3 -Wall -ffast-math -DLINUX -msimd128 >> "$MAIN_LOG_FILE" 2>&1
+        if [[ $? -ne 0 ]]; then
+            echo "Error compiling $file with SIMD, skipping the SIMD variants." | tee -a "$MAIN_LOG_FILE"
+            BUILD_SIMD=false
+            break
+        fi
+        simd_objects+=" $obj_file"
+    done
+fi
+
+# Install the SIMD variant of a module built in $SIMD_DIR, if it shares the JS glue of the module
+install_simd_variant() {
+    local module_name="$1"
+    if cmp -s "$SIMD_DIR/${module_name}.js" "$WASM_DIR/${module_name}.js"; then
+        mv "$SIMD_DIR/${module_name}.wasm" "$WASM_DIR/${module_name}.simd.wasm"
+        echo "Installed the SIMD variant of ${module_name}." | tee -a "$MAIN_LOG_FILE"
+    else
+        echo "Warning: the SIMD variant of ${module_name} was not installed." | tee -a "$MAIN_LOG_FILE"
+    fi
+}
+
 # Compile Additional Objects for Comparative Mapping
 additional_cmap_sources="common-cmap.c mem-cmap.c msg-cmap.c paint-cmap.c time-cmap.c"
 additional_cmap_objects=""
@@ -89,6 +135,11 @@ for file in $additional_cmap_sources; do
     additional_cmap_objects+=" $obj_file"
 done
 
+# Create pre.js shared by all modules: when a wrapper asks to reuse the runtime, keep it alive
+# after callMain so the instance pool (src/wasmRuntime.js) can reset and reuse the instance
+PRE_JS_FILE="$WASM_DIR/gto_pre.js"
+echo "if (Module['reuseRuntime']) { Module['noExitRuntime'] = true; Module['runtimeReusable'] = true; }" > "$PRE_JS_FILE"
+
 compiled_programs=0
 failed_programs=0
 declare -a failed_list
@@ -136,7 +187,7 @@ for ((i=0; i<tool_count; i++)); do
             -sEXPORT_NAME="$module_name"
             -sENVIRONMENT=web,worker
             -sEXPORTED_FUNCTIONS='["_main","_real_main","_malloc","_free"]'
-            -sEXPORTED_RUNTIME_METHODS='["ccall","cwrap","FS","setValue","stringToUTF8","callMain"]'
+            -sEXPORTED_RUNTIME_METHODS='["ccall","cwrap","FS","setValue","stringToUTF8","callMain","stackSave","stackRestore"]'
             -sEXIT_RUNTIME=1   # Add this line
         )
 
@@ -160,12 +211,21 @@ for ((i=0; i<tool_count; i++)); do
 
         # Compile the temp source file with main_wrapper.c
         emcc "${emcc_flags[@]}" "$temp_source" "$SCRIPT_DIR/gto/src/main_wrapper.c" $link_objects -o "$output_js" -lm \
-            --post-js "$WASM_DIR/${module_name}_post.js" >> "$compile_log" 2>&1
+            --pre-js "$PRE_JS_FILE" --post-js "$WASM_DIR/${module_name}_post.js" >> "$compile_log" 2>&1
+        compile_status=$?
+
+        # Comparative Mapping has no vectorized kernels, so it has no SIMD variant
+        if [[ $compile_status -eq 0 && "$BUILD_SIMD" == true && "$prog" != "gto_comparative_map" ]]; then
+            emcc "${emcc_flags[@]}" -msimd128 "$temp_source" "$SCRIPT_DIR/gto/src/main_wrapper.c" $simd_objects \
+                -o "$SIMD_DIR/${module_name}.js" -lm \
+                --pre-js "$PRE_JS_FILE" --post-js "$WASM_DIR/${module_name}_post.js" >> "$compile_log" 2>&1 \
+                && install_simd_variant "$module_name"
+        fi
 
         # Remove the temporary source file
         rm -f "$temp_source"
 
-        if [[ $? -eq 0 ]]; then
+        if [[ $compile_status -eq 0 ]]; then
             echo "Successfully compiled ${module_name}." | tee -a "$MAIN_LOG_FILE"
             compiled_programs=$((compiled_programs + 1))
 
@@ -208,9 +268,86 @@ for ((i=0; i<tool_count; i++)); do
     echo "----------------------------------------" | tee -a "$MAIN_LOG_FILE"
 done
 
+# Link every tool into the multi-call bundle: each main is renamed to gto_<tool>_main and
+# gto/src/multicall.c dispatches on the tool name (the first argument, see main_wrapper.c)
+if [[ "$BUILD_BUNDLE" == true ]]; then
+    echo "Linking multi-call bundle..." | tee -a "$MAIN_LOG_FILE"
+    BUNDLE_DIR="$(mktemp -d)"
+    bundle_header="$BUNDLE_DIR/bundle_tools.h"
+    : > "$bundle_header"
+    bundle_sources=()
+    bundle_tools=()
+
+    for ((i=0; i<tool_count; i++)); do
+        prog=$(jq -r ".tools[$i].name" "$DESCRIPTION_FILE")
+        source_file=$(jq -r ".tools[$i].source // empty" "$DESCRIPTION_FILE")
+        module_name="${prog#gto_}"
+
+        # Comparative Mapping links its own common objects, so it keeps a separate module
+        if [[ -z "$source_file" || ! -f "$SCRIPT_DIR/$source_file" || "$prog" == "gto_comparative_map" ]]; then
+            continue
+        fi
+
+        bundle_source="$BUNDLE_DIR/${module_name}.c"
+        sed "s/\bmain\b/gto_${module_name}_main/g" "$SCRIPT_DIR/$source_file" > "$bundle_source"
+        echo "GTO_TOOL(${module_name})" >> "$bundle_header"
+        bundle_sources+=("$bundle_source")
+        bundle_tools+=("$module_name")
+    done
+
+    echo "window['gto_bundle'] = gto_bundle;" > "$WASM_DIR/gto_bundle_post.js"
+    bundle_log="$WASM_DIR/gto_bundle_compile.log"
+
+    emcc -O3 -Wall -ffast-math -DPROGRESS -DLINUX -DGTO_MULTICALL \
+        -I"$SCRIPT_DIR/gto/src" -I"$BUNDLE_DIR" \
+        -sWASM=1 -sALLOW_MEMORY_GROWTH=1 -sMODULARIZE=1 -sEXPORT_NAME=gto_bundle \
+        -sENVIRONMENT=web,worker \
+        -sEXPORTED_FUNCTIONS='["_main","_real_main","_malloc","_free"]' \
+        -sEXPORTED_RUNTIME_METHODS='["ccall","cwrap","FS","setValue","stringToUTF8","callMain","stackSave","stackRestore"]' \
+        -sEXIT_RUNTIME=1 \
+        "$SCRIPT_DIR/gto/src/multicall.c" "$SCRIPT_DIR/gto/src/main_wrapper.c" "${bundle_sources[@]}" $common_objects \
+        -o "$WASM_DIR/gto_bundle.js" -lm \
+        --pre-js "$PRE_JS_FILE" --post-js "$WASM_DIR/gto_bundle_post.js" > "$bundle_log" 2>&1
+
+    if [[ $? -eq 0 ]]; then
+        # Manifest read by the wrappers to decide which tools run from the bundle
+        printf '%s\n' "${bundle_tools[@]}" | jq -R . | jq -s '{tools: .}' > "$WASM_DIR/gto_bundle.json"
+        echo "Successfully linked gto_bundle with ${#bundle_tools[@]} tools." | tee -a "$MAIN_LOG_FILE"
+
+        if [[ "$BUILD_SIMD" == true ]]; then
+            emcc -O3 -Wall -ffast-math -DPROGRESS -DLINUX -DGTO_MULTICALL -msimd128 \
+                -I"$SCRIPT_DIR/gto/src" -I"$BUNDLE_DIR" \
+                -sWASM=1 -sALLOW_MEMORY_GROWTH=1 -sMODULARIZE=1 -sEXPORT_NAME=gto_bundle \
+                -sENVIRONMENT=web,worker \
+                -sEXPORTED_FUNCTIONS='["_main","_real_main","_malloc","_free"]' \
+                -sEXPORTED_RUNTIME_METHODS='["ccall","cwrap","FS","setValue","stringToUTF8","callMain","stackSave","stackRestore"]' \
+                -sEXIT_RUNTIME=1 \
+                "$SCRIPT_DIR/gto/src/multicall.c" "$SCRIPT_DIR/gto/src/main_wrapper.c" "${bundle_sources[@]}" $simd_objects \
+                -o "$SIMD_DIR/gto_bundle.js" -lm \
+                --pre-js "$PRE_JS_FILE" --post-js "$WASM_DIR/gto_bundle_post.js" >> "$bundle_log" 2>&1 \
+                && install_simd_variant gto_bundle
+        fi
+    else
+        rm -f "$WASM_DIR/gto_bundle.json"
+        failed_list+=("gto_bundle")
+        echo "Failed to link gto_bundle. Check $bundle_log for details." | tee -a "$MAIN_LOG_FILE"
+        grep "error" "$bundle_log" | head -n 5 | tee -a "$MAIN_LOG_FILE"
+    fi
+    rm -rf "$BUNDLE_DIR"
+    echo "----------------------------------------" | tee -a "$MAIN_LOG_FILE"
+fi
+
+# Script with every wrapper and registry of the tools (types, compatibility, help text)
+echo "Generating wrapper bundle and tool registry..." | tee -a "$MAIN_LOG_FILE"
+python "$SCRIPT_DIR/generate_wrapper.py" --all >> "$MAIN_LOG_FILE" 2>&1
+if [[ $? -ne 0 ]]; then
+    failed_list+=("wrapper bundle")
+fi
+
 # Clean up object files
 echo "Cleaning up object files..." | tee -a "$MAIN_LOG_FILE"
 rm -f *.o
+rm -rf "$SIMD_DIR"
 
 # Summary
 echo -e "\n---------------------------------------------" | tee -a "$MAIN_LOG_FILE"
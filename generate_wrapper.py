@@ -1,17 +1,195 @@
 # Biochef/generate_wrapper.py
+import glob
+import hashlib
+import json
 import os
+import subprocess
 import sys
 
 from jinja2 import Environment, FileSystemLoader, TemplateError
 
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+WASM_DIR = os.path.join(SCRIPT_DIR, 'public', 'wasm')
+TEMPLATE_NAME = 'wrapper_template.js.j2'
+DESCRIPTION_FILE = os.path.join(SCRIPT_DIR, 'description.json')
+
+# Batch mode outputs: every wrapper in one script, and the tool registry
+BUNDLE_FILE = os.path.join(WASM_DIR, 'gto_wrappers.js')
+REGISTRY_FILE = os.path.join(WASM_DIR, 'gto_registry.json')
+# Content hashes of the .wasm binaries, versioning the browser's persistent cache of them
+MODULES_FILE = os.path.join(WASM_DIR, 'gto_modules.json')
+
+# Native builds of the tools, run with -h to capture their help text
+NATIVE_BIN_DIR = os.path.join(SCRIPT_DIR, 'gto', 'bin')
+HELP_TIMEOUT = 10
+
+VALID_INPUT_TYPES = ['stdin', 'file']
+VALID_OUTPUT_TYPES = ['stdout', 'file']
+
 
 def camel_case(snake_str):
     components = snake_str.split('_')
     return ''.join(x.title() for x in components)
 
+def load_template():
+    """Load the wrapper template (raises TemplateError)."""
+    env = Environment(loader=FileSystemLoader(SCRIPT_DIR), trim_blocks=True, lstrip_blocks=True)
+    return env.get_template(TEMPLATE_NAME)
+
+def validate_types(input_type, output_type):
+    """Return an error message if the input or output type is not supported, else None."""
+    if input_type not in VALID_INPUT_TYPES:
+        return f"Invalid input_type '{input_type}'. Must be one of {VALID_INPUT_TYPES}."
+    if output_type not in VALID_OUTPUT_TYPES:
+        return f"Invalid output_type '{output_type}'. Must be one of {VALID_OUTPUT_TYPES}."
+    return None
+
+def render_wrapper(template, tool_name, input_type, output_type, is_multi_output):
+    """Render the wrapper of a tool (raises TemplateError)."""
+    return template.render(
+        tool_name=tool_name,
+        tool_name_camel=camel_case(tool_name),
+        input_type=input_type,
+        output_type=output_type,
+        is_multi_output=is_multi_output,
+        is_file_based=(input_type == 'file')
+    )
+
+def write_wrapper(template, tool_name, input_type, output_type, is_multi_output):
+    """Render the wrapper of a tool into public/wasm and return its path (raises TemplateError)."""
+    output = render_wrapper(template, tool_name, input_type, output_type, is_multi_output)
+
+    os.makedirs(WASM_DIR, exist_ok=True)
+
+    # Save the rendered output to a temporary file for debugging
+    temp_output_file = os.path.join(WASM_DIR, f"{tool_name}_wrapper_temp.js")
+    with open(temp_output_file, 'w') as temp_f:
+        temp_f.write(output)
+
+    # Now save the final wrapper file
+    wrapper_file = os.path.join(WASM_DIR, f"{tool_name}_wrapper.js")
+    with open(wrapper_file, 'w') as f:
+        f.write(output)
+    return wrapper_file
+
+def split_formats(formats):
+    return [f.strip() for f in formats.split(',') if f.strip()]
+
+def capture_help(tool_name, bin_dir=NATIVE_BIN_DIR):
+    """Run the native build of a tool with -h, as the wrappers do, and return its output (or None)."""
+    binary = os.path.join(bin_dir, f"gto_{tool_name}")
+    if not os.access(binary, os.X_OK):
+        return None
+    try:
+        # argv[0] is the program name of the WebAssembly modules (thisProgram in the wrapper)
+        result = subprocess.run([f"./{tool_name}", '-h'], executable=binary, stdin=subprocess.DEVNULL,
+                                capture_output=True, text=True, errors='replace', timeout=HELP_TIMEOUT)
+    except (OSError, subprocess.TimeoutExpired):
+        return None
+    return {'stdout': result.stdout.strip(), 'stderr': result.stderr.strip()}
+
+def build_registry(tools, help_texts):
+    """Tool metadata for the front end, with indexes of tools by input format and of compatible next tools."""
+    entries = {}
+    by_input_format = {}
+    for tool in tools:
+        name = tool['name'][len('gto_'):]
+        entry = {
+            'input': {'type': tool['input']['type'], 'formats': split_formats(tool['input']['format'])},
+            'output': {'type': tool['output']['type'], 'formats': split_formats(tool['output']['format'])},
+            'multiOutput': bool(tool.get('is_multi_output', False)),
+            'multiTypeOutput': bool(tool.get('is_multi_type_output', False)),
+        }
+        if help_texts.get(name):
+            entry['help'] = help_texts[name]
+        entries[name] = entry
+        for fmt in entry['input']['formats'] or ['']:
+            by_input_format.setdefault(fmt, []).append(name)
+
+    # Compatibility edges: tools accepting one of the output formats of each tool
+    next_tools = {}
+    for name, entry in entries.items():
+        compatible = {other for fmt in entry['output']['formats'] for other in by_input_format.get(fmt, [])}
+        next_tools[name] = sorted(compatible)
+
+    return {'tools': entries, 'byInputFormat': by_input_format, 'next': next_tools}
+
+def generate_all(bin_dir=NATIVE_BIN_DIR):
+    """Render the wrapper of every compiled tool, then the wrapper bundle and the registry.
+    Return the tools whose wrapper failed."""
+    with open(DESCRIPTION_FILE) as f:
+        tools = json.load(f)['tools']
+
+    template = load_template()
+    failed = []
+    for tool in tools:
+        name = tool['name'][len('gto_'):]
+        input_type = tool['input']['type'].lower()
+        output_type = tool['output']['type'].lower()
+        # Only tools with a compiled module get a wrapper; tools without input keep a hand-written one
+        if not os.path.exists(os.path.join(WASM_DIR, f"{name}.js")) or validate_types(input_type, output_type):
+            continue
+        try:
+            write_wrapper(template, name, input_type, output_type, bool(tool.get('is_multi_output', False)))
+        except TemplateError as e:
+            print(f"Error rendering template for {name}: {e}")
+            failed.append(name)
+
+    write_bundle_and_registry(tools, bin_dir)
+    return failed
+
+def write_module_hashes():
+    """Write the content hash of every .wasm binary in public/wasm."""
+    modules = {}
+    for path in sorted(glob.glob(os.path.join(WASM_DIR, '*.wasm'))):
+        with open(path, 'rb') as f:
+            modules[os.path.basename(path)[:-len('.wasm')]] = hashlib.sha256(f.read()).hexdigest()[:16]
+    with open(MODULES_FILE, 'w') as f:
+        json.dump({'modules': modules}, f, indent=1)
+        f.write('\n')
+    print(f"Generated module hashes at {MODULES_FILE}")
+
+def write_bundle_and_registry(tools, bin_dir=NATIVE_BIN_DIR):
+    """Write the script with every existing wrapper, the registry of the tools they run and
+    the hashes of the binaries."""
+    sources = []
+    help_texts = {}
+    for tool in tools:
+        name = tool['name'][len('gto_'):]
+        wrapper_file = os.path.join(WASM_DIR, f"{name}_wrapper.js")
+        if not os.path.exists(os.path.join(WASM_DIR, f"{name}.js")) or not os.path.exists(wrapper_file):
+            continue
+        with open(wrapper_file) as f:
+            sources.append((name, f.read()))
+        help_texts[name] = capture_help(name, bin_dir)
+
+    # Classic script, so it loads with a <script> tag and with importScripts in the workers
+    with open(BUNDLE_FILE, 'w') as f:
+        f.write("// All GTO wrappers in one script. Automatically generated by generate_wrapper.py --all\n")
+        for name, source in sources:
+            f.write(f"\n// {name}\n{source.rstrip()}\n")
+    print(f"Generated wrapper bundle with {len(sources)} tools at {BUNDLE_FILE}")
+
+    registry = build_registry([t for t in tools if t['name'][len('gto_'):] in help_texts], help_texts)
+    with open(REGISTRY_FILE, 'w') as f:
+        json.dump(registry, f, indent=1)
+        f.write('\n')
+    print(f"Generated tool registry at {REGISTRY_FILE}")
+    write_module_hashes()
+
 def main():
+    if len(sys.argv) >= 2 and sys.argv[1] == '--all':
+        bin_dir = sys.argv[2] if len(sys.argv) > 2 else NATIVE_BIN_DIR
+        try:
+            failed = generate_all(bin_dir)
+        except TemplateError as e:
+            print(f"Error loading template: {e}")
+            sys.exit(1)
+        sys.exit(1 if failed else 0)
+
     if len(sys.argv) != 5:
         print("Usage: python generate_wrapper.py <tool_name> <input_type> <output_type> <is_multi_output>")
+        print("       python generate_wrapper.py --all [native_bin_dir]")
         sys.exit(1)
 
 
@@ -21,53 +199,25 @@ def main():
     is_multi_output = sys.argv[4].lower() == 'true'
 
     # Validate input_type and output_type
-    valid_input_types = ['stdin', 'file']
-    valid_output_types = ['stdout', 'file']
-    if input_type not in valid_input_types:
-        print(f"Error: Invalid input_type '{input_type}'. Must be one of {valid_input_types}.")
-        sys.exit(1)
-    if output_type not in valid_output_types:
-        print(f"Error: Invalid output_type '{output_type}'. Must be one of {valid_output_types}.")
+    error = validate_types(input_type, output_type)
+    if error:
+        print(f"Error: {error}")
         sys.exit(1)
 
-    tool_name_camel = camel_case(tool_name)
-
-    script_dir = os.path.dirname(os.path.abspath(__file__))
-    wasm_dir = os.path.join(script_dir, 'public', 'wasm')
-    os.makedirs(wasm_dir, exist_ok=True)
-
-    env = Environment(loader=FileSystemLoader(script_dir), trim_blocks=True, lstrip_blocks=True)
     try:
-        template = env.get_template('wrapper_template.js.j2')
+        template = load_template()
     except TemplateError as e:
         print(f"Error loading template: {e}")
         sys.exit(1)
 
     try:
-        output = template.render(
-            tool_name=tool_name,
-            tool_name_camel=tool_name_camel,
-            input_type=input_type,
-            output_type=output_type,
-            is_multi_output=is_multi_output,
-            is_file_based=(input_type == 'file')
-        )
+        wrapper_file = write_wrapper(template, tool_name, input_type, output_type, is_multi_output)
     except TemplateError as e:
         print(f"Error rendering template: {e}")
         sys.exit(1)
 
-    # Save the rendered output to a temporary file for debugging
-    temp_output_file = os.path.join(wasm_dir, f"{tool_name}_wrapper_temp.js")
-    with open(temp_output_file, 'w') as temp_f:
-        temp_f.write(output)
-    print(f"Rendered wrapper (temporary) saved at: {temp_output_file}")
-
-    # Now save the final wrapper file
-    wrapper_file = os.path.join(wasm_dir, f"{tool_name}_wrapper.js")
-    with open(wrapper_file, 'w') as f:
-        f.write(output)
-
+    print(f"Rendered wrapper (temporary) saved at: {os.path.join(WASM_DIR, f'{tool_name}_wrapper_temp.js')}")
     print(f"Generated wrapper for {tool_name} at {wrapper_file}")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
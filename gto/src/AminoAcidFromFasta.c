@@ -9,7 +9,7 @@
 #include "parser.h"
 #include <unistd.h>
 
-char TranslateCodon(char *codon)
+static char TranslateCodon(char *codon)
   {
   if(!strcmp(codon, "ATA")) { return 'I';}
   else if(!strcmp(codon, "ATC")) { return 'I';}
@@ -88,6 +88,7 @@ int main(int argc, char *argv[])
   uint8_t  value, header = 1;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -127,6 +128,7 @@ int main(int argc, char *argv[])
   }
   
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   uint8_t i = 0;
   char codon[4];
@@ -172,12 +174,13 @@ int main(int argc, char *argv[])
 
       if(++i == 3)
       {
-        fprintf(stdout, "%c", TranslateCodon(codon));
+        PutOBuffer(Output, TranslateCodon(codon));
         i = 0;
       }
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
@@ -9,7 +9,7 @@
 #include "argparse.h"
 #include <unistd.h>
 
-char TranslateCodon(char *codon)
+static char TranslateCodon(char *codon)
   {
   if(!strcmp(codon, "ATA")) { return 'I';}
   else if(!strcmp(codon, "ATC")) { return 'I';}
@@ -86,6 +86,7 @@ int main(int argc, char *argv[]){
   uint32_t streamSize, index, frame=1;
   uint8_t  value;
   BUF *Buffer;
+  OBUF *Output;
   
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -118,6 +119,7 @@ int main(int argc, char *argv[]){
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   uint8_t i = 0;
   char codon[4];
@@ -154,11 +156,12 @@ int main(int argc, char *argv[]){
 
       if(++i == 3)
       {
-        fprintf(stdout, "%c", TranslateCodon(codon));
+        PutOBuffer(Output, TranslateCodon(codon));
         i = 0;
       }
     } 
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
@@ -16,6 +16,7 @@ int main(int argc, char *argv[])
   int64_t streamSize, index;
   char value;
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -69,6 +70,7 @@ int main(int argc, char *argv[])
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
     for(index = 0 ; index < streamSize ; ++index)
@@ -76,38 +78,39 @@ int main(int argc, char *argv[])
       value = Buffer->buf[index];
       switch(value)
       {
-        case 'R': putchar('P'); break;
-        case 'H': putchar('P'); break;
-        case 'K': putchar('P'); break;
+        case 'R': PutOBuffer(Output, 'P'); break;
+        case 'H': PutOBuffer(Output, 'P'); break;
+        case 'K': PutOBuffer(Output, 'P'); break;
 
-        case 'D': putchar('N'); break;
-        case 'E': putchar('N'); break;
+        case 'D': PutOBuffer(Output, 'N'); break;
+        case 'E': PutOBuffer(Output, 'N'); break;
 
-        case 'S': putchar('U'); break;
-        case 'T': putchar('U'); break;
-        case 'N': putchar('U'); break;
-        case 'Q': putchar('U'); break;
+        case 'S': PutOBuffer(Output, 'U'); break;
+        case 'T': PutOBuffer(Output, 'U'); break;
+        case 'N': PutOBuffer(Output, 'U'); break;
+        case 'Q': PutOBuffer(Output, 'U'); break;
 
-        case 'C': putchar('S'); break;
-        case 'U': putchar('S'); break;
-        case 'G': putchar('S'); break;
-        case 'P': putchar('S'); break;
+        case 'C': PutOBuffer(Output, 'S'); break;
+        case 'U': PutOBuffer(Output, 'S'); break;
+        case 'G': PutOBuffer(Output, 'S'); break;
+        case 'P': PutOBuffer(Output, 'S'); break;
 
-        case 'A': putchar('H'); break;
-        case 'V': putchar('H'); break;
-        case 'I': putchar('H'); break;
-        case 'L': putchar('H'); break;
-        case 'M': putchar('H'); break;
-        case 'F': putchar('H'); break;
-        case 'Y': putchar('H'); break;
-        case 'W': putchar('H'); break;
+        case 'A': PutOBuffer(Output, 'H'); break;
+        case 'V': PutOBuffer(Output, 'H'); break;
+        case 'I': PutOBuffer(Output, 'H'); break;
+        case 'L': PutOBuffer(Output, 'H'); break;
+        case 'M': PutOBuffer(Output, 'H'); break;
+        case 'F': PutOBuffer(Output, 'H'); break;
+        case 'Y': PutOBuffer(Output, 'H'); break;
+        case 'W': PutOBuffer(Output, 'H'); break;
 
-        case '*': putchar('*'); break;
-        case 'X': putchar('X'); break;
+        case '*': PutOBuffer(Output, '*'); break;
+        case 'X': PutOBuffer(Output, 'X'); break;
       }
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
 
   return EXIT_SUCCESS;
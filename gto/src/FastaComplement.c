@@ -7,29 +7,20 @@
 #include "mem.h"
 #include "parser.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include <unistd.h>
 
-static uint8_t FindComplement(uint8_t value)
-{
-  switch(tolower(value)){
-    case 'a': return 'T';
-    case 't': return 'A';
-    case 'c': return 'G';
-    case 'g': return 'C';
-    default:  return value;
-  }
-}
-
 /* 
  * This application replaces the ACGT bases with their complements in FASTA or Multi-FASTA file format.
  */
 int main(int argc, char *argv[])
 {
-  uint32_t streamSize, index;
-  uint8_t  value, line = 0, position = 1;
+  uint32_t streamSize, index, end;
+  uint8_t  line = 0, position = 1;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -60,50 +51,46 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
-    for(index = 0 ; index < streamSize ; ++index)
+    index = 0;
+    while(index < streamSize)
     {
-      value = Buffer->buf[index];
-      switch(line)
+      // A LINE AFTER A SEQUENCE LINE IS A HEADER IF IT STARTS WITH '>'
+      if(line == 0 && position == 0)
       {
-        case 0: 
-          if(position == 0 && value != '>')
+        if(Buffer->buf[index] == '>')
+          position = 1;
+        else
+        {
+          line = 1;
+          if(Buffer->buf[index] == '\n')
           {
-            putchar(FindComplement(value));
-            line = 1;
-            break;
-          }
-
-          if(value == '\n')
-          { 
-            line = 1;
-            putchar(value);
-            break;
+            PutOBuffer(Output, '\n');
+            ++index;
+            continue;
           }
+        }
+      }
 
-          if(position++ == 0 && value == '>')
-          {
-            putchar(value);
-            break;
-          }
-          putchar(value);
-          break;
-        case 1: 
-          if(value == '\n')
-          { 
-            line   = 0; 
-            position    = 0;
-            putchar(value);
-            break; 
-          }
-          putchar(FindComplement(value));
-          break;
-      } 
+      end = index + FindByte(Buffer->buf + index, streamSize - index, '\n');
+      if(line == 1)
+        ComplementBases(Buffer->buf + index, end - index);
+      if(end < streamSize)
+      {
+        ++end;
+        if(line == 1)
+          position = 0;
+        line = !line;
+      }
+      WriteOBuffer(Output, Buffer->buf + index, end - index);
+      index = end;
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
@@ -7,10 +7,59 @@
 #include "buffer.h"
 #include "argparse.h"
 #include "parser.h"
+#include "faidx.h"
 #include <unistd.h>
 
 #define END  100
 
+/*
+ * Extracts the symbols [init, end) with the index of the input: only the
+ * records in the range are read, from the byte of init in the first one.
+ */
+static void ExtractIndexed(FAIDX *Index, uint64_t init, uint64_t end, BUF *Buffer,
+OBUF *Output)
+{
+  uint64_t n, at = 0, base = 0, limit, counter, p, q;
+  uint32_t streamSize, index;
+  uint8_t  value;
+  FAREC    *R;
+
+  for(n = 0 ; n < Index->nRecs && base < end ; base += Index->recs[n++].length)
+  {
+    R = &Index->recs[n];
+    if(base + R->length <= init || R->length == 0)
+      continue;
+    p = MAX(init, base) - base;
+    q = MIN(end, base + R->length) - base;
+
+    // Regular records are read from the line of p, the others from their first
+    if(SeekFaidxSequence(stdin, &at, R) != 0 || SeekInput(stdin, &at,
+    R->lineBases ? FaidxPosition(R, p) : R->offset) != 0)
+    {
+      fprintf(stderr, "ERROR: The index does not match the input!\n");
+      exit(1);
+    }
+    counter = R->lineBases ? p : 0;
+    limit   = R->lineBases ? FaidxPosition(R, q - 1) + 1 : n + 1 < Index->nRecs ?
+    Index->recs[n + 1].header : UINT64_MAX;
+
+    while(counter < q && (streamSize = fread(Buffer->buf, 1, MIN(Buffer->size,
+    limit - at), stdin)))
+    {
+      at += streamSize;
+      for(index = 0 ; index < streamSize && counter < q ; ++index)
+      {
+        value = Buffer->buf[index];
+        if(value < 65 || value > 122) continue;
+
+        if(p <= counter)
+          PutOBuffer(Output, value);
+        ++counter;
+      }
+    }
+  }
+}
+
 /*
  * This application extracts sequences from a FASTA file.
  */
@@ -19,8 +68,11 @@ int main(int argc, char *argv[])
   uint32_t streamSize, index;
   uint64_t counter = 0, init = 0, end = END;
   uint8_t  value, header = 1;
+  char *indexFile = NULL;
+  FAIDX *Index;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -28,6 +80,7 @@ int main(int argc, char *argv[])
         OPT_GROUP("Basic options"),
         OPT_INTEGER('i', "init", &init, "The first position to start the extraction (default 0)"),
         OPT_INTEGER('e', "end", &end, "The last extract position (default 100)"),
+        OPT_STRING('x', "index", &indexFile, "Index of the input (gto_fasta_index), to seek to the positions"),
         OPT_BUFF('<', "input.fasta", "Input FASTA or Multi-FASTA file format (stdin)"),
         OPT_BUFF('>', "output.seq", "Output sequence file (stdout)"),
         OPT_END(),
@@ -52,6 +105,17 @@ int main(int argc, char *argv[])
     exit(1);
   }
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
+
+  if(indexFile != NULL)
+  {
+    Index = LoadFaidx(indexFile);
+    ExtractIndexed(Index, init, end, Buffer, Output);
+    RemoveFaidx(Index);
+    RemoveOBuffer(Output);
+    RemoveBuffer(Buffer);
+    return EXIT_SUCCESS;
+  }
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
@@ -65,11 +129,12 @@ int main(int argc, char *argv[])
       if(value < 65 || value > 122) continue;
 
       if(init <= counter && end > counter)
-        putchar(value);
+        PutOBuffer(Output, value);
       ++counter;
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
   return EXIT_SUCCESS;
 }
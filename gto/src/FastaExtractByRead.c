@@ -6,21 +6,143 @@
 #include "misc.h"
 #include "buffer.h"
 #include "parser.h"
+#include "faidx.h"
 #include "argparse.h"
 #include <unistd.h>
 
 #define END  100
 
+/*
+ * State of the extraction: the position in the current read, and whether a
+ * header is being read.
+ */
+typedef struct
+{
+  uint64_t counter;
+  uint64_t init;
+  uint64_t end;
+  uint8_t  header;
+  OBUF     *Output;
+}
+EXTRACTION;
+
+static inline void ExtractByte(EXTRACTION *X, uint8_t value)
+{
+  if(value == '>')
+  { 
+    X->header = 1;
+    if(X->counter != 0)
+      PutOBuffer(X->Output, '\n');
+    PutOBuffer(X->Output, value); 
+    return; 
+  }
+
+  if(value == '\n' && X->header == 1)
+  { 
+    X->header = 0; 
+    PutOBuffer(X->Output, '\n');
+    X->counter = 0;
+    return; 
+  }
+
+  if(value == '\n') return;
+
+  if(X->header == 1) 
+  {
+    PutOBuffer(X->Output, value);
+    return;
+  }
+  if(value < 65 || value > 122) return;
+
+  if(X->init <= X->counter && X->end > X->counter)
+    PutOBuffer(X->Output, value);
+
+  ++X->counter;
+}
+
+/*
+ * Passes the bytes of the input up to limit (or its end) through the
+ * extraction, or, when out is set, writes the symbols among them.
+ */
+static void ExtractBytes(EXTRACTION *X, BUF *Buffer, uint64_t *at, uint64_t limit,
+uint8_t out)
+{
+  uint32_t streamSize, index;
+  uint8_t  value;
+
+  while(*at < limit && (streamSize = fread(Buffer->buf, 1, MIN(Buffer->size,
+  limit - *at), stdin)))
+  {
+    *at += streamSize;
+    for(index = 0 ; index < streamSize ; ++index)
+    {
+      value = Buffer->buf[index];
+      if(!out)
+        ExtractByte(X, value);
+      else if(value >= 65 && value <= 122)
+        PutOBuffer(X->Output, value);
+    }
+  }
+}
+
+/*
+ * Extracts from each read with the index of the input. Headers are read as they
+ * are; in regular reads only the lines of [init, end) are read, the others are
+ * read in full.
+ */
+static void ExtractIndexed(FAIDX *Index, EXTRACTION *X, BUF *Buffer)
+{
+  uint64_t n, at = 0, q;
+  FAREC    *R;
+
+  for(n = 0 ; n < Index->nRecs ; ++n)
+  {
+    R = &Index->recs[n];
+    if(SeekFaidxRecord(stdin, &at, R) != 0)
+    {
+      fprintf(stderr, "ERROR: The index does not match the input!\n");
+      exit(1);
+    }
+    ExtractByte(X, '>');
+    ExtractBytes(X, Buffer, &at, R->offset, 0);
+    if(X->header == 1 && R->length != 0)
+    {
+      fprintf(stderr, "ERROR: The index does not match the input!\n");
+      exit(1);
+    }
+
+    if(R->lineBases == 0)
+    {
+      ExtractBytes(X, Buffer, &at, n + 1 < Index->nRecs ? Index->recs[n + 1].header :
+      UINT64_MAX, 0);
+      continue;
+    }
+    if(X->init < R->length && X->init < X->end)
+    {
+      q = MIN(X->end, R->length);
+      if(SeekInput(stdin, &at, FaidxPosition(R, X->init)) != 0)
+      {
+        fprintf(stderr, "ERROR: The index does not match the input!\n");
+        exit(1);
+      }
+      ExtractBytes(X, Buffer, &at, FaidxPosition(R, q - 1) + 1, 1);
+    }
+    X->counter = R->length;
+  }
+}
+
 /*
  * This application extracts sequences from each read in a FASTA or Multi-FASTA file (splited by \n).
  */
 int main(int argc, char *argv[])
 {
   uint32_t streamSize, index;
-  uint64_t counter = 0, init = 0, end = END;
-  uint8_t  value, header = 1;
+  uint64_t init = 0, end = END;
+  char *indexFile = NULL;
   PARSER *Parser = CreateParser();
+  FAIDX *Index;
   BUF *Buffer;
+  EXTRACTION X;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -28,6 +150,7 @@ int main(int argc, char *argv[])
         OPT_GROUP("Basic options"),
         OPT_INTEGER('i', "init", &init, "The first position to start the extraction (default 0)"),
         OPT_INTEGER('e', "end", &end, "The last extract position (default 100)"),
+        OPT_STRING('x', "index", &indexFile, "Index of the input (gto_fasta_index), to seek to the reads"),
         OPT_BUFF('<', "input.fasta", "Input FASTA or Multi-FASTA file format (stdin)"),
         OPT_BUFF('>', "output.fasta", "Output FASTA or Multi-FASTA file format (stdout)"),
         OPT_END(),
@@ -53,46 +176,24 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  X.Output  = CreateOBuffer(stdout, DEF_IO_SIZE);
+  X.counter = 0;
+  X.init    = init;
+  X.end     = end;
+  X.header  = 1;
 
-  while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
+  if(indexFile != NULL)
   {
-    for(index = 0 ; index < streamSize ; ++index)
-    {
-      value = Buffer->buf[index];
-
-      if(value == '>')
-      { 
-        header = 1;
-        if(counter != 0)
-          putchar('\n');
-        putchar(value); 
-        continue; 
-      }
-
-      if(value == '\n' && header == 1)
-      { 
-        header = 0; 
-        putchar('\n');
-        counter = 0;
-        continue; 
-      }
-
-      if(value == '\n') continue;
-
-      if(header == 1) 
-      {
-        putchar(value);
-        continue;
-      }
-      if(value < 65 || value > 122) continue;
-
-      if(init <= counter && end > counter)
-        putchar(value);
-
-      ++counter;
-    }
+    Index = LoadFaidx(indexFile);
+    ExtractIndexed(Index, &X, Buffer);
+    RemoveFaidx(Index);
   }
+  else
+    while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
+      for(index = 0 ; index < streamSize ; ++index)
+        ExtractByte(&X, Buffer->buf[index]);
 
+  RemoveOBuffer(X.Output);
   RemoveBuffer(Buffer);
   return EXIT_SUCCESS;
 }
@@ -23,6 +23,7 @@ int main(int argc, char *argv[])
   uint8_t  *hName = (uint8_t *) Calloc(MAX_HEADER+1, sizeof(uint8_t));
   const char *pattern = NULL;
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -56,6 +57,7 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -85,22 +87,23 @@ int main(int argc, char *argv[])
           hName[headerIndex+1] = '\0';
           if(strcasestr((char *) hName,(char *) pattern) != NULL && invert == 0)
           {
-            fprintf(stdout, "%s\n", hName);
+            PrintOBuffer(Output, "%s\n", hName);
             write = 1;
           }
           //else invert active, show the non-matching
           if(strcasestr((char *) hName,(char *) pattern) == NULL && invert == 1)
           {
-            fprintf(stdout, "%s\n", hName);
+            PrintOBuffer(Output, "%s\n", hName);
             write = 1;
           }
         }
         continue;
       }
 
-      if(write == 1) putchar(value);
+      if(write == 1) PutOBuffer(Output, value);
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   Free(hName, 0);
   return EXIT_SUCCESS;
@@ -19,6 +19,7 @@ int main(int argc, char *argv[])
   uint32_t sequenceSize, index, pos = 0, lineSize = BREAKER;
   uint8_t  value;
   BUF *Buffer;
+  OBUF *Output;
   const char *readTitle = NULL;
 
   char *programName = argv[0];
@@ -52,10 +53,11 @@ int main(int argc, char *argv[])
     exit(1);
   }
 
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   if(readTitle != NULL)
-    fprintf(stdout, ">%s\n", readTitle);
+    PrintOBuffer(Output, ">%s\n", readTitle);
   else
-    fprintf(stdout, ">Computed_with_%s\n", programName);
+    PrintOBuffer(Output, ">Computed_with_%s\n", programName);
 
   Buffer = CreateBuffer(BUF_SIZE);
   while((sequenceSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
@@ -66,13 +68,14 @@ int main(int argc, char *argv[])
       if(value == '\n')
         continue; 
 
-      putchar(value);
+      PutOBuffer(Output, value);
       if(++pos == lineSize)
       {
-        putchar('\n');
+        PutOBuffer(Output, '\n');
         pos = 0;
       }
     }
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
 
   return EXIT_SUCCESS;
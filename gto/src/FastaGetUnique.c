@@ -4,23 +4,85 @@
 #include <regex.h>
 #include <ctype.h>
 #include "mem.h"
+#include "buffer.h"
 #include "defs.h"
 #include "labels.h"
 #include "common.h"
 #include "parser.h"
 #include "argparse.h"
+#include "simd.h"
 #include <unistd.h>
 
+#define MAX_HEADER 8000
+
+/*
+ * Makes the next byte of the input available in its buffer, returning 0 at the
+ * end of the input.
+ */
+static int FillHeaderByte(IBUF *In)
+{
+  if(In->idx < In->len)
+    return 1;
+  if(FillIBuffer(In) == EOF)
+    return 0;
+  --In->idx;
+  return 1;
+}
+
+/*
+ * Reads the name of a header, after its '>', as fscanf("%s"): the blanks before
+ * it are skipped and it ends before the next blank, which is left in the input.
+ * Returns the length of the name, or 0 at the end of the input.
+ */
+static uint32_t ReadHeaderName(IBUF *In, char *name)
+{
+  uint32_t n = 0;
+
+  while(FillHeaderByte(In) && isspace(In->buf[In->idx]))
+    ++In->idx;
+  while(n < MAX_HEADER - 1 && FillHeaderByte(In) && !isspace(In->buf[In->idx]))
+    name[n++] = In->buf[In->idx++];
+  name[n] = '\0';
+  return n;
+}
+
+/*
+ * Copies (or skips) the bytes of the input until the next '>', a block at a
+ * time. Returns '>', which is consumed, or EOF.
+ */
+static int CopyToHeader(IBUF *In, OBUF *Out, int copy)
+{
+  uint32_t k;
+
+  while(FillHeaderByte(In))
+  {
+    k = FindByte(In->buf + In->idx, In->len - In->idx, '>');
+    if(copy)
+      WriteOBuffer(Out, In->buf + In->idx, k);
+    In->idx += k;
+    if(In->idx < In->len)
+    {
+      ++In->idx;
+      return '>';
+    }
+  }
+  return EOF;
+}
+
 /*
- * This application extracts unique reads from Multi-FASTA files.
+ * This application extracts unique reads from Multi-FASTA files. The species
+ * seen are kept in a hashed set of labels, so each header is checked in
+ * constant time, and the sequences are copied (or skipped) a block at a time.
  */
 int main(int argc, char *argv[])
 {
-  char fname[8000];
-  uint64_t nSeq, n, unique;
-  uint32_t filtered;
-  int sym;
+  char fname[MAX_HEADER];
+  uint64_t nSeq, n, unique, filtered;
+  int sym, added;
+  char end;
   PARSER *Parser = CreateParser();
+  IBUF *Input;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -61,53 +123,56 @@ int main(int argc, char *argv[])
     return 1;
   }
 
+  Input  = CreateIBuffer(stdin, DEF_IO_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   nSeq = 0;
   unique = 0;
   filtered = 0;
-  while((sym = fgetc(stdin)) != EOF)
+  sym = CopyToHeader(Input, Output, 0);
+  while(sym == '>')
   {
-    if(sym == '>')
+    if(ReadHeaderName(Input, fname) == 0)
     {
-      HD:
-      if(fscanf(stdin, "%s", fname) != 1)
-      {
-        fprintf(stderr, "  [x] Error: unknown type of file!\n");
-        exit(1);
-      }
-
-      if(regexec(&regexCompiled, fname, 2, groupArray, 0) == 0)
-      {
-        char sourceCopy[strlen(fname) + 1];
-        strcpy(sourceCopy, fname);
-        sourceCopy[groupArray[1].rm_eo] = 0;
-        if(SearchSLabels(SL, sourceCopy + groupArray[1].rm_so) == 0)
-        {
-          ++unique;
-          AddSLabel(SL, sourceCopy + groupArray[1].rm_so);
-          UpdateSLabels(SL);
-        }
-        else
-        {
-          ++filtered;
-          continue;
-        }
-      }
-      ++nSeq;
+      fprintf(stderr, "  [x] Error: unknown type of file!\n");
+      RemoveOBuffer(Output);
+      exit(1);
+    }
 
-      fprintf(stdout, ">%s", fname);
-      while(((sym = fgetc(stdin)) != EOF))
+    if(regexec(&regexCompiled, fname, 2, groupArray, 0) == 0)
+    {
+      end = fname[groupArray[1].rm_eo];
+      fname[groupArray[1].rm_eo] = '\0';
+      added = InsertSLabel(SL, fname + groupArray[1].rm_so);
+      fname[groupArray[1].rm_eo] = end;
+      if(added)
+        ++unique;
+      else
       {
-        if(sym == '>')
-          goto HD;
-        fputc(sym, stdout);
+        ++filtered;
+        sym = CopyToHeader(Input, Output, 0);
+        continue;
       }
     }
+    ++nSeq;
+
+    PrintOBuffer(Output, ">%s", fname);
+    sym = CopyToHeader(Input, Output, 1);
   }
 
+  RemoveIBuffer(Input);
+  RemoveOBuffer(Output);
+  regfree(&regexCompiled);
+
   fprintf(stderr, "Number of unique existing species: %"PRIu64".\n", unique);
   fprintf(stderr, "Unique species:\n");
   for(n = 0 ; n < SL->idx ; ++n)
     fprintf(stderr, "  [+] %s\n", SL->names[n]);
+  fprintf(stderr, "Memory: ");
+  PrintHRBytes(PeakMem());
+  fprintf(stderr, " peak, ");
+  PrintHRBytes(SLabelsBytes(SL));
+  fprintf(stderr, " for the labels of %"PRIu64" records (%"PRIu64" filtered).\n",
+  nSeq + filtered, filtered);
   DeleteSLabels(SL);
   
   return EXIT_SUCCESS;
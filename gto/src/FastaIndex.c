@@ -0,0 +1,58 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include "defs.h"
+#include "misc.h"
+#include "mem.h"
+#include "faidx.h"
+#include "argparse.h"
+#include "parser.h"
+#include <unistd.h>
+
+/*
+ * This application builds the index of a FASTA or Multi-FASTA file, which
+ * gto_fasta_extract and gto_fasta_extract_by_read use (-x) to seek to the
+ * records they extract from, instead of reading the file from its beginning.
+ */
+int main(int argc, char *argv[])
+{
+  PARSER *Parser = CreateParser();
+  FAIDX *Index;
+
+  char *programName = argv[0];
+  struct argparse_option options[] = {
+        OPT_HELP(),
+        OPT_GROUP("Basic options"),
+        OPT_BUFF('<', "input.fasta", "Input FASTA or Multi-FASTA file format (stdin)"),
+        OPT_BUFF('>', "input.fasta.gfi", "Output index (stdout)"),
+        OPT_END(),
+  };
+  struct argparse argparse;
+
+  char usage[400] = "\nExample: ";
+  strcat(usage, programName);
+  strcat(usage, " < input.fasta > input.fasta.gfi\n"
+    "\nOutput, one line per record (tab separated):\n"
+    "name  length  offset  line bases  line width  header offset\n"
+    "\nLine bases and line width are 0 in records with lines of different sizes.\n");
+
+  argparse_init(&argparse, options, NULL, programName, 0);
+  argparse_describe(&argparse, "\nIt builds the index of a FASTA or Multi-FASTA file, "
+  "used by the extraction tools to seek to the records.", usage);
+  argc = argparse_parse(&argparse, argc, argv);
+
+  if(argc != 0 || isatty(STDIN_FILENO))
+    argparse_help_cb(&argparse, options);
+
+  FileType(Parser, stdin);
+  if(Parser->type != 1)
+  {
+    fprintf(stderr, "ERROR: This is not a FASTA file!\n");
+    exit(1);
+  }
+
+  Index = BuildFaidx(stdin);
+  WriteFaidx(Index, stdout);
+  RemoveFaidx(Index);
+  return EXIT_SUCCESS;
+}
@@ -2,6 +2,7 @@
 #include <stdlib.h>
 #include <string.h>
 #include <ctype.h>
+#include "buffer.h"
 #include "argparse.h"
 #include <unistd.h>
 
@@ -16,6 +17,7 @@ int main(int argc, char *argv[])
 {
 
   FILE *HEADERS, *EXTRA, *DNA;
+  OBUF *Output;
   int c, d = 0;
   const char *output_headers = NULL;
   const char *output_extra = NULL;
@@ -71,16 +73,17 @@ int main(int argc, char *argv[])
     return 1;
   }
 
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((c = fgetc(EXTRA)) != EOF)
   {
     
     if(c == '>')
     {
-      fprintf(stdout, "%c", c);
+      PutOBuffer(Output, c);
       while((c = fgetc(HEADERS)) != EOF)
       {
         if(c == EOF) goto x;
-        fprintf(stdout, "%c", c);
+        PutOBuffer(Output, c);
         if(c == '\n') break;
       }
       continue;
@@ -93,27 +96,30 @@ int main(int argc, char *argv[])
         if((d = fgetc(DNA)) == EOF)
         {
           fprintf(stderr, "Error: invalid format!");
+          RemoveOBuffer(Output);
           return 1;
         }
-        fprintf(stdout, "%c", d); 
+        PutOBuffer(Output, d); 
         break;
 
       case 1:
         if((d = fgetc(DNA)) == EOF)
         {
           fprintf(stderr, "Error: invalid format!");
+          RemoveOBuffer(Output);
           return 1;
         }
-        fprintf(stdout, "%c", tolower(d));
+        PutOBuffer(Output, tolower(d));
         break;
       
         default:
-          fprintf(stdout, "%c", c);
+          PutOBuffer(Output, c);
         break;      
     }
   }
 
   x:
+  RemoveOBuffer(Output);
 
   if(!HEADERS) fclose(HEADERS);
   if(!EXTRA)   fclose(EXTRA);
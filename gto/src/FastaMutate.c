@@ -21,6 +21,7 @@ int main(int argc, char *argv[])
   PARSER *Parser = CreateParser();
   char *bases = "ACGT";
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -88,6 +89,7 @@ int main(int argc, char *argv[])
 
   srand(seed);
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
     for(index = 0 ; index < streamSize ; ++index)
@@ -96,7 +98,7 @@ int main(int argc, char *argv[])
       {
         if(ParseSym(Parser, (value = Buffer->buf[index])) == -1)
         {
-          putchar(value);
+          PutOBuffer(Output, value);
           continue;
         }
       }
@@ -104,7 +106,7 @@ int main(int argc, char *argv[])
       {
         if(ParseSymN(Parser, (value = Buffer->buf[index])) == -1)
         {
-          putchar(value);
+          PutOBuffer(Output, value);
           continue;
         }
       }
@@ -113,7 +115,7 @@ int main(int argc, char *argv[])
       {
         while((randomValue = bases[rand() % nSymbols]) == value)
           ;
-        putchar(randomValue);
+        PutOBuffer(Output, randomValue);
         continue;
       }
 
@@ -121,12 +123,13 @@ int main(int argc, char *argv[])
         continue;
 
       if(rand() / (RAND_MAX + 1.0) < insertionRate)
-        putchar(bases[rand() % nSymbols]);
+        PutOBuffer(Output, bases[rand() % nSymbols]);
 
-      putchar(value);
+      PutOBuffer(Output, value);
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
   RemoveParser(Parser);
 
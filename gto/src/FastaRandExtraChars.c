@@ -13,14 +13,14 @@
  * This application substitues in the DNA sequence the outside ACGT chars by random ACGT symbols.
  * It works both in FASTA and Multi-FASTA file formats.
  */
-static void RandIfExtra(uint8_t value, char *bases)
+static void RandIfExtra(OBUF *Output, uint8_t value, char *bases)
 {
   if(value == 'A' || value == 'C' || value == 'G' || value == 'T')
   {
-    putchar(value);
+    PutOBuffer(Output, value);
     return;
   }
-  putchar(bases[rand()%4]);
+  PutOBuffer(Output, bases[rand()%4]);
 }
 
 int main(int argc, char *argv[])
@@ -30,6 +30,7 @@ int main(int argc, char *argv[])
   char     *bases = "ACGT";
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
   srand(seed);
 
   char *programName = argv[0];
@@ -63,6 +64,7 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   uint8_t header = 0, sym;
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
@@ -71,15 +73,16 @@ int main(int argc, char *argv[])
     {
       sym = Buffer->buf[index];
 
-      if(sym == '>'){ header = 1; putchar(sym); continue; }
-      if(sym == '\n' && header == 1){ header = 0; putchar(sym); continue; }
-      if(sym == '\n'){ putchar(sym); continue; }
-      if(header == 1){ putchar(sym); continue; }
+      if(sym == '>'){ header = 1; PutOBuffer(Output, sym); continue; }
+      if(sym == '\n' && header == 1){ header = 0; PutOBuffer(Output, sym); continue; }
+      if(sym == '\n'){ PutOBuffer(Output, sym); continue; }
+      if(header == 1){ PutOBuffer(Output, sym); continue; }
 
-      RandIfExtra(sym, bases);
+      RandIfExtra(Output, sym, bases);
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
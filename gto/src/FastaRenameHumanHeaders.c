@@ -14,6 +14,7 @@
 int main(int argc, char *argv[])
 {
   BUF *Buffer;
+  OBUF *Output;
   int64_t header = 0, streamSize = 0, index = 0;
   uint8_t value; 
   uint8_t chrs[30][4] = {"1", "2", "3", "4", "5", "6", "7", "8", 
@@ -43,6 +44,7 @@ int main(int argc, char *argv[])
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   int indexHeader = 0;
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -54,7 +56,7 @@ int main(int argc, char *argv[])
 
       if(header == 1 && value == '\n')
       {   
-        fprintf(stdout, ">chr%s\n", chrs[indexHeader]);
+        PrintOBuffer(Output, ">chr%s\n", chrs[indexHeader]);
         if(indexHeader < 29)
           ++indexHeader;
         header = 0;
@@ -62,8 +64,9 @@ int main(int argc, char *argv[])
       }
 
       if(header == 0)
-        putchar(value);
+        PutOBuffer(Output, value);
     }
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
 
   return EXIT_SUCCESS;
@@ -7,6 +7,7 @@
 #include "mem.h"
 #include "parser.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include <unistd.h>
 
@@ -15,10 +16,11 @@
  */
 int main(int argc, char *argv[])
 {
-  uint32_t streamSize, index, tmpIndex, basesIndex = 0;
+  uint32_t streamSize, index, basesIndex = 0;
   uint8_t  value, line = 0;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -49,6 +51,7 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
     uint8_t basesByRead[streamSize];
@@ -62,9 +65,9 @@ int main(int argc, char *argv[])
           if(value == '\n')
           {
             line = 1;
-            fprintf(stdout, " (Reversed)");
+            PutsOBuffer(Output, " (Reversed)");
           }
-          putchar(value);
+          PutOBuffer(Output, value);
           break;
 
         case 1: 
@@ -80,11 +83,11 @@ int main(int argc, char *argv[])
           if(value == '>')
           {
             line = 0;
-            for(tmpIndex = basesIndex ; tmpIndex > 0 ; --tmpIndex)
-              putchar(basesByRead[tmpIndex-1]);
+            ReverseBytes(basesByRead, basesIndex);
+            WriteOBuffer(Output, basesByRead, basesIndex);
             basesIndex = 0;
-            putchar('\n');
-            putchar(value);
+            PutOBuffer(Output, '\n');
+            PutOBuffer(Output, value);
           }
           else
           {
@@ -96,14 +99,15 @@ int main(int argc, char *argv[])
       if (index == streamSize-1) //Last read
       {
         if(value != '\n')
-          putchar(value);
-        for(tmpIndex = basesIndex ; tmpIndex > 0 ; --tmpIndex)
-          putchar(basesByRead[tmpIndex-1]);
+          PutOBuffer(Output, value);
+        ReverseBytes(basesByRead, basesIndex);
+        WriteOBuffer(Output, basesByRead, basesIndex);
         break;
       }
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
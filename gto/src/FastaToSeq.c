@@ -5,6 +5,7 @@
 #include "misc.h"
 #include "mem.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include "parser.h"
 #include <unistd.h>
@@ -14,10 +15,11 @@
  */
 int main(int argc, char *argv[])
 {
-  uint32_t streamSize, index;
-  uint8_t  value, header = 1;
+  uint32_t streamSize, index, end, mark;
+  uint8_t  header = 1;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -48,21 +50,31 @@ int main(int argc, char *argv[])
   }
   
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
-    for(index = 0 ; index < streamSize ; ++index)
+    for(index = 0 ; index < streamSize ; index = end)
     {
-      value = Buffer->buf[index];
-      if(value == '>'){ header = 1; continue; }
-      if(value == '\n' && header == 1){ header = 0; continue; }
-      if(value == '\n') continue;
-      if(header == 1) continue;
-      if(value < 65 || value > 122) continue;
-      putchar(value);
+      end = index + FindByte(Buffer->buf + index, streamSize - index, '\n');
+      if(header == 0)
+      {
+        // A '>' STARTS A HEADER, EVEN WITHIN A LINE
+        mark = index + FindByte(Buffer->buf + index, end - index, '>');
+        WriteOBuffer(Output, Buffer->buf + index, KeepRange(Buffer->buf + index,
+        Buffer->buf + index, mark - index, 65, 122));
+        if(mark < end)
+          header = 1;
+      }
+      if(end < streamSize)
+      {
+        header = 0;
+        ++end;
+      }
     }
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
@@ -7,29 +7,20 @@
 #include "mem.h"
 #include "parser.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include <unistd.h>
 
-static uint8_t FindComplement(uint8_t value)
-{
-  switch(tolower(value)){
-    case 'a': return 'T';
-    case 't': return 'A';
-    case 'c': return 'G';
-    case 'g': return 'C';
-    default:  return value;
-  }
-}
-
 /*
  * This application replaces the ACGT bases with their complements in a FASTQ file format.
  */
 int main(int argc, char *argv[])
 {
-  uint32_t streamSize, index;
-  uint8_t  value, line = 0;
+  uint32_t streamSize, index, end;
+  uint8_t  line = 0;
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -61,40 +52,24 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
-    for(index = 0 ; index < streamSize ; ++index)
+    for(index = 0 ; index < streamSize ; index = end)
     {
-      value = Buffer->buf[index];
-      switch(line)
+      // ONLY THE BASES (THE SECOND LINE OF EACH READ) ARE COMPLEMENTED
+      end = index + FindByte(Buffer->buf + index, streamSize - index, '\n');
+      if(line == 1)
+        ComplementBases(Buffer->buf + index, end - index);
+      if(end < streamSize)
       {
-        case 0:
-          putchar(value);
-          if(value == '\n') line = 1;
-          break;
-
-        case 1: 
-          if(value == '\n')
-          {
-            putchar('\n');
-            line = 2;
-            break;
-          }
-          putchar(FindComplement(value));
-          break;
-
-        case 2:
-          putchar(value); 
-          if(value == '\n') line = 3; 
-          break;
-        
-        case 3: 
-          putchar(value);
-          if(value == '\n') line = 0; 
-          break;
-      } 
+        ++end;
+        line = (line + 1) % 4;
+      }
+      WriteOBuffer(Output, Buffer->buf + index, end - index);
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
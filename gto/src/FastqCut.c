@@ -6,6 +6,7 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -17,6 +18,7 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   uint32_t seqSize = 0, initial = UINT_MAX, end = UINT_MAX, n;
 
   char *programName = argv[0];
@@ -49,26 +51,28 @@ int main(int argc, char *argv[])
     exit(1);
   }
  
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     seqSize = strlen((char *) Read->bases) - 1;
 
     // PRINT READ
-    fprintf(stdout, "@");
+    PutOBuffer(Output, '@');
     for(n = 0 ; n < strlen((char *) Read->header1) ; ++n)
-      fprintf(stdout, "%c", Read->header1[n]);
+      PutOBuffer(Output, Read->header1[n]);
     for(n = 0 ; n < seqSize ; ++n)
       if(n >= initial && n <= end)
-        fprintf(stdout, "%c", Read->bases[n]);
+        PutOBuffer(Output, Read->bases[n]);
 
-    fprintf(stdout, "\n+\n");
+    PutsOBuffer(Output, "\n+\n");
     for(n = 0 ; n < seqSize ; ++n)
       if(n >= initial && n <= end)
-        fprintf(stdout, "%c", Read->scores[n]);
+        PutOBuffer(Output, Read->scores[n]);
         
-    fprintf(stdout, "\n");
+    PutOBuffer(Output, '\n');
   }
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
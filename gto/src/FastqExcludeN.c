@@ -6,6 +6,7 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -17,6 +18,7 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   uint32_t sequenceSize = 0, N_counter = 0, globalIndex, index;
   uint64_t okReads = 0, totalReads = 0;
   int max_n_read = 0;
@@ -56,6 +58,7 @@ int main(int argc, char *argv[])
   }
  
   // LOAD PARAMETERS
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     sequenceSize = strlen((char *) Read->bases) - 1;
@@ -70,15 +73,15 @@ int main(int argc, char *argv[])
     if(N_counter > max_n_read) continue;
 
     // Print read
-    fprintf(stdout, "@");
+    PutOBuffer(Output, '@');
     for(index = 0 ; index < strlen((char *) Read->header1) ; ++index)
-      fprintf(stdout, "%c", Read->header1[index]);
+      PutOBuffer(Output, Read->header1[index]);
     for(index = 0 ; index < globalIndex ; ++index)
-      fprintf(stdout, "%c", Read->bases[index]);
-    fprintf(stdout, "\n+\n");
+      PutOBuffer(Output, Read->bases[index]);
+    PutsOBuffer(Output, "\n+\n");
     for(index = 0 ; index < globalIndex ; ++index)
-      fprintf(stdout, "%c", Read->scores[index]);
-    fprintf(stdout, "\n");
+      PutOBuffer(Output, Read->scores[index]);
+    PutOBuffer(Output, '\n');
 
     ++okReads;
   }
@@ -86,6 +89,7 @@ int main(int argc, char *argv[])
   fprintf(stderr, "Total reads    : %"PRIu64"\n", totalReads);
   fprintf(stderr, "Filtered reads : %"PRIu64"\n", totalReads-okReads);
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
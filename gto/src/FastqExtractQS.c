@@ -5,6 +5,7 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -15,6 +16,7 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   uint32_t sequenceSize = 0, index;
   uint64_t totalReads = 0, totalQS = 0;
 
@@ -43,21 +45,23 @@ int main(int argc, char *argv[])
   if(argc != 0 || isatty(STDIN_FILENO))
     argparse_help_cb(&argparse, options);
   
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     sequenceSize = strlen((char *) Read->scores) - 1;
     ++totalReads;
     for(index = 0 ; index < sequenceSize ; ++index)
     {
-      fprintf(stdout, "%c", Read->scores[index]);
+      PutOBuffer(Output, Read->scores[index]);
       ++totalQS;
     }
-    fprintf(stdout, "\n");
+    PutOBuffer(Output, '\n');
   }
 
   fprintf(stderr, "Total reads          : %"PRIu64"\n", totalReads);
   fprintf(stderr, "Total Quality-Scores : %"PRIu64"\n", totalQS);
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
@@ -19,6 +19,7 @@ int main(int argc, char *argv[]){
   uint8_t  value;
   uint64_t idx = 1;
   BUF *Buffer;
+  OBUF *Output;
   const char *readTitle = NULL;
 
   char *programName = argv[0];
@@ -54,6 +55,7 @@ int main(int argc, char *argv[]){
 
   uint8_t *scores = (uint8_t *) Calloc(lineSize+1, sizeof(uint8_t));
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((sequenceSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < sequenceSize ; ++index)
     {
@@ -65,12 +67,12 @@ int main(int argc, char *argv[]){
       if(pos == 0)
       {
         if(readTitle != NULL)
-          fprintf(stdout, "@%s%"PRIu64"\n", readTitle, idx);
+          PrintOBuffer(Output, "@%s%"PRIu64"\n", readTitle, idx);
         else
-          fprintf(stdout, "@Computed_with_%s%"PRIu64"\n", programName, idx);
+          PrintOBuffer(Output, "@Computed_with_%s%"PRIu64"\n", programName, idx);
       }
 
-      putchar(value);
+      PutOBuffer(Output, value);
       scores[pos] = 'F';
 
       if(++pos == lineSize)
@@ -78,16 +80,17 @@ int main(int argc, char *argv[]){
         scores[pos] = '\0';
         pos = 0;
         ++idx;
-        fprintf(stdout, "\n+\n%s\n", scores);
+        PrintOBuffer(Output, "\n+\n%s\n", scores);
       }
     }
     
   if (pos != 0)
   {
     scores[++pos] = '\0';
-    fprintf(stdout, "\n+\n%s\n", scores);
+    PrintOBuffer(Output, "\n+\n%s\n", scores);
   }
   
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
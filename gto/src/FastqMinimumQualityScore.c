@@ -6,6 +6,7 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -16,6 +17,7 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   uint32_t seqSize = 0, totalQS = 0, globalIndex, index;
   uint64_t okReads = 0, totalReads = 0;
   int min_avg_qs = 0;
@@ -53,6 +55,7 @@ int main(int argc, char *argv[])
     exit(1);
   }
  
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     seqSize = strlen((char *) Read->bases) - 1;
@@ -69,15 +72,15 @@ int main(int argc, char *argv[])
     if((totalQS / seqSize) < min_avg_qs) continue;
 
     // Print read
-    fprintf(stdout, "@");
+    PutOBuffer(Output, '@');
     for(index = 0 ; index < strlen((char *) Read->header1) ; ++index)
-      fprintf(stdout, "%c", Read->header1[index]);
+      PutOBuffer(Output, Read->header1[index]);
     for(index = 0 ; index < seqSize ; ++index)
-      fprintf(stdout, "%c", Read->bases[index]);
-    fprintf(stdout, "\n+\n");
+      PutOBuffer(Output, Read->bases[index]);
+    PutsOBuffer(Output, "\n+\n");
     for(index = 0 ; index < seqSize ; ++index)
-      fprintf(stdout, "%c", Read->scores[index]);
-    fprintf(stdout, "\n");
+      PutOBuffer(Output, Read->scores[index]);
+    PutOBuffer(Output, '\n');
 
     ++okReads;
   }
@@ -85,6 +88,7 @@ int main(int argc, char *argv[])
   fprintf(stderr, "Total reads    : %"PRIu64"\n", totalReads);
   fprintf(stderr, "Filtered reads : %"PRIu64"\n", totalReads-okReads);
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
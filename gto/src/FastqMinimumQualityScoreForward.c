@@ -5,6 +5,7 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -16,6 +17,7 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   int32_t seqSize = 0, x, n;
   uint64_t cutted = 0, totalReads = 0;
   int windowsize = 5, min_QS_window = 25, min_QS = 33;
@@ -51,6 +53,7 @@ int main(int argc, char *argv[])
 
   fprintf(stderr, "Minimum QS     : %d\n", min_QS);
  
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     seqSize = strlen((char *) Read->bases) - 1;
@@ -76,24 +79,25 @@ int main(int argc, char *argv[])
     if(x < windowsize) continue;
 
     // PRINT READ
-    fprintf(stdout, "@");
+    PutOBuffer(Output, '@');
     for(n = 0 ; n < strlen((char *) Read->header1) ; ++n)
-      fprintf(stdout, "%c", Read->header1[n]);
+      PutOBuffer(Output, Read->header1[n]);
     
     for(n = 0 ; n < x ; ++n)
-      fprintf(stdout, "%c", Read->bases[n]);
+      PutOBuffer(Output, Read->bases[n]);
     
-    fprintf(stdout, "\n+\n");
+    PutsOBuffer(Output, "\n+\n");
     
     for(n = 0 ; n < x ; ++n)
-      fprintf(stdout, "%c", Read->scores[n]);
+      PutOBuffer(Output, Read->scores[n]);
     
-    fprintf(stdout, "\n");
+    PutOBuffer(Output, '\n');
   }
 
   fprintf(stderr, "Total reads    : %"PRIu64"\n", totalReads);
   fprintf(stderr, "Trimmed reads  : %"PRIu64"\n", cutted);
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
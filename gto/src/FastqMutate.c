@@ -21,6 +21,7 @@ int main(int argc, char *argv[])
   PARSER *Parser = CreateParser();
   char *bases = "ACGT";
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -93,12 +94,13 @@ int main(int argc, char *argv[])
 
   srand(seed);
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
     {
       if(ParseSym(Parser, (value = Buffer->buf[index])) == -1)
       {
-        putchar(value);
+        PutOBuffer(Output, value);
         continue;
       }
        
@@ -106,7 +108,7 @@ int main(int argc, char *argv[])
       {
         while((randomValue = bases[rand() % nSymbols]) == value)
           ;
-        putchar(randomValue);
+        PutOBuffer(Output, randomValue);
         continue;
       }
 
@@ -114,11 +116,12 @@ int main(int argc, char *argv[])
         continue;
 
       if(rand() / (RAND_MAX + 1.0) < insertionRate)
-        putchar(bases[rand() % nSymbols]);
+        PutOBuffer(Output, bases[rand() % nSymbols]);
 
-      putchar(value);
+      PutOBuffer(Output, value);
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
   RemoveParser(Parser);
   return 0;
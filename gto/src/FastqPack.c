@@ -5,23 +5,24 @@
 #include "defs.h"
 #include "misc.h"
 #include "mem.h"
+#include "buffer.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
 
-void PrintStream(uint8_t *b, uint32_t n, uint8_t terminator)
+void PrintStream(OBUF *Output, uint8_t *b, uint32_t n, uint8_t terminator)
 {
   int k;
   for(k = 0 ; k < n ; ++k)
     if(b[k] == '\n' || k == (n-1)) 
-      putchar(127);
+      PutOBuffer(Output, 127);
     else 
-      putchar(b[k]);
+      PutOBuffer(Output, b[k]);
 }
 
-void PrintID(uint32_t i)
+void PrintID(OBUF *Output, uint32_t i)
 {
-  fprintf(stdout, "\t%u\n", i);
+  PrintOBuffer(Output, "\t%u\n", i);
 }
 
 /* 
@@ -31,6 +32,7 @@ void PrintID(uint32_t i)
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
+  OBUF *Output;
   uint32_t index = 0, scores = 0;
 
   char *programName = argv[0];
@@ -56,24 +58,26 @@ int main(int argc, char *argv[])
   if(argc != 0 || isatty(STDIN_FILENO))
     argparse_help_cb(&argparse, options);
   
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     if(scores == 0)
     {
-      PrintStream(Read->bases,  strlen((char *) Read->bases ),  0);
-      PrintStream(Read->scores, strlen((char *) Read->scores),  0);
+      PrintStream(Output, Read->bases,  strlen((char *) Read->bases ),  0);
+      PrintStream(Output, Read->scores, strlen((char *) Read->scores),  0);
     }
     else
     {
-      PrintStream(Read->scores, strlen((char *) Read->scores),  0);
-      PrintStream(Read->bases,  strlen((char *) Read->bases ),  0);
+      PrintStream(Output, Read->scores, strlen((char *) Read->scores),  0);
+      PrintStream(Output, Read->bases,  strlen((char *) Read->bases ),  0);
     }
 
-    PrintStream(Read->header1,  strlen((char *) Read->header1), 0);
-    PrintStream(Read->header2,  strlen((char *) Read->header2), 0);
-    PrintID(index++);
+    PrintStream(Output, Read->header1,  strlen((char *) Read->header1), 0);
+    PrintStream(Output, Read->header2,  strlen((char *) Read->header2), 0);
+    PrintID(Output, index++);
   }
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
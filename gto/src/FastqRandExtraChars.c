@@ -9,14 +9,14 @@
 #include "argparse.h"
 #include <unistd.h>
 
-static void RandIfExtra(uint8_t value, char *bases)
+static void RandIfExtra(OBUF *Output, uint8_t value, char *bases)
 {
   if(value == 'A' || value == 'C' || value == 'G' || value == 'T')
   {
-    putchar(value);
+    PutOBuffer(Output, value);
     return;
   }
-  putchar(bases[rand()%4]);
+  PutOBuffer(Output, bases[rand()%4]);
 }
 
 /* 
@@ -29,6 +29,7 @@ int main(int argc, char *argv[])
   char     *bases = "ACGT";
   PARSER *Parser = CreateParser();
   BUF *Buffer;
+  OBUF *Output;
   srand(seed);
 
   char *programName = argv[0];
@@ -60,6 +61,7 @@ int main(int argc, char *argv[])
   }
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -68,32 +70,33 @@ int main(int argc, char *argv[])
       switch(line)
       {
         case 0:
-          putchar(value);
+          PutOBuffer(Output, value);
           if(value == '\n') line = 1;
           break;
 
         case 1: 
           if(value == '\n')
           {
-            putchar('\n');
+            PutOBuffer(Output, '\n');
             line = 2;
             break;
           }
-          RandIfExtra(value, bases);
+          RandIfExtra(Output, value, bases);
           break;
 
         case 2:
-          putchar(value); 
+          PutOBuffer(Output, value); 
           if(value == '\n') line = 3; 
           break;
         
         case 3: 
-          putchar(value);
+          PutOBuffer(Output, value);
           if(value == '\n') line = 0; 
           break;
       } 
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
@@ -7,6 +7,8 @@
 #include "misc.h"
 #include "parser.h"
 #include "mem.h"
+#include "buffer.h"
+#include "simd.h"
 #include "reads.h"
 #include "argparse.h"
 #include <unistd.h>
@@ -17,7 +19,8 @@
 int main(int argc, char *argv[])
 {
   Read *Read = CreateRead(65536+GUARD, 65535+GUARD);
-  uint32_t seqSize = 0, index;
+  OBUF *Output;
+  uint32_t seqSize = 0;
   PARSER *Parser = CreateParser();
 
   char *programName = argv[0];
@@ -48,24 +51,25 @@ int main(int argc, char *argv[])
     exit(1);
   }
 
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while(GetRead(stdin, Read))
   {
     seqSize = strlen((char *) Read->bases) - 1;
 
-    fprintf(stdout, "@");
-    for(index = 0 ; index < strlen((char *) Read->header1)-1 ; ++index)
-      fprintf(stdout, "%c", Read->header1[index]);
-    fprintf(stdout, " (Reversed)\n");
-    for(index = seqSize ; index > 0 ; --index)
-        fprintf(stdout, "%c", Read->bases[index-1]);
+    PutOBuffer(Output, '@');
+    WriteOBuffer(Output, Read->header1, strlen((char *) Read->header1)-1);
+    PutsOBuffer(Output, " (Reversed)\n");
+    ReverseBytes(Read->bases, seqSize);
+    WriteOBuffer(Output, Read->bases, seqSize);
 
-    fprintf(stdout, "\n+\n");
-    for(index = seqSize ; index > 0 ; --index)
-      fprintf(stdout, "%c", Read->scores[index-1]);
+    PutsOBuffer(Output, "\n+\n");
+    ReverseBytes(Read->scores, seqSize);
+    WriteOBuffer(Output, Read->scores, seqSize);
         
-    fprintf(stdout, "\n");
+    PutOBuffer(Output, '\n');
   }
 
+  RemoveOBuffer(Output);
   FreeRead(Read);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
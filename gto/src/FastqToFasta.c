@@ -16,6 +16,7 @@ int main(int argc, char *argv[])
   uint32_t streamSize, index;
   uint8_t  value, line = 0;
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -42,8 +43,9 @@ int main(int argc, char *argv[])
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
-  fprintf(stdout, "> Computed with Fastq2Fasta\n");
+  PutsOBuffer(Output, "> Computed with Fastq2Fasta\n");
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -56,7 +58,7 @@ int main(int argc, char *argv[])
           break;
         case 1: 
           if(value == '\n') line = 2;
-          putchar(value);
+          PutOBuffer(Output, value);
           break;
         case 2:
           if(value == '\n') line = 3;
@@ -67,6 +69,7 @@ int main(int argc, char *argv[])
       } 
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
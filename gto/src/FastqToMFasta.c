@@ -16,6 +16,7 @@ int main(int argc, char *argv[])
   uint32_t streamSize, index;
   uint8_t  value, line = 0, pos = 0;
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -42,6 +43,7 @@ int main(int argc, char *argv[])
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -52,13 +54,13 @@ int main(int argc, char *argv[])
         case 0: 
           if(value == '\n') line = 1;
           if(value == '@' && pos++ == 0)
-            putchar('>');
+            PutOBuffer(Output, '>');
           else
-            putchar(value);
+            PutOBuffer(Output, value);
           break;
         case 1: 
           if(value == '\n') line = 2;
-          putchar(value);
+          PutOBuffer(Output, value);
           break;
         case 2:
           if(value == '\n') line = 3;
@@ -73,6 +75,7 @@ int main(int argc, char *argv[])
       } 
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
@@ -206,6 +206,10 @@ int main(int argc, char *argv[])
   "          It changes the headers of FASTA or Multi-FASTA file to          \n" 
   "          simple chrX by order, where X is the number.                    \n"
   "                                                                          \n"
+  "      [gto_fasta_index]                                                   \n"
+  "          It builds the index of a FASTA or Multi-FASTA file, used        \n"
+  "          by the extraction tools to seek to the records.                 \n"
+  "                                                                          \n"
   "      [gto_fasta_info]                                                    \n"
   "          It shows the readed information of a FASTA or Multi-FASTA       \n"
   "          file format.                                                    \n"
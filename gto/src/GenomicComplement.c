@@ -7,28 +7,18 @@
 #include "mem.h"
 #include "parser.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include <unistd.h>
 
-static uint8_t FindComplement(uint8_t value)
-{
-  switch(tolower(value)){
-    case 'a': return 'T';
-    case 't': return 'A';
-    case 'c': return 'G';
-    case 'g': return 'C';
-    default:  return value;
-  }
-}
-
 /* 
  * This application complements in the DNA sequence.
  * It works in sequence file formats.
  */
 int main(int argc, char *argv[]){
-  uint32_t streamSize, index;
-  uint8_t  value;
+  uint32_t streamSize, index, end;
   BUF *Buffer;
+  OBUF *Output;
   
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -52,16 +42,17 @@ int main(int argc, char *argv[]){
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
-    for(index = 0 ; index < streamSize ; ++index)
+    for(index = 0 ; index < streamSize ; index = end + 1)
     {
-      value = Buffer->buf[index];
-      if(value == '\n')
-        continue;
-      putchar(FindComplement(value));
+      end = index + FindByte(Buffer->buf + index, streamSize - index, '\n');
+      ComplementBases(Buffer->buf + index, end - index);
+      WriteOBuffer(Output, Buffer->buf + index, end - index);
     } 
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
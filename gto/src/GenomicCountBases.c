@@ -15,21 +15,72 @@
 #include "defs.h"
 #include "parser.h"
 #include "buffer.h"
+#include "simd.h"
 #include "common.h"
 #include "argparse.h"
 #include <unistd.h>
 
+#define COUNT_BLOCK 1073741824
+
+/*
+ * Adds the bases of a block that ParseSym would accept to count: every base of
+ * a sequence, those outside the headers of FASTA, those of the second line of
+ * each FASTQ read. The parser keeps the state of the lines across blocks.
+ */
+static void CountBlock(PARSER *Parser, const uint8_t *buf, uint32_t size, uint64_t *count)
+{
+  uint32_t index, end, mark;
+
+  if(Parser->type != 1 && Parser->type != 2)
+  {
+    CountBases(buf, size, count);
+    return;
+  }
+
+  for(index = 0 ; index < size ; index = end)
+  {
+    end = index + FindByte(buf + index, size - index, '\n');
+    if(Parser->type == 1)
+    {
+      if(Parser->header == 0)
+      {
+        // A '>' STARTS A HEADER, EVEN WITHIN A LINE
+        mark = index + FindByte(buf + index, end - index, '>');
+        CountBases(buf + index, mark - index, count);
+        if(mark < end)
+          Parser->header = 1;
+      }
+      if(end < size)
+      {
+        Parser->header = 0;
+        ++end;
+      }
+    }
+    else
+    {
+      if(Parser->line == 1)
+        CountBases(buf + index, end - index, count);
+      if(end < size)
+      {
+        Parser->line = (Parser->line + 1) % 4;
+        ++end;
+      }
+    }
+  }
+}
+
 /*
  * This application counts the number of bases in sequence, FASTA or FASTQ files.
  */
 int main(int argc, char *argv[])
 {
-  uint64_t nBases = 0, info[6] = {0, 0, 0, 0, 0, 0};
+  uint64_t nBases = 0, info[6] = {0, 0, 0, 0, 0, 0}, count[5] = {0, 0, 0, 0, 0};
   char     type[4][20] = {"DNA", "FASTA", "FASTQ", "UNKNOWN"};
-  uint8_t  sym, *buf;
+  uint8_t  *buf;
+  int      x;
   struct   stat s;
-  size_t   size, streamSize;
-  long     fd=0;
+  size_t   size, streamSize, block;
+  int      fd;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -63,25 +114,41 @@ int main(int argc, char *argv[])
 
   PARSER   *Parser = CreateParser();
   FileType(Parser, stdin);
-  fstat(fd, &s);
-  size = s.st_size;
-  
-  #if defined(OSX)
-    // OSX doesnt have a MAP_POPULATE flag
-    #define MAP_FLAGS MAP_PRIVATE
-  #else
-    #define MAP_FLAGS MAP_PRIVATE|MAP_POPULATE
-  #endif
-  buf = (uint8_t *) mmap(0, size, PROT_READ, MAP_FLAGS, fd, 0);
-  #undef MAP_FLAGS
-
-  madvise(buf, s.st_size, MADV_SEQUENTIAL);
-  for(streamSize = 0 ; streamSize < size ; ++streamSize)
+  fd = fileno(stdin);
+
+  if(fd >= 0 && fstat(fd, &s) == 0 && S_ISREG(s.st_mode))
+  {
+    size = s.st_size;
+
+    #if defined(OSX)
+      // OSX doesnt have a MAP_POPULATE flag
+      #define MAP_FLAGS MAP_PRIVATE
+    #else
+      #define MAP_FLAGS MAP_PRIVATE|MAP_POPULATE
+    #endif
+    buf = (uint8_t *) mmap(0, size, PROT_READ, MAP_FLAGS, fd, 0);
+    #undef MAP_FLAGS
+
+    madvise(buf, s.st_size, MADV_SEQUENTIAL);
+    for(streamSize = 0 ; streamSize < size ; streamSize += block)
+    {
+      block = size - streamSize < COUNT_BLOCK ? size - streamSize : COUNT_BLOCK;
+      CountBlock(Parser, buf + streamSize, block, count);
+    }
+    munmap(buf, size);
+  }
+  else
+  {
+    // PIPES AND IN-MEMORY STREAMS (libgto.c) CANNOT BE MAPPED
+    buf = (uint8_t *) Malloc(DEF_IO_SIZE);
+    while((block = fread(buf, 1, DEF_IO_SIZE, stdin)) > 0)
+      CountBlock(Parser, buf, block, count);
+    Free(buf, DEF_IO_SIZE);
+  }
+  for(x = 0 ; x < 4 ; ++x)
   {
-    if(ParseSym(Parser, (sym = *buf++)) == -1)
-      continue; 
-    info[DNASymToNum(sym)]++;
-    ++nBases;
+    info[x] = count[x];
+    nBases += count[x];
   }
 
   fprintf(stdout, "File type        : %s\n", type[Parser->type]);
@@ -94,7 +161,6 @@ int main(int argc, char *argv[])
   fprintf(stdout, "Number of others : %"PRIu64"\n", info[5]);
 
   RemoveParser(Parser);
-  close(fd);
 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
@@ -19,6 +19,7 @@ int main(int argc, char *argv[])
   double mutationRate = 0, deletionRate = 0, insertionRate = 0;
   char *bases = "ACGT";
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -79,6 +80,7 @@ int main(int argc, char *argv[])
 
   srand(seed);
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
     {
@@ -87,7 +89,7 @@ int main(int argc, char *argv[])
       {
         while((randomValue = bases[rand() % nSymbols]) == value)
           ;
-        putchar(randomValue);
+        PutOBuffer(Output, randomValue);
         continue;
       }
       
@@ -95,11 +97,12 @@ int main(int argc, char *argv[])
         continue;
       
       if(rand() / (RAND_MAX + 1.0) < insertionRate)
-        putchar(bases[rand() % nSymbols]);
+        PutOBuffer(Output, bases[rand() % nSymbols]);
       
-      putchar(value);
+      PutOBuffer(Output, value);
     }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer);
   return 0;
 }
\ No newline at end of file
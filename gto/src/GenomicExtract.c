@@ -4,18 +4,22 @@
 #include <string.h>
 #include "defs.h"
 #include "misc.h"
+#include "buffer.h"
 #include "argparse.h"
 #include <unistd.h>
 
 #define END  100
 
 /*
- * This application extracts sequences from a sequence file.
+ * This application extracts sequences from a sequence file. Positions are
+ * bytes of the file, so the extraction starts at byte init.
  */
 int main(int argc, char *argv[])
 {
   uint64_t count = 0, init = 0, end = END;
-  char value;
+  uint32_t streamSize;
+  BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -40,16 +44,18 @@ int main(int argc, char *argv[])
   if(argc != 0 || isatty(STDIN_FILENO))
     argparse_help_cb(&argparse, options);
 
-  do
-  {
-    value = fgetc(stdin);
-    
-    if(init <= count && end > count)
-      fprintf(stdout, "%c", value);		
-    
-    if(count++ >= end) break;
-  }
-  while(value != EOF);
-
+  // The bytes before init are seeked over in files, and only read in pipes
+  Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
+  if(init < end && SeekInput(stdin, &count, init) == 0)
+    while(count < end && (streamSize = fread(Buffer->buf, 1, MIN(Buffer->size,
+    end - count), stdin)))
+    {
+      WriteOBuffer(Output, Buffer->buf, streamSize);
+      count += streamSize;
+    }
+
+  RemoveOBuffer(Output);
+  RemoveBuffer(Buffer);
   return EXIT_SUCCESS;
 }
\ No newline at end of file
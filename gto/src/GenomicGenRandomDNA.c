@@ -3,6 +3,7 @@
 #include <string.h>
 #include <limits.h>
 #include "defs.h"
+#include "buffer.h"
 #include "argparse.h"
 
 /*
@@ -14,6 +15,7 @@ int main(int argc, char *argv[])
   char *bases = "ACGT";
   double freqs[4] = {0.25, 0.25, 0.25, 0.25}, cum[4], value, totalFreq;
   const char *frequency = NULL;
+  OBUF *Output;
 
 
   char *programName = argv[0];
@@ -73,14 +75,16 @@ int main(int argc, char *argv[])
   cum[3] = 1;
 
   srand(seed);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   for(index = 0 ; index < seqSize ; index++)
   {
     value = rand() / (RAND_MAX + 1.0);
     for(indexAux = 0 ; indexAux < 4 ; indexAux++)
       if(value <= cum[indexAux])
         break;
-    putchar(bases[indexAux]);
+    PutOBuffer(Output, bases[indexAux]);
   }
 
+  RemoveOBuffer(Output);
   return 0;
 }
\ No newline at end of file
@@ -1,5 +1,6 @@
 #include <stdio.h>
 #include <stdlib.h>
+#include <pthread.h>
 #include "defs.h"
 #include "fcm.h"
 #include "dna.h"
@@ -9,24 +10,96 @@
 #include "argparse.h"
 #include <unistd.h>
 
+#define PERIOD_BLOCK      1048576     // SYMBOLS MODELLED BETWEEN READS
+#define MAX_PERIOD_ORDER  (GUARD - 1) // PAST SYMBOLS KEPT BEFORE A BLOCK
+#define MAX_PERIOD_THREADS 64
+#define DEF_PERIOD_MEMORY 1024        // MB OF ARRAY TABLES
+
+/*
+ * Models of a share of the orders, over a block of symbols. The ACGT symbols of
+ * the block come after the last MAX_PERIOD_ORDER symbols of the previous block,
+ * so every order reads its context from the same buffer.
+ */
+typedef struct
+{
+  FCM      **Fcm;
+  uint64_t *bits;     // CODE LENGTH OF THE SEQUENCE, PER ORDER
+  uint32_t nOrders;
+  uint32_t first;     // ORDERS first, first + step, ...
+  uint32_t step;
+  uint8_t  *sym;
+  uint32_t size;
+}
+PJOB;
+
+static void *ModelBlock(void *arg)
+{
+  PJOB     *J = (PJOB *) arg;
+  FCM      *M;
+  uint64_t bits;
+  uint32_t o, i;
+
+  for(o = J->first ; o < J->nOrders ; o += J->step)
+  {
+    M = J->Fcm[o];
+    bits = 0;
+    for(i = 0 ; i < J->size ; ++i)
+    {
+      GetIdx4Dna(J->sym + i - 1, M);
+      Compute4DnaFCM(M);
+      bits += CompProbs(M, J->sym[i]);
+      Update4DnaFCM(M, J->sym[i], 0);
+    }
+    J->bits[o] += bits;
+  }
+  return NULL;
+}
+
+/*
+ * Runs the jobs of a block, each on a thread. Where threads are not available
+ * (e.g. WASM builds without pthreads), the jobs run one after the other.
+ */
+static void ModelBlockJobs(PJOB *J, pthread_t *T, uint32_t nJobs)
+{
+  uint32_t x;
+  uint8_t  started[MAX_PERIOD_THREADS];
+
+  for(x = 1 ; x < nJobs ; ++x)
+    started[x] = pthread_create(&T[x], NULL, ModelBlock, &J[x]) == 0;
+  ModelBlock(&J[0]);
+  for(x = 1 ; x < nJobs ; ++x)
+  {
+    if(started[x])
+      pthread_join(T[x], NULL);
+    else
+      ModelBlock(&J[x]);
+  }
+}
+
 /*
  * This application calculates the best order depth of a sequence, using FCMs.
- * It only works "ACGT", while the rest will be discarded.
+ * It only works "ACGT", while the rest will be discarded. The sequence is read
+ * once, with the models of all the orders updated along it.
  */
 int main(int argc, char *argv[])
 {
-  uint32_t k, i, order = 1, max = 11;
-  uint8_t s;
-  uint64_t info[2][max];
-  BUF *B;
-  CBUF *CB;
-  FCM *Fcm;
-  // FILE *PLOT = popen("gnuplot -p", "w");
+  int      minOrder = 1, maxOrder = 11, threads = 1, memory = DEF_PERIOD_MEMORY;
+  uint32_t k, i, x, order, nOrders, nJobs, size;
+  uint64_t symbols = 0, arrayBytes = 0, tableBytes, *bits;
+  uint8_t  s, *sym;
+  BUF      *B;
+  FCM      **Fcm;
+  PJOB     J[MAX_PERIOD_THREADS];
+  pthread_t T[MAX_PERIOD_THREADS];
 
   char *programName = argv[0];
   struct argparse_option options[] = {
       OPT_HELP(),
       OPT_GROUP("Basic options"),
+      OPT_INTEGER('n', "min", &minOrder, "Minimum order (default 1)"),
+      OPT_INTEGER('m', "max", &maxOrder, "Maximum order (default 11)"),
+      OPT_INTEGER('t', "threads", &threads, "Threads modelling the orders (default 1)"),
+      OPT_INTEGER('r', "memory", &memory, "MB of array tables; higher orders use hash tables (default 1024)"),
       OPT_BUFF('<', "input.seq", "Input sequence file format (stdin)"),
       OPT_BUFF('>', "output", "Output is given by log_2(4)*K(x)/|x|) (stdout)"),
       OPT_END(),
@@ -35,7 +108,7 @@ int main(int argc, char *argv[])
 
   char usage[250] = "\nExample: ";
   strcat(usage, programName);
-  strcat(usage, " < input.seq > output\n");
+  strcat(usage, " -m <max> -t <threads> < input.seq > output\n");
 
   argparse_init(&argparse, options, NULL, programName, 0);
   argparse_describe(&argparse, "\nIt calculates the best order depth of a sequence, using FCMs."
@@ -46,50 +119,84 @@ int main(int argc, char *argv[])
   if (argc != 0 || isatty(STDIN_FILENO))
     argparse_help_cb(&argparse, options);
 
-  // SEQUENCE
-  for (order = 1; order <= max; ++order)
+  if (minOrder < 1 || maxOrder > MAX_PERIOD_ORDER || minOrder > maxOrder)
   {
-    fprintf(stderr, "Running order: %u ... ", order);
-    rewind(stdin);
-    info[0][order] = 0;
-    info[1][order] = 0;
-    B = CreateBuffer(BUF_SIZE);
-    CB = CreateCBuffer(BUF_SIZE, GUARD);
-    Fcm = Create4DnaFCM(order, 1, 0, 4);
-
-    while ((k = fread(B->buf, 1, B->size, stdin)))
-      for (i = 0; i < k; ++i)
-      {
-        s = B->buf[i];
-        if (s == 'A' || s == 'C' || s == 'G' || s == 'T')
-        {
-          s = S2N(s);
-          CB->buf[CB->idx] = s;
-          GetIdx4Dna(CB->buf + CB->idx - 1, Fcm);
-          Compute4DnaFCM(Fcm);
-          info[0][order] += CompProbs(Fcm, s);
-          info[1][order]++;
-          Update4DnaFCM(Fcm, s, 0);
-          UpdateCBuffer(CB);
-        }
-      }
+    fprintf(stderr, "Error: the orders must be within 1 and %d!\n", MAX_PERIOD_ORDER);
+    exit(1);
+  }
+  if (threads < 1 || threads > MAX_PERIOD_THREADS)
+  {
+    fprintf(stderr, "Error: the threads must be within 1 and %d!\n", MAX_PERIOD_THREADS);
+    exit(1);
+  }
 
-    fprintf(stderr, "Done!\n");
-    RemoveBuffer(B);
-    RemoveCBuffer(CB);
-    Free4DnaModel(Fcm);
+  // MODELS: ARRAY TABLES WHILE THEY FIT THE MEMORY, HASH TABLES AFTER THEM
+  nOrders = maxOrder - minOrder + 1;
+  Fcm  = (FCM **) Calloc(nOrders, sizeof(FCM *));
+  bits = (uint64_t *) Calloc(nOrders, sizeof(uint64_t));
+  for (x = 0 ; x < nOrders ; ++x)
+  {
+    order = minOrder + x;
+    tableBytes = ((uint64_t) 1 << (2 * order)) * 4 * sizeof(ACC);
+    if (arrayBytes + tableBytes <= (uint64_t) memory << 20)
+    {
+      Fcm[x] = Create4DnaFCM(order, 1, 0, 4);
+      if (Fcm[x]->mode == ARRAY_TABLE)
+        arrayBytes += tableBytes;
+    }
+    else
+      Fcm[x] = CreateMode4DnaFCM(order, 1, 0, 4, HASH_TABLE);
   }
 
-  // fprintf(PLOT, "plot '-' with lines\n");
-  for (order = 1; order <= max; ++order)
+  nJobs = (uint32_t) threads < nOrders ? (uint32_t) threads : nOrders;
+  sym = (uint8_t *) Calloc(MAX_PERIOD_ORDER + PERIOD_BLOCK, sizeof(uint8_t));
+  for (x = 0 ; x < nJobs ; ++x)
   {
-    fprintf(stdout, "%2u\t%.4g\n", order, (double)(2 * info[0][order]) / info[1][order]);
-    // fprintf(PLOT, "%2u\t%.4g\n", order, (double)(2 * info[0][order]) / info[1][order]);
+    J[x].Fcm     = Fcm;
+    J[x].bits    = bits;
+    J[x].nOrders = nOrders;
+    J[x].first   = x;
+    J[x].step    = nJobs;
+    J[x].sym     = sym + MAX_PERIOD_ORDER;
   }
 
-  // fprintf(PLOT, "e\n");
-  // fflush(PLOT);
-  // pclose(PLOT);
+  // SEQUENCE
+  fprintf(stderr, "Running orders: %d to %d ... ", minOrder, maxOrder);
+  B = CreateBuffer(BUF_SIZE);
+  size = 0;
+  while ((k = fread(B->buf, 1, B->size, stdin)))
+    for (i = 0; i < k; ++i)
+    {
+      s = B->buf[i];
+      if (s == 'A' || s == 'C' || s == 'G' || s == 'T')
+      {
+        sym[MAX_PERIOD_ORDER + size++] = S2N(s);
+        if (size == PERIOD_BLOCK)
+        {
+          for (x = 0 ; x < nJobs ; ++x)
+            J[x].size = size;
+          ModelBlockJobs(J, T, nJobs);
+          memcpy(sym, sym + size, MAX_PERIOD_ORDER);
+          symbols += size;
+          size = 0;
+        }
+      }
+    }
+  for (x = 0 ; x < nJobs ; ++x)
+    J[x].size = size;
+  ModelBlockJobs(J, T, nJobs);
+  symbols += size;
+  fprintf(stderr, "Done!\n");
+
+  for (x = 0 ; x < nOrders ; ++x)
+    fprintf(stdout, "%2u\t%.4g\n", minOrder + x, (double)(2 * bits[x]) / symbols);
+
+  for (x = 0 ; x < nOrders ; ++x)
+    Free4DnaModel(Fcm[x]);
+  Free(Fcm, 0);
+  Free(bits, 0);
+  Free(sym, 0);
+  RemoveBuffer(B);
 
   return EXIT_SUCCESS;
 }
@@ -8,14 +8,14 @@
 #include <unistd.h>
 #include "argparse.h"
 
-static void RandIfExtra(uint8_t value, char *bases)
+static void RandIfExtra(OBUF *Output, uint8_t value, char *bases)
 {
   if(value == 'A' || value == 'C' || value == 'G' || value == 'T')
   {
-    putchar(value);
+    PutOBuffer(Output, value);
     return;
   }
-  putchar(bases[rand()%4]);
+  PutOBuffer(Output, bases[rand()%4]);
 }
 
 /* 
@@ -26,6 +26,7 @@ int main(int argc, char *argv[]){
   uint8_t  value;
   char     *bases = "ACGT";
   BUF *Buffer;
+  OBUF *Output;
   srand(seed);
   
   char *programName = argv[0];
@@ -51,6 +52,7 @@ int main(int argc, char *argv[]){
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
 
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
     for(index = 0 ; index < streamSize ; ++index)
@@ -58,9 +60,10 @@ int main(int argc, char *argv[]){
       value = Buffer->buf[index];
       if(value == '\n')
         continue;
-      RandIfExtra(value, bases);
+      RandIfExtra(Output, value, bases);
     } 
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
\ No newline at end of file
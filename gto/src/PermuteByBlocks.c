@@ -8,6 +8,7 @@
 #include "misc.h"
 #include "argparse.h"
 #include "mem.h"
+#include "buffer.h"
 #include <unistd.h>
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -63,6 +64,7 @@ int main(int argc, char *argv[])
   uint32_t seed = 0;
   Pair *pair;
   Seq  *seq = (Seq *) Calloc(1, sizeof(Seq));
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -116,10 +118,12 @@ int main(int argc, char *argv[])
   qsort(pair, nBlocks, sizeof(Pair), (int (*) (const void *, const void *)) 
   Compare);
 
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   for(n = 0 ; n < nBlocks ; ++n)
     for(k = 0 ; k < numBases ; ++k)
       if(numBases * pair[n].idx + k < seq->size)
-        putchar(seq->buf[numBases * pair[n].idx + k]);
+        PutOBuffer(Output, seq->buf[numBases * pair[n].idx + k]);
+  RemoveOBuffer(Output);
 
   Free(seq->buf, seq->size * sizeof(uint8_t));
   Free(seq, sizeof(Seq));
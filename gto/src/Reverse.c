@@ -5,6 +5,7 @@
 #include "misc.h"
 #include "mem.h"
 #include "buffer.h"
+#include "simd.h"
 #include "argparse.h"
 #include <unistd.h>
 
@@ -13,9 +14,9 @@
  */
 int main(int argc, char *argv[])
 {
-  uint32_t streamSize, index;
-  uint8_t  value;
+  uint32_t streamSize;
   BUF *Buffer;
+  OBUF *Output;
 
   char *programName = argv[0];
   struct argparse_option options[] = {
@@ -39,15 +40,14 @@ int main(int argc, char *argv[])
     argparse_help_cb(&argparse, options);
 
   Buffer = CreateBuffer(BUF_SIZE);
+  Output = CreateOBuffer(stdout, DEF_IO_SIZE);
   while((streamSize = fread(Buffer->buf, 1, Buffer->size, stdin)))
   {
-    for(index = streamSize ; index > 0 ; --index)
-    {
-      value = Buffer->buf[index-1];
-      putchar(value);
-    }
+    ReverseBytes(Buffer->buf, streamSize);
+    WriteOBuffer(Output, Buffer->buf, streamSize);
   }
 
+  RemoveOBuffer(Output);
   RemoveBuffer(Buffer); 
   return EXIT_SUCCESS;
 }
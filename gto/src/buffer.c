@@ -1,3 +1,6 @@
+#include <stdio.h>
+#include <stdarg.h>
+#include <stdlib.h>
 #include <string.h>
 #include "buffer.h"
 #include "mem.h"
@@ -75,3 +78,123 @@ void RemoveBuffer(BUF *B){
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// CREATE BLOCK INPUT BUFFER
+//
+IBUF *CreateIBuffer(FILE *F, uint32_t s){
+  IBUF *B = (IBUF *) Calloc(1, sizeof(IBUF));
+  B->size = s;
+  B->buf  = (uint8_t *) Calloc(B->size, sizeof(uint8_t));
+  B->idx  = 0;
+  B->len  = 0;
+  B->F    = F;
+  return B;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// READ THE NEXT BLOCK AND RETURN ITS FIRST BYTE, OR EOF
+//
+int FillIBuffer(IBUF *B){
+  B->len = fread(B->buf, 1, B->size, B->F);
+  B->idx = 0;
+  if(B->len == 0)
+    return EOF;
+  return B->buf[B->idx++];
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// REMOVE BLOCK INPUT BUFFER
+//
+void RemoveIBuffer(IBUF *B){
+  Free(B->buf, 0);
+  Free(B, 0);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// CREATE BLOCK OUTPUT BUFFER
+//
+OBUF *CreateOBuffer(FILE *F, uint32_t s){
+  OBUF *B = (OBUF *) Calloc(1, sizeof(OBUF));
+  B->size = s;
+  B->buf  = (uint8_t *) Calloc(B->size, sizeof(uint8_t));
+  B->idx  = 0;
+  B->F    = F;
+  return B;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE THE BUFFERED BYTES TO THE STREAM
+//
+void FlushOBuffer(OBUF *B){
+  if(B->idx == 0)
+    return;
+  if(fwrite(B->buf, 1, B->idx, B->F) != B->idx){
+    fprintf(stderr, "Error: failed to write the output!\n");
+    exit(1);
+    }
+  B->idx = 0;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE A BLOCK OF BYTES TO AN OUTPUT STREAM
+//
+void WriteOBuffer(OBUF *B, const uint8_t *data, uint32_t n){
+  if(n >= B->size){
+    FlushOBuffer(B);
+    if(fwrite(data, 1, n, B->F) != n){
+      fprintf(stderr, "Error: failed to write the output!\n");
+      exit(1);
+      }
+    return;
+    }
+  if(B->idx + n > B->size)
+    FlushOBuffer(B);
+  memcpy(B->buf + B->idx, data, n);
+  B->idx += n;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE A STRING TO AN OUTPUT STREAM
+//
+void PutsOBuffer(OBUF *B, const char *str){
+  WriteOBuffer(B, (const uint8_t *) str, strlen(str));
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE FORMATTED OUTPUT (AS fprintf) TO AN OUTPUT STREAM
+//
+void PrintOBuffer(OBUF *B, const char *format, ...){
+  va_list args;
+  int n;
+
+  va_start(args, format);
+  n = vsnprintf((char *) B->buf + B->idx, B->size - B->idx, format, args);
+  va_end(args);
+  if(n < 0)
+    return;
+  if((uint32_t) n < B->size - B->idx){  // IT FITTED, WITH ITS NULL TERMINATOR
+    B->idx += n;
+    return;
+    }
+
+  FlushOBuffer(B);
+  va_start(args, format);
+  if((uint32_t) n < B->size){
+    vsnprintf((char *) B->buf, B->size, format, args);
+    B->idx = n;
+    }
+  else
+    vfprintf(B->F, format, args);
+  va_end(args);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// FLUSH AND REMOVE BLOCK OUTPUT BUFFER
+//
+void RemoveOBuffer(OBUF *B){
+  FlushOBuffer(B);
+  fflush(B->F);
+  Free(B->buf, 0);
+  Free(B, 0);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
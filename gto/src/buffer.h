@@ -1,10 +1,12 @@
 #ifndef BUFFER_H_INCLUDED
 #define BUFFER_H_INCLUDED
 
+#include <stdio.h>
 #include "defs.h"
 
 #define DEF_BUF_GUARD 32
 #define DEF_BUF_SIZE  65535
+#define DEF_IO_SIZE   1048576  // BLOCK I/O BUFFERS (1 MB)
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
@@ -23,6 +25,27 @@ typedef struct{
   }
 BUF;
 
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// BLOCK I/O: STREAMS READ AND WRITTEN A BUFFER AT A TIME, SO PER-BYTE TOOLS DO
+// NOT GO THROUGH STDIO (AND, IN WASM, THE JS OUTPUT CALLBACKS) FOR EACH BYTE
+
+typedef struct{
+  uint8_t  *buf;
+  uint32_t idx;   // NEXT BYTE
+  uint32_t len;   // BYTES IN buf
+  uint32_t size;
+  FILE     *F;
+  }
+IBUF;
+
+typedef struct{
+  uint8_t  *buf;
+  uint32_t idx;   // BYTES IN buf
+  uint32_t size;
+  FILE     *F;
+  }
+OBUF;
+
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 CBUF     *CreateCBuffer (uint32_t, uint32_t);
@@ -32,6 +55,31 @@ void     UpdateBuffer   (BUF *);
 void     ResetCBuffer   (CBUF *);
 void     RemoveCBuffer  (CBUF *);
 void     RemoveBuffer   (BUF *);
+IBUF     *CreateIBuffer (FILE *, uint32_t);
+int      FillIBuffer    (IBUF *);
+void     RemoveIBuffer  (IBUF *);
+OBUF     *CreateOBuffer (FILE *, uint32_t);
+void     FlushOBuffer   (OBUF *);
+void     WriteOBuffer   (OBUF *, const uint8_t *, uint32_t);
+void     PutsOBuffer    (OBUF *, const char *);
+void     PrintOBuffer   (OBUF *, const char *, ...);
+void     RemoveOBuffer  (OBUF *);
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// NEXT BYTE OF AN INPUT STREAM, OR EOF
+//
+static inline int GetIBuffer(IBUF *B){
+  return B->idx < B->len ? B->buf[B->idx++] : FillIBuffer(B);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE A BYTE TO AN OUTPUT STREAM
+//
+static inline void PutOBuffer(OBUF *B, uint8_t c){
+  if(B->idx == B->size)
+    FlushOBuffer(B);
+  B->buf[B->idx++] = c;
+  }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
@@ -29,6 +29,13 @@ typedef int32_t  I32;
 typedef int16_t  I16;
 typedef int8_t   I8;
 
+// STATE OF A TOOL RUN, KEPT PER THREAD WHEN THE TOOLS RUN IN-PROCESS (libgto.c)
+#if defined(_MSC_VER)
+  #define THREAD_LOCAL __declspec(thread)
+#else
+  #define THREAD_LOCAL __thread
+#endif
+
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 #define RELEASE                2
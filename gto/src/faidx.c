@@ -0,0 +1,249 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <ctype.h>
+#include "faidx.h"
+#include "misc.h"
+#include "mem.h"
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// STATE OF THE LINES OF THE RECORD BEING INDEXED
+//
+typedef struct{
+  uint64_t symbols;     // SYMBOLS IN THE CURRENT LINE
+  uint64_t bytes;       // BYTES IN THE CURRENT LINE, WITHOUT ITS '\n'
+  uint8_t  cr;          // THE LINE HAS A '\r', WHICH MUST BE ITS LAST BYTE
+  uint8_t  bad;         // THE LINE HAS OTHER BYTES THAN SYMBOLS
+  uint8_t  ended;       // A SHORT LINE WAS SEEN: ONLY EMPTY LINES CAN FOLLOW
+  uint8_t  irregular;
+  uint64_t lines;
+  }
+FALINES;
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// ADD A RECORD TO AN INDEX
+//
+static FAREC *AddFaidxRecord(FAIDX *I){
+  if(I->nRecs == I->maxRecs){
+    I->maxRecs += FAIDX_CACHE;
+    I->recs = (FAREC *) Realloc(I->recs, I->maxRecs * sizeof(FAREC),
+    FAIDX_CACHE * sizeof(FAREC));
+    }
+  memset(&I->recs[I->nRecs], 0, sizeof(FAREC));
+  return &I->recs[I->nRecs++];
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// END A LINE OF A RECORD, ITS '\n' INCLUDED IF IT HAS ONE
+//
+static void EndFaidxLine(FAREC *R, FALINES *L, uint8_t newline){
+  uint64_t width = L->bytes + newline;
+
+  if(L->bad)
+    L->irregular = 1;
+  else if(L->symbols == 0)
+    L->ended = 1;
+  else if(L->ended || L->symbols > UINT32_MAX)
+    L->irregular = 1;
+  else if(L->lines == 0){
+    R->lineBases = L->symbols;
+    R->lineWidth = newline ? width : L->symbols + 1;
+    }
+  else if(L->symbols > R->lineBases)
+    L->irregular = 1;
+  else if(L->symbols < R->lineBases)
+    L->ended = 1;
+  else if(newline && width != R->lineWidth)
+    L->irregular = 1;
+
+  if(L->symbols != 0)
+    ++L->lines;
+  L->symbols = 0;
+  L->bytes   = 0;
+  L->cr      = 0;
+  L->bad     = 0;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// END A RECORD
+//
+static void EndFaidxRecord(FAREC *R, FALINES *L, uint8_t header, uint64_t pos){
+  if(R == NULL)
+    return;
+  if(header)
+    R->offset = pos;
+  else
+    EndFaidxLine(R, L, 0);
+  if(L->irregular){
+    R->lineBases = 0;
+    R->lineWidth = 0;
+    }
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// BUILD THE INDEX OF A FASTA OR MULTI-FASTA STREAM, READ FROM ITS BEGINNING.
+// RECORDS ARE SPLIT AS IN gto_fasta_extract: A '>' STARTS A HEADER, WHICH ENDS
+// AT THE NEXT '\n'
+//
+FAIDX *BuildFaidx(FILE *F){
+  FAIDX    *I = (FAIDX *) Calloc(1, sizeof(FAIDX));
+  FAREC    *R = NULL;
+  FALINES  L;
+  uint8_t  *buf = (uint8_t *) Malloc(BUF_SIZE), value, header = 0, naming = 0;
+  char     name[FAIDX_MAX_NAME];
+  uint32_t nameSize = 0, k, i;
+  uint64_t pos = 0;
+
+  memset(&L, 0, sizeof(FALINES));
+  while((k = fread(buf, 1, BUF_SIZE, F)) != 0){
+    for(i = 0 ; i < k ; ++i, ++pos){
+      value = buf[i];
+      if(value == '>'){
+        if(header){
+          if(naming && nameSize < FAIDX_MAX_NAME - 1)
+            name[nameSize++] = value;
+          continue;
+          }
+        EndFaidxRecord(R, &L, 0, pos);
+        R = AddFaidxRecord(I);
+        R->header = pos;
+        memset(&L, 0, sizeof(FALINES));
+        header   = 1;
+        naming   = 1;
+        nameSize = 0;
+        continue;
+        }
+
+      if(header){
+        if(value == '\n'){
+          header    = 0;
+          R->offset = pos + 1;
+          }
+        if(naming && (isspace(value) || nameSize == FAIDX_MAX_NAME - 1))
+          naming = 0;
+        if(naming)
+          name[nameSize++] = value;
+        else if(R->name == NULL){
+          name[nameSize] = '\0';
+          R->name = (char *) Malloc(nameSize + 1);
+          memcpy(R->name, name, nameSize + 1);
+          }
+        continue;
+        }
+
+      if(R == NULL)
+        continue;
+      if(value == '\n'){
+        EndFaidxLine(R, &L, 1);
+        continue;
+        }
+      ++L.bytes;
+      if(value >= 65 && value <= 122){
+        if(L.cr)
+          L.bad = 1;
+        ++L.symbols;
+        ++R->length;
+        }
+      else if(value == '\r' && !L.cr)
+        L.cr = 1;
+      else
+        L.bad = 1;
+      }
+    }
+
+  EndFaidxRecord(R, &L, header, pos);
+  if(R != NULL && R->name == NULL){
+    name[nameSize] = '\0';
+    R->name = (char *) Malloc(nameSize + 1);
+    memcpy(R->name, name, nameSize + 1);
+    }
+  Free(buf, 0);
+  return I;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// WRITE AN INDEX: NAME, LENGTH, OFFSET, LINE BASES, LINE WIDTH AND HEADER
+//
+void WriteFaidx(FAIDX *I, FILE *F){
+  uint64_t n;
+  for(n = 0 ; n < I->nRecs ; ++n)
+    fprintf(F, "%s\t%"PRIu64"\t%"PRIu64"\t%u\t%u\t%"PRIu64"\n", I->recs[n].name ?
+    I->recs[n].name : "", I->recs[n].length, I->recs[n].offset,
+    I->recs[n].lineBases, I->recs[n].lineWidth, I->recs[n].header);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// LOAD AN INDEX WRITTEN BY WriteFaidx (WITHOUT THE NAMES), CHECKING THAT ITS
+// RECORDS FOLLOW EACH OTHER
+//
+FAIDX *LoadFaidx(const char *fn){
+  FILE     *F = Fopen(fn, "r");
+  FAIDX    *I = (FAIDX *) Calloc(1, sizeof(FAIDX));
+  FAREC    *R, *P = NULL;
+  int      c;
+
+  while((c = fgetc(F)) != EOF){
+    while(c != '\t' && c != '\n' && c != EOF)
+      c = fgetc(F);
+    R = AddFaidxRecord(I);
+    if(c != '\t' || fscanf(F, "%"SCNu64"\t%"SCNu64"\t%u\t%u\t%"SCNu64, &R->length,
+    &R->offset, &R->lineBases, &R->lineWidth, &R->header) != 5
+    || R->header >= R->offset || R->lineBases > R->lineWidth
+    || (P != NULL && P->offset > R->header)){
+      fprintf(stderr, "[x] Error: invalid index %s (record %"PRIu64")!\n", fn,
+      I->nRecs);
+      exit(1);
+      }
+    while((c = fgetc(F)) != '\n' && c != EOF)
+      ;
+    P = R;
+    }
+
+  fclose(F);
+  return I;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// BYTE OF THE SYMBOL AT A POSITION OF A REGULAR RECORD
+//
+uint64_t FaidxPosition(FAREC *R, uint64_t p){
+  return R->offset + p / R->lineBases * R->lineWidth + p % R->lineBases;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// MOVE AN INPUT STREAM, AT BYTE *at, PAST THE '>' OF A RECORD. RETURNS -1 IF
+// THE RECORD CANNOT BE REACHED OR THE STREAM HAS NO '>' THERE (THE INDEX IS NOT
+// OF THIS STREAM)
+//
+int SeekFaidxRecord(FILE *F, uint64_t *at, FAREC *R){
+  if(SeekInput(F, at, R->header) != 0 || fgetc(F) != '>')
+    return -1;
+  ++*at;
+  return 0;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// MOVE AN INPUT STREAM, AT BYTE *at, TO THE SEQUENCE OF A RECORD, CHECKING ITS
+// '>' AND THE '\n' OF ITS HEADER. RETURNS -1 AS SeekFaidxRecord
+//
+int SeekFaidxSequence(FILE *F, uint64_t *at, FAREC *R){
+  if(SeekFaidxRecord(F, at, R) != 0 || SeekInput(F, at, R->offset - 1) != 0
+  || fgetc(F) != '\n')
+    return -1;
+  ++*at;
+  return 0;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// REMOVE AN INDEX
+//
+void RemoveFaidx(FAIDX *I){
+  uint64_t n;
+  for(n = 0 ; n < I->nRecs ; ++n)
+    if(I->recs[n].name != NULL)
+      Free(I->recs[n].name, 0);
+  Free(I->recs, 0);
+  Free(I, 0);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
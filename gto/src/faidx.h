@@ -0,0 +1,47 @@
+#ifndef FAIDX_H_INCLUDED
+#define FAIDX_H_INCLUDED
+
+#include <stdio.h>
+#include "defs.h"
+
+#define FAIDX_CACHE    1024
+#define FAIDX_MAX_NAME 1024
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// INDEX OF A FASTA OR MULTI-FASTA FILE, SIMILAR TO A SAMTOOLS .fai: ONE LINE
+// PER RECORD WITH ITS NAME, LENGTH, OFFSET, LINE BASES AND LINE WIDTH, PLUS THE
+// OFFSET OF ITS '>', TAB SEPARATED. THE LENGTH COUNTS THE SYMBOLS THAT
+// gto_fasta_extract COUNTS (65 TO 122, OUT OF HEADERS). IN A RECORD WHOSE LINES
+// ARE NOT ALL OF LINE BASES SYMBOLS (BUT THE LAST ONE), THE POSITIONS CANNOT BE
+// COMPUTED: ITS LINE BASES ARE 0 AND IT IS READ FROM ITS OFFSET.
+
+typedef struct{
+  char     *name;       // FIRST WORD OF THE HEADER (ONLY WHEN BUILT)
+  uint64_t length;      // SYMBOLS
+  uint64_t offset;      // FIRST BYTE AFTER THE HEADER LINE
+  uint32_t lineBases;   // SYMBOLS IN A FULL LINE, 0 IF THE LINES ARE IRREGULAR
+  uint32_t lineWidth;   // BYTES IN A FULL LINE, WITH ITS END
+  uint64_t header;      // POSITION OF THE '>'
+  }
+FAREC;
+
+typedef struct{
+  FAREC    *recs;
+  uint64_t nRecs;
+  uint64_t maxRecs;
+  }
+FAIDX;
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+FAIDX    *BuildFaidx       (FILE *);
+void     WriteFaidx        (FAIDX *, FILE *);
+FAIDX    *LoadFaidx        (const char *);
+uint64_t FaidxPosition     (FAREC *, uint64_t);
+int      SeekFaidxRecord   (FILE *, uint64_t *, FAREC *);
+int      SeekFaidxSequence (FILE *, uint64_t *, FAREC *);
+void     RemoveFaidx       (FAIDX *);
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+#endif
@@ -64,9 +64,19 @@ void Update4DnaFCM(FCM *M, uint32_t c, uint8_t ir){
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
-// CREATES 4 SYMBOL FCM
+// CREATES 4 SYMBOL FCM, WITH A HASH-TABLE FROM DEEP CONTEXTS ON
 //
 FCM *Create4DnaFCM(uint32_t c, uint32_t a, uint8_t i, uint8_t n){
+  return CreateMode4DnaFCM(c, a, i, n, pow(n,c) < DEEP_CTX ? ARRAY_TABLE :
+  HASH_TABLE);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// CREATES 4 SYMBOL FCM WITH THE GIVEN TABLE [ARRAY_TABLE|HASH_TABLE], E.G. A
+// HASH-TABLE TO BOUND THE MEMORY OF A CONTEXT THAT AN ARRAY WOULD TAKE
+//
+FCM *CreateMode4DnaFCM(uint32_t c, uint32_t a, uint8_t i, uint8_t n, uint8_t
+mode){
   FCM    *M = (FCM *) Calloc(1, sizeof(FCM));
   M->nSym   = n;
   M->ctx    = c;
@@ -78,13 +88,13 @@ FCM *Create4DnaFCM(uint32_t c, uint32_t a, uint8_t i, uint8_t n){
   M->freqs  = (uint32_t *) Calloc(M->nSym+1, sizeof(uint32_t));
   M->nPMod  = (uint64_t) pow(n,c);
 
-  if(M->nPMod < DEEP_CTX){
+  if(mode == ARRAY_TABLE){
     Init4DnaArrayTab(M);
-    M->mode = 0;
+    M->mode = ARRAY_TABLE;
     }
   else{
     M->H = CreatePHash();
-    M->mode = 2;
+    M->mode = HASH_TABLE;
     }
 
   return M;
@@ -44,6 +44,7 @@ void        Reset4DnaModel  (FCM *);
 void        Free4DnaModel   (FCM *);
 void        Update4DnaFCM   (FCM *, uint32_t, uint8_t);
 FCM         *Create4DnaFCM  (uint32_t, uint32_t, uint8_t, uint8_t);
+FCM         *CreateMode4DnaFCM (uint32_t, uint32_t, uint8_t, uint8_t, uint8_t);
 void        Compute4DnaFCM  (FCM *);
 uint32_t    CompProbs       (FCM *, uint32_t);
 void        GetIdx4DnaRev   (uint8_t *, FCM *);
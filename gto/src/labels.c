@@ -7,64 +7,156 @@
 #include "mem.h"
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// FNV-1a HASH OF A LABEL IN LOWER CASE
+//
+static uint32_t HashSLabel(const char *str){
+  uint32_t n, h = 2166136261u;
+  for(n = 0 ; n < SLMAXSTR && str[n] != '\0' ; ++n)
+    h = (h ^ (uint8_t) tolower((uint8_t) str[n])) * 16777619u;
+  return h;
+  }
 
-SLABELS *CreateSLabels(void){
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// COMPARE A STORED LABEL (IN LOWER CASE) WITH A LABEL IN ANY CASE
+//
+static int EqualSLabel(const char *name, const char *str){
   uint32_t n;
-  SLABELS *SL = (SLABELS *) Calloc(1, sizeof(SLABELS));
-  SL->idx     = 0;
-  SL->maxV    = SLCACHE;
-  SL->maxH    = SLMAXSTR;
-  SL->names   = (char **) Calloc(SL->maxV, sizeof(char *));
-  for(n = 0 ; n < SL->maxV ; ++n)
-    SL->names[n] = (char *) Calloc(SL->maxH+1, sizeof(char));
-  return SL;
+  for(n = 0 ; n < SLMAXSTR && str[n] != '\0' ; ++n)
+    if(name[n] != (char) tolower((uint8_t) str[n]))
+      return 0;
+  return name[n] == '\0';
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// POSITION OF A LABEL IN THE TABLE, OR OF THE EMPTY ONE WHERE IT WOULD BE
+//
+static uint32_t FindSLabel(SLABELS *SL, const char *str, uint32_t h){
+  uint32_t e, mask = SL->tableSize - 1, p = h & mask;
+  while((e = SL->table[p]) != 0){
+    if(SL->hashes[e-1] == h && EqualSLabel(SL->names[e-1], str))
+      return p;
+    p = (p + 1) & mask;
+    }
+  return p;
+  }
 
-void AddSLabel(SLABELS *SL, char *str){
-  uint32_t n;
-  char c;
-  for(n = 0 ; n < SL->maxH ; ++n){
-    if((c = str[n]) == '\0')
-      break;
-    SL->names[SL->idx][n] = tolower(c);  
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// DOUBLE THE TABLE, PLACING THE LABELS AGAIN
+//
+static void GrowSLabelsTable(SLABELS *SL){
+  uint32_t n, p, mask;
+  Free(SL->table, SL->tableSize * sizeof(uint32_t));
+  SL->bytes    += SL->tableSize * sizeof(uint32_t);
+  SL->tableSize <<= 1;
+  SL->table     = (uint32_t *) Calloc(SL->tableSize, sizeof(uint32_t));
+  mask          = SL->tableSize - 1;
+  for(n = 0 ; n < SL->idx ; ++n){
+    for(p = SL->hashes[n] & mask ; SL->table[p] != 0 ; p = (p + 1) & mask)
+      ;
+    SL->table[p] = n + 1;
     }
-  SL->names[SL->idx][n] = '\0';
-  SL->idx++;
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// COPY A LABEL IN LOWER CASE TO THE BLOCKS OF KEYS
+//
+static char *CopySLabel(SLABELS *SL, const char *str){
+  uint32_t n, size = 0;
+  SLBLOCK  *B;
+  char     *key;
+
+  while(size < SLMAXSTR && str[size] != '\0')
+    ++size;
+  if(SL->keys == NULL || SL->keys->used + size + 1 > SL->keys->size){
+    n = size + 1 > SLARENA ? size + 1 : SLARENA;
+    B = (SLBLOCK *) Malloc(sizeof(SLBLOCK) + n);
+    B->size = n;
+    B->used = 0;
+    B->next = SL->keys;
+    SL->keys = B;
+    SL->bytes += sizeof(SLBLOCK) + n;
+    }
+  key = SL->keys->data + SL->keys->used;
+  for(n = 0 ; n < size ; ++n)
+    key[n] = tolower((uint8_t) str[n]);
+  key[size] = '\0';
+  SL->keys->used += size + 1;
+  return key;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+SLABELS *CreateSLabels(void){
+  SLABELS *SL   = (SLABELS *) Calloc(1, sizeof(SLABELS));
+  SL->idx       = 0;
+  SL->maxV      = SLCACHE;
+  SL->names     = (char **) Calloc(SL->maxV, sizeof(char *));
+  SL->hashes    = (uint32_t *) Calloc(SL->maxV, sizeof(uint32_t));
+  SL->tableSize = 2048;
+  SL->table     = (uint32_t *) Calloc(SL->tableSize, sizeof(uint32_t));
+  SL->keys      = NULL;
+  SL->bytes     = sizeof(SLABELS) + SL->maxV * (sizeof(char *) + sizeof(uint32_t))
+                + SL->tableSize * sizeof(uint32_t);
+  return SL;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// ADD A LABEL IF IT IS NOT IN THE SET, RETURNING 1 IF IT WAS ADDED
+//
+int InsertSLabel(SLABELS *SL, const char *str){
+  uint32_t p, h = HashSLabel(str);
+
+  p = FindSLabel(SL, str, h);
+  if(SL->table[p] != 0)
+    return 0;
 
-void UpdateSLabels(SLABELS *SL){
-  uint32_t n;
   if(SL->idx == SL->maxV){
-    SL->maxV += SLCACHE;
-    SL->names = (char **) 
-    Realloc(SL->names, SL->maxV * sizeof(char *), 0);
-    for(n = SL->idx ; n < SL->maxV ; ++n)
-      SL->names[n] = (char *) Calloc(SL->maxH+1, sizeof(char));
+    SL->maxV += SL->maxV;
+    SL->names  = (char **) Realloc(SL->names, SL->maxV * sizeof(char *),
+    (SL->maxV - SL->idx) * sizeof(char *));
+    SL->hashes = (uint32_t *) Realloc(SL->hashes, SL->maxV * sizeof(uint32_t),
+    (SL->maxV - SL->idx) * sizeof(uint32_t));
+    SL->bytes += (SL->maxV - SL->idx) * (sizeof(char *) + sizeof(uint32_t));
     }
+  SL->names[SL->idx]  = CopySLabel(SL, str);
+  SL->hashes[SL->idx] = h;
+  SL->table[p]        = ++SL->idx;
+
+  if(2 * SL->idx > SL->tableSize)
+    GrowSLabelsTable(SL);
+  return 1;
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-int SearchSLabels(SLABELS *SL, char *str){
-  uint32_t n;
-  for(n = 0 ; n < SL->idx ; ++n)
-    if(Strcasecmp(SL->names[n], str) == 0)
-      return 1;
-  return 0;
+void AddSLabel(SLABELS *SL, const char *str){
+  InsertSLabel(SL, str);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+int SearchSLabels(SLABELS *SL, const char *str){
+  return SL->table[FindSLabel(SL, str, HashSLabel(str))] != 0;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+uint64_t SLabelsBytes(SLABELS *SL){
+  return SL->bytes;
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 void DeleteSLabels(SLABELS *SL){
-  uint32_t n;
-  for(n = 0 ; n < SL->maxV ; ++n)
-    Free(SL->names[n], 0);
-  Free(SL->names, 0);
-  Free(SL, 0);
+  SLBLOCK *B;
+  while((B = SL->keys) != NULL){
+    SL->keys = B->next;
+    Free(B, sizeof(SLBLOCK) + B->size);
+    }
+  Free(SL->table, SL->tableSize * sizeof(uint32_t));
+  Free(SL->hashes, SL->maxV * sizeof(uint32_t));
+  Free(SL->names, SL->maxV * sizeof(char *));
+  Free(SL, sizeof(SLABELS));
   }
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -7,24 +7,40 @@
 #include <stdio.h>
 
 #define SLCACHE  1000
-#define SLMAXSTR 5000
+#define SLMAXSTR 5000   // LABELS ARE COMPARED ON THEIR FIRST SLMAXSTR CHARACTERS
+#define SLARENA  65536  // BYTES OF EACH BLOCK OF KEYS
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// SET OF LABELS, CASE-INSENSITIVE: AN OPEN ADDRESSING HASH TABLE OVER THE
+// LABELS, WHICH ARE KEPT IN LOWER CASE IN BLOCKS OF KEYS (AN ARENA)
+
+typedef struct SLBLOCK{
+  struct SLBLOCK *next;
+  uint32_t size;
+  uint32_t used;
+  char     data[];
+  }
+SLBLOCK;
 
 typedef struct{
-  char     **names;
-  uint32_t maxH;
+  char     **names;     // LABELS IN LOWER CASE, IN THE ORDER THEY WERE ADDED
+  uint32_t *hashes;     // HASH OF EACH LABEL
+  uint32_t *table;      // 1 + INDEX OF A LABEL, 0 IF EMPTY
+  uint32_t tableSize;   // POWER OF 2, AT LEAST TWICE THE LABELS
   uint32_t maxV;
-  uint32_t idx;
+  uint32_t idx;         // NUMBER OF LABELS
+  SLBLOCK  *keys;       // CURRENT BLOCK OF KEYS, FOLLOWED BY THE FULL ONES
+  uint64_t bytes;       // MEMORY OF THE SET
   }
 SLABELS;
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
 SLABELS    *CreateSLabels  (void);
-void       AddSLabel       (SLABELS *, char *);
-void       UpdateSLabels   (SLABELS *);
-int        SearchSLabels   (SLABELS *, char *);
+int        InsertSLabel    (SLABELS *, const char *);
+void       AddSLabel       (SLABELS *, const char *);
+int        SearchSLabels   (SLABELS *, const char *);
+uint64_t   SLabelsBytes    (SLABELS *);
 void       DeleteSLabels   (SLABELS *);
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -0,0 +1,144 @@
+#include <setjmp.h>
+#include "defs.h"
+#include "libgto.h"
+
+// In-process entry points of the GTO tools, built as a shared library by the
+// gtolib Python package. The tools are linked as in the multi-call bundle
+// (multicall.c), and libgto.h gives each run its own standard streams and
+// turns exit into a return from the run, so runs on different threads do not
+// interfere. The state that the common objects keep, and the generator of
+// rand, are per thread as well.
+
+THREAD_LOCAL FILE *GTO_Stdin, *GTO_Stdout, *GTO_Stderr;
+
+static THREAD_LOCAL jmp_buf *exitJump;
+static THREAD_LOCAL int exitStatus;
+
+int real_main(int argc, char **argv);
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// END THE RUN OF THE TOOL, OR THE PROCESS OUTSIDE OF A RUN
+//
+void GTO_Exit(int status){
+  if(exitJump == NULL)
+    (exit)(status);
+  exitStatus = status;
+  longjmp(*exitJump, 1);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// THE rand GENERATOR OF THE RUN. WITH glibc IT IS THE GENERATOR OF rand WITH
+// ITS STATE PER THREAD, SO SEEDED RUNS GIVE THE OUTPUTS OF THE TOOLS IN gto/bin
+//
+#ifdef __GLIBC__
+static THREAD_LOCAL struct random_data randomData;
+static THREAD_LOCAL char randomState[128];
+
+void GTO_Srand(unsigned seed){
+  initstate_r(seed, randomState, sizeof(randomState), &randomData);
+  }
+
+int GTO_Rand(void){
+  int32_t value;
+  random_r(&randomData, &value);
+  return value;
+  }
+#else
+static THREAD_LOCAL unsigned randomSeed;
+
+void GTO_Srand(unsigned seed){
+  randomSeed = seed;
+  }
+
+int GTO_Rand(void){
+  return rand_r(&randomSeed);
+  }
+#endif
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// RUN A TOOL WITH THE GIVEN STREAMS, RETURNING ITS EXIT STATUS
+//
+static int Run(int argc, char **argv, FILE *in, FILE *out, FILE *err){
+  jmp_buf jump;
+  int status;
+
+  GTO_Stdin  = in;
+  GTO_Stdout = out;
+  GTO_Stderr = err;
+  exitJump   = &jump;
+  GTO_Srand(1);
+  if(setjmp(jump) == 0)
+    status = real_main(argc, argv);
+  else
+    status = exitStatus;
+  exitJump   = NULL;
+
+  fflush(out);
+  fflush(err);
+  GTO_Stdin = GTO_Stdout = GTO_Stderr = NULL;
+  return status;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// OPEN A BUFFER FOR READING; fmemopen DOES NOT TAKE EMPTY BUFFERS EVERYWHERE
+//
+static FILE *OpenBuffer(const char *b, size_t size){
+  if(size == 0)
+    return fopen("/dev/null", "r");
+  return fmemopen((void *) b, size, "r");
+  }
+
+static void CloseStreams(FILE *in, FILE *out, FILE *err){
+  if(in)  fclose(in);
+  if(out) fclose(out);
+  if(err) fclose(err);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// RUN A TOOL ON A BUFFER, WITH ITS OUTPUT AND LOG IN NEW BUFFERS
+//
+int GTO_RunBuffer(int argc, char **argv, const char *in, size_t inSize,
+char **out, size_t *outSize, char **log, size_t *logSize){
+  FILE *I, *O, *E;
+  int  status = -1;
+
+  *out = *log = NULL;
+  *outSize = *logSize = 0;
+  I = OpenBuffer(in, inSize);
+  O = open_memstream(out, outSize);
+  E = open_memstream(log, logSize);
+  if(I && O && E)
+    status = Run(argc, argv, I, O, E);
+  CloseStreams(I, O, E);
+  return status;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// RUN A TOOL FROM A FILE DESCRIPTOR TO ANOTHER (E.G. PIPES), WITH ITS LOG IN A
+// NEW BUFFER. BOTH DESCRIPTORS ARE CLOSED
+//
+int GTO_RunFd(int argc, char **argv, int inFd, int outFd, char **log,
+size_t *logSize){
+  FILE *I, *O, *E;
+  int  status = -1;
+
+  *log = NULL;
+  *logSize = 0;
+  I = fdopen(inFd, "r");
+  O = fdopen(outFd, "w");
+  E = open_memstream(log, logSize);
+  if(I == NULL) close(inFd);
+  if(O == NULL) close(outFd);
+  if(I && O && E)
+    status = Run(argc, argv, I, O, E);
+  CloseStreams(I, O, E);
+  return status;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+void GTO_Free(void *p){
+  free(p);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
@@ -0,0 +1,47 @@
+#ifndef LIBGTO_H_INCLUDED
+#define LIBGTO_H_INCLUDED
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <unistd.h>
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// IN-PROCESS BUILD OF THE TOOLS (libgto.c). EVERY SOURCE OF THE LIBRARY IS
+// COMPILED WITH -include libgto.h, SO THE STANDARD STREAMS OF A TOOL ARE THE
+// STREAMS OF ITS RUN, KEPT PER THREAD, AND exit RETURNS FROM THE RUN INSTEAD OF
+// ENDING THE PROCESS. THE STREAMS OF A RUN ARE NEVER TERMINALS AND EACH RUN HAS
+// ITS OWN rand GENERATOR, SEEDED WITH 1 AS IN A NEW PROCESS. ONLY SYSTEM
+// HEADERS ARE INCLUDED HERE, AS SOME TOOLS DO NOT INCLUDE defs.h.
+
+extern __thread FILE *GTO_Stdin, *GTO_Stdout, *GTO_Stderr;
+
+void GTO_Exit  (int) __attribute__((noreturn));
+int  GTO_Rand  (void);
+void GTO_Srand (unsigned);
+
+#undef  stdin
+#undef  stdout
+#undef  stderr
+#define stdin          GTO_Stdin
+#define stdout         GTO_Stdout
+#define stderr         GTO_Stderr
+#define printf(...)    fprintf(GTO_Stdout, __VA_ARGS__)
+#define exit(status)   GTO_Exit(status)
+#define rand()         GTO_Rand()
+#define srand(seed)    GTO_Srand(seed)
+#define isatty(fd)     0
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// RUN A TOOL: argv[0] IS ITS NAME (AS IN multicall.c). THE INPUT IS A BUFFER OR
+// A FILE DESCRIPTOR AND THE OUTPUT A malloc'd BUFFER OR A FILE DESCRIPTOR; THE
+// DESCRIPTORS ARE CLOSED BY THE RUN. THE LOG (stderr) IS A malloc'd BUFFER.
+// RETURNS THE EXIT STATUS OF THE TOOL, OR -1 IF ITS STREAMS CANNOT BE OPENED.
+
+int  GTO_RunBuffer (int, char **, const char *, size_t, char **, size_t *,
+                    char **, size_t *);
+int  GTO_RunFd     (int, char **, int, int, char **, size_t *);
+void GTO_Free      (void *);
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+#endif
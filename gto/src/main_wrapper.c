@@ -47,6 +47,15 @@ int needs_stdin(int argc, char **argv)
 
 int main(int argc, char **argv)
 {
+#ifdef GTO_MULTICALL
+    // The multi-call bundle is called as `gto_bundle <tool> [args]`: run the tool as argv[0]
+    if (argc > 1)
+    {
+        argc--;
+        argv++;
+    }
+#endif
+
     // Set stdout and stderr to unbuffered mode
     setvbuf(stdout, NULL, _IONBF, 0);
     setvbuf(stderr, NULL, _IONBF, 0);
@@ -64,9 +73,9 @@ int main(int argc, char **argv)
 
     int result = real_main(argc, argv);
 
-    // Flush stdout and stderr to ensure all output is captured
-    fflush(stdout);
-    fflush(stderr);
+    // Flush every open stream to ensure all output is captured, including
+    // output files, since a reused runtime does not flush them on exit
+    fflush(NULL);
 
     return result;
 }
\ No newline at end of file
@@ -7,9 +7,9 @@
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 // MEMORY VARIABLES
 //
-static size_t CM = 0; // CURRENT HEAP MEMORY
-static size_t PM = 0; // PEAK HEAP MEMORY
-static size_t RS = 0; // RESET HAS BEEN DONE
+static THREAD_LOCAL size_t CM = 0; // CURRENT HEAP MEMORY
+static THREAD_LOCAL size_t PM = 0; // PEAK HEAP MEMORY
+static THREAD_LOCAL size_t RS = 0; // RESET HAS BEEN DONE
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 // WARN ERROR AND QUIT
@@ -97,6 +97,30 @@ uint64_t FNBytes(FILE *F){
   return n;
   }
 
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// MOVE AN INPUT STREAM FROM BYTE *at TO BYTE to: WITH fseeko IF IT IS A FILE,
+// OTHERWISE (PIPES) BY READING UP TO IT, ONLY FORWARD. RETURNS 0, OR -1 IF to
+// CANNOT BE REACHED
+//
+int SeekInput(FILE *F, uint64_t *at, uint64_t to){
+  uint8_t buf[BUF_SIZE];
+  size_t  k;
+  if(to == *at)
+    return 0;
+  if(ftello(F) >= 0 && fseeko(F, (off_t) to, SEEK_SET) == 0){
+    *at = to;
+    return 0;
+    }
+  if(to < *at)
+    return -1;
+  while(*at < to){
+    if((k = fread(buf, 1, MIN(to - *at, BUF_SIZE), F)) == 0)
+      return -1;
+    *at += k;
+    }
+  return 0;
+  }
+
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 // PROGRESS PERCENTAGE OF A COMPUTATION
 //
@@ -17,6 +17,7 @@ double   PW             (double, double);
 FILE     *Fopen         (const char *, const char *);
 void     CheckFile      (uint8_t, char *);
 uint64_t FNBytes        (FILE *);
+int      SeekInput      (FILE *, uint64_t *, uint64_t);
 void     Progress       (uint64_t, uint64_t);
 void     ReverseStr     (uint8_t *, uint8_t *, uint32_t);
 uint8_t  Pack8bits      (uint8_t *);
@@ -0,0 +1,48 @@
+#include <stdio.h>
+#include <string.h>
+
+// Multi-call entry point of the GTO WebAssembly bundle (compile-all-gto.sh --bundle).
+// Every tool's main is renamed to gto_<tool>_main and listed in bundle_tools.h, which
+// the build generates as one GTO_TOOL(<tool>) line per tool.
+
+#define GTO_TOOL(name) int gto_##name##_main(int argc, char **argv);
+#include "bundle_tools.h"
+#undef GTO_TOOL
+
+typedef struct
+{
+    const char *name;
+    int (*main)(int argc, char **argv);
+} GtoTool;
+
+static const GtoTool tools[] = {
+#define GTO_TOOL(name) {#name, gto_##name##_main},
+#include "bundle_tools.h"
+#undef GTO_TOOL
+};
+
+// Dispatch on the tool name in argv[0] (path and 'gto_' prefix are ignored)
+int real_main(int argc, char **argv)
+{
+    const char *tool_name = argv[0];
+    const char *last_slash = strrchr(tool_name, '/');
+    if (last_slash)
+    {
+        tool_name = last_slash + 1;
+    }
+    if (strncmp(tool_name, "gto_", 4) == 0)
+    {
+        tool_name += 4;
+    }
+
+    for (size_t i = 0; i < sizeof(tools) / sizeof(tools[0]); i++)
+    {
+        if (strcmp(tool_name, tools[i].name) == 0)
+        {
+            return tools[i].main(argc, argv);
+        }
+    }
+
+    fprintf(stderr, "ERROR: Unknown tool '%s'\n", tool_name);
+    return 1;
+}
@@ -27,7 +27,9 @@ void FileType(PARSER *PA, FILE *IN){
     case '@': PA->type = 2; break;
     default : PA->type = 0;
     }
-  rewind(IN);
+  // Pushed back rather than rewound: pipes cannot be rewound
+  if(PA->sym != EOF)
+    ungetc(PA->sym, IN);
   } 
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
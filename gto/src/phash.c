@@ -6,7 +6,7 @@
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
-static HCCs hauxCnts;
+static THREAD_LOCAL HCCs hauxCnts;
 
 // - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
 
@@ -0,0 +1,193 @@
+#include "simd.h"
+
+#if defined(__wasm_simd128__)
+  #include <wasm_simd128.h>
+  #define SIMD_KERNELS
+  typedef v128_t VEC;
+  #define VLoad(p)        wasm_v128_load(p)
+  #define VStore(p, v)    wasm_v128_store(p, v)
+  #define VSet(c)         wasm_i8x16_splat((int8_t) (c))
+  #define VEq(a, b)       wasm_i8x16_eq(a, b)
+  #define VOr(a, b)       wasm_v128_or(a, b)
+  #define VSub(a, b)      wasm_i8x16_sub(a, b)
+  #define VMax(a, b)      wasm_u8x16_max(a, b)
+  #define VMin(a, b)      wasm_u8x16_min(a, b)
+  #define VSelect(m, a, b) wasm_v128_bitselect(a, b, m)
+  #define VMask(v)        ((uint32_t) wasm_i8x16_bitmask(v))
+  #define VZero()         wasm_i64x2_splat(0)
+  static inline VEC VReverse(VEC v){
+    return wasm_i8x16_shuffle(v, v, 15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 2,
+    1, 0);
+    }
+#elif defined(__SSE2__)
+  #include <emmintrin.h>
+  #define SIMD_KERNELS
+  typedef __m128i VEC;
+  #define VLoad(p)        _mm_loadu_si128((const __m128i *) (p))
+  #define VStore(p, v)    _mm_storeu_si128((__m128i *) (p), v)
+  #define VSet(c)         _mm_set1_epi8((char) (c))
+  #define VEq(a, b)       _mm_cmpeq_epi8(a, b)
+  #define VOr(a, b)       _mm_or_si128(a, b)
+  #define VSub(a, b)      _mm_sub_epi8(a, b)
+  #define VMax(a, b)      _mm_max_epu8(a, b)
+  #define VMin(a, b)      _mm_min_epu8(a, b)
+  #define VSelect(m, a, b) _mm_or_si128(_mm_and_si128(m, a), _mm_andnot_si128(m, b))
+  #define VMask(v)        ((uint32_t) _mm_movemask_epi8(v))
+  #define VZero()         _mm_setzero_si128()
+  // REVERSE THE 32-BIT WORDS, THEN THE 16-BIT HALVES, THEN THE BYTES OF EACH HALF
+  static inline VEC VReverse(VEC v){
+    v = _mm_shuffle_epi32(v, _MM_SHUFFLE(0, 1, 2, 3));
+    v = _mm_shufflelo_epi16(v, _MM_SHUFFLE(2, 3, 0, 1));
+    v = _mm_shufflehi_epi16(v, _MM_SHUFFLE(2, 3, 0, 1));
+    return _mm_or_si128(_mm_slli_epi16(v, 8), _mm_srli_epi16(v, 8));
+    }
+#endif
+
+#define VEC_SIZE   16
+#define MAX_ACC    255  // VECTORS COUNTED IN 8-BIT LANES BEFORE THEY OVERFLOW
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// COMPLEMENT OF A BASE: ACGT IN EITHER CASE TO UPPER CASE TGCA, OTHERS AS THEY ARE
+//
+static inline uint8_t ComplementSym(uint8_t s){
+  switch(s | 0x20){
+    case 'a': return 'T';
+    case 't': return 'A';
+    case 'c': return 'G';
+    case 'g': return 'C';
+    default:  return s;
+    }
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// COMPLEMENT THE BASES OF A BLOCK, IN PLACE
+//
+void ComplementBases(uint8_t *b, uint32_t n){
+  uint32_t i = 0;
+  #ifdef SIMD_KERNELS
+  const VEC caseBit = VSet(0x20), a = VSet('a'), c = VSet('c'), g = VSet('g'),
+  t = VSet('t'), A = VSet('A'), C = VSet('C'), G = VSet('G'), T = VSet('T');
+  for( ; i + VEC_SIZE <= n ; i += VEC_SIZE){
+    VEC v = VLoad(b + i), lower = VOr(v, caseBit);
+    v = VSelect(VEq(lower, a), T, v);
+    v = VSelect(VEq(lower, t), A, v);
+    v = VSelect(VEq(lower, c), G, v);
+    v = VSelect(VEq(lower, g), C, v);
+    VStore(b + i, v);
+    }
+  #endif
+  for( ; i < n ; ++i)
+    b[i] = ComplementSym(b[i]);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// REVERSE A BLOCK, IN PLACE
+//
+void ReverseBytes(uint8_t *b, uint32_t n){
+  uint32_t i = 0, j = n;
+  uint8_t  tmp;
+  #ifdef SIMD_KERNELS
+  for( ; j - i >= 2 * VEC_SIZE ; i += VEC_SIZE, j -= VEC_SIZE){
+    VEC front = VLoad(b + i), back = VLoad(b + j - VEC_SIZE);
+    VStore(b + i, VReverse(back));
+    VStore(b + j - VEC_SIZE, VReverse(front));
+    }
+  #endif
+  for( ; j > i + 1 ; ++i, --j){
+    tmp      = b[i];
+    b[i]     = b[j-1];
+    b[j-1]   = tmp;
+    }
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// POSITION OF THE FIRST OCCURRENCE OF A BYTE IN A BLOCK, OR ITS SIZE IF NONE
+//
+uint32_t FindByte(const uint8_t *b, uint32_t n, uint8_t s){
+  uint32_t i = 0;
+  #ifdef SIMD_KERNELS
+  const VEC sym = VSet(s);
+  for( ; i + VEC_SIZE <= n ; i += VEC_SIZE){
+    uint32_t mask = VMask(VEq(VLoad(b + i), sym));
+    if(mask)
+      return i + __builtin_ctz(mask);
+    }
+  #endif
+  for( ; i < n ; ++i)
+    if(b[i] == s)
+      return i;
+  return n;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// COPY THE BYTES OF A BLOCK WITHIN [low, high], RETURNING HOW MANY. dst MAY BE
+// src (IN PLACE), OR ANY POSITION BEFORE IT
+//
+uint32_t KeepRange(uint8_t *dst, const uint8_t *src, uint32_t n, uint8_t low,
+uint8_t high){
+  uint32_t i = 0, k = 0;
+  #ifdef SIMD_KERNELS
+  const VEC lo = VSet(low), hi = VSet(high);
+  uint32_t x;
+  for( ; i + VEC_SIZE <= n ; i += VEC_SIZE){
+    VEC v = VLoad(src + i);
+    if(VMask(VEq(VMin(VMax(v, lo), hi), v)) == 0xFFFF){  // ALL IN RANGE
+      VStore(dst + k, v);
+      k += VEC_SIZE;
+      continue;
+      }
+    for(x = i ; x < i + VEC_SIZE ; ++x)
+      if(src[x] >= low && src[x] <= high)
+        dst[k++] = src[x];
+    }
+  #endif
+  for( ; i < n ; ++i)
+    if(src[i] >= low && src[i] <= high)
+      dst[k++] = src[i];
+  return k;
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// ADD THE BASES OF A BLOCK TO count[5]: A, C, G AND T IN EITHER CASE (T WITH
+// U, AS IN FBasesPol) AND N IN EITHER CASE
+//
+static inline void CountSym(uint8_t s, uint64_t *count){
+  switch(s | 0x20){
+    case 'a': ++count[0]; break;
+    case 'c': ++count[1]; break;
+    case 'g': ++count[2]; break;
+    case 't': ++count[3]; break;
+    case 'n': ++count[4]; break;
+    case 'u': if(s == 'U') ++count[3]; break;
+    }
+  }
+
+void CountBases(const uint8_t *b, uint32_t n, uint64_t *count){
+  uint32_t i = 0;
+  #ifdef SIMD_KERNELS
+  uint32_t x, y, z;
+  const VEC caseBit = VSet(0x20), U = VSet('U'), sym[5] = { VSet('a'), VSet('c'),
+  VSet('g'), VSet('t'), VSet('n') };
+  uint8_t lanes[VEC_SIZE];
+  while(i + VEC_SIZE <= n){
+    VEC acc[5] = { VZero(), VZero(), VZero(), VZero(), VZero() };
+    // MATCHES ARE -1 IN EACH LANE, SUBTRACTED UP TO MAX_ACC TIMES
+    for(y = 0 ; y < MAX_ACC && i + VEC_SIZE <= n ; ++y, i += VEC_SIZE){
+      VEC v = VLoad(b + i), lower = VOr(v, caseBit);
+      for(x = 0 ; x < 4 ; ++x)
+        acc[x] = VSub(acc[x], VEq(lower, sym[x]));
+      acc[3] = VSub(acc[3], VEq(v, U));
+      acc[4] = VSub(acc[4], VEq(lower, sym[4]));
+      }
+    for(x = 0 ; x < 5 ; ++x){
+      VStore(lanes, acc[x]);
+      for(z = 0 ; z < VEC_SIZE ; ++z)
+        count[x] += lanes[z];
+      }
+    }
+  #endif
+  for( ; i < n ; ++i)
+    CountSym(b[i], count);
+  }
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
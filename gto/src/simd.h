@@ -0,0 +1,19 @@
+#ifndef SIMD_H_INCLUDED
+#define SIMD_H_INCLUDED
+
+#include "defs.h"
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+// VECTORIZED KERNELS OF THE BYTE-WISE SEQUENCE TRANSFORMS, 16 BYTES AT A TIME:
+// SSE2 IN NATIVE x86 BUILDS, SIMD128 IN WASM BUILDS WITH -msimd128 AND SCALAR
+// LOOPS ELSEWHERE. EVERY KERNEL GIVES THE SAME RESULT WITH EACH BACKEND.
+
+void     ComplementBases (uint8_t *, uint32_t);
+void     ReverseBytes    (uint8_t *, uint32_t);
+uint32_t FindByte        (const uint8_t *, uint32_t, uint8_t);
+uint32_t KeepRange       (uint8_t *, const uint8_t *, uint32_t, uint8_t, uint8_t);
+void     CountBases      (const uint8_t *, uint32_t, uint64_t *);
+
+// - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - - -
+
+#endif
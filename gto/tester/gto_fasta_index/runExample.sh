@@ -0,0 +1,3 @@
+#!/bin/bash
+../../bin/gto_fasta_index < input.mfasta > input.mfasta.gfi
+../../bin/gto_fasta_extract_by_read -i 0 -e 50 -x input.mfasta.gfi < input.mfasta > output.mfasta
\ No newline at end of file
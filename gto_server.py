@@ -0,0 +1,358 @@
+#!/usr/bin/env python3
+"""Local service that runs the native GTO tools for the workflow page.
+
+The browser runs the tools as WebAssembly; for large inputs the native gto/bin/gto_* tools
+are much faster. This service runs them on request over HTTP, streaming the request body
+to the stdin of the tool and its stdout back as the response body (chunked), so neither is
+held in memory. At most --jobs tools run at a time; further requests wait in a queue of
+--queue requests, and are refused (503) past it.
+
+Usage:
+    python gto_server.py [--host 127.0.0.1] [--port 8765] [--jobs N] [--queue N]
+                         [--allow-origin http://localhost:8082]
+
+Only pages of the --allow-origin origin (the development server of the app by default) may
+call the service from a browser; with an empty --allow-origin no CORS headers are sent.
+Requests of other origins to /run and /jobs are refused (403), and /run requires the
+X-GTO-Client header, so browsers check the origin with a preflight before sending a job.
+
+API (one request per connection):
+    GET  /health           Tools served, jobs and queue state (JSON)
+    POST /run/<tool>?arg=-i&arg=2
+                           Runs gto_<tool> with the arguments, body as stdin (with an
+                           X-GTO-Client header). The response
+                           streams stdout; its X-GTO-Job header names the job
+    GET  /jobs/<id>        Exit code, stderr and timings of a finished job (JSON)
+
+Only tools that read stdin (or no input) and write stdout are served. Each job runs in an
+empty directory of its own and its arguments cannot be paths, so a request cannot read or
+write files on this machine, nor the files of other jobs. Uses the standard library only.
+"""
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlsplit
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DESCRIPTION_FILE = os.path.join(SCRIPT_DIR, 'description.json')
+NATIVE_BIN_DIR = os.path.join(SCRIPT_DIR, 'gto', 'bin')
+
+DEFAULT_PORT = 8765
+
+# Origin of the app served by `npm start` (webpack.config.js)
+DEFAULT_ORIGIN = 'http://localhost:8082'
+
+# Header that runs need: it is not a CORS-safelisted header, so browsers send a preflight first
+CLIENT_HEADER = 'X-GTO-Client'
+
+# Bytes moved between the sockets and the tools at a time
+CHUNK_SIZE = 1 << 16
+
+# Limits of a request head, of the stderr kept per job and of the finished jobs kept
+MAX_HEAD_BYTES = 64 * 1024
+MAX_STDERR_BYTES = 1024 * 1024
+MAX_JOBS = 1000
+
+STATUS_TEXT = {
+    200: 'OK', 204: 'No Content', 400: 'Bad Request', 403: 'Forbidden', 404: 'Not Found',
+    405: 'Method Not Allowed', 503: 'Service Unavailable',
+}
+
+
+class RequestError(Exception):
+    """A request that cannot be served, with the HTTP status to answer."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def load_tools(bin_dir):
+    """Names (without gto_) and binaries of the tools that can be served."""
+    with open(DESCRIPTION_FILE) as f:
+        configs = json.load(f)['tools']
+    tools = {}
+    for config in configs:
+        if config['input']['type'] not in ('stdin', '') or config['output']['type'] != 'stdout':
+            continue
+        binary = os.path.join(bin_dir, config['name'])
+        if os.access(binary, os.X_OK):
+            tools[config['name'][len('gto_'):]] = binary
+    return tools
+
+
+def check_args(args):
+    """Refuse arguments that are paths. Tools run in an empty directory, so other file
+    names given to them name no file."""
+    for arg in args:
+        if '/' in arg or '\\' in arg or arg in ('.', '..'):
+            raise RequestError(400, f"Arguments cannot be paths: {arg}")
+
+
+class Request:
+    """Method, path, query and headers of an HTTP request, with its body stream."""
+
+    def __init__(self, method, target, headers, reader):
+        url = urlsplit(target)
+        self.method = method
+        self.path = url.path
+        self.query = parse_qsl(url.query, keep_blank_values=True)
+        self.headers = headers
+        self.reader = reader
+
+    @classmethod
+    async def read(cls, reader):
+        try:
+            head = await reader.readuntil(b'\r\n\r\n')
+        except asyncio.LimitOverrunError:
+            raise RequestError(400, "Request head too large")
+        lines = head.decode('latin-1').split('\r\n')
+        parts = lines[0].split(' ')
+        if len(parts) != 3:
+            raise RequestError(400, "Bad request line")
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                name, value = line.split(':', 1)
+                headers[name.strip().lower()] = value.strip()
+        return cls(parts[0], parts[1], headers, reader)
+
+    async def body(self):
+        """Yield the body in chunks, from its length or its chunked encoding."""
+        try:
+            async for data in self.read_body():
+                yield data
+        except ValueError:
+            raise RequestError(400, "Bad body length")
+
+    async def read_body(self):
+        if self.headers.get('transfer-encoding', '').lower() == 'chunked':
+            while True:
+                size = int((await self.reader.readuntil(b'\r\n')).split(b';')[0], 16)
+                if size == 0:
+                    # Trailers, up to the empty line
+                    while await self.reader.readuntil(b'\r\n') != b'\r\n':
+                        pass
+                    return
+                data = await self.reader.readexactly(size)
+                await self.reader.readexactly(2)
+                yield data
+        else:
+            remaining = int(self.headers.get('content-length', '0'))
+            while remaining > 0:
+                data = await self.reader.read(min(CHUNK_SIZE, remaining))
+                if not data:
+                    raise RequestError(400, "Body shorter than its length")
+                remaining -= len(data)
+                yield data
+
+
+class GtoService:
+    """Runs the tools of requests, at most `jobs` at a time."""
+
+    def __init__(self, tools, jobs, queue, allow_origin):
+        self.tools = tools
+        self.jobs = jobs
+        self.queue = queue
+        self.allow_origin = allow_origin
+        self.slots = asyncio.Semaphore(jobs)
+        self.running = 0
+        self.waiting = 0
+        self.finished = OrderedDict()  # job id -> report, oldest first
+
+    def cors_headers(self):
+        if not self.allow_origin:
+            return {}
+        return {
+            'Access-Control-Allow-Origin': self.allow_origin,
+            'Access-Control-Allow-Methods': 'GET, POST, OPTIONS',
+            'Access-Control-Allow-Headers': f"Content-Type, {CLIENT_HEADER}",
+            'Access-Control-Expose-Headers': 'X-GTO-Job',
+            # Lets the page, served from another address, call this local service
+            'Access-Control-Allow-Private-Network': 'true',
+        }
+
+    async def send_head(self, writer, status, headers):
+        lines = [f"HTTP/1.1 {status} {STATUS_TEXT[status]}"]
+        headers = {**self.cors_headers(), 'Connection': 'close', **headers}
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+
+    async def send_json(self, writer, status, value, headers=None):
+        body = json.dumps(value).encode()
+        await self.send_head(writer, status, {'Content-Type': 'application/json',
+                                              'Content-Length': str(len(body)), **(headers or {})})
+        writer.write(body)
+        await writer.drain()
+
+    async def handle(self, reader, writer):
+        try:
+            try:
+                request = await Request.read(reader)
+                await self.route(request, writer)
+            except RequestError as e:
+                await self.send_json(writer, e.status, {'error': str(e)},
+                                     {'Retry-After': '1'} if e.status == 503 else None)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass  # The client went away
+        finally:
+            writer.close()
+
+    def check_origin(self, request):
+        """Refuse requests of pages from other origins. Requests without an Origin header
+        do not come from a page (e.g. curl or run_recipe.py)."""
+        origin = request.headers.get('origin')
+        if origin is not None and origin != self.allow_origin:
+            raise RequestError(403, f"Origin not allowed: {origin}")
+
+    async def route(self, request, writer):
+        if request.method == 'OPTIONS':
+            await self.send_head(writer, 204, {'Content-Length': '0'})
+        elif request.path == '/health' and request.method == 'GET':
+            await self.send_json(writer, 200, {'tools': sorted(self.tools), 'jobs': self.jobs,
+                                               'running': self.running, 'waiting': self.waiting})
+        elif request.path.startswith('/jobs/') and request.method == 'GET':
+            self.check_origin(request)
+            report = self.finished.get(request.path[len('/jobs/'):])
+            if report is None:
+                raise RequestError(404, "Unknown job")
+            await self.send_json(writer, 200, report)
+        elif request.path.startswith('/run/'):
+            if request.method != 'POST':
+                raise RequestError(405, "Tools run with POST")
+            self.check_origin(request)
+            if CLIENT_HEADER.lower() not in request.headers:
+                raise RequestError(403, f"Runs need the {CLIENT_HEADER} header")
+            await self.run(request, writer)
+        else:
+            raise RequestError(404, "Not found")
+
+    async def run(self, request, writer):
+        tool = request.path[len('/run/'):]
+        if tool.startswith('gto_'):
+            tool = tool[len('gto_'):]
+        if tool not in self.tools:
+            raise RequestError(404, f"Unknown tool: {tool}")
+        args = [value for name, value in request.query if name == 'arg']
+        check_args(args)
+        if self.waiting >= self.queue and self.slots.locked():
+            raise RequestError(503, "Too many jobs waiting")
+
+        # Job ids cannot be guessed, so the reports of jobs are only read by their clients
+        job = secrets.token_hex(16)
+        report = {'job': job, 'tool': tool, 'args': args}
+        received = time.monotonic()
+        self.waiting += 1
+        try:
+            await self.slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            report['queued'] = time.monotonic() - received
+            await self.execute(self.tools[tool], args, request, writer, report)
+        finally:
+            self.running -= 1
+            self.slots.release()
+            self.finished[job] = report
+            while len(self.finished) > MAX_JOBS:
+                self.finished.popitem(last=False)
+
+    async def execute(self, binary, args, request, writer, report):
+        # Output files of a job (e.g. named by its arguments) are not seen by other jobs
+        with tempfile.TemporaryDirectory(prefix='gto_job_') as work_dir:
+            await self.execute_in(binary, args, request, writer, report, work_dir)
+
+    async def execute_in(self, binary, args, request, writer, report, work_dir):
+        started = time.monotonic()
+        process = await asyncio.create_subprocess_exec(
+            binary, *args, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE, cwd=work_dir)
+        stderr = bytearray()
+        report['input_bytes'] = 0
+        report['output_bytes'] = 0
+
+        async def feed():
+            # The tool may stop reading early (e.g. an extraction past its end)
+            try:
+                async for data in request.body():
+                    report['input_bytes'] += len(data)
+                    process.stdin.write(data)
+                    await process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            finally:
+                process.stdin.close()
+
+        async def collect():
+            while data := await process.stderr.read(CHUNK_SIZE):
+                stderr.extend(data[:MAX_STDERR_BYTES - len(stderr)])
+
+        tasks = [asyncio.ensure_future(feed()), asyncio.ensure_future(collect())]
+        try:
+            await self.send_head(writer, 200, {'Content-Type': 'application/octet-stream',
+                                               'Transfer-Encoding': 'chunked', 'X-GTO-Job': report['job']})
+            while data := await process.stdout.read(CHUNK_SIZE):
+                report['output_bytes'] += len(data)
+                writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+                await writer.drain()
+            await asyncio.gather(*tasks)
+            report['exit_code'] = await process.wait()
+            writer.write(b'0\r\n\r\n')
+            await writer.drain()
+        except RequestError as e:
+            # The response has started: it ends unfinished, which the client sees as an error
+            report['error'] = str(e)
+        finally:
+            if process.returncode is None:
+                # The client went away, or sent a broken body. The exit of the tool is only
+                # reported once its pipes are closed, so its output is drained
+                tasks[0].cancel()
+                process.kill()
+                while await process.stdout.read(CHUNK_SIZE):
+                    pass
+                await tasks[1]
+                report['exit_code'] = await process.wait()
+            report['stderr'] = stderr.decode('utf-8', errors='replace')
+            report['elapsed'] = time.monotonic() - started
+
+
+async def serve(args):
+    tools = load_tools(args.bin_dir)
+    if not tools:
+        print(f"Error: no native tools in {args.bin_dir}")
+        sys.exit(1)
+    service = GtoService(tools, max(1, args.jobs), max(0, args.queue), args.allow_origin)
+    server = await asyncio.start_server(service.handle, args.host, args.port, limit=MAX_HEAD_BYTES)
+    print(f"Serving {len(tools)} tools on http://{args.host}:{args.port} "
+          f"({service.jobs} jobs, {service.queue} waiting, "
+          f"{f'callable from {args.allow_origin}' if args.allow_origin else 'no CORS'})")
+    async with server:
+        await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the native GTO tools for the workflow page.")
+    parser.add_argument('--host', default='127.0.0.1', help="Address to listen on")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help="Tools run at a time")
+    parser.add_argument('--queue', type=int, default=64, help="Requests waiting for a job, at most")
+    parser.add_argument('--bin-dir', default=NATIVE_BIN_DIR, help="Directory of the native gto_* tools")
+    parser.add_argument('--allow-origin', default=DEFAULT_ORIGIN,
+                        help="Origin of the page allowed to call the service (CORS); empty for none")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+"""In-process bindings to the GTO tools.
+
+Runs the tools from libgto, a shared library of gto/src (see gtolib/build.py), instead of
+gto/bin/gto_* processes with temporary files: inputs are bytes-like objects or chunk
+iterators and outputs come back as bytes. Each run has its own streams and its exit ends
+the run, not the process; the GIL is released while a tool runs, so runs on different
+threads (run_many, run_files) use the cores in parallel.
+
+    import gtolib
+    reverse = gtolib.run('fasta_reverse', data).output
+    for block in gtolib.stream('fasta_complement', chunks):
+        ...
+
+Tools are named as in description.json, with or without the gto_ prefix, and take the
+same arguments as their command-line versions. Tools that write files (e.g.
+fasta_split_streams) write them in the working directory, as they would on the command
+line. Each run has its own random generator, so seeded tools give the outputs of their
+command-line versions, also when runs overlap.
+"""
+import ctypes
+import os
+import threading
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from . import build as _build
+
+# Bytes read from the output of a streamed run at a time
+STREAM_READ_SIZE = 1 << 16
+
+Result = namedtuple('Result', ['output', 'log', 'status'])
+Result.__doc__ = "Output (stdout) and log (stderr) of a run, as bytes, and its exit status."
+
+
+class GtoError(Exception):
+    """A run that ended with a non-zero exit status."""
+
+    def __init__(self, tool, status, log):
+        self.tool = tool
+        self.status = status
+        self.log = log
+        message = log.decode('utf-8', errors='replace').strip().splitlines()
+        super().__init__(f"{tool} exited with status {status}" + (f": {message[-1]}" if message else ''))
+
+
+_library = None
+_library_lock = threading.Lock()
+
+
+def load(path=None):
+    """The library, built first if it is missing or out of date (unless a path is given)."""
+    global _library
+    with _library_lock:
+        if _library is None:
+            library = ctypes.CDLL(path or _build.build())
+            library.GTO_RunBuffer.argtypes = [
+                ctypes.c_int, ctypes.POINTER(ctypes.c_char_p), ctypes.c_void_p, ctypes.c_size_t,
+                ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t),
+                ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t),
+            ]
+            library.GTO_RunBuffer.restype = ctypes.c_int
+            library.GTO_RunFd.argtypes = [
+                ctypes.c_int, ctypes.POINTER(ctypes.c_char_p), ctypes.c_int, ctypes.c_int,
+                ctypes.POINTER(ctypes.c_void_p), ctypes.POINTER(ctypes.c_size_t),
+            ]
+            library.GTO_RunFd.restype = ctypes.c_int
+            library.GTO_Free.argtypes = [ctypes.c_void_p]
+            library.GTO_Free.restype = None
+            _library = library
+    return _library
+
+
+def _argv(tool, args):
+    """The argv of a run; argparse in gto/src writes into it, so each run gets its own."""
+    values = [tool.encode()] + [os.fsencode(arg) if isinstance(arg, os.PathLike) else str(arg).encode()
+                                for arg in args]
+    return len(values), (ctypes.c_char_p * (len(values) + 1))(*values, None)
+
+
+def _input_pointer(data):
+    """A pointer to the bytes of a buffer and the object that keeps them alive. bytes and
+    writable contiguous buffers are passed as they are; other buffers are copied."""
+    if isinstance(data, str):
+        data = data.encode()
+    if isinstance(data, bytes):
+        return ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p), data, len(data)
+    view = memoryview(data)
+    if view.readonly or not view.c_contiguous:
+        data = view.tobytes()
+        return ctypes.cast(ctypes.c_char_p(data), ctypes.c_void_p), data, len(data)
+    if view.nbytes == 0:
+        return None, view, 0
+    array = (ctypes.c_char * view.nbytes).from_buffer(view.cast('B'))
+    return ctypes.cast(array, ctypes.c_void_p), array, view.nbytes
+
+
+def _take(library, pointer, size):
+    """The bytes of a buffer allocated by the library, which is freed."""
+    try:
+        return ctypes.string_at(pointer.value, size.value) if pointer.value else b''
+    finally:
+        library.GTO_Free(pointer)
+
+
+def run(tool, data=b'', args=(), check=True):
+    """Run a tool on a bytes-like input (or str), returning its Result.
+    Raises GtoError if the tool fails and check is set."""
+    library = load()
+    argc, argv = _argv(tool, args)
+    pointer, keep, size = _input_pointer(data)
+    out, out_size = ctypes.c_void_p(), ctypes.c_size_t()
+    log, log_size = ctypes.c_void_p(), ctypes.c_size_t()
+    status = library.GTO_RunBuffer(argc, argv, pointer, size, ctypes.byref(out), ctypes.byref(out_size),
+                                   ctypes.byref(log), ctypes.byref(log_size))
+    del keep
+    result = Result(_take(library, out, out_size), _take(library, log, log_size), status)
+    if check and status != 0:
+        raise GtoError(tool, status, result.log)
+    return result
+
+
+def stream(tool, chunks, args=(), read_size=STREAM_READ_SIZE):
+    """Run a tool on an iterable of bytes-like chunks, yielding its output in blocks as it
+    is written. The tool reads from a pipe, so its memory does not grow with the input.
+    Raises GtoError once the output ends if the tool failed."""
+    library = load()
+    argc, argv = _argv(tool, args)
+    in_read, in_write = os.pipe()
+    out_read, out_write = os.pipe()
+    outcome = {}
+
+    def feed():
+        try:
+            with open(in_write, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+        except BrokenPipeError:
+            pass  # The tool stopped reading its input
+        except Exception as e:
+            outcome['error'] = e
+
+    def execute():
+        log, log_size = ctypes.c_void_p(), ctypes.c_size_t()
+        # Both descriptors are closed by the run
+        outcome['status'] = library.GTO_RunFd(argc, argv, in_read, out_write,
+                                              ctypes.byref(log), ctypes.byref(log_size))
+        outcome['log'] = _take(library, log, log_size)
+
+    feeder = threading.Thread(target=feed, daemon=True)
+    runner = threading.Thread(target=execute, daemon=True)
+    feeder.start()
+    runner.start()
+    try:
+        while True:
+            block = os.read(out_read, read_size)
+            if not block:
+                break
+            yield block
+    finally:
+        os.close(out_read)
+        runner.join()
+        feeder.join()
+    if 'error' in outcome:
+        raise outcome['error']
+    if outcome['status'] != 0:
+        raise GtoError(tool, outcome['status'], outcome['log'])
+
+
+def run_many(tool, inputs, args=(), jobs=None, check=True):
+    """Run a tool on each of the inputs (bytes-like) on a pool of threads, returning the
+    Results in the order of the inputs."""
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        return list(pool.map(lambda data: run(tool, data, args, check), inputs))
+
+
+def run_files(tool, paths, args=(), jobs=None, check=True):
+    """Run a tool on the contents of each of the files on a pool of threads, returning the
+    Results in the order of the paths."""
+    def run_file(path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        return run(tool, data, args, check)
+
+    load()
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        return list(pool.map(run_file, paths))
+
+
+__all__ = ['GtoError', 'Result', 'load', 'run', 'run_files', 'run_many', 'stream']
@@ -0,0 +1,144 @@
+"""Build of libgto, the shared library of the GTO tools that gtolib runs in-process.
+
+Links the tools of description.json (except Comparative Mapping, which has its own common
+objects) as in the multi-call bundle of build_wasm.py: each main is renamed to
+gto_<tool>_main and gto/src/multicall.c dispatches on the tool name. Every source is
+compiled with -include libgto.h, which gives each run its own streams (gto/src/libgto.c).
+The library is only rebuilt when the hash of its inputs (sources, headers, flags and
+compiler version) changed since its last build.
+
+Usage:
+    python -m gtolib.build [--force] [--jobs N] [--cc CC]
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(SCRIPT_DIR, 'gto', 'src')
+DESCRIPTION_FILE = os.path.join(SCRIPT_DIR, 'description.json')
+
+BUILD_DIR = os.path.join(SCRIPT_DIR, 'build', 'python')
+KEY_FILE = os.path.join(BUILD_DIR, 'libgto.key')
+LIBRARY = os.path.join(BUILD_DIR, 'libgto.dylib' if sys.platform == 'darwin' else 'libgto.so')
+
+# As COMMON_SOURCES in build_wasm.py, with the in-process entry points
+COMMON_SOURCES = ['argparse.c', 'buffer.c', 'common.c', 'csmodel.c', 'dna.c', 'fcm.c', 'labels.c',
+                  'mem.c', 'misc.c', 'parser.c', 'phash.c', 'reads.c', 'simd.c', 'faidx.c', 'multicall.c', 'libgto.c']
+CMAP_TOOL = 'gto_comparative_map'
+
+# As CFLAGS in gto/src/Makefile
+CFLAGS = ['-O3', '-Wall', '-ffast-math', '-fPIC',
+          '-DOSX' if sys.platform == 'darwin' else '-DLINUX',
+          *(['-msse2'] if platform.machine().lower() in ('x86_64', 'amd64', 'i386', 'i686') else []),
+          '-include', 'libgto.h']
+
+
+class BuildError(Exception):
+    """A library that could not be compiled or linked."""
+
+
+def digest(*parts):
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def file_hash(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def library_tools():
+    """Module names and sources of the tools linked into the library."""
+    with open(DESCRIPTION_FILE) as f:
+        tools = json.load(f)['tools']
+    return [(tool['name'][len('gto_'):], os.path.join(SCRIPT_DIR, tool['source'])) for tool in tools
+            if tool['name'] != CMAP_TOOL and tool.get('source')
+            and os.path.isfile(os.path.join(SCRIPT_DIR, tool['source']))]
+
+
+def compiler_version(cc):
+    try:
+        result = subprocess.run([cc, '--version'], capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError) as e:
+        raise BuildError(f"could not run {cc} ({e})")
+    return result.stdout.splitlines()[0] if result.stdout else ''
+
+
+def compile_source(cc, source, obj, include_dirs):
+    result = subprocess.run([cc, *CFLAGS, *(f'-I{d}' for d in include_dirs), '-c', source, '-o', obj],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise BuildError(f"could not compile {os.path.basename(source)}:\n{result.stderr.strip()}")
+    return obj
+
+
+def build(cc=None, jobs=None, force=False):
+    """Build the library if its inputs changed, returning its path."""
+    cc = cc or os.environ.get('CC', 'cc')
+    tools = library_tools()
+    headers = sorted(glob.glob(os.path.join(SRC_DIR, '*.h')))
+    key = digest(compiler_version(cc), CFLAGS,
+                 *(f"{name}={file_hash(path)}" for name, path in tools),
+                 *(f"{os.path.basename(path)}={file_hash(path)}" for path in headers),
+                 *(file_hash(os.path.join(SRC_DIR, source)) for source in COMMON_SOURCES))
+    if not force and os.path.exists(LIBRARY) and os.path.exists(KEY_FILE):
+        with open(KEY_FILE) as f:
+            if f.read() == key:
+                return LIBRARY
+
+    # Renamed tool sources and the tool list of multicall.c, as the bundle of build_wasm.py
+    src_dir = os.path.join(BUILD_DIR, 'src')
+    obj_dir = os.path.join(BUILD_DIR, 'obj')
+    os.makedirs(src_dir, exist_ok=True)
+    os.makedirs(obj_dir, exist_ok=True)
+    sources = [os.path.join(SRC_DIR, source) for source in COMMON_SOURCES]
+    for name, path in tools:
+        with open(path) as f:
+            renamed = re.sub(r'\bmain\b', f"gto_{name}_main", f.read())
+        sources.append(os.path.join(src_dir, f"gto_{name}.c"))
+        with open(sources[-1], 'w') as f:
+            f.write(renamed)
+    with open(os.path.join(src_dir, 'bundle_tools.h'), 'w') as f:
+        f.write(''.join(f"GTO_TOOL({name})\n" for name, _ in tools))
+
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as pool:
+        futures = [pool.submit(compile_source, cc, source,
+                               os.path.join(obj_dir, os.path.basename(source).replace('.c', '.o')),
+                               [SRC_DIR, src_dir])
+                   for source in sources]
+        objects = [future.result() for future in futures]
+
+    result = subprocess.run([cc, '-shared', '-o', LIBRARY, *objects, '-lm', '-lpthread'], capture_output=True, text=True)
+    if result.returncode != 0:
+        raise BuildError(f"could not link {os.path.basename(LIBRARY)}:\n{result.stderr.strip()}")
+    with open(KEY_FILE, 'w') as f:
+        f.write(key)
+    return LIBRARY
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the shared library of the GTO tools for gtolib.")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the library is up to date")
+    parser.add_argument('--jobs', '-j', type=int, default=None, help="Parallel compiler jobs")
+    parser.add_argument('--cc', default=None, help="C compiler (default: $CC or cc)")
+    args = parser.parse_args()
+    try:
+        print(build(args.cc, args.jobs, args.force))
+    except BuildError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
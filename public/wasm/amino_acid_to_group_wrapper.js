@@ -6,10 +6,15 @@
 (function() {
   /**
    * Runs the AminoAcidToGroup tool.
-   * Uses a single stdin data string.   * @param {string} inputData - The input data.   * @param {Array<string>} args - CLI arguments (include flags and filenames for file inputs).
-   * @returns {Promise<Object>} An object containing stdout and stderr outputs.
+   * Uses a single stdin data string or byte array, or a Blob that is streamed to the tool.   * @param {string|Uint8Array|Blob} inputData - The input data.   * @param {Array<string>} args - CLI arguments (include flags and filenames for file inputs).
+   * @param {Object} options - { streamOutput: return stdout as a Blob drained in chunks,
+   *   binaryOutput: return stdout and output files as Uint8Array instead of text,
+   *   outputPipe: also write stdout to this pipe, keepOutput: false to only write it there,
+   *   files: { name: data } written to the virtual filesystem besides the input }.
+   * @returns {Promise<Object>} An object containing stdout and stderr outputs, the exit
+   *   status of the tool (exitCode) and the metrics of the run (timings in milliseconds, heap and byte counts, see src/utils/stepMetrics.js).
    */
-  async function runAminoAcidToGroup(inputData, args = []) {
+  async function runAminoAcidToGroup(inputData, args = [], options = {}) {
     console.log("Starting runAminoAcidToGroup");
     console.log("Arguments:", args);
 
@@ -18,42 +23,104 @@
       let stdoutBuffer = '';
       let stderrBuffer = '';
 
-      // Module instantiation options
-      const options = {
-        locateFile: (path) => path.endsWith('.wasm') ? `/wasm/${path}` : path,
-        thisProgram: './amino_acid_to_group',
-        noInitialRun: true,
-        print: (text) => { stdoutBuffer += text + '\n'; },
-        printErr: (text) => { stderrBuffer += text + '\n'; },
+      // Time of each phase of the run
+      const metrics = { timings: {}, inputBytes: byteSize(inputData) };
+      let phaseStart = performance.now();
+      const endPhase = (name) => {
+        const time = performance.now();
+        metrics.timings[name] = (metrics.timings[name] || 0) + time - phaseStart;
+        phaseStart = time;
       };
 
-      // Load the WASM module script
-      await loadModuleScript('amino_acid_to_group');
-      const moduleFactory = window['amino_acid_to_group'];
+      // Load the WASM module script: the multi-call bundle if it includes this tool,
+      // otherwise the tool's own module
+      const target = await resolveModule('amino_acid_to_group');
+      await loadModuleScript(target.moduleName);
+      const moduleFactory = window[target.moduleName];
       if (typeof moduleFactory !== 'function') {
-        throw new Error(`Module factory for amino_acid_to_group not available.`);
+        throw new Error(`Module factory for ${target.moduleName} not available.`);
       }
-      const module = await moduleFactory(options);
-
-      // ------------------------------------------------------------------
-      // Write inputs into the virtual filesystem
-      // ------------------------------------------------------------------
-      // Normalize and write single stdin input
-      inputData = inputData.replace(/\r\n/g, '\n');
-      module.FS.writeFile('input.txt', inputData);
-      let fullArgs = args.slice();
+      endPhase('scriptLoad');
+
+      // Take a warm instance and bind this run's output buffers to it
+      const lease = await acquireInstance(target.moduleName, moduleFactory);
+      lease.bindOutput(
+        (text) => { stdoutBuffer += text + '\n'; },
+        (text) => { stderrBuffer += text + '\n'; }
+      );
+      const module = lease.module;
+      endPhase('instantiate');
+      metrics.warm = !!lease.warm;
+      if (lease.compileTime) {
+        metrics.timings.compile = lease.compileTime;
+        metrics.timings.instantiate -= lease.compileTime;
+      }
+
+      // Completes the metrics of a result, and its exit status
+      let exitCode;
+      const finish = (result) => {
+        endPhase('outputRead');
+        result.exitCode = exitCode;
+        metrics.heapBytes = lease.heapBytes ? lease.heapBytes() : 0;
+        metrics.outputBytes = byteSize(result.stdout) + byteSize(result.outputs);
+        result.metrics = metrics;
+        return result;
+      };
+
+      try {
+        // ------------------------------------------------------------------
+        // Write inputs into the virtual filesystem
+        // ------------------------------------------------------------------
+        // Large inputs are read from the Blob on demand, and a pipeline stage reads the
+        // previous tool's output from a pipe (see src/wasmStreams.js)
+        const streamed = isStreamSource(inputData) && lease.streamInput
+          ? lease.streamInput('input.txt', inputData)
+          : false;
+        if (!streamed) {
+          if (isBlob(inputData)) {
+            inputData = await inputData.text();
+          }
+          // Normalize and write single stdin input (bytes, e.g. a previous step's output, as they are)
+          if (typeof inputData === 'string') {
+            inputData = inputData.replace(/\r\n/g, '\n');
+          }
+          module.FS.writeFile('input.txt', inputData);
+        }
+        // Extra files the arguments refer to (e.g. the index of the input, see src/utils/sequenceIndex.js)
+        for (const [name, data] of Object.entries(options.files || {})) {
+          module.FS.writeFile(name, data);
+        }
+        let fullArgs = args.slice();
       
 
 
-      console.log("Executing module.callMain with arguments:", fullArgs);
-      module.callMain(fullArgs);
+        // Capture stdout as bytes, in a chunked Blob sink when streaming, or into the pipe to the
+        // next tool in a pipeline (see src/wasmStreams.js).
+        // Without the shared runtime it is collected line by line through print.
+        const streaming = !!options.streamOutput;
+        const sink = lease.captureStdout
+          ? lease.captureStdout(streaming, options.outputPipe || null, options.keepOutput !== false)
+          : null;
+
+        endPhase('fsWrite');
+        console.log("Executing module.callMain with arguments:", fullArgs);
+        exitCode = module.callMain([...target.args, ...fullArgs]);
+        lease.flush();
+        endPhase('callMain');
 
-      // ------------------------------------------------------------------
-      // Collect outputs
-      // ------------------------------------------------------------------
-      // Single-output: capture stdout
-      const outData = stdoutBuffer.trim();
-      return { stdout: outData, stderr: stderrBuffer.trim() };
+        // ------------------------------------------------------------------
+        // Collect outputs
+        // ------------------------------------------------------------------
+        if (streaming && sink) {
+          return finish({ stdout: sink.toBlob(), stderr: stderrBuffer.trim(), streamed: true });
+        }
+
+        // Single-output: capture stdout
+        const outData = sink ? decodeOutput(trimBytes(sink.toBytes()), options) : stdoutBuffer.trim();
+        return finish({ stdout: outData, stderr: stderrBuffer.trim() });
+      } finally {
+        lease.release();
+      }
 
     } catch (err) {
       console.error(`Error in runAminoAcidToGroup:`, err);
@@ -61,12 +128,115 @@
     }
   }
 
+  /**
+   * Resolves the module that runs the tool and the arguments that select it.
+   * @returns {Promise<{moduleName: string, args: Array<string>}>}
+   */
+  function resolveModule(toolName) {
+    const runtime = window.gtoWasmRuntime;
+    if (runtime && runtime.resolveModule) {
+      return runtime.resolveModule(toolName);
+    }
+    return Promise.resolve({ moduleName: toolName, args: [] });
+  }
+
+  /**
+   * Takes an instance of the module from the shared runtime (see src/wasmRuntime.js),
+   * falling back to a fresh instance when the runtime is not available.
+   * @returns {Promise<Object>} A lease with the module and bindOutput/flush/release methods.
+   */
+  async function acquireInstance(moduleName, moduleFactory) {
+    // Module instantiation options
+    const options = {
+      locateFile: (path) => path.endsWith('.wasm') ? `/wasm/${path}` : path,
+      thisProgram: `./${moduleName}`,
+      noInitialRun: true,
+    };
+
+    const runtime = window.gtoWasmRuntime;
+    if (runtime) {
+      return runtime.acquire(moduleName, moduleFactory, options);
+    }
+
+    const output = { print: () => {}, printErr: () => {} };
+    const module = await moduleFactory({
+      ...options,
+      print: (text) => output.print(text),
+      printErr: (text) => output.printErr(text),
+    });
+    return {
+      module,
+      heapBytes: () => (module.HEAP8 ? module.HEAP8.length : 0),
+      bindOutput: (print, printErr) => { output.print = print; output.printErr = printErr; },
+      flush: () => {},
+      release: () => {},
+    };
+  }
+
+  function isBlob(value) {
+    return typeof Blob !== 'undefined' && value instanceof Blob;
+  }
+
+  /**
+   * Checks if stdin data is read on demand: a Blob or the reading end of a pipe.
+   */
+  function isStreamSource(value) {
+    return isBlob(value) || (value !== null && typeof value === 'object' && typeof value.readSync === 'function');
+  }
+
+  /**
+   * Size of input or output data: bytes, Blob size or text length, summed over the values
+   * of an object (output files, or file parameters with their data). 0 for pipes.
+   */
+  function byteSize(value) {
+    if (value === undefined || value === null) return 0;
+    if (typeof value === 'string') return value.length;
+    if (ArrayBuffer.isView(value)) return value.byteLength;
+    if (isBlob(value)) return value.size;
+    // The reading end of a pipe has no size
+    if (typeof value === 'object' && !isStreamSource(value)) {
+      return Object.values(value).reduce((size, item) => size + byteSize(item && item.data !== undefined ? item.data : item), 0);
+    }
+    return 0;
+  }
+
+  const decoder = new TextDecoder('utf-8', { fatal: false });
+
+  /**
+   * Returns output bytes as text, or as they are when the caller asked for binary output.
+   */
+  function decodeOutput(bytes, options) {
+    return options.binaryOutput ? bytes : decoder.decode(bytes);
+  }
+
+  /**
+   * Drops leading and trailing ASCII whitespace, like String.prototype.trim, without copying.
+   */
+  function trimBytes(bytes) {
+    const isSpace = (byte) => byte === 0x20 || (byte >= 0x09 && byte <= 0x0d);
+    let start = 0;
+    let end = bytes.length;
+    while (start < end && isSpace(bytes[start])) start++;
+    while (end > start && isSpace(bytes[end - 1])) end--;
+    return bytes.subarray(start, end);
+  }
+
   /**
    * Dynamically loads the WASM module script if not already loaded.
    */
   function loadModuleScript(moduleName) {
     return new Promise((resolve, reject) => {
       if (window[moduleName]) return resolve();
+      if (typeof document === 'undefined') {
+        // Inside a Web Worker (see src/workers/gtoWorker.js)
+        try {
+          importScripts(`/wasm/${moduleName}.js`);
+          resolve();
+        } catch (e) {
+          reject(new Error(`Failed to load ${moduleName}.js`));
+        }
+        return;
+      }
       const script = document.createElement('script');
       script.src = `/wasm/${moduleName}.js`;
       script.onload = () => resolve();
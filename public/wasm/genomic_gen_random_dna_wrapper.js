@@ -85,6 +85,17 @@
         return;
       }
 
+      if (typeof document === 'undefined') {
+        // Inside a Web Worker (see src/workers/gtoWorker.js)
+        try {
+          importScripts(`/wasm/${moduleName}.js`);
+          resolve();
+        } catch (e) {
+          reject(new Error(`Failed to load module script ${moduleName}.js.`));
+        }
+        return;
+      }
+
       const script = document.createElement('script');
       script.src = `/wasm/${moduleName}.js`;
       script.onload = () => {
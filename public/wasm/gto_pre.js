@@ -0,0 +1 @@
+if (Module['reuseRuntime']) { Module['noExitRuntime'] = true; Module['runtimeReusable'] = true; }
@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""Headless runner of the recipes exported from the workflow page, with the native GTO tools.
+
+Loads a recipe JSON (workflow.input.files and workflow.tools[].toolName/params), maps the
+parameters of each step to command-line flags as the workflow page does (description.json),
+and runs the steps against gto/bin/gto_* connected by OS pipes. Input files are spread
+across a pool of processes, and the wall time, CPU time and peak RSS of every step are
+reported.
+
+Usage:
+    python run_recipe.py recipe.json [inputs ...] [--out-dir DIR] [--jobs N] [--report report.json]
+
+Inputs are files or directories (their files are taken). Without inputs, the files embedded
+in the recipe are run. When the first tool takes an index of its input (index_flag in
+description.json), the index is built with gto_fasta_index beside the input (input.gfi) and
+rebuilt when the input is newer, unless --no-index is given.
+"""
+import argparse
+import csv
+import json
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DESCRIPTION_FILE = os.path.join(SCRIPT_DIR, 'description.json')
+NATIVE_BIN_DIR = os.path.join(SCRIPT_DIR, 'gto', 'bin')
+
+# Extensions of the output files, by the first output format of the last tool
+# (as TypeToExtensionMap in src/utils/exportRecipeScript.js)
+FORMAT_EXTENSIONS = {
+    'Multi-FASTA': 'fa',
+    'FASTA': 'fa',
+    'FASTQ': 'fq',
+    'POS': 'pos',
+    'SVG': 'svg',
+    'NUM': 'num',
+}
+
+# Intervals of the peak RSS sampling of a running step, in seconds
+RSS_SAMPLE_MIN = 0.001
+RSS_SAMPLE_MAX = 0.02
+
+# Bytes of stderr shown when a step fails
+STDERR_TAIL = 2000
+
+# Extension of the input indexes built by gto_fasta_index
+INDEX_EXTENSION = '.gfi'
+
+
+class RecipeError(Exception):
+    """A recipe that cannot run with the native tools."""
+
+
+class Step:
+    """A tool of the recipe, resolved against description.json."""
+
+    def __init__(self, tool_name, args, config, binary):
+        self.tool_name = tool_name
+        self.args = args
+        self.binary = binary
+        self.index_flag = config.get('index_flag')
+        self.input_type = config['input']['type'].lower()
+        self.output_type = config['output']['type'].lower()
+        self.output_formats = [f.strip() for f in config['output']['format'].split(',') if f.strip()]
+
+    @property
+    def command(self):
+        return [self.binary] + self.args
+
+
+def build_tool_args(params, config):
+    """Command-line arguments of a step, as buildToolArgs in src/components/RecipePanel.js."""
+    args = []
+    if not params:
+        return args
+    for flag in config['flags']:
+        if flag['required'] or params.get(flag['flag']):
+            args.append(flag['flag'])
+            # Check if the flag has an associated parameter
+            value = params.get(flag['parameter']) if flag['parameter'] else None
+            if value is not None and value != '':
+                args.append(str(value).lower() if isinstance(value, bool) else str(value))
+    return args
+
+
+def load_recipe(path):
+    with open(path) as f:
+        recipe = json.load(f)
+    workflow = recipe.get('workflow', recipe)
+    if not workflow.get('tools'):
+        raise RecipeError(f"{path} has no tools")
+    return workflow
+
+
+def resolve_steps(workflow, bin_dir):
+    """Resolve the tools of a recipe into steps, checking that they form one pipe."""
+    with open(DESCRIPTION_FILE) as f:
+        configs = {tool['name']: tool for tool in json.load(f)['tools']}
+
+    steps = []
+    tools = workflow['tools']
+    for index, tool in enumerate(tools):
+        name = tool['toolName']
+        config = configs.get(f"gto_{name}")
+        if config is None:
+            raise RecipeError(f"Unknown tool: {name}")
+        binary = os.path.join(bin_dir, f"gto_{name}")
+        if not os.access(binary, os.X_OK):
+            raise RecipeError(f"Native tool not found: {binary}")
+        step = Step(name, build_tool_args(tool.get('params'), config), config, binary)
+
+        if step.input_type == 'file':
+            raise RecipeError(f"{name} takes its inputs as parameter files, which cannot be piped")
+        if step.input_type == '' and index > 0:
+            raise RecipeError(f"{name} takes no input, so it can only be the first step")
+        if step.output_type == 'file' and index < len(tools) - 1:
+            raise RecipeError(f"{name} writes output files, so it can only be the last step")
+        steps.append(step)
+    return steps
+
+
+def output_path(steps, out_dir, input_name):
+    """Output file of an input, or output directory when the last tool writes files."""
+    stem = os.path.splitext(os.path.basename(input_name))[0]
+    last = steps[-1]
+    if last.output_type == 'file':
+        return os.path.join(out_dir, stem)
+    extension = FORMAT_EXTENSIONS.get(last.output_formats[0] if last.output_formats else '', 'txt')
+    return os.path.join(out_dir, f"{stem}.{extension}")
+
+
+def peak_rss_kb(pid):
+    """High-water RSS of a running process, in kilobytes (Linux), or None."""
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1])
+    except (OSError, ValueError):
+        pass
+    return None
+
+
+def wait_step(process, metrics, started):
+    """Reap a step with its resource usage; `started` is the time the step was launched.
+
+    The ru_maxrss of a child includes the memory of this process before the exec, so on
+    Linux the peak RSS is sampled from /proc while the step runs, at growing intervals.
+    A step that exits before the first sample (or a system without /proc) falls back to
+    ru_maxrss, which may overstate a small step by the RSS of this process.
+    """
+    peak = None
+    interval = RSS_SAMPLE_MIN
+    while True:
+        rss = peak_rss_kb(process.pid)
+        if rss is not None:
+            peak = rss if peak is None else max(peak, rss)
+        pid, status, usage = os.wait4(process.pid, os.WNOHANG)
+        if pid:
+            break
+        time.sleep(interval)
+        interval = min(interval * 2, RSS_SAMPLE_MAX)
+    metrics['elapsed'] = time.monotonic() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    metrics['exit_code'] = process.returncode
+    metrics['user'] = usage.ru_utime
+    metrics['sys'] = usage.ru_stime
+    if peak is None:
+        # Includes the pre-exec RSS; ru_maxrss is in kilobytes on Linux, in bytes on macOS
+        peak = usage.ru_maxrss // 1024 if sys.platform == 'darwin' else usage.ru_maxrss
+    metrics['max_rss_kb'] = peak
+
+
+def read_tail(stream):
+    stream.seek(0, os.SEEK_END)
+    stream.seek(max(0, stream.tell() - STDERR_TAIL))
+    return stream.read().decode('utf-8', errors='replace').strip()
+
+
+def input_index(step, input_path):
+    """Path of the index of an input, building it if it is missing or older than the input.
+    Return None if the first step takes no index or the index cannot be built."""
+    if not step.index_flag or not step.input_type:
+        return None
+    path = input_path + INDEX_EXTENSION
+    try:
+        if os.path.exists(path) and os.path.getmtime(path) >= os.path.getmtime(input_path):
+            return path
+        indexer = os.path.join(os.path.dirname(step.binary), 'gto_fasta_index')
+        partial = f"{path}.{os.getpid()}.tmp"
+        with open(input_path, 'rb') as source, open(partial, 'wb') as sink:
+            code = subprocess.run([indexer], stdin=source, stdout=sink, stderr=subprocess.DEVNULL).returncode
+        if code != 0:
+            os.remove(partial)
+            return None
+        os.replace(partial, path)
+        return path
+    except OSError:
+        return None
+
+
+def run_pipeline(steps, input_path, out_path, use_index=True):
+    """Run the steps on one input, each step reading the stdout of the previous one.
+    Return the run report; failed steps have their stderr tail."""
+    last = steps[-1]
+    if last.output_type == 'file':
+        os.makedirs(out_path, exist_ok=True)
+        cwd = out_path  # The tool writes its output files in its working directory
+    else:
+        os.makedirs(os.path.dirname(out_path) or '.', exist_ok=True)
+        cwd = None
+
+    report = {'input': input_path, 'output': out_path, 'steps': []}
+    # The first step seeks in the input with its index, instead of reading it all
+    index_path = input_index(steps[0], input_path) if use_index else None
+    if index_path:
+        report['index'] = index_path
+    waiters = []
+    stderr_files = []
+    started = time.monotonic()
+    source = open(input_path, 'rb') if steps[0].input_type else subprocess.DEVNULL
+    sink = open(out_path, 'wb') if last.output_type == 'stdout' else subprocess.DEVNULL
+    try:
+        stdin = source
+        for index, step in enumerate(steps):
+            stderr = tempfile.TemporaryFile()
+            stderr_files.append(stderr)
+            stdout = sink if index == len(steps) - 1 else subprocess.PIPE
+            command = step.command + ([step.index_flag, index_path] if index == 0 and index_path else [])
+            step_started = time.monotonic()
+            process = subprocess.Popen(command, stdin=stdin, stdout=stdout, stderr=stderr, cwd=cwd)
+            # The parent keeps no end of the pipes, so a step sees EOF (or SIGPIPE) when its
+            # neighbour exits
+            if index > 0:
+                stdin.close()
+            stdin = process.stdout
+            metrics = {'tool': step.tool_name, 'args': step.args}
+            report['steps'].append(metrics)
+            # Steps are reaped as they exit, so the wall time of each one is its own: from its
+            # launch to its exit
+            waiter = threading.Thread(target=wait_step, args=(process, metrics, step_started))
+            waiter.start()
+            waiters.append(waiter)
+    finally:
+        if source is not subprocess.DEVNULL:
+            source.close()
+        if sink is not subprocess.DEVNULL:
+            sink.close()
+        for waiter in waiters:
+            waiter.join()
+    report['elapsed'] = time.monotonic() - started
+
+    report['status'] = 'ok'
+    for index, (metrics, stderr) in enumerate(zip(report['steps'], stderr_files)):
+        code = metrics['exit_code']
+        # A step killed by SIGPIPE only stopped writing to a following step that finished early
+        if code == 0 or (code == -signal.SIGPIPE and index < len(steps) - 1):
+            continue
+        report['status'] = 'failed'
+        report['error'] = f"{metrics['tool']} exited with code {code}: {read_tail(stderr)}"
+        break
+    for stderr in stderr_files:
+        stderr.close()
+    return report
+
+
+def embedded_inputs(workflow, work_dir):
+    """Write the input files embedded in the recipe, returning their paths."""
+    paths = []
+    for index, file in enumerate(workflow.get('input', {}).get('files', [])):
+        if not file.get('content'):
+            continue
+        name = os.path.basename(file.get('name') or f"input_{index}.txt")
+        path = os.path.join(work_dir, name)
+        with open(path, 'w') as f:
+            f.write(file['content'])
+        paths.append(path)
+    return paths
+
+
+def expand_inputs(inputs):
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(sorted(os.path.join(item, name) for name in os.listdir(item)
+                                if os.path.isfile(os.path.join(item, name))))
+        else:
+            paths.append(item)
+    return paths
+
+
+def summarize(reports):
+    """Print the totals of each step over the runs."""
+    totals = {}
+    for report in reports:
+        for index, step in enumerate(report['steps']):
+            if 'elapsed' not in step:
+                continue
+            total = totals.setdefault(index, {'tool': step['tool'], 'runs': 0, 'elapsed': 0.0,
+                                              'cpu': 0.0, 'max_rss_kb': 0})
+            total['runs'] += 1
+            total['elapsed'] += step['elapsed']
+            total['cpu'] += step['user'] + step['sys']
+            total['max_rss_kb'] = max(total['max_rss_kb'], step['max_rss_kb'] or 0)
+
+    print(f"\n{'step':<5}{'tool':<32}{'runs':>6}{'wall s':>10}{'mean s':>10}{'cpu s':>10}{'peak RSS MB':>13}")
+    for index, total in sorted(totals.items()):
+        print(f"{index + 1:<5}{total['tool']:<32}{total['runs']:>6}{total['elapsed']:>10.3f}"
+              f"{total['elapsed'] / total['runs']:>10.3f}{total['cpu']:>10.3f}{total['max_rss_kb'] / 1024:>13.1f}")
+
+
+def write_report(reports, path):
+    """Write the reports as JSON, or as CSV (one row per step run) for a .csv path."""
+    if not path.endswith('.csv'):
+        with open(path, 'w') as f:
+            json.dump(reports, f, indent=1)
+            f.write('\n')
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['input', 'status', 'step', 'tool', 'args', 'elapsed', 'user', 'sys', 'max_rss_kb', 'exit_code'])
+        for report in reports:
+            for index, step in enumerate(report['steps']):
+                writer.writerow([report['input'], report['status'], index + 1, step['tool'], ' '.join(step['args']),
+                                 step.get('elapsed'), step.get('user'), step.get('sys'),
+                                 step.get('max_rss_kb'), step.get('exit_code')])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a workflow recipe with the native GTO tools.")
+    parser.add_argument('recipe', help="Recipe JSON exported from the workflow page")
+    parser.add_argument('inputs', nargs='*', help="Input files or directories (default: the recipe's files)")
+    parser.add_argument('--out-dir', '-o', default='recipe_output', help="Directory of the outputs")
+    parser.add_argument('--jobs', '-j', type=int, default=os.cpu_count() or 1, help="Inputs run in parallel")
+    parser.add_argument('--bin-dir', default=NATIVE_BIN_DIR, help="Directory of the native gto_* tools")
+    parser.add_argument('--report', help="Write the per-step metrics to this JSON or CSV file")
+    parser.add_argument('--no-index', dest='index', action='store_false',
+                        help="Do not build or use input indexes (.gfi) for the first step")
+    args = parser.parse_args()
+
+    try:
+        workflow = load_recipe(args.recipe)
+        steps = resolve_steps(workflow, args.bin_dir)
+    except (OSError, ValueError, RecipeError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    print("Pipeline: " + ' | '.join(' '.join([f"gto_{step.tool_name}"] + step.args) for step in steps))
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        if steps[0].input_type == '':
+            # The first tool generates the data: a single run
+            inputs = [steps[0].tool_name]
+        else:
+            inputs = expand_inputs(args.inputs) if args.inputs else embedded_inputs(workflow, work_dir)
+        if not inputs:
+            print("Error: no input files")
+            sys.exit(1)
+
+        jobs = max(1, min(args.jobs, len(inputs)))
+        print(f"Running {len(inputs)} input(s) with {jobs} job(s)")
+        reports = []
+        started = time.monotonic()
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            futures = {executor.submit(run_pipeline, steps, path, output_path(steps, args.out_dir, path), args.index): path
+                       for path in inputs}
+            for future in as_completed(futures):
+                try:
+                    report = future.result()
+                except OSError as e:
+                    report = {'input': futures[future], 'status': 'failed', 'error': str(e), 'steps': []}
+                reports.append(report)
+                if report['status'] == 'ok':
+                    print(f"[ok] {report['input']} -> {report['output']} ({report['elapsed']:.3f}s)")
+                else:
+                    print(f"[failed] {report['input']}: {report['error']}")
+        elapsed = time.monotonic() - started
+
+    reports.sort(key=lambda report: report['input'])
+    summarize(reports)
+    failed = sum(report['status'] != 'ok' for report in reports)
+    print(f"\n{len(reports) - failed} succeeded, {failed} failed in {elapsed:.3f}s")
+    if args.report:
+        write_report(reports, args.report)
+        print(f"Report written to {args.report}")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
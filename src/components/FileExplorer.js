@@ -42,6 +42,7 @@ import React, { useContext, useRef, useState } from 'react';
 import { DataTypeContext } from '../contexts/DataTypeContext';
 import { NotificationContext } from '../contexts/NotificationContext';
 import { processFile } from '../utils/fileProcessor';
+import TextViewer from './TextViewer';
 
 const FileExplorer = ({ selectedFiles, setSelectedFiles, tree, setTree }) => {
 
@@ -937,23 +938,17 @@ const FileExplorer = ({ selectedFiles, setSelectedFiles, tree, setTree }) => {
                         sx={{
                             p: 2,
                             bgcolor: 'grey.100',
-                            maxHeight: '500px',
-                            overflowY: 'auto',
                             '&:hover': {
                                 boxShadow: 6,
                             },
                         }}
                     >
-                        <Typography
-                            variant="body2"
-                            sx={{
-                                fontFamily: 'monospace',
-                                whiteSpace: 'pre-wrap',
-                                wordBreak: 'break-all'
-                            }}
-                        >
-                            {activeNode?.content || 'No content available'}
-                        </Typography>
+                        <TextViewer
+                            text={activeNode?.content || ''}
+                            source={activeNode?.source ?? null}
+                            height={460}
+                            emptyText="No content available"
+                        />
                     </Paper>
                 </DialogContent>
                 <DialogActions>
@@ -1,6 +1,6 @@
 import { Button, CircularProgress, TextField, Typography } from '@mui/material';
 import React, { useState } from 'react';
-import { loadWasmModule } from '../gtoWasm';
+import { getToolRunner } from '../gtoWasm';
 
 const GtoTool = ({ name, inputType }) => {
   const [input, setInput] = useState('');
@@ -16,7 +16,7 @@ const GtoTool = ({ name, inputType }) => {
 
     try {
       // Load the wrapper function
-      const runFunction = await loadWasmModule(name);
+      const runFunction = await getToolRunner(name);
 
       if (typeof runFunction === 'function') {
         // Prepare command-line arguments
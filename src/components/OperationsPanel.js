@@ -22,7 +22,7 @@ import React, { useContext, useEffect, useMemo, useState } from 'react';
 import { DataTypeContext } from '../contexts/DataTypeContext';
 import { NotificationContext } from '../contexts/NotificationContext';
 import { ValidationErrorsContext } from '../contexts/ValidationErrorsContext';
-import { getCompatibleTools } from '../utils/compatibility';
+import { getCompatibleTools, loadCompatibilityIndexes } from '../utils/compatibility';
 import operationCategories from '../utils/operationCategories';
 
 
@@ -62,6 +62,12 @@ const OperationsPanel = ({ onAddOperation, isWorkflowEmpty, isLoading, setIsLoad
     );
   };
 
+  // Compatible tools are looked up in the tool registry (and the built modules) once loaded
+  const [indexesLoaded, setIndexesLoaded] = useState(false);
+  useEffect(() => {
+    loadCompatibilityIndexes().then(() => setIndexesLoaded(true));
+  }, []);
+
   // Determine compatible tools
   const compatibleTools = useMemo(() => {
     if (isWorkflowEmpty) {
@@ -74,7 +80,7 @@ const OperationsPanel = ({ onAddOperation, isWorkflowEmpty, isLoading, setIsLoad
     const compatible = getCompatibleTools(dataType, isWorkflowEmpty, workflow);
     // Assuming tool names in operationCategories do not have the 'gto_' prefix
     return new Set(compatible.map((tool) => tool.name.replace(/^gto_/, '')));
-  }, [dataType, isWorkflowEmpty, workflow]);
+  }, [dataType, isWorkflowEmpty, workflow, indexesLoaded]);
 
   // Expand categories with available tools
   useEffect(() => {
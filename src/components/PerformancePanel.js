@@ -0,0 +1,117 @@
+import { Delete, GetApp } from '@mui/icons-material';
+import {
+  Button,
+  Dialog,
+  DialogActions,
+  DialogContent,
+  DialogTitle,
+  Table,
+  TableBody,
+  TableCell,
+  TableContainer,
+  TableHead,
+  TableRow,
+  Typography,
+} from '@mui/material';
+import { saveAs } from 'file-saver';
+import React, { useEffect, useState } from 'react';
+import { METRIC_PHASES, stepMetrics } from '../utils/stepMetrics';
+
+const formatTime = (ms) => (ms === null || ms === undefined ? '-' : `${ms.toFixed(1)}`);
+
+const formatBytes = (bytes) => {
+  if (bytes === null || bytes === undefined) return '-';
+  if (bytes < 1024) return `${bytes} B`;
+  if (bytes < 1024 * 1024) return `${(bytes / 1024).toFixed(1)} KB`;
+  return `${(bytes / 1024 / 1024).toFixed(1)} MB`;
+};
+
+const formatState = (entry) => {
+  if (entry.cached) return 'cached';
+  if (entry.native) return 'native';
+  const state = entry.warm === null ? '' : entry.warm ? 'warm' : 'cold';
+  return entry.pipelined ? `${state} (pipe)`.trim() : state;
+};
+
+// Shows the latest recorded run of each workflow step, updated live while the workflow runs
+const PerformancePanel = ({ open, onClose, workflow }) => {
+  const [entries, setEntries] = useState(stepMetrics.getEntries());
+
+  useEffect(() => {
+    if (!open) return undefined;
+    setEntries(stepMetrics.getEntries());
+    return stepMetrics.subscribe((updated) => setEntries(updated.slice()));
+  }, [open]);
+
+  const latest = new Map();
+  for (const entry of entries) latest.set(entry.stepId, entry);
+  // Steps in workflow order, then steps that are no longer in the workflow
+  const rows = [
+    ...workflow.filter((step) => latest.has(step.id)).map((step) => latest.get(step.id)),
+    ...[...latest.values()].filter((entry) => !workflow.some((step) => step.id === entry.stepId)),
+  ];
+
+  const handleExport = () => {
+    const blob = new Blob([JSON.stringify(stepMetrics.toJSON(), null, 2)], { type: 'application/json' });
+    saveAs(blob, `gto_step_metrics_${Date.now()}.json`);
+  };
+
+  return (
+    <Dialog open={open} onClose={onClose} maxWidth="xl" fullWidth>
+      <DialogTitle>Step Performance</DialogTitle>
+      <DialogContent>
+        {rows.length === 0 ? (
+          <Typography variant="body2" color="textSecondary">
+            No step has run yet. Run the workflow to record the metrics of its steps.
+          </Typography>
+        ) : (
+          <TableContainer>
+            <Table size="small">
+              <TableHead>
+                <TableRow>
+                  <TableCell>Step</TableCell>
+                  <TableCell align="right">Total (ms)</TableCell>
+                  {METRIC_PHASES.map((phase) => (
+                    <TableCell key={phase} align="right">{phase} (ms)</TableCell>
+                  ))}
+                  <TableCell align="right">Heap</TableCell>
+                  <TableCell align="right">Input</TableCell>
+                  <TableCell align="right">Output</TableCell>
+                  <TableCell>State</TableCell>
+                </TableRow>
+              </TableHead>
+              <TableBody>
+                {rows.map((entry) => (
+                  <TableRow key={entry.stepId}>
+                    <TableCell>{entry.toolName}</TableCell>
+                    <TableCell align="right">{formatTime(entry.total)}</TableCell>
+                    {METRIC_PHASES.map((phase) => (
+                      <TableCell key={phase} align="right">{formatTime(entry.timings[phase])}</TableCell>
+                    ))}
+                    <TableCell align="right">{formatBytes(entry.heapBytes)}</TableCell>
+                    <TableCell align="right">{formatBytes(entry.inputBytes)}</TableCell>
+                    <TableCell align="right">{formatBytes(entry.outputBytes)}</TableCell>
+                    <TableCell>{formatState(entry)}</TableCell>
+                  </TableRow>
+                ))}
+              </TableBody>
+            </Table>
+          </TableContainer>
+        )}
+      </DialogContent>
+      <DialogActions>
+        <Button onClick={() => stepMetrics.clear()} startIcon={<Delete />} color="secondary">
+          Clear
+        </Button>
+        <Button onClick={handleExport} startIcon={<GetApp />} disabled={entries.length === 0}>
+          Export JSON
+        </Button>
+        <Button onClick={onClose} color="primary">
+          Close
+        </Button>
+      </DialogActions>
+    </Dialog>
+  );
+};
+
+export default PerformancePanel;
@@ -13,7 +13,7 @@ import {
   arrayMove,
   verticalListSortingStrategy,
 } from '@dnd-kit/sortable';
-import { AddCircle, ContentCopy, ExpandLess, ExpandMore, FileUpload, GetApp, HelpOutline, Save, Visibility, VisibilityOff } from '@mui/icons-material';
+import { AddCircle, ContentCopy, ExpandLess, ExpandMore, FileUpload, GetApp, HelpOutline, Save, Speed, Visibility, VisibilityOff } from '@mui/icons-material';
 import {
   Box,
   Button,
@@ -39,21 +39,35 @@ import {
 } from '@mui/material';
 import { saveAs } from 'file-saver';
 import JSZip from 'jszip';
-import React, { useContext, useEffect, useState } from 'react';
+import React, { useContext, useEffect, useRef, useState } from 'react';
 import description from '../../description.json';
 import { DataTypeContext } from '../contexts/DataTypeContext';
 import { NotificationContext } from '../contexts/NotificationContext';
 import { ValidationErrorsContext } from '../contexts/ValidationErrorsContext';
-import { loadWasmModule } from '../gtoWasm';
-import { detectDataType } from '../utils/detectDataType';
+import { getToolHelpOutput, getToolRunner, runToolPipeline } from '../gtoWasm';
+import { withNativeService } from '../nativeService';
+import { isBlob, isRawData } from '../wasmStreams';
+import { getInsertableTools } from '../utils/compatibility';
+import { detectOutputType } from '../utils/detectDataType';
 import { exportRecipeConfigFile } from '../utils/exportRecipeConfigFile';
 import { exportRecipeScript } from '../utils/exportRecipeScript';
 import { handleFastaMergeStreams, isFastaMergeStreams } from '../utils/fastaMergeStreamsHandler';
-import { processFile } from '../utils/fileProcessor';
+import { PREVIEW_LINES, processFile, readFirstNLines } from '../utils/fileProcessor';
 import { getExtensionForType } from '../utils/getExtensionDataType';
 import { importRecipeCommand } from '../utils/importRecipeCommand';
 import { importRecipeConfigFile } from '../utils/importRecipeConfigFile';
+import { runWithSequenceIndex } from '../utils/sequenceIndex';
+import { isDeterministicStep, stepResultCache } from '../utils/stepResultCache';
+import { stepMetrics, withStepMetrics } from '../utils/stepMetrics';
+import { getPipelineRun } from '../utils/toolPipeline';
+import { compileWorkflow, getNodeId, getStaleNodes, runGraph } from '../utils/workflowGraph';
+import { loadState, resolveContents, saveState } from '../workflowStore';
+import PerformancePanel from './PerformancePanel';
 import SortableItem from './SortableItem';
+import TextViewer from './TextViewer';
+
+// Height in px of the expanded step outputs (see TextViewer)
+const OUTPUT_VIEWER_HEIGHT = 200;
 
 export function classifyStderrLines(stderr) {
   const result = { info: [], error: [] };
@@ -68,14 +82,33 @@ export function classifyStderrLines(stderr) {
   return result;
 }
 
-const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading, setIsLoading, insertAtIndex, setInsertAtIndex, setAddingATool, setFilteredTools, selectedFiles, setSelectedFiles, tabIndex, setTabIndex, tree, setTree }) => {
+// Builds the CLI arguments of a step from the tool configuration and user-set parameters
+const buildToolArgs = (tool, toolConfig) => {
+  const args = [];
+  if (tool.params && Object.keys(tool.params).length > 0) {
+    // Handle flags
+    toolConfig.flags.forEach((flagObj) => {
+      if (flagObj.required || tool.params[flagObj.flag]) {
+        args.push(flagObj.flag);
+        // Check if the flag has an associated parameter
+        if (
+          flagObj.parameter &&
+          tool.params[flagObj.parameter] !== undefined &&
+          tool.params[flagObj.parameter] !== ''
+        ) {
+          args.push(`${tool.params[flagObj.parameter]}`);
+        }
+      }
+    });
+  }
+  return args;
+};
+
+const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading, setIsLoading, setInsertAtIndex, setAddingATool, setFilteredTools, selectedFiles, setSelectedFiles, tabIndex, setTabIndex, tree, setTree }) => {
   const [activeId, setActiveId] = useState(null);
   const { setDataType, dataType, inputDataType, setInputDataType } = useContext(DataTypeContext); // To update data type context
   const [invalidItemIds, setInvalidItemIds] = useState([]); // To store invalid item IDs
-  const [outputMap, setOutputMap] = useState(() => {
-    const savedMap = localStorage.getItem('outputMap');
-    return savedMap ? JSON.parse(savedMap) : {};
-  });
+  const [outputMap, setOutputMap] = useState({});
   const [toolMessageMap, setToolMessageMap] = useState({}); // To store messages for each tool
   const { validationErrors, setValidationErrors } = useContext(ValidationErrorsContext); // Access validation errors of parameters
   const [helpMessages, setHelpMessages] = useState({}); // To store help messages for tools
@@ -83,6 +116,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
   const [openExportDialog, setOpenExportDialog] = useState(false); // State for export dialog
   const [command, setCommand] = useState('');
   const [openImportDialog, setOpenImportDialog] = useState(false); // State for import dialog
+  const [openPerformancePanel, setOpenPerformancePanel] = useState(false); // State for the step metrics dialog
   const [importInput, setImportInput] = useState(''); // State for import input
   const [importError, setImportError] = useState(''); // State for import error
   const [expandedTools, setExpandedTools] = useState(() => {  // Track each tool's expanded state
@@ -104,6 +138,73 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
   }); // Track which output type is selected for multi-type output tools
   const { validateData } = useContext(DataTypeContext);
   const showNotification = useContext(NotificationContext);
+  // Outputs of steps as the next step takes them: streamed Blobs or stdout bytes, by input
+  // and tool. outputMap keeps their text (a preview, for streamed outputs).
+  const rawOutputs = useRef({});
+  // Steps whose output was piped to the next step and not kept, by input and tool
+  const pipedSteps = useRef({});
+  const [materializeRequest, setMaterializeRequest] = useState(0); // Re-runs the workflow to show a piped output
+  // Signatures of the steps when they last ran (see compileWorkflow), by input, with the
+  // input they ran on: only the steps that changed since, and the steps after them, run again
+  const completedSteps = useRef({});
+  // Saved ManualInput outputs, as workflow store references read when a step output is viewed.
+  // Each is dropped once outputMap has the output of its step.
+  const storedOutputs = useRef(null);
+
+  // Returns the data a step receives: the previous step's output or the input itself
+  const getStepInput = (input, previousTool) => {
+    if (previousTool) {
+      return rawOutputs.current[input.id]?.[previousTool.id] ?? outputMap[input.id]?.[previousTool.id];
+    }
+    return input.source ?? input.content;
+  };
+
+  // Keeps the raw output of a step aside and returns the text to show in outputMap
+  const resolveStepOutput = async (inputId, toolId, output, bytes = null) => {
+    const raw = isBlob(output) ? output : bytes;
+    if (!raw) {
+      if (rawOutputs.current[inputId]) delete rawOutputs.current[inputId][toolId];
+      return output;
+    }
+    rawOutputs.current[inputId] = { ...rawOutputs.current[inputId], [toolId]: raw };
+    return isBlob(output) ? readFirstNLines(output, PREVIEW_LINES) : output;
+  };
+
+  // Runs consecutive stdin/stdout steps as one pipeline (see getPipelineRun), keeping the
+  // outputs of the steps for which keep(step, index) is true
+  const executePipeline = async (steps, input, keep) => {
+    const stages = steps.map((step, index) => {
+      const toolConfig = description.tools.find((t) => t.name === `gto_${step.toolName}`);
+      return {
+        toolName: step.toolName,
+        args: buildToolArgs(step, toolConfig),
+        keepOutput: keep(step, index),
+        // Streamed inputs give a streamed output, as in executeTool
+        streamOutput: isBlob(input) && index === steps.length - 1,
+      };
+    });
+    // The stages run concurrently, so each gets the wall time of the whole pipeline
+    const start = performance.now();
+    const results = await runToolPipeline(stages, input);
+    const total = performance.now() - start;
+    steps.forEach((step, index) => stepMetrics.record(step, results[index], { total, pipelined: true }));
+    return results;
+  };
+
+  // Returns the whole streamed output of a step, which outputMap only has a preview of
+  const getStreamedOutput = (toolId) => {
+    const inputId = tabIndex === 0 ? "ManualInput" : selectedInput;
+    const raw = rawOutputs.current[inputId]?.[toolId];
+    return isBlob(raw) ? raw : null;
+  };
+
+  // Checks if data can feed a pipeline: non-empty stdin data (empty inputs may use parameter files)
+  const isPipelineInput = (data) =>
+    typeof data === 'string' ? data !== '' : isRawData(data) && (isBlob(data) ? data.size : data.length) > 0;
+
+  // Returns text for type detection: the data itself, or the first lines of raw data
+  const getPreviewText = async (data) =>
+    isRawData(data) ? readFirstNLines(new Blob([data]), PREVIEW_LINES) : data;
 
   // Update outputs initialization to handle both modes
   const outputs = React.useMemo(() => {
@@ -124,12 +225,25 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
     useSensor(TouchSensor, { activationConstraint: { delay: 250, tolerance: 5 } })
   );
 
-  // Save only ManualInput outputMap in localStorage
+  // Load the saved ManualInput outputs, without their contents
   useEffect(() => {
+    loadState('outputMap').then((savedMap) => {
+      if (storedOutputs.current === null) {
+        storedOutputs.current = savedMap?.["ManualInput"] || {};
+      }
+    });
+  }, []);
+
+  // Save only ManualInput outputMap in the workflow store
+  useEffect(() => {
+    if (storedOutputs.current === null) return; // Not loaded yet
+
+    // Outputs of new runs replace the saved ones
+    Object.keys(outputMap["ManualInput"] || {}).forEach((toolId) => delete storedOutputs.current[toolId]);
     // Extract only the ManualInput data from the outputMap
-    const manualInputData = outputMap["ManualInput"] ? { "ManualInput": outputMap["ManualInput"] } : {};
+    const manualInputData = { "ManualInput": { ...storedOutputs.current, ...outputMap["ManualInput"] } };
 
-    // Create a filtered copy for localStorage
+    // Create a filtered copy for the workflow store
     const filteredManualInputData = { "ManualInput": {} };
 
     // Find the index of the first tool with file input
@@ -139,16 +253,16 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
     });
 
     // Copy only outputs from tools before the first file input tool
-    Object.entries(manualInputData["ManualInput"] || {}).forEach(([toolId, output]) => {
+    Object.entries(manualInputData["ManualInput"]).forEach(([toolId, output]) => {
       const toolIndex = workflow.findIndex(t => t.id === toolId);
-      if (toolIndex < fileInputToolIndex || fileInputToolIndex === -1) {
+      if (toolIndex !== -1 && (toolIndex < fileInputToolIndex || fileInputToolIndex === -1)) {
         filteredManualInputData["ManualInput"][toolId] = output;
       }
     });
 
-    // Store only the filtered ManualInput data in localStorage
-    localStorage.setItem('outputMap', JSON.stringify(filteredManualInputData));
-  }, [outputMap]);
+    // Store only the filtered ManualInput data (debounced, in IndexedDB)
+    saveState('outputMap', filteredManualInputData);
+  }, [outputMap, workflow]);
 
   // Save expandedTools in localStorage
   useEffect(() => {
@@ -205,42 +319,128 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       }
 
       if (workflow.length > 0) {
-        let data = (insertAtIndex !== null && insertAtIndex > 0)
-          ? outputMap[input.id]?.[workflow[insertAtIndex - 1].id]
-          : input.content;
+        const graph = compileWorkflow(workflow, [input.id], selectedOutputTypes);
+
+        // Steps run again only if they changed since they last ran, or a step before them did
+        const content = input.source ?? input.content;
+        let completed = completedSteps.current[input.id];
+        if (
+          !completed ||
+          completed.content !== content ||
+          completed.inputDataType !== inputDataType ||
+          completed.materializeRequest !== materializeRequest
+        ) {
+          completed = { content, inputDataType, materializeRequest, signatures: {} };
+          completedSteps.current[input.id] = completed;
+        }
+        const markCompleted = (step) => {
+          completed.signatures[step.id] = graph.byId.get(getNodeId(input.id, step.id)).signature;
+        };
+        const stale = getStaleNodes(
+          graph,
+          (node) => completed.signatures[node.step.id] === node.signature,
+          (node) => getStepInput(input, node.step) !== undefined
+        );
 
-        for (let i = (insertAtIndex !== null && insertAtIndex > 0) ? insertAtIndex : 0; i < workflow.length; i++) {
-          const tool = workflow[i];
+        // The other steps keep their outputs
+        const results = new Map();
+        graph.nodes.forEach((node) => {
+          if (!stale.has(node.id)) results.set(node.id, getStepInput(input, node.step));
+        });
 
-          // Get tool configuration at the beginning of each loop iteration
-          // This ensures it's available throughout the entire iteration
-          const toolConfig = description.tools.find((t) => t.name === `gto_${tool.toolName}`);
-          const isMultiTypeOutput = toolConfig && toolConfig.is_multi_type_output;
+        const runStep = async (node, results) => {
+          const tool = node.step;
+          const isMultiTypeOutput = node.toolConfig && node.toolConfig.is_multi_type_output;
+          const outputs = new Map();
+          let data = node.source ? results.get(node.source) : getStepInput(input, null);
 
           try {
             // Validate parameters
             const isValid = validateParameters(tool, data);
             if (!isValid) {
               setDataType('UNKNOWN');
-              break;
+              return null;
             }
 
             let output;
+            let rawOutput = null;
+
+            // If the previous tool is multi-type and we have a selection, use only that selected output
+            if (node.stream && typeof data === 'object' && data.hasOwnProperty(node.stream)) {
+              console.log(`Using selected output stream ${node.stream} for tool ${tool.toolName}`);
+              data = data[node.stream];
+            }
+
+            // Consecutive stdin/stdout steps run as one pipeline; only the outputs being
+            // viewed and the last one, which the next step or the display needs, are kept
+            const pipelineRun = [];
+            for (const step of getPipelineRun(workflow, node.index)) {
+              if (results.has(getNodeId(input.id, step.id))) break; // Up to date
+              pipelineRun.push(step);
+            }
+            if (
+              pipelineRun.length > 1 &&
+              isPipelineInput(data) &&
+              pipelineRun.every((step) => validateParameters(step, data))
+            ) {
+              const last = pipelineRun.length - 1;
+              const pipelineResults = await executePipeline(
+                pipelineRun,
+                data,
+                (step, index) => index === last || !!visibleOutputs[step.id]
+              );
 
-            // Check if previous tool was multi-type and we have a selection
-            if (i > 0) {
-              const prevTool = workflow[i - 1];
-              const prevToolConfig = description.tools.find((t) => t.name === `gto_${prevTool.toolName}`);
-              const isPrevMultiTypeOutput = prevToolConfig && prevToolConfig.is_multi_type_output;
+              let lastOutput = null;
+              for (const [index, step] of pipelineRun.entries()) {
+                const result = pipelineResults[index];
+                setToolMessageMap((prev) => ({
+                  ...prev,
+                  [step.id]: classifyStderrLines(result.stderr),
+                }));
+                markCompleted(step);
+
+                if (result.piped) {
+                  // Computed again if the user views it (see handleViewTool)
+                  pipedSteps.current[input.id] = { ...pipedSteps.current[input.id], [step.id]: true };
+                  if (rawOutputs.current[input.id]) delete rawOutputs.current[input.id][step.id];
+                  setOutputMap((prevMap) => {
+                    const inputOutputs = { ...prevMap[input.id] };
+                    delete inputOutputs[step.id];
+                    return { ...prevMap, [input.id]: inputOutputs };
+                  });
+                  outputs.set(getNodeId(input.id, step.id), undefined);
+                  continue;
+                }
 
-              // If previous tool is multi-type and we have a selection, use only that selected output
-              if (isPrevMultiTypeOutput && selectedOutputTypes[prevTool.id] && typeof data === 'object' && data.hasOwnProperty(selectedOutputTypes[prevTool.id])) {
-                console.log(`Using selected output stream ${selectedOutputTypes[prevTool.id]} from ${prevTool.toolName} for tool ${tool.toolName}`);
-                data = data[selectedOutputTypes[prevTool.id]];
+                if (pipedSteps.current[input.id]) delete pipedSteps.current[input.id][step.id];
+                const stepOutput = await resolveStepOutput(input.id, step.id, result.stdout, result.stdoutBytes ?? null);
+                setOutputMap((prevMap) => ({
+                  ...prevMap,
+                  [input.id]: {
+                    ...prevMap[input.id],
+                    [step.id]: stepOutput,
+                  },
+                }));
+                outputs.set(getNodeId(input.id, step.id), rawOutputs.current[input.id]?.[step.id] ?? stepOutput);
+                if (index === last) {
+                  lastOutput = stepOutput;
+                }
               }
+
+              if (pipelineRun[last].id === workflow[workflow.length - 1].id) {
+                const detectedType = detectOutputType(lastOutput);
+                if (dataType !== detectedType) {
+                  setDataType(detectedType);
+                  showNotification(`Data type updated to ${detectedType}`, 'info');
+                }
+              }
+              return outputs;
             }
 
-            if (typeof data === 'object' && !Array.isArray(data)) {
+            // Merge steps also take the streams of their split step
+            const split = node.split && { output: results.get(node.split.id), stream: node.split.stream };
+
+            if (typeof data === 'object' && !Array.isArray(data) && !isRawData(data)) {
               // If data is a multi-output object, process each file
               output = {};
 
@@ -250,8 +450,12 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                 [tool.id]: { info: [], error: [] },
               }));
 
-              for (const [filename, content] of Object.entries(data)) {
-                const result = await executeTool(tool, content);
+              // Run the tool on every file concurrently, then merge the results in order
+              const entries = Object.entries(data);
+              const fileResults = await Promise.all(entries.map(([, content]) => executeTool(tool, content, split)));
+
+              for (const [index, [filename]] of entries.entries()) {
+                const result = fileResults[index];
 
                 // Handle messages in stderr
                 const toolMessages = classifyStderrLines(result.stderr);
@@ -277,7 +481,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                   }
                 } else {
                   // Detect the output type
-                  const detectedType = detectDataType("output.txt", result.stdout);
+                  const detectedType = detectOutputType(result.stdout);
 
                   // Update the extension of filename based on the detected type
                   const baseFilename = filename.split('.')[0];
@@ -289,7 +493,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
               }
             } else {
               // Single input case
-              const result = await executeTool(tool, data);
+              const result = await executeTool(tool, data, split);
 
               // Handle messages in stderr
               const toolMessages = classifyStderrLines(result.stderr);
@@ -320,9 +524,17 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                 }
               } else {
                 output = result.stdout;
+                rawOutput = result.stdoutBytes ?? null;
               }
             }
 
+            // Streamed outputs and stdout bytes continue to the next step as they are;
+            // streamed outputs are shown as a preview
+            if (isBlob(output)) {
+              rawOutput = output;
+            }
+            output = await resolveStepOutput(input.id, tool.id, output, rawOutput);
+
             // Store the output in the map
             setOutputMap((prevMap) => ({
               ...prevMap,
@@ -332,14 +544,9 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
               },
             }));
 
-            // For the next tool in the loop, use the appropriate output
-            if (isMultiTypeOutput && selectedOutputTypes[tool.id] && typeof output === 'object') {
-              // For subsequent tools, data should be the selected output type
-              data = output[selectedOutputTypes[tool.id]];
-              console.log(`Using selected output type ${selectedOutputTypes[tool.id]} for next tool`);
-            } else {
-              data = output;
-            }
+            // The next steps take the raw output; the next step picks its stream (see compileWorkflow)
+            markCompleted(tool);
+            outputs.set(node.id, rawOutput ?? output);
 
             // Detect the data type of the output for the final output display
             let detectedType = 'UNKNOWN';
@@ -348,29 +555,33 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
               if (isMultiTypeOutput && selectedOutputTypes[tool.id]) {
                 const selectedOutput = output[selectedOutputTypes[tool.id]];
                 if (selectedOutput) {
-                  detectedType = detectDataType('output.txt', selectedOutput);
+                  detectedType = detectOutputType(selectedOutput);
                   console.log(`Detected type for selected output ${selectedOutputTypes[tool.id]}: ${detectedType}`);
                 }
               } else {
                 // Otherwise try to detect type from the first output file
                 const firstOutput = Object.values(output)[0];
                 if (firstOutput) {
-                  detectedType = detectDataType('output.txt', firstOutput);
+                  detectedType = detectOutputType(firstOutput);
                   console.log(`Detected type from first output: ${detectedType}`);
                 }
               }
             } else {
-              detectedType = detectDataType('output.txt', output);
+              detectedType = detectOutputType(output);
             }
 
             if (tool.id === workflow[workflow.length - 1].id && dataType !== detectedType) {
               setDataType(detectedType);
               showNotification(`Data type updated to ${detectedType}`, 'info');
             }
+            return outputs;
           } catch (error) {
             console.error(`Failed to update data type for tool ${tool.toolName}:`, error);
+            return null;
           }
-        }
+        };
+
+        await runGraph(graph, runStep, results);
       } else {
         if (dataType !== inputDataType) {
           setDataType(inputDataType);
@@ -387,7 +598,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
     } else {
       setDeleteOperation(false);
     }
-  }, [workflow, inputData, selectedInput, inputDataType, selectedOutputTypes]);
+  }, [workflow, inputData, selectedInput, inputDataType, selectedOutputTypes, materializeRequest]);
 
   // Run validateParameters when the page is loaded
   useEffect(() => {
@@ -445,8 +656,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
   // Load help message for a tool
   const loadHelpMessage = async (toolName) => {
     try {
-      const runFunction = await loadWasmModule(toolName);
-      const outputData = await runFunction('', ['-h']); // Execute the tool with -h flag
+      const outputData = await getToolHelpOutput(toolName); // Output of the tool with -h flag
 
       if (outputData.stderr) {
         console.error(`Error in ${toolName} help message: ${outputData.stderr}`);
@@ -663,47 +873,59 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
         });
 
         // Execute the tools subsequent to the deleted one to update the outputMap
-        let allInputs = workflowInput;
-        let previousTool = workflow[toolIndex - 1];
-
-        for (const input of allInputs) {
-          let data = previousTool ? outputMap[input.id]?.[previousTool.id] : input.content;
-
-          for (let i = toolIndex; i < newWorkflow.length; i++) {
-            const tool = newWorkflow[i];
-            const result = await executeTool(tool, data);
-
-            // Handle messages in stderr
-            const toolMessages = classifyStderrLines(result.stderr);
+        const inputsById = new Map(workflowInput.map((input) => [input.id, input]));
+        const graph = compileWorkflow(newWorkflow, [...inputsById.keys()], selectedOutputTypes);
+        const getNodeOutput = (node) => getStepInput(inputsById.get(node.input), node.step);
+        // The tools before the deleted one keep their outputs, unless they were piped and not kept
+        const stale = getStaleNodes(graph, (node) => node.index < toolIndex, (node) => getNodeOutput(node) !== undefined);
+        const results = new Map();
+        graph.nodes.forEach((node) => {
+          if (!stale.has(node.id)) results.set(node.id, getNodeOutput(node));
+        });
 
-            setToolMessageMap((prev) => ({
-              ...prev,
-              [tool.id]: {
-                info: toolMessages.info,
-                error: toolMessages.error,
-              },
-            }));
+        // The inputs are independent, so their tools run concurrently
+        await runGraph(graph, async (node, results) => {
+          const input = inputsById.get(node.input);
+          const tool = node.step;
+          let data = node.source ? results.get(node.source) : getStepInput(input, null);
+          if (node.stream && typeof data === 'object' && data.hasOwnProperty(node.stream)) {
+            data = data[node.stream];
+          }
+          const split = node.split && { output: results.get(node.split.id), stream: node.split.stream };
+          const result = await executeTool(tool, data, split);
+
+          // Handle messages in stderr
+          const toolMessages = classifyStderrLines(result.stderr);
+
+          setToolMessageMap((prev) => ({
+            ...prev,
+            [tool.id]: {
+              info: toolMessages.info,
+              error: toolMessages.error,
+            },
+          }));
+
+          let output;
+          // Handle multi-output vs. single output
+          if (typeof result === 'object' && result.outputs) {
+            output = result.outputs;
+          } else {
+            output = result.stdout;
+          }
 
-            let output;
-            // Handle multi-output vs. single output
-            if (typeof result === 'object' && result.outputs) {
-              output = result.outputs;
-            } else {
-              output = result.stdout;
-            }
+          const nextData = result.stdoutBytes ?? output;
+          output = await resolveStepOutput(input.id, tool.id, output, result.stdoutBytes);
 
-            data = output;
-
-            // Store the output in the map
-            setOutputMap((prevMap) => ({
-              ...prevMap,
-              [input.id]: {
-                ...prevMap[input.id],
-                [tool.id]: output,
-              },
-            }));
-          }
-        }
+          // Store the output in the map
+          setOutputMap((prevMap) => ({
+            ...prevMap,
+            [input.id]: {
+              ...prevMap[input.id],
+              [tool.id]: output,
+            },
+          }));
+          return new Map([[node.id, nextData]]);
+        }, results);
 
         // Remove the help message for the tool
         setHelpMessages((prev) => {
@@ -729,18 +951,18 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                 // If it's a multi-type output tool and we have a selection, use that specific output
                 const selectedOutput = lastOutput[selectedOutputTypes[lastTool.id]];
                 if (selectedOutput) {
-                  lastOutputType = detectDataType('output.txt', selectedOutput);
+                  lastOutputType = detectOutputType(selectedOutput);
                   console.log(`Using selected output type ${selectedOutputTypes[lastTool.id]} for data type detection`);
                 }
               } else {
                 // For multiple outputs, try to detect type from the first output file
                 const firstOutput = Object.values(lastOutput)[0];
                 if (firstOutput) {
-                  lastOutputType = detectDataType('output.txt', firstOutput);
+                  lastOutputType = detectOutputType(firstOutput);
                 }
               }
             } else {
-              lastOutputType = detectDataType('output.txt', lastOutput);
+              lastOutputType = detectOutputType(lastOutput);
             }
           } else {
             // If the manual input doesn't have the output, try using the other inputs
@@ -752,7 +974,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                     // If it's a multi-type output tool and we have a selection, use that specific output
                     const selectedOutput = lastOutput[selectedOutputTypes[lastTool.id]];
                     if (selectedOutput) {
-                      lastOutputType = detectDataType('output.txt', selectedOutput);
+                      lastOutputType = detectOutputType(selectedOutput);
                       console.log(`Using selected output type ${selectedOutputTypes[lastTool.id]} for data type detection`);
                       break;
                     }
@@ -760,12 +982,12 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                     // For multiple outputs, try to detect type from the first output file
                     const firstOutput = Object.values(lastOutput)[0];
                     if (firstOutput) {
-                      lastOutputType = detectDataType('output.txt', firstOutput);
+                      lastOutputType = detectOutputType(firstOutput);
                       break;
                     }
                   }
                 } else {
-                  lastOutputType = detectDataType('output.txt', lastOutput);
+                  lastOutputType = detectOutputType(lastOutput);
                   break;
                 }
               }
@@ -865,18 +1087,18 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
               // If it's a multi-type output tool and we have a selection, use that specific output
               const selectedOutput = lastOutput[selectedOutputTypes[lastTool.id]];
               if (selectedOutput) {
-                lastOutputType = detectDataType('output.txt', selectedOutput);
+                lastOutputType = detectOutputType(selectedOutput);
                 console.log(`Using selected output type ${selectedOutputTypes[lastTool.id]} for data type detection`);
               }
             } else {
               // For multiple outputs, try to detect type from the first output file
               const firstOutput = Object.values(lastOutput)[0];
               if (firstOutput) {
-                lastOutputType = detectDataType('output.txt', firstOutput);
+                lastOutputType = detectOutputType(firstOutput);
               }
             }
           } else {
-            lastOutputType = detectDataType('output.txt', lastOutput);
+            lastOutputType = detectOutputType(lastOutput);
           }
         } else {
           // If the manual input doesn't have the output, try using the other inputs
@@ -888,7 +1110,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                   // If it's a multi-type output tool and we have a selection, use that specific output
                   const selectedOutput = lastOutput[selectedOutputTypes[lastTool.id]];
                   if (selectedOutput) {
-                    lastOutputType = detectDataType('output.txt', selectedOutput);
+                    lastOutputType = detectOutputType(selectedOutput);
                     console.log(`Using selected output type ${selectedOutputTypes[lastTool.id]} for data type detection`);
                     break;
                   }
@@ -896,12 +1118,12 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                   // For multiple outputs, try to detect type from the first output file
                   const firstOutput = Object.values(lastOutput)[0];
                   if (firstOutput) {
-                    lastOutputType = detectDataType('output.txt', firstOutput);
+                    lastOutputType = detectOutputType(firstOutput);
                     break;
                   }
                 }
               } else {
-                lastOutputType = detectDataType('output.txt', lastOutput);
+                lastOutputType = detectOutputType(lastOutput);
                 break;
               }
             }
@@ -953,8 +1175,8 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       }
       paramValue = processedFile.name;
 
-      // Store the processed file in toolParameterFiles
-      const fileObj = { name: processedFile.name, data: processedFile.content };
+      // Store the processed file in toolParameterFiles (large files in full, not their preview)
+      const fileObj = { name: processedFile.name, data: processedFile.source ?? processedFile.content };
       setToolParameterFiles((prev) => ({
         ...prev,
         [id]: {
@@ -986,21 +1208,13 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
     const previous = workflow[index]
     let previousOutputType = null
     if (tabIndex === 0) {
-      previousOutputType = detectDataType('output.txt', outputMap["ManualInput"]?.[previous.id]);
+      previousOutputType = detectOutputType(outputMap["ManualInput"]?.[previous.id]);
     } else {
-      previousOutputType = detectDataType('output.txt', outputMap[selectedInput]?.[previous.id]);
+      previousOutputType = detectOutputType(outputMap[selectedInput]?.[previous.id]);
     }
 
     const next = workflow[index + 1]
-    const nextTool = description.tools.find((t) => t.name === `gto_${next.toolName}`)
-    const nextInputTypes = nextTool.input.format.split(',').map(f => f.trim())
-
-    const filteredOperations = description.tools.filter((tool) => {
-      const toolInputTypes = tool.input.format.split(',').map(f => f.trim());
-      const toolOutputTypes = tool.output.format.split(',').map(f => f.trim());
-
-      return toolInputTypes.includes(previousOutputType) && toolOutputTypes.some((type) => nextInputTypes.includes(type));
-    });
+    const filteredOperations = getInsertableTools(previousOutputType, next.toolName);
 
     setAddingATool(true);
     setFilteredTools(filteredOperations);
@@ -1012,11 +1226,9 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
     setOpenExportDialog(true);
   };
 
-  const executeTool = async (tool, input) => {
+  // split: output and selected stream of the fasta_split_streams step of a merge step
+  const executeTool = async (tool, input, split = null) => {
     try {
-      // Load the wrapper function dynamically
-      const runFunction = await loadWasmModule(tool.toolName);
-
       // Find tool configuration from description.json
       const toolConfig = description.tools.find(
         (t) => t.name === `gto_${tool.toolName}`
@@ -1026,54 +1238,54 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
         throw new Error(`Configuration for tool ${tool.toolName} not found.`);
       }
 
+      // Resolve the runner (Web Worker pool, or the wrapper on the main thread). Large inputs
+      // run in the native service when it is running. Steps whose input and parameters did
+      // not change are served from the step result cache.
+      // Each run is recorded in the step metrics (see PerformancePanel).
+      const runFunction = withStepMetrics(
+        tool,
+        stepResultCache.wrap(
+          tool.toolName,
+          withNativeService(tool.toolName, await getToolRunner(tool.toolName, { keepBytes: true })),
+          isDeterministicStep(toolConfig, tool.params)
+        )
+      );
+
       // Special handling for fasta_merge_streams
       if (isFastaMergeStreams(tool)) {
-        return await handleFastaMergeStreams(
-          tool,
-          input,
-          workflow,
-          outputMap,
-          selectedOutputTypes,
-          tabIndex,
-          selectedInput,
-          runFunction
-        );
+        return await handleFastaMergeStreams(input, split, runFunction);
       }
 
       // Prepare arguments based on tool configuration and user-set parameters
-      let args = [];
-      if (tool.params && Object.keys(tool.params).length > 0) {
-        // Handle flags
-        toolConfig.flags.forEach((flagObj) => {
-          if (flagObj.required || tool.params[flagObj.flag]) {
-            args.push(flagObj.flag);
-            // Check if the flag has an associated parameter
-            if (
-              flagObj.parameter &&
-              tool.params[flagObj.parameter] !== undefined &&
-              tool.params[flagObj.parameter] !== ''
-            ) {
-              args.push(`${tool.params[flagObj.parameter]}`);
-            }
-          }
-        });
+      const args = buildToolArgs(tool, toolConfig);
+
+      // Streamed inputs stay streamed through stdin tools; other tools get their text
+      const isStdinTool = toolConfig.input.type === 'stdin';
+      if (isBlob(input)) {
+        if (isStdinTool && !toolConfig.is_multi_output) {
+          // Tools that take an index of the input seek to the records they read
+          return await runWithSequenceIndex(runFunction, toolConfig, input, args, { streamOutput: true });
+        }
+        input = await input.text();
+      }
+      // Bytes from a previous step go to stdin tools as they are
+      if (input instanceof Uint8Array && (!isStdinTool || input.length === 0)) {
+        input = new TextDecoder('utf-8', { fatal: false }).decode(input);
       }
 
       // Handle multiple inputs
       if (typeof input === 'object' && !Array.isArray(input)) {
-        // If input is an object (multiple files), process each one
-        const results = {};
-        for (const [filename, content] of Object.entries(input)) {
+        // If input is an object (multiple files), process the files concurrently
+        const entries = Object.entries(input);
+        const outputs = await Promise.all(
           // Ensure content is defined
-          if (content === undefined || content === null) {
-            content = '';
-          }
-
-          // Execute the tool for this input
-          const outputData = await runFunction(content, args);
+          entries.map(([, content]) => runFunction(content ?? '', args))
+        );
 
-          results[filename] = outputData;
-        }
+        const results = {};
+        entries.forEach(([filename], index) => {
+          results[filename] = outputs[index];
+        });
         return results;
       } else {
         // Single input case
@@ -1115,6 +1327,24 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       ...prev,
       [tool.id]: true,
     }));
+
+    // Outputs piped to the next step were not kept: run the workflow again to keep it
+    const inputId = tabIndex === 0 ? "ManualInput" : selectedInput;
+    if (pipedSteps.current[inputId]?.[tool.id]) {
+      setMaterializeRequest((count) => count + 1);
+    }
+
+    // Outputs saved by an earlier session are read when first viewed
+    const storedOutput = inputId === "ManualInput" && storedOutputs.current?.[tool.id];
+    if (storedOutput && !outputMap[inputId]?.[tool.id]) {
+      const output = await resolveContents(storedOutput);
+      if (output === undefined) return;
+      setOutputMap((prevMap) => (
+        prevMap[inputId]?.[tool.id] !== undefined
+          ? prevMap // The workflow ran meanwhile
+          : { ...prevMap, [inputId]: { ...prevMap[inputId], [tool.id]: output } }
+      ));
+    }
   };
 
   const handleSaveOutput = async (stopAtIndex) => {
@@ -1124,61 +1354,92 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       ? [{ id: "ManualInput", content: inputData }]
       : Array.from(selectedFiles);
 
-    const exportOutputs = {};
-
-    for (const input of allInputs) {
-      let data = input.content;
-
-      for (let i = 0; i <= endIndex && i < workflow.length; i++) {
-        const tool = workflow[i];
-        try {
-          // Handle multi-output data from previous steps
-          if (typeof data === 'object' && !Array.isArray(data)) {
-            // If data is a multi-output object, process each file
-            const output = {};
-            for (const [filename, content] of Object.entries(data)) {
-              const result = await executeTool(tool, content);
-              if (typeof result === 'object' && result.outputs) {
-                // If the tool also produces multiple outputs, merge them with unique names
-                for (const [resultFilename, resultContent] of Object.entries(result.outputs)) {
-                  const uniqueFilename = `${filename}_${resultFilename}`;
-                  output[uniqueFilename] = resultContent;
-                }
-              } else {
-                // Detect the output type
-                const detectedType = detectDataType("output.txt", result.stdout);
-
-                // Update the extension of filename based on the detected type
-                const baseFilename = filename.split('.')[0];
-                const newFilename = `${baseFilename}${getExtensionForType(detectedType)}`;
+    const steps = workflow.slice(0, endIndex + 1);
+    const inputsById = new Map(allInputs.map((input) => [input.id, input]));
+    const graph = compileWorkflow(steps, [...inputsById.keys()], selectedOutputTypes);
+
+    // Each step runs once the steps it depends on are done: the inputs are independent,
+    // so their steps run concurrently
+    const results = await runGraph(graph, async (node, results) => {
+      const input = inputsById.get(node.input);
+      const tool = node.step;
+      const outputs = new Map();
+      // Streamed inputs are exported in full, not as their preview
+      let data = node.source ? results.get(node.source) : input.source ?? input.content;
+      if (node.stream && typeof data === 'object' && data.hasOwnProperty(node.stream)) {
+        data = data[node.stream];
+      }
 
-                // If the tool produces single output, store it with the input filename
-                output[newFilename] = result.stdout;
-              }
-            }
-            data = output;
-          } else {
-            // Single input case
-            const result = await executeTool(tool, data);
+      try {
+        // Consecutive stdin/stdout steps run as one pipeline, keeping only the last output
+        const pipelineRun = getPipelineRun(steps, node.index);
+        if (pipelineRun.length > 1 && isPipelineInput(data)) {
+          const last = pipelineRun.length - 1;
+          const pipelineResults = await executePipeline(pipelineRun, data, (step, index) => index === last);
+          pipelineRun.forEach((step, index) => {
+            const result = pipelineResults[index];
+            outputs.set(getNodeId(input.id, step.id), index === last ? result.stdoutBytes ?? result.stdout : undefined);
+          });
+          return outputs;
+        }
 
-            let output;
-            // result can return an object with the key "outputs" (multiple outputs) or the key "stdout" (single output)
+        // Merge steps also take the streams of their split step
+        const split = node.split && { output: results.get(node.split.id), stream: node.split.stream };
+
+        // Handle multi-output data from previous steps
+        if (typeof data === 'object' && !Array.isArray(data) && !isRawData(data)) {
+          // If data is a multi-output object, process each file
+          const output = {};
+          const entries = Object.entries(data);
+          const fileResults = await Promise.all(entries.map(([, content]) => executeTool(tool, content, split)));
+          for (const [index, [filename]] of entries.entries()) {
+            const result = fileResults[index];
             if (typeof result === 'object' && result.outputs) {
-              output = result.outputs;
+              // If the tool also produces multiple outputs, merge them with unique names
+              for (const [resultFilename, resultContent] of Object.entries(result.outputs)) {
+                const uniqueFilename = `${filename}_${resultFilename}`;
+                output[uniqueFilename] = resultContent;
+              }
             } else {
-              output = result.stdout;
+              // Detect the output type
+              const detectedType = detectOutputType(result.stdout);
+
+              // Update the extension of filename based on the detected type
+              const baseFilename = filename.split('.')[0];
+              const newFilename = `${baseFilename}${getExtensionForType(detectedType)}`;
+
+              // If the tool produces single output, store it with the input filename
+              output[newFilename] = result.stdout;
             }
-            data = output;
           }
+          outputs.set(node.id, output);
+        } else {
+          // Single input case
+          const result = await executeTool(tool, data, split);
 
-          // If it's the last output, store to save it
-          if (i === endIndex) {
-            exportOutputs[input.id] = data;
+          // result can return an object with the key "outputs" (multiple outputs) or the key "stdout" (single output)
+          if (typeof result === 'object' && result.outputs) {
+            outputs.set(node.id, result.outputs);
+          } else {
+            // Bytes (or a streamed Blob) go on without being encoded again
+            outputs.set(node.id, result.stdoutBytes ?? result.stdout);
           }
-        } catch (error) {
-          console.error(`Failed to process input ${input.id} with tool ${tool.toolName}:`, error);
-          showNotification(`Error processing ${input.id}`, 'error');
         }
+        return outputs;
+      } catch (error) {
+        console.error(`Failed to process input ${input.id} with tool ${tool.toolName}:`, error);
+        showNotification(`Error processing ${input.id}`, 'error');
+        return null;
+      }
+    });
+
+    // The outputs of the last step, for the inputs it ran on
+    const exportOutputs = {};
+    if (steps.length > 0) {
+      const lastStep = steps[steps.length - 1];
+      for (const input of allInputs) {
+        const output = results.get(getNodeId(input.id, lastStep.id));
+        if (output !== undefined) exportOutputs[input.id] = output;
       }
     }
 
@@ -1187,7 +1448,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       const inputFileName = Object.keys(exportOutputs)[0];
       const outputContent = exportOutputs[inputFileName];
 
-      if (typeof outputContent === 'object') {
+      if (typeof outputContent === 'object' && !isRawData(outputContent)) {
         // Multiple output files
         const zip = new JSZip();
         for (const [filename, content] of Object.entries(outputContent)) {
@@ -1201,7 +1462,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
         const blob = new Blob([outputContent], { type: 'text/plain;charset=utf-8' });
         const url = URL.createObjectURL(blob);
         const link = document.createElement('a');
-        const detectedType = detectDataType("output.txt", outputContent);
+        const detectedType = detectOutputType(await getPreviewText(outputContent));
         const extension = getExtensionForType(detectedType);
         link.download = `output${extension}`;
         link.href = url;
@@ -1212,7 +1473,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
       // Multiple inputs
       const zip = new JSZip();
       for (const [inputFileName, outputContent] of Object.entries(exportOutputs)) {
-        if (typeof outputContent === 'object') {
+        if (typeof outputContent === 'object' && !isRawData(outputContent)) {
           // Multiple output files for this input
           const inputFolder = zip.folder(inputFileName);
           for (const [filename, content] of Object.entries(outputContent)) {
@@ -1220,7 +1481,7 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
           }
         } else {
           // Single output file for this input
-          const detectedType = detectDataType("output.txt", outputContent);
+          const detectedType = detectOutputType(await getPreviewText(outputContent));
           const extension = getExtensionForType(detectedType);
           zip.file(`${inputFileName}_output${extension}`, outputContent);
         }
@@ -1258,17 +1519,11 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
   const handleOutputTypeSelection = (toolId, outputType) => {
     console.log(`Selecting output type ${outputType} for tool ${toolId}`);
 
+    // The steps after the tool run again, as they take another stream (see compileWorkflow)
     setSelectedOutputTypes(prev => ({
       ...prev,
       [toolId]: outputType
     }));
-
-    // Find the tool in the workflow to trigger reprocessing from this point
-    const toolIndex = workflow.findIndex(tool => tool.id === toolId);
-    if (toolIndex >= 0) {
-      // Set insertAtIndex to trigger reprocessing from this tool onwards
-      setInsertAtIndex(toolIndex);
-    }
   };
 
   // Render multi-type output selector for tools like fasta_split_streams
@@ -1769,10 +2024,8 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                                     </Button>
                                   </Box>
                                   <Collapse in={expandedOutputFiles[`${tool.id}_${filename}`]} timeout="auto" unmountOnExit>
-                                    <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5', overflow: 'auto', maxHeight: '100px', wordWrap: 'break-word' }}>
-                                      <Typography variant="body2" sx={{ fontFamily: 'monospace', whiteSpace: 'pre-wrap', fontSize: '0.800rem' }}>
-                                        {content?.replace(/\x00/g, '\\x00').replace(/\x01/g, '\\x01')}
-                                      </Typography>
+                                    <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5' }}>
+                                      <TextViewer text={content} height={OUTPUT_VIEWER_HEIGHT} escapeControls />
                                     </Paper>
                                   </Collapse>
                                   {!expandedOutputFiles[`${tool.id}_${filename}`] && (
@@ -1786,10 +2039,13 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                               ))}
                             </Box>
                           ) : (
-                            <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5', overflow: 'auto', maxHeight: '100px', wordWrap: 'break-word' }}>
-                              <Typography variant="body2" sx={{ fontFamily: 'monospace', whiteSpace: 'pre-wrap', fontSize: '0.800rem' }}>
-                                {outputs?.[tool.id]?.replace(/\x00/g, '\\x00').replace(/\x01/g, '\\x01')}
-                              </Typography>
+                            <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5' }}>
+                              <TextViewer
+                                text={outputs?.[tool.id]}
+                                source={getStreamedOutput(tool.id)}
+                                height={OUTPUT_VIEWER_HEIGHT}
+                                escapeControls
+                              />
                             </Paper>
                           )}
                         </Collapse>
@@ -1947,10 +2203,8 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                           </Button>
                         </Box>
                         <Collapse in={expandedOutputFiles[`OutputBox_${filename}`]} timeout="auto" unmountOnExit>
-                          <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5', overflow: 'auto', maxHeight: '100px', wordWrap: 'break-word' }}>
-                            <Typography variant="body2" sx={{ fontFamily: 'monospace', whiteSpace: 'pre-wrap', fontSize: '0.800rem' }}>
-                              {content}
-                            </Typography>
+                          <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5' }}>
+                            <TextViewer text={content} height={OUTPUT_VIEWER_HEIGHT} />
                           </Paper>
                         </Collapse>
                         {!expandedOutputFiles[`OutputBox_${filename}`] && (
@@ -1964,10 +2218,12 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
                     ))}
                   </Box>
                 ) : (
-                  <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5', overflow: 'auto', maxHeight: '100px', wordWrap: 'break-word' }}>
-                    <Typography variant="body2" sx={{ fontFamily: 'monospace', whiteSpace: 'pre-wrap', fontSize: '0.800rem' }}>
-                      {outputs?.[workflow[workflow.length - 1]?.id]}
-                    </Typography>
+                  <Paper sx={{ padding: 1, backgroundColor: '#f5f5f5' }}>
+                    <TextViewer
+                      text={outputs?.[workflow[workflow.length - 1]?.id]}
+                      source={getStreamedOutput(workflow[workflow.length - 1]?.id)}
+                      height={OUTPUT_VIEWER_HEIGHT}
+                    />
                   </Paper>
                 )
               ) : (
@@ -2042,8 +2298,22 @@ const RecipePanel = ({ workflow, setWorkflow, inputData, setInputData, isLoading
         >
           Import Recipe
         </Button>
+        <Button
+          variant="outlined"
+          color="primary"
+          onClick={() => setOpenPerformancePanel(true)}
+          startIcon={<Speed />}
+        >
+          Performance
+        </Button>
       </Box>
 
+      <PerformancePanel
+        open={openPerformancePanel}
+        onClose={() => setOpenPerformancePanel(false)}
+        workflow={workflow}
+      />
+
       {/* Export Recipe Dialog */}
       <Dialog open={openExportDialog} onClose={() => {
         setOpenExportDialog(false)
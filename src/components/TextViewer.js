@@ -0,0 +1,238 @@
+import { NavigateBefore, NavigateNext } from '@mui/icons-material';
+import { Box, IconButton, TextField, Tooltip, Typography } from '@mui/material';
+import React, { useEffect, useMemo, useRef, useState } from 'react';
+import { buildBlobIndex, buildTextIndex, findEntry } from '../utils/lineIndex';
+
+const ROW_HEIGHT = 18; // px, rows never wrap
+const OVERSCAN_ROWS = 20;
+const LOAD_MARGIN_ROWS = 200; // Rows read around the visible ones from Blob sources
+// Browsers cap element heights; taller contents scroll proportionally
+const MAX_SCROLL_HEIGHT = 10000000;
+
+const escapeControlChars = (text) => text.replace(/\x00/g, '\\x00').replace(/\x01/g, '\\x01');
+
+/**
+ * Windowed text viewer: only the rows in view are in the DOM, from a line-offset index
+ * built once per text (see utils/lineIndex.js), so large outputs cost as much as small
+ * ones. With a Blob source, only the rows in view are read. FASTA and FASTQ texts get
+ * jump-to-record navigation, long texts jump-to-line.
+ * @param {string} text - The text to show.
+ * @param {Blob} source - Alternatively, a Blob to read on demand (e.g. a streamed output).
+ * @param {number} height - Height of the viewport in px; by default it fills its container.
+ * @param {boolean} escapeControls - Shows \x00 and \x01 characters escaped.
+ * @param {string} emptyText - Shown when there is no text.
+ */
+const TextViewer = ({ text = '', source = null, height = null, escapeControls = false, emptyText = '', sx = {} }) => {
+  const viewportRef = useRef(null);
+  const [scrollTop, setScrollTop] = useState(0);
+  const [measuredHeight, setMeasuredHeight] = useState(0);
+  const [blobIndex, setBlobIndex] = useState(null);
+  const [loadedRows, setLoadedRows] = useState({ first: 0, rows: [] }); // Rows read from the source
+  const [lineInput, setLineInput] = useState('');
+  const [recordInput, setRecordInput] = useState('');
+
+  const textIndex = useMemo(() => (source ? null : buildTextIndex(text)), [text, source]);
+  const index = source ? blobIndex : textIndex;
+
+  // Index Blob sources in the background
+  useEffect(() => {
+    setBlobIndex(null);
+    setLoadedRows({ first: 0, rows: [] });
+    if (!source) return undefined;
+    let cancelled = false;
+    buildBlobIndex(source, () => cancelled).then((built) => {
+      if (!cancelled) setBlobIndex(built);
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [source]);
+
+  // Back to the top for a new text
+  useEffect(() => {
+    setScrollTop(0);
+    if (viewportRef.current) viewportRef.current.scrollTop = 0;
+  }, [text, source]);
+
+  const rowCount = index ? index.rowStarts.length : 0;
+
+  // Without a height, the viewport fills its container
+  useEffect(() => {
+    const viewport = viewportRef.current;
+    if (height !== null || !viewport || typeof ResizeObserver === 'undefined') return undefined;
+    const observer = new ResizeObserver(() => setMeasuredHeight(viewport.clientHeight));
+    observer.observe(viewport);
+    setMeasuredHeight(viewport.clientHeight);
+    return () => observer.disconnect();
+  }, [height, rowCount > 0]);
+
+  const viewportHeight = height ?? measuredHeight;
+  const contentHeight = rowCount * ROW_HEIGHT;
+  const scrollHeight = Math.min(contentHeight, MAX_SCROLL_HEIGHT);
+  const scrollRatio = scrollHeight > viewportHeight ? Math.max(contentHeight - viewportHeight, 0) / (scrollHeight - viewportHeight) : 1;
+
+  const offset = scrollTop * scrollRatio; // Position in the content
+  const firstRow = Math.max(Math.floor(offset / ROW_HEIGHT) - OVERSCAN_ROWS, 0);
+  const lastRow = Math.min(Math.ceil((offset + viewportHeight) / ROW_HEIGHT) + OVERSCAN_ROWS, rowCount);
+  const windowTop = scrollTop - (offset - firstRow * ROW_HEIGHT);
+
+  // Read the rows around the visible ones from Blob sources
+  useEffect(() => {
+    if (!source || !index || rowCount === 0) return undefined;
+    const loadedLast = loadedRows.first + loadedRows.rows.length;
+    if (firstRow >= loadedRows.first && lastRow <= loadedLast && loadedRows.rows.length > 0) return undefined;
+
+    let cancelled = false;
+    const first = Math.max(firstRow - LOAD_MARGIN_ROWS, 0);
+    const last = Math.min(lastRow + LOAD_MARGIN_ROWS, rowCount);
+    const start = index.rowStarts[first];
+    source.slice(start, index.rowEnds[last - 1]).arrayBuffer().then((buffer) => {
+      if (cancelled) return;
+      const bytes = new Uint8Array(buffer);
+      const decoder = new TextDecoder();
+      const rows = [];
+      for (let row = first; row < last; row++) {
+        rows.push(decoder.decode(bytes.subarray(index.rowStarts[row] - start, index.rowEnds[row] - start)));
+      }
+      setLoadedRows({ first, rows });
+    });
+    return () => {
+      cancelled = true;
+    };
+  }, [source, index, firstRow, lastRow]);
+
+  const getRow = (row) => {
+    if (!source) return text.slice(index.rowStarts[row], index.rowEnds[row]);
+    return loadedRows.rows[row - loadedRows.first] ?? '';
+  };
+
+  const scrollToRow = (row) => {
+    const top = (row * ROW_HEIGHT) / scrollRatio;
+    if (viewportRef.current) viewportRef.current.scrollTop = top;
+    setScrollTop(top);
+  };
+
+  const jumpToLine = (line) => {
+    if (!index || index.lineRows.length === 0) return;
+    const target = Math.min(Math.max(line, 1), index.lineRows.length);
+    scrollToRow(index.lineRows[target - 1]);
+  };
+
+  const jumpToRecord = (record) => {
+    if (!index || index.recordRows.length === 0) return;
+    const target = Math.min(Math.max(record, 1), index.recordRows.length);
+    scrollToRow(index.recordRows[target - 1]);
+  };
+
+  if (!index) {
+    return (
+      <Typography variant="body2" sx={{ fontFamily: 'monospace', fontSize: '0.800rem' }}>
+        {source ? 'Indexing output...' : emptyText}
+      </Typography>
+    );
+  }
+  if (rowCount === 0) {
+    return (
+      <Typography variant="body2" sx={{ fontFamily: 'monospace', fontSize: '0.800rem' }}>
+        {emptyText}
+      </Typography>
+    );
+  }
+
+  const topRow = Math.min(Math.floor(offset / ROW_HEIGHT), rowCount - 1);
+  const lineCount = index.lineRows.length;
+  const recordCount = index.recordRows.length;
+  const currentLine = findEntry(index.lineRows, topRow) + 1;
+  const currentRecord = recordCount > 0 ? findEntry(index.recordRows, topRow) + 1 : 0;
+  const showNavigation = contentHeight > viewportHeight || recordCount > 1;
+
+  const rows = [];
+  for (let row = firstRow; row < lastRow; row++) {
+    const content = getRow(row);
+    rows.push(
+      <div key={row} style={{ height: ROW_HEIGHT, lineHeight: `${ROW_HEIGHT}px`, whiteSpace: 'pre' }}>
+        {escapeControls ? escapeControlChars(content) : content}
+      </div>
+    );
+  }
+
+  const handleKeyDown = (jump, value) => (event) => {
+    if (event.key === 'Enter' && value !== '') jump(Number(value));
+  };
+
+  return (
+    <Box sx={height === null ? { display: 'flex', flexDirection: 'column', height: '100%', ...sx } : sx}>
+      {showNavigation && (
+        <Box sx={{ display: 'flex', alignItems: 'center', gap: 1, marginBottom: 0.5, flexWrap: 'wrap' }}>
+          <Typography variant="caption" color="textSecondary">
+            Line {currentLine.toLocaleString()} of {lineCount.toLocaleString()}
+            {recordCount > 0 && ` · Record ${currentRecord.toLocaleString()} of ${recordCount.toLocaleString()}`}
+          </Typography>
+          <TextField
+            size="small"
+            type="number"
+            placeholder="Line"
+            value={lineInput}
+            onChange={(event) => setLineInput(event.target.value)}
+            onKeyDown={handleKeyDown(jumpToLine, lineInput)}
+            inputProps={{ min: 1, max: lineCount, style: { padding: '2px 6px', fontSize: '0.75rem', width: 70 } }}
+          />
+          {recordCount > 0 && (
+            <>
+              <TextField
+                size="small"
+                type="number"
+                placeholder="Record"
+                value={recordInput}
+                onChange={(event) => setRecordInput(event.target.value)}
+                onKeyDown={handleKeyDown(jumpToRecord, recordInput)}
+                inputProps={{ min: 1, max: recordCount, style: { padding: '2px 6px', fontSize: '0.75rem', width: 70 } }}
+              />
+              <Tooltip title="Previous record">
+                <span>
+                  <IconButton size="small" onClick={() => jumpToRecord(currentRecord - 1)} disabled={currentRecord <= 1}>
+                    <NavigateBefore fontSize="small" />
+                  </IconButton>
+                </span>
+              </Tooltip>
+              <Tooltip title="Next record">
+                <span>
+                  <IconButton size="small" onClick={() => jumpToRecord(currentRecord + 1)} disabled={currentRecord >= recordCount}>
+                    <NavigateNext fontSize="small" />
+                  </IconButton>
+                </span>
+              </Tooltip>
+            </>
+          )}
+        </Box>
+      )}
+      <Box
+        ref={viewportRef}
+        onScroll={(event) => setScrollTop(event.currentTarget.scrollTop)}
+        sx={{
+          height: height === null ? 'auto' : Math.min(height, contentHeight + 1),
+          flexGrow: 1,
+          minHeight: 0,
+          overflow: 'auto',
+          position: 'relative',
+        }}
+      >
+        <Box sx={{ height: scrollHeight, position: 'relative' }}>
+          <Box
+            sx={{
+              position: 'absolute',
+              top: windowTop,
+              left: 0,
+              fontFamily: 'monospace',
+              fontSize: '0.800rem',
+            }}
+          >
+            {rows}
+          </Box>
+        </Box>
+      </Box>
+    </Box>
+  );
+};
+
+export default TextViewer;
@@ -1,8 +1,9 @@
 import SaveIcon from '@mui/icons-material/Save';
-import { Box, FormControl, IconButton, MenuItem, Paper, Select, TextField, Tooltip, Typography } from '@mui/material';
+import { Box, FormControl, IconButton, MenuItem, Paper, Select, Tooltip, Typography } from '@mui/material';
 import { saveAs } from 'file-saver';
 import JSZip from 'jszip';
 import React, { useEffect, useState } from 'react';
+import TextViewer from './TextViewer';
 
 const ToolOutputPanel = ({ outputData, setOutputData, workflow = null, tool = null, inputData, page }) => {
     const [selectedFile, setSelectedFile] = useState('');
@@ -92,27 +93,12 @@ const ToolOutputPanel = ({ outputData, setOutputData, workflow = null, tool = nu
                     </FormControl>
                 )}
             </Box>
-            {/* TextField with dynamic height */}
-            <Box sx={{ flexGrow: 1, display: 'flex', flexDirection: 'column', overflow: 'hidden', padding: 2 }}>
-                <TextField
-                    variant="outlined"
-                    value={displayedOutput}
-                    placeholder="Output Data"
-                    InputProps={{
-                        multiline: true,
-                        inputComponent: 'textarea',
-                        readOnly: true,
-                    }}
-                    rows={8}
-                    sx={{
-                        flexGrow: 1,
-                        flexShrink: 1,
-                        overflow: 'auto',
-                        minHeight: '100px',
-                        whiteSpace: 'pre-wrap',
-                        wordBreak: 'break-word',
-                        fontSize: '0.875rem',
-                    }}
+            {/* Windowed viewer filling the panel */}
+            <Box sx={{ flexGrow: 1, display: 'flex', flexDirection: 'column', overflow: 'hidden', padding: 2, minHeight: '100px' }}>
+                <TextViewer
+                    text={typeof displayedOutput === 'string' ? displayedOutput : ''}
+                    emptyText="Output Data"
+                    sx={{ border: '1px solid rgba(0, 0, 0, 0.23)', borderRadius: 1, padding: 1 }}
                 />
             </Box>
             {/* Save button always visible */}
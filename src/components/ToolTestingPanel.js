@@ -21,7 +21,7 @@ import React, { useContext, useEffect, useState } from 'react';
 import description from '../../description.json';
 import { DataTypeContext } from '../contexts/DataTypeContext';
 import { NotificationContext } from '../contexts/NotificationContext';
-import { loadWasmModule } from '../gtoWasm';
+import { getToolHelpOutput, getToolRunner } from '../gtoWasm';
 import { detectDataType } from '../utils/detectDataType';
 import { processFile } from '../utils/fileProcessor';
 
@@ -53,8 +53,7 @@ const ToolTestingPanel = ({ tool, inputData, setOutputData, setIsLoading }) => {
     // Load help message for a tool
     const loadHelpMessage = async (toolName) => {
         try {
-            const runFunction = await loadWasmModule(toolName);
-            const outputData = await runFunction('', ['-h']); // Execute the tool with -h flag
+            const outputData = await getToolHelpOutput(toolName); // Output of the tool with -h flag
 
             if (outputData.stderr) {
                 console.error(`Error in ${toolName} help message: ${outputData.stderr}`);
@@ -164,8 +163,8 @@ const ToolTestingPanel = ({ tool, inputData, setOutputData, setIsLoading }) => {
             }
             paramValue = processedFile.name;
 
-            // Store the processed file in toolParameterFiles
-            const fileObj = { name: processedFile.name, data: processedFile.content };
+            // Store the processed file in toolParameterFiles (large files in full, not their preview)
+            const fileObj = { name: processedFile.name, data: processedFile.source ?? processedFile.content };
             setToolParameterFiles((prev) => ({
                 ...prev,
                 [name]: fileObj,
@@ -189,7 +188,7 @@ const ToolTestingPanel = ({ tool, inputData, setOutputData, setIsLoading }) => {
             }
 
             // Load the wrapper function dynamically
-            const runFunction = await loadWasmModule(tool.name);
+            const runFunction = await getToolRunner(tool.name);
 
             // Find tool configuration from description.json
             const toolConfig = description.tools.find(
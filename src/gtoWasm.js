@@ -1,3 +1,209 @@
+import { loadModuleHashes } from './wasmModuleCache';
+import { WasmInstancePool } from './wasmRuntime';
+import { GtoWorkerPool, workersSupported } from './workers/workerPool';
+
+// Compiled modules and warm instances shared by every generated wrapper
+const wasmRuntime = new WasmInstancePool();
+window.gtoWasmRuntime = wasmRuntime;
+
+// Tools run in Web Workers when available, keeping the UI responsive during long runs
+const workerPool = workersSupported() ? new GtoWorkerPool() : null;
+
+// Run functions already resolved, by tool name
+const runFunctions = new Map();
+
+// Generated by `generate_wrapper.py --all`: every wrapper in one script, and the tool registry
+// (types, formats, compatibility indexes and the help text of each tool)
+const WRAPPER_BUNDLE_URL = '/wasm/gto_wrappers.js';
+const REGISTRY_URL = '/wasm/gto_registry.json';
+let wrapperBundle = null;
+let registry = null;
+
+const decoder = new TextDecoder('utf-8', { fatal: false });
+
+/**
+ * Updates the compiled-module cache and instance pool settings.
+ * @param {Object} config - e.g. { maxInstancesPerTool, memoryBudgetBytes, prewarm }.
+ */
+export function configureWasmRuntime(config) {
+  wasmRuntime.configure(config);
+  if (workerPool) workerPool.configure(config);
+}
+
+/**
+ * Compiles, when the browser is idle, the modules of the tools in the workflow saved in
+ * localStorage, so reopening the workflow page runs it without a fetch or compile stall.
+ * Binaries come from the persistent cache when a previous session stored them.
+ */
+export function prefetchSavedWorkflowModules() {
+  let toolNames;
+  try {
+    const workflow = JSON.parse(localStorage.getItem('workflow') || '[]');
+    toolNames = [...new Set(workflow.map((tool) => tool.toolName).filter(Boolean))];
+  } catch (error) {
+    return;
+  }
+  if (toolNames.length === 0) return;
+
+  const prefetch = () => {
+    if (workerPool) {
+      workerPool.prefetch(toolNames);
+    } else {
+      toolNames.forEach((toolName) => loadWasmModule(toolName).catch(() => {}));
+    }
+  };
+  if (typeof requestIdleCallback === 'function') {
+    requestIdleCallback(prefetch, { timeout: 2000 });
+  } else {
+    setTimeout(prefetch, 0);
+  }
+}
+
+/**
+ * Checks if tools read Blob inputs on demand (in Web Workers), so they can also seek in them.
+ * On the main thread Blob inputs are read as text, with their line ends normalized.
+ * @returns {boolean}
+ */
+export function streamsBlobInputs() {
+  return workerPool !== null;
+}
+
+/**
+ * Returns counters for the compiled-module cache and instance pool.
+ * @returns {Object} - compiles, instantiations, warmHits, reuses, evictions and idleBytes.
+ */
+export function getWasmRuntimeStats() {
+  return { ...wasmRuntime.stats, idleBytes: wasmRuntime.idleBytes() };
+}
+
+/**
+ * Decodes the byte outputs of a run for display, keeping the bytes of stdout, and adds the
+ * decoding time to the metrics of the run.
+ * @param {Object} result - A result produced with { binaryOutput: true }.
+ * @returns {Object} - The result with text outputs and stdoutBytes.
+ */
+const withTextOutputs = (result) => {
+  const start = performance.now();
+  const decoded = { ...result };
+  if (result.stdout instanceof Uint8Array) {
+    decoded.stdout = decoder.decode(result.stdout);
+    decoded.stdoutBytes = result.stdout;
+  }
+  if (result.outputs) {
+    decoded.outputs = {};
+    for (const [name, content] of Object.entries(result.outputs)) {
+      decoded.outputs[name] = content instanceof Uint8Array ? decoder.decode(content) : content;
+    }
+  }
+  if (result.metrics) {
+    decoded.metrics = { ...result.metrics, timings: { ...result.metrics.timings, decode: performance.now() - start } };
+  }
+  return decoded;
+};
+
+/**
+ * Returns a function that runs a GTO tool, in a Web Worker when supported and on the
+ * main thread otherwise. It has the same signature as the wrappers' run functions.
+ * @param {string} toolName - The name of the GTO tool without the 'gto_' prefix.
+ * @param {Object} options - { keepBytes: also return stdout as bytes (stdoutBytes), so a
+ *   following step can take it without encoding the text again }.
+ * @returns {Promise<Function>} - (input, args, options) => Promise<{ stdout, stderr, outputs?, file? }>
+ */
+export async function getToolRunner(toolName, { keepBytes = false } = {}) {
+  const run = workerPool
+    ? (input, args, options) => workerPool.run(toolName, input, args, options)
+    : await loadWasmModule(toolName);
+  if (!keepBytes) {
+    return run;
+  }
+  return async (input, args, options = {}) => withTextOutputs(await run(input, args, { ...options, binaryOutput: true }));
+}
+
+/**
+ * Runs consecutive stdin/stdout tools as a pipeline (see GtoWorkerPool.runPipeline), so
+ * only the outputs of stages with keepOutput are materialized. Without Web Workers the
+ * stages run one after the other, passing stdout bytes along.
+ * @param {Array<{toolName: string, args: Array<string>, keepOutput: boolean, streamOutput: boolean}>} stages
+ * @param {string|Uint8Array|Blob} input - Stdin data of the first stage.
+ * @returns {Promise<Array<Object>>} - One result per stage, as returned by a keepBytes runner;
+ *   `piped` is set on the results whose output was not kept.
+ */
+export async function runToolPipeline(stages, input) {
+  if (workerPool) {
+    const results = await workerPool.runPipeline(stages, input);
+    return results.map(withTextOutputs);
+  }
+
+  const results = [];
+  let data = input;
+  for (const { toolName, args, streamOutput } of stages) {
+    const run = await getToolRunner(toolName, { keepBytes: true });
+    const result = await run(data, args, { streamOutput: !!streamOutput });
+    results.push(result);
+    data = result.stdoutBytes ?? result.stdout;
+  }
+  return results;
+}
+
+/**
+ * Loads the tool registry once.
+ * @returns {Promise<Object|null>} - The registry, or null if it was not generated.
+ */
+export function loadToolRegistry() {
+  if (!registry) {
+    registry = fetch(REGISTRY_URL)
+      .then((response) => (response.ok ? response.json() : null))
+      .catch((error) => {
+        console.warn('Tool registry not available:', error);
+        return null;
+      });
+  }
+  return registry;
+}
+
+/**
+ * Returns the tools with a compiled module: the tools of the registry, or of the module
+ * manifest (gto_modules.json) when the registry was not generated.
+ * @returns {Promise<Set<string>|null>} - Tool names without 'gto_', or null if neither is available.
+ */
+export async function loadBuiltTools() {
+  const tools = (await loadToolRegistry())?.tools;
+  if (tools) {
+    return new Set(Object.keys(tools));
+  }
+  const modules = Object.keys(await loadModuleHashes());
+  return modules.length > 0 ? new Set(modules) : null;
+}
+
+/**
+ * Returns the output of a tool run with -h: the help text captured at build time when the
+ * registry has it, else the output of an actual run.
+ * @param {string} toolName - The name of the GTO tool without the 'gto_' prefix.
+ * @returns {Promise<{stdout: string, stderr: string}>}
+ */
+export async function getToolHelpOutput(toolName) {
+  const help = (await loadToolRegistry())?.tools?.[toolName]?.help;
+  if (help) {
+    return help;
+  }
+  const runFunction = await getToolRunner(toolName);
+  return runFunction('', ['-h']);
+}
+
+/**
+ * Loads the script with every wrapper once. Tools missing from it (or a missing bundle)
+ * fall back to their own wrapper script.
+ * @returns {Promise<void>}
+ */
+function loadWrapperBundle() {
+  if (!wrapperBundle) {
+    wrapperBundle = loadScript(WRAPPER_BUNDLE_URL).catch((error) => {
+      console.warn('Wrapper bundle not available, loading wrappers one by one:', error);
+    });
+  }
+  return wrapperBundle;
+}
+
 /**
  * Loads a specific GTO tool's wrapper function.
  * @param {string} toolName - The name of the GTO tool/module to load.
@@ -5,33 +211,37 @@
  */
 
 export async function loadWasmModule(toolName) {
+  if (runFunctions.has(toolName)) {
+    return runFunctions.get(toolName);
+  }
+
   try {
     console.log(`Attempting to load module for tool: ${toolName}`);
     const moduleName = toolName; // Assume toolName is without 'gto_' prefix
-    const scriptUrl = `/wasm/${moduleName}_wrapper.js`;
-    console.log(`Script URL: ${scriptUrl}`);
-
-    await loadScript(scriptUrl);
-    console.log(`Script loaded successfully: ${scriptUrl}`);
-
     const runFunctionName = `run_${moduleName}`;
-    console.log(`Looking for run function: ${runFunctionName}`);
-
-    // Retry mechanism to wait for the function to be available
-    let retries = 5;
-    while (retries > 0) {
-      const runFunction = window[runFunctionName];
-      if (typeof runFunction === 'function') {
-        console.log(`Run function found for ${toolName}`);
-        return runFunction;
-      }
-      console.log(`Run function not found, retrying...`);
-      await new Promise(resolve => setTimeout(resolve, 100)); // Wait for 100ms before retrying
-      retries--;
+
+    await loadWrapperBundle();
+    if (typeof window[runFunctionName] !== 'function') {
+      const scriptUrl = `/wasm/${moduleName}_wrapper.js`;
+      await loadScript(scriptUrl);
+      console.log(`Script loaded successfully: ${scriptUrl}`);
     }
 
-    console.error(`Run function not found for ${toolName}`);
-    throw new Error(`Function ${runFunctionName} not found on window.`);
+    // Start compiling the binary (the tool's own or the multi-call bundle) while the caller
+    // prepares its inputs
+    wasmRuntime.resolveModule(moduleName)
+      .then((target) => wasmRuntime.getCompiledModule(target.moduleName))
+      .catch((error) => {
+        console.warn(`Failed to precompile ${moduleName}:`, error);
+      });
+
+    // The wrapper scripts define their run function as soon as they have loaded
+    const runFunction = window[runFunctionName];
+    if (typeof runFunction !== 'function') {
+      throw new Error(`Function ${runFunctionName} not found on window.`);
+    }
+    runFunctions.set(toolName, runFunction);
+    return runFunction;
   } catch (error) {
     console.error(`Failed to load module for ${toolName}`, error);
     throw error;
@@ -67,4 +277,4 @@ function loadScript(src) {
 
     document.head.appendChild(script);
   });
-}
\ No newline at end of file
+}
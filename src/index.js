@@ -6,6 +6,7 @@ import App from './App';
 import { DataTypeProvider } from './contexts/DataTypeContext';
 import { NotificationProvider } from './contexts/NotificationContext';
 import { ValidationErrorsProvider } from './contexts/ValidationErrorsContext';
+import { prefetchSavedWorkflowModules } from './gtoWasm';
 
 const theme = createTheme({
   palette: {
@@ -40,3 +41,6 @@ root.render(
     </ThemeProvider>
   </React.StrictMode>
 );
+
+// Warm up the tools of the saved workflow while the page is idle
+prefetchSavedWorkflowModules();
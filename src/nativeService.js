@@ -0,0 +1,153 @@
+/**
+ * Client of the local native service (gto_server.py), which runs the native GTO tools.
+ *
+ * Steps whose input is larger than the threshold run in the service when it is running:
+ * the input is uploaded as the request body and stdout comes back as the response body.
+ * When the service is not running, does not serve the tool, has a full queue or fails, the
+ * step runs in WebAssembly as usual. The service is checked at most every HEALTH_RETRY_MS.
+ *
+ * Configured from the console, saved in localStorage:
+ *   window.gtoNativeService.configure({ url, thresholdBytes, enabled })
+ */
+import { isBlob } from './wasmStreams';
+
+export const DEFAULT_NATIVE_SERVICE_URL = 'http://127.0.0.1:8765';
+export const DEFAULT_NATIVE_THRESHOLD_BYTES = 16 * 1024 * 1024;
+
+const HEALTH_TIMEOUT_MS = 1000;
+const HEALTH_RETRY_MS = 30 * 1000;
+const CONFIG_KEY = 'nativeService';
+
+// Required by the service on runs; a non-safelisted header, so runs are preflighted
+const CLIENT_HEADER = { 'X-GTO-Client': 'biochef' };
+
+const decoder = new TextDecoder('utf-8', { fatal: false });
+
+const loadConfig = () => {
+  const config = { url: DEFAULT_NATIVE_SERVICE_URL, thresholdBytes: DEFAULT_NATIVE_THRESHOLD_BYTES, enabled: true };
+  try {
+    const saved = typeof localStorage !== 'undefined' ? localStorage.getItem(CONFIG_KEY) : null;
+    if (saved) Object.assign(config, JSON.parse(saved));
+  } catch (error) {
+    console.warn('Invalid native service settings:', error);
+  }
+  return config;
+};
+
+const config = loadConfig();
+let health = null; // { checked, tools: Promise of the Set of served tools, null if down }
+
+/**
+ * Updates the service settings.
+ * @param {Object} options - { url, thresholdBytes, enabled }
+ */
+export function configureNativeService(options = {}) {
+  Object.assign(config, options);
+  health = null;
+  if (typeof localStorage !== 'undefined') localStorage.setItem(CONFIG_KEY, JSON.stringify(config));
+}
+
+/**
+ * @returns {Object} - The service settings.
+ */
+export const getNativeServiceConfig = () => ({ ...config });
+
+const inputSize = (input) => {
+  if (isBlob(input)) return input.size;
+  if (input instanceof Uint8Array || typeof input === 'string') return input.length;
+  return 0;
+};
+
+const fetchTools = async () => {
+  const controller = new AbortController();
+  const timer = setTimeout(() => controller.abort(), HEALTH_TIMEOUT_MS);
+  try {
+    const response = await fetch(`${config.url}/health`, { signal: controller.signal });
+    return response.ok ? new Set((await response.json()).tools) : null;
+  } catch (error) {
+    return null; // Not running
+  } finally {
+    clearTimeout(timer);
+  }
+};
+
+/**
+ * @returns {Promise<Set<string>|null>} - The tools the service runs, null if it is not running.
+ */
+const servedTools = () => {
+  if (!health || performance.now() - health.checked > HEALTH_RETRY_MS) {
+    health = { checked: performance.now(), tools: fetchTools() };
+  }
+  return health.tools;
+};
+
+// Same trimming as the wrappers' outputs (see wrapper_template.js.j2)
+const trimBytes = (bytes) => {
+  const isSpace = (byte) => byte === 0x20 || (byte >= 0x09 && byte <= 0x0d);
+  let start = 0;
+  let end = bytes.length;
+  while (start < end && isSpace(bytes[start])) start++;
+  while (end > start && isSpace(bytes[end - 1])) end--;
+  return bytes.subarray(start, end);
+};
+
+/**
+ * Runs a tool in the service.
+ * @returns {Promise<Object|null>} - A result as returned by a keepBytes runner (see
+ *   getToolRunner), or null if the tool did not run there.
+ */
+const runNative = async (toolName, input, args, options) => {
+  const start = performance.now();
+  const query = args.map((arg) => `arg=${encodeURIComponent(arg)}`).join('&');
+  try {
+    const response = await fetch(`${config.url}/run/${toolName}${query ? `?${query}` : ''}`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/octet-stream', ...CLIENT_HEADER },
+      body: input,
+    });
+    if (!response.ok) return null; // Full queue
+    const job = response.headers.get('X-GTO-Job');
+    const output = options.streamOutput ? await response.blob() : new Uint8Array(await response.arrayBuffer());
+    const report = await (await fetch(`${config.url}/jobs/${job}`)).json();
+
+    const total = performance.now() - start;
+    const result = {
+      stderr: (report.stderr || '').trim(),
+      exitCode: report.exit_code,
+      metrics: {
+        native: true,
+        timings: { callMain: report.elapsed * 1000, outputRead: Math.max(0, total - report.elapsed * 1000) },
+        inputBytes: report.input_bytes,
+        outputBytes: report.output_bytes,
+      },
+    };
+    if (isBlob(output)) return { ...result, stdout: output, streamed: true };
+    const bytes = trimBytes(output);
+    return { ...result, stdout: decoder.decode(bytes), stdoutBytes: bytes };
+  } catch (error) {
+    console.warn(`Native run of ${toolName} failed, running it in WebAssembly:`, error);
+    health = null;
+    return null;
+  }
+};
+
+/**
+ * Wraps the run function of a tool so large inputs run in the native service when it is
+ * running, and in the run function otherwise.
+ * @param {string} toolName - Tool name without the 'gto_' prefix.
+ * @param {Function} runFunction - A keepBytes runner, (input, args, options) => Promise<result>
+ * @returns {Function} - A function with the same signature as runFunction.
+ */
+export const withNativeService = (toolName, runFunction) => async (input, args = [], options = {}) => {
+  // Runs given files besides stdin (e.g. an index of the input) need the virtual filesystem
+  if (!config.enabled || options.files || inputSize(input) < config.thresholdBytes) {
+    return runFunction(input, args, options);
+  }
+  const tools = await servedTools();
+  const result = tools && tools.has(toolName) ? await runNative(toolName, input, args, options) : null;
+  return result ?? runFunction(input, args, options);
+};
+
+if (typeof window !== 'undefined') {
+  window.gtoNativeService = { configure: configureNativeService, config: getNativeServiceConfig };
+}
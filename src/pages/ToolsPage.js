@@ -1,6 +1,6 @@
 import { Box, Container, Grid, Typography } from '@mui/material';
 import React, { useState } from 'react';
-import { loadWasmModule } from '../gtoWasm';
+import { getToolRunner } from '../gtoWasm';
 import AllOperationsPanel from '/src/components/AllOperationsPanel';
 import ToolInputPanel from '/src/components/ToolInputPanel';
 import ToolOutputPanel from '/src/components/ToolOutputPanel';
@@ -17,7 +17,7 @@ const ToolsPage = () => {
 
         try {
             const startTime = performance.now();
-            const runFunction = await loadWasmModule(tool.name);
+            const runFunction = await getToolRunner(tool.name);
             const loadTime = performance.now() - startTime;
             console.log(`Module ${tool.name} loaded in ${loadTime.toFixed(2)}ms`);
             const outputData = await runFunction('', ['-h']);
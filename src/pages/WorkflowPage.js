@@ -12,6 +12,7 @@ import ErrorBoundary from '/src/components/ErrorBoundary'; // Ensure this compon
 import OperationsPanel from '/src/components/OperationsPanel';
 import RecipePanel from '/src/components/RecipePanel';
 import { DataTypeContext } from '/src/contexts/DataTypeContext';
+import { loadState, resolveContents, saveState } from '/src/workflowStore';
 
 
 const WorkflowPage = () => {
@@ -38,26 +39,29 @@ const WorkflowPage = () => {
     const theme = useTheme();
     const isMobile = useMediaQuery(theme.breakpoints.down('sm'));
 
-    // Load workflow and input data from localStorage
+    // Load the workflow from localStorage and the input data from the workflow store
     useEffect(() => {
         const savedWorkflow = localStorage.getItem('workflow');
-        const savedInputData = localStorage.getItem('inputData');
         const savedInputDataType = localStorage.getItem('inputDataType');
 
         if (savedWorkflow) {
             setWorkflow(JSON.parse(savedWorkflow));
         }
-        if (savedInputData) {
-            setInputData(savedInputData);
-        }
         if (savedInputDataType) {
             setInputDataType(savedInputDataType);
         }
 
-        setIsVariableLoaded(true); // Set flag to true after loading workflow
+        const loadInputData = async () => {
+            const savedInputData = await resolveContents(await loadState('inputData', 'text'));
+            if (savedInputData) {
+                setInputData(savedInputData);
+            }
+            setIsVariableLoaded(true); // Set flag to true after loading workflow
+        };
+        loadInputData();
     }, []);
 
-    // Save workflow in localStorage
+    // Save workflow in localStorage (kept there, small, for the module prefetch in gtoWasm.js)
     useEffect(() => {
         if (isVariableLoaded) {
             // Create a copy of the workflow and remove file input parameters
@@ -76,10 +80,12 @@ const WorkflowPage = () => {
         }
     }, [workflow, isVariableLoaded]);
 
-    // Save input in localStorage
+    // Save input in the workflow store (debounced, in IndexedDB)
     useEffect(() => {
-        localStorage.setItem('inputData', inputData);
-    }, [inputData]);
+        if (isVariableLoaded) {
+            saveState('inputData', inputData);
+        }
+    }, [inputData, isVariableLoaded]);
 
     // Save input data type in localStorage
     useEffect(() => {
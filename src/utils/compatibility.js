@@ -1,4 +1,5 @@
 import description from '../../description.json';
+import { loadBuiltTools, loadToolRegistry } from '../gtoWasm';
 
 /**
  * Checks if fasta_merge_streams should be available based on workflow state
@@ -13,6 +14,43 @@ export const isFastaMergeStreamsAvailable = (workflow) => {
   return splitCount > mergeCount;
 };
 
+// Compatible tools by input format, computed once per format instead of on every lookup
+const compatibleToolsIndex = new Map();
+const fastaMergeStreamsTool = description.tools.find(tool => tool.name === 'gto_fasta_merge_streams');
+
+// Tools of description.json by name (without 'gto_'), and their order there
+const toolsByName = new Map(description.tools.map(tool => [tool.name.replace(/^gto_/, ''), tool]));
+const toolOrder = new Map(description.tools.map((tool, index) => [tool, index]));
+
+// Indexes of the tool registry (see generate_wrapper.py), null until loaded or if it is missing
+let registryIndexes = null;
+
+// Tools with a compiled module (without 'gto_'), null until loaded or if it is not known
+let builtTools = null;
+
+// Tools of description.json that can run, all of them while the built ones are not known
+const scannedTools = () =>
+  (builtTools ? description.tools.filter(tool => builtTools.has(tool.name.replace(/^gto_/, ''))) : description.tools);
+
+/**
+ * Loads the tool registry, so compatible tools are looked up in its indexes by input format
+ * (byInputFormat) and by next tool (next) instead of scanning description.json. The registry
+ * only has the tools with a compiled module; without it, the scan skips the tools missing
+ * from the module manifest. Either way tools that cannot run are not offered.
+ * @returns {Promise<boolean>} - True if the registry indexes are used.
+ */
+export const loadCompatibilityIndexes = async () => {
+  const registry = await loadToolRegistry();
+  registryIndexes = registry?.byInputFormat && registry?.next ? registry : null;
+  builtTools = await loadBuiltTools();
+  compatibleToolsIndex.clear();
+  return registryIndexes !== null;
+};
+
+// Tool objects of names, in the order of description.json
+const toolsOf = (names) =>
+  [...names].map(name => toolsByName.get(name)).filter(Boolean).sort((a, b) => toolOrder.get(a) - toolOrder.get(b));
+
 /**
  * Determines which tools are compatible with the current input format.
  * @param {string} currentFormat - The format of the current input data (e.g., "FASTQ").
@@ -21,14 +59,56 @@ export const isFastaMergeStreamsAvailable = (workflow) => {
  * @returns {Array} - An array of tool objects that are compatible.
  */
 export const getCompatibleTools = (currentFormat, isWorkflowEmpty, workflow = []) => {
-  return description.tools.filter(tool => {
-    // Special case for fasta_merge_streams
-    if (tool.name === 'gto_fasta_merge_streams') {
-      return isFastaMergeStreamsAvailable(workflow);
+  const key = `${isWorkflowEmpty}:${currentFormat}`;
+  if (!compatibleToolsIndex.has(key)) {
+    let tools;
+    if (registryIndexes) {
+      // Formats matching the current one (e.g. FASTA data also matches Multi-FASTA), and the
+      // tools without input when the workflow is empty
+      const names = new Set();
+      for (const [format, formatTools] of Object.entries(registryIndexes.byInputFormat)) {
+        if ((format === '' && isWorkflowEmpty) || format.includes(currentFormat)) {
+          formatTools.forEach(name => names.add(name));
+        }
+      }
+      tools = toolsOf(names);
+    } else {
+      tools = scannedTools().filter(tool => {
+        // Normal compatibility logic
+        const isToolInputEmpty = tool.input.format === '';
+        return (isToolInputEmpty && isWorkflowEmpty) || tool.input.format.includes(currentFormat);
+      });
     }
-    
-    // Normal compatibility logic
-    const isToolInputEmpty = tool.input.format === '';
-    return (isToolInputEmpty && isWorkflowEmpty) || tool.input.format.includes(currentFormat);
+    compatibleToolsIndex.set(key, tools.filter(tool => tool !== fastaMergeStreamsTool));
+  }
+  const compatibleTools = compatibleToolsIndex.get(key);
+
+  // Special case for fasta_merge_streams
+  if (fastaMergeStreamsTool && isFastaMergeStreamsAvailable(workflow)) {
+    return [...compatibleTools, fastaMergeStreamsTool];
+  }
+  return compatibleTools;
+};
+
+/**
+ * Determines which tools can be inserted between two steps: tools taking the output format of
+ * the previous step whose output the next step takes.
+ * @param {string} previousFormat - The format of the output of the previous step.
+ * @param {string} nextToolName - The tool of the next step, without 'gto_'.
+ * @returns {Array} - An array of tool objects that are compatible.
+ */
+export const getInsertableTools = (previousFormat, nextToolName) => {
+  if (registryIndexes) {
+    const candidates = registryIndexes.byInputFormat[previousFormat] || [];
+    return toolsOf(candidates.filter(name => registryIndexes.next[name]?.includes(nextToolName)));
+  }
+
+  const nextTool = toolsByName.get(nextToolName);
+  const nextInputTypes = nextTool.input.format.split(',').map(f => f.trim());
+  return scannedTools().filter((tool) => {
+    const toolInputTypes = tool.input.format.split(',').map(f => f.trim());
+    const toolOutputTypes = tool.output.format.split(',').map(f => f.trim());
+
+    return toolInputTypes.includes(previousFormat) && toolOutputTypes.some((type) => nextInputTypes.includes(type));
   });
-};
\ No newline at end of file
+};
@@ -1,172 +1,365 @@
+// Define mapping of extensions to possible data types
+const extensionToTypeMap = {
+  fasta: ['Multi-FASTA', 'FASTA'],
+  fa: ['Multi-FASTA', 'FASTA'],
+  fastq: ['FASTQ'],
+  fq: ['FASTQ'],
+  fastqpack: ['PackagedFASTQ'],
+  pos: ['POS'],
+  svg: ['SVG'],
+  txt: ['Multi-FASTA', 'FASTA', 'FASTQ', 'PackagedFASTQ', 'DNA', 'RNA', 'AminoAcids', 'text', 'NUM', 'BIN', 'Group'], // Prioritize specific types
+  num: ['NUM'],
+  bin: ['BIN'],
+  // Add more mappings if necessary
+};
+
 /**
- * Detects the data type based on file name or content.
- * @param {string} fileName - Name of the file.
- * @param {string|object} content - Content of the file or object containing multiple outputs.
- * @returns {string} - Detected data type (e.g., 'FASTA', 'FASTQ', 'DNA', 'RNA', 'AminoAcids', 'TEXT', 'UNKNOWN').
+ * Character classes, one bit each. A whole content matches a class when all of its
+ * characters have the bit (DNA to TEXT), a line when all of its non-space characters have it
+ * (SEQ, PRINTABLE).
  */
-export const detectDataType = (fileName, content) => {
-  // Handle object content (multiple outputs)
-  if (typeof content === 'object' && content !== null) {
-    // Try to detect type from the first output file
-    const firstOutput = Object.values(content)[0];
-    if (firstOutput) {
-      return detectDataType(fileName, firstOutput);
+const DNA = 1; // [ACGTNacgtn\s]
+const RNA = 2; // [ACGUacgu\s]
+const GROUP = 4; // [PNUSH*X], case-insensitive
+const AMINO = 8; // [ACDEFGHIKLMNPQRSTVWY\s], case-insensitive
+const BIN = 16; // [01\s]
+const TEXT = 32; // [\x20-\x7E\s]
+const SPACE = 64; // \s
+const SEQ = 128; // [ACGTNacgtn]
+const PRINTABLE = 256; // [!-~]
+const ALL_CLASSES = 511;
+
+const SPACE_CLASSES = DNA | RNA | AMINO | BIN | TEXT | SPACE;
+
+const LF = 10;
+const CR = 13;
+const TAB = 9;
+const DEL = 127;
+
+const buildClassTable = () => {
+  const table = new Uint16Array(128);
+  const add = (chars, bits) => {
+    for (const c of chars) {
+      table[c.charCodeAt(0)] |= bits;
+      table[c.toLowerCase().charCodeAt(0)] |= bits;
     }
-    return 'UNKNOWN';
+  };
+  for (let code = 0x20; code <= 0x7e; code++) table[code] |= TEXT;
+  for (let code = 0x21; code <= 0x7e; code++) table[code] |= PRINTABLE;
+  for (const code of [9, 10, 11, 12, 13, 32]) table[code] |= SPACE_CLASSES;
+  add('ACGTN', DNA | SEQ);
+  add('ACGU', RNA);
+  add('PNUSH*X', GROUP);
+  add('ACDEFGHIKLMNPQRSTVWY', AMINO);
+  add('01', BIN);
+  return table;
+};
+
+const CLASS_TABLE = buildClassTable();
+
+// Non-ASCII characters matched by \s (and removed by String.prototype.trim)
+const isUnicodeSpace = (code) =>
+  code === 0xa0 || code === 0x1680 || (code >= 0x2000 && code <= 0x200a) || code === 0x2028 ||
+  code === 0x2029 || code === 0x202f || code === 0x205f || code === 0x3000 || code === 0xfeff;
+
+const classOf = (code) => (code < 128 ? CLASS_TABLE[code] : isUnicodeSpace(code) ? SPACE_CLASSES : 0);
+
+/**
+ * Per-line statistics, as the former line.trim() and regex tests saw them.
+ */
+class LineStats {
+  constructor() {
+    this.reset();
   }
 
-  // Handle string content
-  if (typeof content !== 'string') {
-    return 'UNKNOWN';
+  reset() {
+    this.length = 0;
+    this.first = -1;
+    this.nonSpace = 0;
+    this.leadingSpace = false; // Spaces before the first non-space character
+    this.trailingSpace = false; // Spaces after the last non-space character, so far
+    this.innerSpace = false; // Spaces between non-space characters
+    this.classes = ALL_CLASSES; // Classes shared by the non-space characters
+    this.escapes = 0; // DEL characters (packaged FASTQ)
+    this.digitRun = 0; // Trailing digits, and the character before them
+    this.beforeDigits = -1;
   }
 
-  // Trim content to remove leading/trailing whitespace
-  const trimmedContent = content.trim();
+  push(code, bits) {
+    if (this.length++ === 0) this.first = code;
+    if (bits & SPACE) {
+      if (this.nonSpace === 0) this.leadingSpace = true;
+      else this.trailingSpace = true;
+    } else {
+      if (this.trailingSpace) this.innerSpace = true;
+      this.trailingSpace = false;
+      this.nonSpace++;
+      this.classes &= bits;
+    }
+    if (code >= 48 && code <= 57) {
+      this.digitRun++;
+    } else {
+      if (code === DEL) this.escapes++;
+      this.digitRun = 0;
+      this.beforeDigits = code;
+    }
+  }
 
-  // Check file extension
-  const extension = fileName.split('.').pop().toLowerCase();
+  // line.trim() is not empty and only has characters of the class
+  trimmedMatches(bit) {
+    return this.nonSpace > 0 && !this.innerSpace && (this.classes & bit) !== 0;
+  }
+}
 
-  // Define mapping of extensions to possible data types
-  const extensionToTypeMap = {
-    fasta: ['Multi-FASTA', 'FASTA'],
-    fa: ['Multi-FASTA', 'FASTA'],
-    fastq: ['FASTQ'],
-    fq: ['FASTQ'],
-    fastqpack: ['PackagedFASTQ'],
-    pos: ['POS'],
-    svg: ['SVG'],
-    txt: ['Multi-FASTA', 'FASTA', 'FASTQ', 'PackagedFASTQ', 'DNA', 'RNA', 'AminoAcids', 'text', 'NUM', 'BIN', 'Group'], // Prioritize specific types
-    num: ['NUM'],
-    bin: ['BIN'],
-    // Add more mappings if necessary
-  };
+/**
+ * Computes every predicate of the detection in one pass over content[start, end).
+ * FASTA blocks follow content.split('>'), lines follow split(/\r?\n/), as before.
+ * @param {boolean} partial - The range is a sample cut at a line end: FASTQ ignores an
+ *   incomplete last record.
+ */
+const scanContent = (content, start, end, partial) => {
+  const line = new LineStats();
+  const blockLine = new LineStats();
+
+  let classes = ALL_CLASSES;
+  let lineCount = 0;
+  let headers = 0;
+  let fastaLines = 0;
+  let fastaValid = true;
+  let fastqLines = 0; // Leading lines with the FASTQ structure
+  let packagedValid = true;
 
-  // Define regex patterns for new data types
-  const dnaPattern = /^[ACGTNacgtn\s]+$/;
-  const rnaPattern = /^[ACGUacgu\s]+$/;
-  const aminoAcidsPattern = /^[ACDEFGHIKLMNPQRSTVWYacdefghiklmnpqrstvwy\s]+$/;
-  const groupPattern = /^[PNUSH\*X]+$/i;
+  // Multi-FASTA: state of the current block (text after a '>')
+  let multiValid = true;
+  let inBlock = false;
+  let blockLines = 0; // Non-blank lines
+  let sequenceStarted = false;
+  let sequencePendingSpace = false;
+  let blockValid = true;
 
-  // Function to count headers starting with '>'
-  const countHeaders = (content) => {
-    const lines = content.split(/\r?\n/);
-    return lines.filter(line => line.startsWith('>')).length;
+  const endLine = () => {
+    const index = lineCount++;
+    if (line.first === 62) { // '>'
+      headers++;
+    } else {
+      fastaLines++;
+      if (fastaValid && !line.trimmedMatches(SEQ)) fastaValid = false;
+    }
+    if (fastqLines === index) {
+      const position = index % 4;
+      const valid = position === 0 ? line.first === 64 // '@'
+        : position === 2 ? line.first === 43 // '+'
+          : line.trimmedMatches(PRINTABLE); // Sequence or quality
+      if (valid) fastqLines++;
+    }
+    if (index < 5 && packagedValid) {
+      packagedValid = line.escapes >= 3 && line.digitRun > 0 && line.beforeDigits === TAB;
+    }
+    line.reset();
   };
 
-  // Check based on file extension
-  if (extensionToTypeMap[extension]) {
-    for (const type of extensionToTypeMap[extension]) {
-      switch (type) {
-        case 'PackagedFASTQ':
-          // Check if this is a packaged FASTQ file
-          // Each line contains ESCAPE (ASCII 127) characters and ends with a tab followed by a number
-          const lines = trimmedContent.split(/\r?\n/);
-
-          // Check at least the first few lines to confirm pattern
-          const isPackagedFastq = lines.slice(0, Math.min(5, lines.length)).every(line => {
-            // Count escape characters (ASCII 127 or char code 127)
-            const escapeCount = (line.match(/\x7F/g) || []).length;
-
-            // Should have at least 3 escape characters and end with \t followed by a number
-            return escapeCount >= 3 && /\t\d+$/.test(line);
-          });
-
-          if (isPackagedFastq && lines.length > 0) {
-            return 'PackagedFASTQ';
-          }
-          break;
-
-        case 'Multi-FASTA':
-          if (trimmedContent.startsWith('>')) {
-            const headers = countHeaders(trimmedContent);
-            if (headers >= 2) {
-              const fastaBlocks = trimmedContent.split('>').slice(1); // Split and ignore the first empty element
-              const isValid = fastaBlocks.every(block => {
-                const lines = block.split(/\r?\n/).filter(line => line.trim() !== '');
-                const sequence = lines.slice(1).join('');
-                // Allow sequences with A, C, G, T, N (case-insensitive)
-                return lines.length > 1 && /^[ACGTacgtNn]+$/.test(sequence.trim());
-              });
-              if (isValid) {
-                return 'Multi-FASTA';
-              }
-            }
-          }
-          break;
-
-        case 'FASTA':
-          if (trimmedContent.startsWith('>')) {
-            const headers = countHeaders(trimmedContent);
-            if (headers === 1) {
-              const lines = trimmedContent.split(/\r?\n/).filter(line => !line.startsWith('>'));
-              const isValid = lines.length > 0 && lines.every(line => /^[ACGTacgtNn]+$/.test(line.trim()));
-              if (isValid) {
-                return 'FASTA';
-              }
-            }
-          }
-          break;
-
-        case 'FASTQ':
-          if (trimmedContent.startsWith('@')) {
-            const lines = trimmedContent.split(/\r?\n/);
-            if (
-              lines.length >= 4 &&
-              lines.length % 4 === 0 &&
-              lines.every((line, index) => {
-                if (index % 4 === 0) return line.startsWith('@');
-                if (index % 4 === 2) return line.startsWith('+');
-                // Lines 1 and 3 should contain sequence and quality scores respectively
-                return /^[ACGTacgtNn]+$/.test(line.trim()) || /^[!-~]+$/.test(line.trim());
-              })
-            ) {
-              return 'FASTQ';
-            }
-          }
-          break;
-
-        // Add more cases as needed
-        default:
-          break;
+  const endBlockLine = () => {
+    if (blockLine.nonSpace > 0 && blockValid) {
+      if (++blockLines > 1) {
+        // Sequence lines are joined, then trimmed: spaces only around the whole sequence
+        if (sequencePendingSpace || (sequenceStarted && blockLine.leadingSpace) ||
+          blockLine.innerSpace || !(blockLine.classes & SEQ)) {
+          blockValid = false;
+        }
+        sequenceStarted = true;
+        sequencePendingSpace = blockLine.trailingSpace;
       }
     }
-  }
+    blockLine.reset();
+  };
 
-  // Check content directly if no extension matches or specific type wasn't detected
-  if (trimmedContent.startsWith('<svg')) {
-    return 'SVG';
+  // The last block of a sample may be cut after its header
+  const endBlock = (last = false) => {
+    endBlockLine();
+    if (inBlock && !(blockValid && (blockLines > 1 || last))) multiValid = false;
+    inBlock = true;
+    blockLines = 0;
+    sequenceStarted = false;
+    sequencePendingSpace = false;
+    blockValid = true;
+  };
+
+  for (let i = start; i < end; i++) {
+    const code = content.charCodeAt(i);
+    if (code === CR && i + 1 < end && content.charCodeAt(i + 1) === LF) continue; // Part of \r\n
+    const bits = classOf(code);
+    classes &= bits;
+    if (code === LF) {
+      endLine();
+      endBlockLine();
+      continue;
+    }
+    line.push(code, bits);
+    if (code === 62) {
+      endBlock();
+    } else {
+      blockLine.push(code, bits);
+    }
   }
+  endLine();
+  endBlock(partial);
+
+  return {
+    classes: end > start ? classes : 0,
+    first: end > start ? content.charCodeAt(start) : -1,
+    lineCount,
+    headers,
+    fastaLines,
+    fastaValid,
+    fastqLines,
+    multiValid,
+    packagedValid,
+    partial,
+  };
+};
 
-  // Additional detections for new data types
-  if (dnaPattern.test(trimmedContent)) {
-    return 'DNA';
+const isSpaceCode = (code) => (classOf(code) & SPACE) !== 0;
+
+// Sizes of the contents sampled by { sample: true }, in characters
+export const DEFAULT_SAMPLE_SIZE = 1 << 20;
+
+/**
+ * Scans of recent contents, by content string then sample size. Outputs are detected again on
+ * every re-render of a workflow, so each one is scanned once. Holds at most MEMO_MAX_ENTRIES
+ * contents and MEMO_MAX_CHARS characters, dropping the least recently used.
+ */
+const MEMO_MAX_ENTRIES = 64;
+const MEMO_MAX_CHARS = 64 << 20;
+const scanMemo = new Map();
+let memoChars = 0;
+
+const memoizedScan = (content, sampleSize) => {
+  let scans = scanMemo.get(content);
+  if (scans) {
+    // Move to the most recently used end
+    scanMemo.delete(content);
+    scanMemo.set(content, scans);
+    if (scans.has(sampleSize)) return scans.get(sampleSize);
   }
 
-  if (rnaPattern.test(trimmedContent)) {
-    return 'RNA';
+  // Trimmed range, as content.trim()
+  let start = 0;
+  let end = content.length;
+  while (start < end && isSpaceCode(content.charCodeAt(start))) start++;
+  while (end > start && isSpaceCode(content.charCodeAt(end - 1))) end--;
+
+  // Samples end at the last line end within the sample size
+  let partial = false;
+  if (end - start > sampleSize) {
+    partial = true;
+    const lineEnd = content.lastIndexOf('\n', start + sampleSize);
+    end = lineEnd > start ? lineEnd : start + sampleSize;
+    while (end > start && isSpaceCode(content.charCodeAt(end - 1))) end--;
   }
 
-  if (groupPattern.test(trimmedContent)) {
-    return 'Group';
+  const scan = scanContent(content, start, end, partial);
+  scan.svg = content.startsWith('<svg', start);
+
+  if (content.length <= MEMO_MAX_CHARS) {
+    if (!scans) {
+      scans = new Map();
+      scanMemo.set(content, scans);
+      memoChars += content.length;
+      for (const [oldContent] of scanMemo) {
+        if (scanMemo.size <= MEMO_MAX_ENTRIES && memoChars <= MEMO_MAX_CHARS) break;
+        scanMemo.delete(oldContent);
+        memoChars -= oldContent.length;
+      }
+    }
+    scans.set(sampleSize, scan);
   }
+  return scan;
+};
+
+const matchesType = (type, scan) => {
+  switch (type) {
+    case 'PackagedFASTQ':
+      // Each of the first lines contains ESCAPE (ASCII 127) characters and ends with a tab followed by a number
+      return scan.packagedValid;
+
+    case 'Multi-FASTA':
+      // Every block has a header and a sequence of A, C, G, T, N (case-insensitive)
+      return scan.first === 62 && scan.headers >= 2 && scan.multiValid;
 
-  if (aminoAcidsPattern.test(trimmedContent)) {
-    return 'AminoAcids';
+    case 'FASTA':
+      return scan.first === 62 && scan.headers === 1 && scan.fastaLines > 0 && scan.fastaValid;
+
+    case 'FASTQ': {
+      // Records of 4 lines: @header, sequence, +, quality scores
+      if (scan.first !== 64) return false;
+      if (scan.partial) {
+        const completeLines = scan.lineCount - (scan.lineCount % 4);
+        return completeLines >= 4 && scan.fastqLines >= completeLines;
+      }
+      return scan.lineCount >= 4 && scan.lineCount % 4 === 0 && scan.fastqLines === scan.lineCount;
+    }
+
+    // Add more cases as needed
+    default:
+      return false;
   }
+};
 
-  if (/^[01\s\r\n]+$/.test(trimmedContent)) {
-    return 'BIN';
+/**
+ * Detects the data type based on file name or content.
+ * All the type checks come from a single scan of the content, memoized per content.
+ * @param {string} fileName - Name of the file.
+ * @param {string|object} content - Content of the file or object containing multiple outputs.
+ * @param {Object} options - { sample: only scan the first DEFAULT_SAMPLE_SIZE characters of
+ *   larger contents (or sampleSize characters), cut at a line end }.
+ * @returns {string} - Detected data type (e.g., 'FASTA', 'FASTQ', 'DNA', 'RNA', 'AminoAcids', 'TEXT', 'UNKNOWN').
+ */
+export const detectDataType = (fileName, content, { sample = false, sampleSize = DEFAULT_SAMPLE_SIZE } = {}) => {
+  // Handle object content (multiple outputs)
+  if (typeof content === 'object' && content !== null) {
+    // Try to detect type from the first output file
+    const firstOutput = Object.values(content)[0];
+    if (firstOutput) {
+      return detectDataType(fileName, firstOutput, { sample, sampleSize });
+    }
+    return 'UNKNOWN';
   }
 
-  if (/^\d+(\.\d+)?(\s+\d+(\.\d+)?)*/.test(trimmedContent)) {
-    return 'NUM';
+  // Handle string content
+  if (typeof content !== 'string') {
+    return 'UNKNOWN';
   }
 
-  // Check if content is readable text (contains mostly printable ASCII characters)
-  if (/^[\x20-\x7E\s\r\n]+$/.test(trimmedContent)) {
-    return 'TEXT';
+  const scan = memoizedScan(content, sample ? sampleSize : Infinity);
+
+  // Check based on file extension
+  const extension = fileName.split('.').pop().toLowerCase();
+  for (const type of extensionToTypeMap[extension] || []) {
+    if (matchesType(type, scan)) {
+      return type;
+    }
   }
 
+  // Check content directly if no extension matches or specific type wasn't detected
+  if (scan.svg) return 'SVG';
+  if (scan.classes & DNA) return 'DNA';
+  if (scan.classes & RNA) return 'RNA';
+  if (scan.classes & GROUP) return 'Group';
+  if (scan.classes & AMINO) return 'AminoAcids';
+  if (scan.classes & BIN) return 'BIN';
+  // Starts with a number
+  if (scan.first >= 48 && scan.first <= 57) return 'NUM';
+  // Check if content is readable text (printable ASCII characters)
+  if (scan.classes & TEXT) return 'TEXT';
+
   // Fallback to 'UNKNOWN' if the content doesn't match any known type or isn't readable text
   return 'UNKNOWN';
-};
\ No newline at end of file
+};
+
+/**
+ * Detects the type of a step output, for the tools offered next. Outputs can be far larger
+ * than inputs and are not validated against their type, so large ones are sampled.
+ * @param {string|object} content - The output, or an object of output files.
+ * @returns {string} - Detected data type.
+ */
+export const detectOutputType = (content) => detectDataType('output.txt', content, { sample: true });
@@ -1,9 +1,13 @@
+import { STREAMING_THRESHOLD_BYTES } from '../wasmStreams';
 import { detectDataType } from './detectDataType';
 
 // Define acceptable file extensions
 export const acceptableExtensions = ['.fasta', '.fa', '.fastq', '.fq', '.pos', '.svg', '.txt', '.num'];
 
-const readFirstNLines = (file, maxLines = 100) => {
+// Lines loaded as text from streamed files and outputs, for display and type detection
+export const PREVIEW_LINES = 10000;
+
+export const readFirstNLines = (file, maxLines = 100) => {
     return new Promise((resolve, reject) => {
         let lineCount = 0;
         let result = '';
@@ -78,15 +82,15 @@ export const processFile = async (file, validateData, showNotification) => {
         return null;
     }
 
-    const fileSizeLimit = 1 * 1024 * 1024; // 1MB limit
-    const isPartial = file.size > fileSizeLimit;
+    // Larger files are streamed to the tools; only their first lines are loaded as text
+    const isPartial = file.size > STREAMING_THRESHOLD_BYTES;
 
     try {
         let content;
 
         if (isPartial) {
-            showNotification(`The file ${file.name} is too large. Only the first 10000 lines will be loaded.`, 'warning');
-            content = await readFirstNLines(file, 10000);
+            showNotification(`The file ${file.name} is large. Only the first ${PREVIEW_LINES} lines are shown; the tools read the whole file.`, 'info');
+            content = await readFirstNLines(file, PREVIEW_LINES);
         } else {
             // For smaller files, read the entire content
             const reader = new FileReader();
@@ -110,6 +114,7 @@ export const processFile = async (file, validateData, showNotification) => {
             type: "file",
             fileType: detectedType,
             content,
+            source: isPartial ? file : undefined, // Streamed to the tools (see RecipePanel)
             size: file.size,
             lastModified: new Date(file.lastModified),
             relativePath: '',
@@ -0,0 +1,146 @@
+/**
+ * Line-offset indexes of texts, for the windowed TextViewer.
+ *
+ * An index splits a text in display rows: one per line, with lines longer than
+ * MAX_ROW_CHARS (e.g. a single-line SVG) split over several rows, so a row never puts more
+ * than MAX_ROW_CHARS characters in the DOM. It also lists the first row of each line and
+ * of each FASTA/FASTQ record, for jump-to-line and jump-to-record navigation.
+ *
+ * Indexes of Blobs are built by reading them in chunks, with byte offsets; the viewer then
+ * reads only the rows it shows.
+ */
+
+export const MAX_ROW_CHARS = 2000;
+export const INDEX_CHUNK_BYTES = 4 * 1024 * 1024;
+
+const NEWLINE = 10;
+const CARRIAGE_RETURN = 13;
+const FASTA_HEADER = 62; // '>'
+const FASTQ_HEADER = 64; // '@'
+
+class LineIndexBuilder {
+  constructor() {
+    this.rowStarts = [];
+    this.rowEnds = [];
+    this.lineRows = [];
+    this.recordRows = [];
+    this.format = null; // 'fasta' or 'fastq', from the first character
+  }
+
+  /**
+   * Adds the line [start, end), without its newline.
+   * @param {number} firstCode - Code of the first character of the line (-1 if empty).
+   * @param {number} lastCode - Code of the last character, to drop the '\r' of CRLF lines.
+   */
+  addLine(start, end, firstCode, lastCode) {
+    const line = this.lineRows.length;
+    if (line === 0) {
+      this.format = firstCode === FASTA_HEADER ? 'fasta' : firstCode === FASTQ_HEADER ? 'fastq' : null;
+    }
+    if (lastCode === CARRIAGE_RETURN) end -= 1;
+
+    const row = this.rowStarts.length;
+    this.lineRows.push(row);
+    if (
+      (this.format === 'fasta' && firstCode === FASTA_HEADER) ||
+      (this.format === 'fastq' && line % 4 === 0 && firstCode === FASTQ_HEADER)
+    ) {
+      this.recordRows.push(row);
+    }
+    let rowStart = start;
+    do {
+      const rowEnd = Math.min(end, rowStart + MAX_ROW_CHARS);
+      this.rowStarts.push(rowStart);
+      this.rowEnds.push(rowEnd);
+      rowStart = rowEnd;
+    } while (rowStart < end);
+  }
+
+  build(size) {
+    return {
+      size,
+      format: this.format,
+      rowStarts: Float64Array.from(this.rowStarts),
+      rowEnds: Float64Array.from(this.rowEnds),
+      lineRows: Uint32Array.from(this.lineRows),
+      recordRows: Uint32Array.from(this.recordRows),
+    };
+  }
+}
+
+/**
+ * Indexes a string, with character offsets.
+ * @param {string} text
+ * @returns {Object} - { size, format, rowStarts, rowEnds, lineRows, recordRows }
+ */
+export const buildTextIndex = (text) => {
+  const builder = new LineIndexBuilder();
+  let start = 0;
+  while (start < text.length) {
+    let end = text.indexOf('\n', start);
+    if (end === -1) end = text.length;
+    builder.addLine(
+      start,
+      end,
+      end > start ? text.charCodeAt(start) : -1,
+      end > start ? text.charCodeAt(end - 1) : -1
+    );
+    start = end + 1;
+  }
+  return builder.build(text.length);
+};
+
+/**
+ * Indexes a Blob, with byte offsets, reading it INDEX_CHUNK_BYTES at a time.
+ * @param {Blob} blob
+ * @param {Function} isCancelled - Stops the indexing when it returns true.
+ * @returns {Promise<Object|null>} - The index, or null if cancelled.
+ */
+export const buildBlobIndex = async (blob, isCancelled = () => false) => {
+  const builder = new LineIndexBuilder();
+  let lineStart = 0;
+  let firstCode = -1;
+  let lastCode = -1;
+  for (let offset = 0; offset < blob.size; offset += INDEX_CHUNK_BYTES) {
+    if (isCancelled()) return null;
+    const bytes = new Uint8Array(await blob.slice(offset, offset + INDEX_CHUNK_BYTES).arrayBuffer());
+    let position = 0;
+    while (position < bytes.length) {
+      if (offset + position === lineStart) firstCode = bytes[position];
+      const newline = bytes.indexOf(NEWLINE, position);
+      if (newline === -1) {
+        lastCode = bytes[bytes.length - 1];
+        break;
+      }
+      if (newline > position) lastCode = bytes[newline - 1];
+      const end = offset + newline;
+      builder.addLine(lineStart, end, end > lineStart ? firstCode : -1, end > lineStart ? lastCode : -1);
+      lineStart = end + 1;
+      position = newline + 1;
+    }
+  }
+  if (lineStart < blob.size) {
+    builder.addLine(lineStart, blob.size, firstCode, lastCode);
+  }
+  return builder.build(blob.size);
+};
+
+/**
+ * Finds the line or record a row belongs to.
+ * @param {Uint32Array} rows - Sorted first rows (lineRows or recordRows).
+ * @param {number} row
+ * @returns {number} - Index of the last entry <= row.
+ */
+export const findEntry = (rows, row) => {
+  let low = 0;
+  let high = rows.length - 1;
+  while (low < high) {
+    const middle = (low + high + 1) >> 1;
+    if (rows[middle] <= row) {
+      low = middle;
+    } else {
+      high = middle - 1;
+    }
+  }
+  return low;
+};
@@ -0,0 +1,135 @@
+/**
+ * Indexes of large FASTA inputs, for the extraction tools.
+ *
+ * Tools with an `index_flag` in description.json (gto_fasta_extract, gto_fasta_extract_by_read)
+ * take the index built by gto_fasta_index and seek to the records they extract from, instead
+ * of reading a streamed input from its beginning. An index is built on the first run over an
+ * input, kept for the session and saved in the workflow store with the last few indexes, keyed
+ * by a fingerprint of the input (its size and the hash of its first and last bytes).
+ *
+ * The tools check that the input has a record header and a line end where the index says;
+ * if it does not (an input edited in the middle), the index is dropped and the step runs
+ * without it.
+ *
+ * Indexes are only used once the module of gto_fasta_index is built (see loadBuiltTools): it
+ * is built with the modules of the extraction tools that take an index (build_wasm.py), and
+ * older modules of these tools do not know the index flag.
+ */
+import { getToolRunner, loadBuiltTools, streamsBlobInputs } from '../gtoWasm';
+import { withNativeService } from '../nativeService';
+import { isBlob } from '../wasmStreams';
+import { loadContent, isContentRef, loadState, saveState } from '../workflowStore';
+import { hashData } from './stepResultCache';
+
+export const INDEX_FILE = 'input.gfi';
+export const MAX_SAVED_INDEXES = 8;
+
+const FINGERPRINT_BYTES = 64 * 1024;
+const SAVED_INDEXES_KEY = 'sequenceIndexes';
+
+// Errors of the tools given an index that is not of their input
+const INDEX_ERRORS = /index does not match|invalid index/;
+
+const indexes = new Map(); // fingerprint -> Promise of the index text (null if it cannot be built)
+let savedIndexes = null; // Promise of the saved [{ fingerprint, index }], most recent last
+
+/**
+ * @param {Blob} blob
+ * @returns {Promise<string>} - The size of the Blob and the hashes of its first and last bytes.
+ */
+export const fingerprintBlob = async (blob) => {
+  const head = new Uint8Array(await blob.slice(0, FINGERPRINT_BYTES).arrayBuffer());
+  const tail = new Uint8Array(await blob.slice(Math.max(0, blob.size - FINGERPRINT_BYTES)).arrayBuffer());
+  return `${blob.size}:${hashData(head)}:${hashData(tail)}`;
+};
+
+const loadSavedIndexes = () => {
+  if (!savedIndexes) {
+    savedIndexes = loadState(SAVED_INDEXES_KEY).then((saved) => (Array.isArray(saved) ? saved : []));
+  }
+  return savedIndexes;
+};
+
+const saveIndex = async (fingerprint, index) => {
+  const saved = (await loadSavedIndexes()).filter((entry) => entry.fingerprint !== fingerprint);
+  if (index !== null) saved.push({ fingerprint, index });
+  savedIndexes = Promise.resolve(saved.slice(-MAX_SAVED_INDEXES));
+  saveState(SAVED_INDEXES_KEY, await savedIndexes);
+};
+
+const loadIndex = async (fingerprint) => {
+  const entry = (await loadSavedIndexes()).find((saved) => saved.fingerprint === fingerprint);
+  if (!entry) return undefined;
+  const index = isContentRef(entry.index) ? await loadContent(entry.index) : entry.index;
+  return typeof index === 'string' ? index : undefined;
+};
+
+const buildIndex = async (blob) => {
+  // Large inputs are indexed by the native service when it is running
+  const run = withNativeService('fasta_index', await getToolRunner('fasta_index'));
+  const result = await run(blob, [], { streamOutput: true });
+  // Only a streamed output has its first line as it is (outputs in text are trimmed)
+  if (result.exitCode || !isBlob(result.stdout)) return null;
+  return result.stdout.text();
+};
+
+/**
+ * Checks if the modules that build and take indexes were built.
+ * @returns {Promise<boolean>}
+ */
+export const sequenceIndexesAvailable = async () => Boolean((await loadBuiltTools())?.has('fasta_index'));
+
+/**
+ * Returns the index of a streamed input, building it if it is not known.
+ * @param {Blob} blob - The input.
+ * @returns {Promise<string|null>} - The index, or null if the input is not FASTA.
+ */
+export const getSequenceIndex = async (blob) => {
+  const fingerprint = await fingerprintBlob(blob);
+  if (!indexes.has(fingerprint)) {
+    const index = (async () => {
+      const saved = await loadIndex(fingerprint);
+      if (saved !== undefined) return saved;
+      const built = await buildIndex(blob);
+      if (built !== null) await saveIndex(fingerprint, built);
+      return built;
+    })();
+    indexes.set(fingerprint, index);
+    // A failed build is retried on the next run
+    index.catch(() => indexes.delete(fingerprint));
+  }
+  return indexes.get(fingerprint);
+};
+
+/**
+ * Forgets the index of an input.
+ * @param {Blob} blob
+ */
+export const dropSequenceIndex = async (blob) => {
+  const fingerprint = await fingerprintBlob(blob);
+  indexes.delete(fingerprint);
+  await saveIndex(fingerprint, null);
+};
+
+/**
+ * Runs a step over a streamed input, giving the tool the index of the input when it takes one.
+ * @param {Function} runFunction - (input, args, options) => Promise<result>
+ * @param {Object} toolConfig - Tool entry from description.json.
+ * @param {Blob} blob - The input.
+ * @param {Array<string>} args - CLI arguments of the step.
+ * @param {Object} options - Run options.
+ * @returns {Promise<Object>} - The result of the run.
+ */
+export const runWithSequenceIndex = async (runFunction, toolConfig, blob, args, options = {}) => {
+  const flag = toolConfig.index_flag;
+  // On the main thread the input is read as text, so the offsets of the index do not hold
+  const indexed = flag && streamsBlobInputs() && (await sequenceIndexesAvailable());
+  const index = indexed ? await getSequenceIndex(blob).catch(() => null) : null;
+  if (index) {
+    const result = await runFunction(blob, [...args, flag, INDEX_FILE], { ...options, files: { [INDEX_FILE]: index } });
+    if (!result.exitCode || !INDEX_ERRORS.test(result.stderr || '')) return result;
+    console.warn(`The index of the input does not match it, running ${toolConfig.name} without it.`);
+    await dropSequenceIndex(blob);
+  }
+  return runFunction(blob, args, options);
+};
@@ -0,0 +1,129 @@
+/**
+ * Per-step performance metrics of workflow runs.
+ *
+ * The generated wrappers time each phase of a run (script load, compile, instantiate, FS write,
+ * callMain, output read) and report the WASM heap size and input/output byte counts in
+ * result.metrics; getToolRunner adds the decoding time. The recorder adds the wall time of
+ * the step and of its output type detection, and keeps the latest runs.
+ *
+ * Exposed as window.gtoStepMetrics, so test harnesses can read exact per-step metrics:
+ *   window.gtoStepMetrics.toJSON()
+ */
+import { detectOutputType } from './detectDataType';
+
+export const MAX_STEP_METRICS = 1000;
+
+// Phases in the order they happen, for display
+export const METRIC_PHASES = ['scriptLoad', 'compile', 'instantiate', 'fsWrite', 'callMain', 'outputRead', 'decode', 'typeDetection'];
+
+export class StepMetricsRecorder {
+  constructor(maxEntries = MAX_STEP_METRICS) {
+    this.maxEntries = maxEntries;
+    this.entries = [];
+    this.listeners = new Set();
+    this.recordedResults = new WeakSet(); // Results already recorded: later ones come from the step result cache
+  }
+
+  /**
+   * Records a run of a step.
+   * @param {Object} step - Workflow step ({ id, toolName }).
+   * @param {Object} result - The result of the run function, with its metrics.
+   * @param {Object} extra - { total: wall time of the step in ms, typeDetection: ms, pipelined }.
+   * @returns {Object} - The recorded entry.
+   */
+  record(step, result, { total = null, typeDetection = null, pipelined = false } = {}) {
+    const cached = !!result && typeof result === 'object' && this.recordedResults.has(result);
+    const metrics = (!cached && result?.metrics) || {};
+    const entry = {
+      stepId: step.id,
+      toolName: step.toolName,
+      recordedAt: new Date().toISOString(),
+      cached,
+      pipelined,
+      warm: metrics.warm ?? null,
+      native: !!metrics.native, // Run by the native service (see src/nativeService.js)
+      total,
+      timings: { ...metrics.timings },
+      heapBytes: metrics.heapBytes ?? null,
+      inputBytes: metrics.inputBytes ?? null,
+      outputBytes: metrics.outputBytes ?? null,
+    };
+    if (typeDetection !== null) entry.timings.typeDetection = typeDetection;
+    if (result && typeof result === 'object') this.recordedResults.add(result);
+
+    this.entries.push(entry);
+    if (this.entries.length > this.maxEntries) {
+      this.entries.splice(0, this.entries.length - this.maxEntries);
+    }
+    this.listeners.forEach((listener) => listener(this.entries));
+    return entry;
+  }
+
+  /**
+   * @returns {Array<Object>} - The recorded runs, oldest first.
+   */
+  getEntries() {
+    return this.entries.slice();
+  }
+
+  /**
+   * @returns {Map<string, Object>} - The latest run of each step.
+   */
+  getLatestByStep() {
+    const latest = new Map();
+    for (const entry of this.entries) latest.set(entry.stepId, entry);
+    return latest;
+  }
+
+  clear() {
+    this.entries = [];
+    this.listeners.forEach((listener) => listener(this.entries));
+  }
+
+  /**
+   * @param {Function} listener - Called with the entries after every change.
+   * @returns {Function} - Unsubscribes the listener.
+   */
+  subscribe(listener) {
+    this.listeners.add(listener);
+    return () => this.listeners.delete(listener);
+  }
+
+  toJSON() {
+    return {
+      exportedAt: new Date().toISOString(),
+      userAgent: typeof navigator !== 'undefined' ? navigator.userAgent : null,
+      entries: this.entries,
+    };
+  }
+}
+
+// Shared by every component that executes workflow steps
+export const stepMetrics = new StepMetricsRecorder();
+
+if (typeof window !== 'undefined') {
+  window.gtoStepMetrics = stepMetrics;
+}
+
+/**
+ * Wraps the run function of a step so each run is recorded, with its wall time and the time
+ * to detect the type of its text output. Detections are memoized, so the later detections of
+ * the same output are free.
+ * @param {Object} step - Workflow step ({ id, toolName }).
+ * @param {Function} runFunction - (input, args, options) => Promise<result>
+ * @returns {Function} - A function with the same signature as runFunction.
+ */
+export const withStepMetrics = (step, runFunction) => async (input, args, options) => {
+  const start = performance.now();
+  const result = await runFunction(input, args, options);
+  const total = performance.now() - start;
+
+  let typeDetection = null;
+  if (typeof result?.stdout === 'string') {
+    const detectionStart = performance.now();
+    detectOutputType(result.stdout);
+    typeDetection = performance.now() - detectionStart;
+  }
+  stepMetrics.record(step, result, { total, typeDetection });
+  return result;
+};
@@ -0,0 +1,193 @@
+/**
+ * Memoization of workflow step results.
+ *
+ * A step is keyed on the tool name, its CLI arguments (built from the normalized
+ * parameters) and a hash of its input, so re-running a recipe only executes the steps
+ * whose input or parameters changed. Entries are evicted least recently used first once
+ * the cached results exceed a byte budget.
+ */
+
+export const DEFAULT_STEP_CACHE_BYTES = 128 * 1024 * 1024;
+
+/**
+ * Checks if a step always produces the same output for the same input.
+ * Tools driven by a random generator are only deterministic when the seed is set.
+ * @param {Object} toolConfig - Tool entry from description.json.
+ * @param {Object} params - Parameters set by the user for the step.
+ * @returns {boolean}
+ */
+export const isDeterministicStep = (toolConfig, params = {}) => {
+  const seedFlag = toolConfig?.flags?.find((flag) => flag.parameter === 'seed');
+  if (!seedFlag) return true;
+  const seed = params?.seed;
+  return seed !== undefined && seed !== null && `${seed}` !== '';
+};
+
+// Streamed inputs (Blobs) are identified by object, as they cannot be hashed synchronously
+const blobIds = new WeakMap();
+let nextBlobId = 0;
+
+const blobKey = (blob) => {
+  if (!blobIds.has(blob)) blobIds.set(blob, nextBlobId++);
+  return `blob${blobIds.get(blob)}:${blob.size}`;
+};
+
+const isBlob = (value) => typeof Blob !== 'undefined' && value instanceof Blob;
+
+/**
+ * Hashes a string or byte array (cyrb53, 53 bits) and prefixes the length.
+ * @param {string|Uint8Array} data
+ * @returns {string}
+ */
+export const hashData = (data) => {
+  let h1 = 0xdeadbeef;
+  let h2 = 0x41c6ce57;
+  const isBytes = data instanceof Uint8Array;
+  for (let i = 0; i < data.length; i++) {
+    const code = isBytes ? data[i] : data.charCodeAt(i);
+    h1 = Math.imul(h1 ^ code, 2654435761);
+    h2 = Math.imul(h2 ^ code, 1597334677);
+  }
+  h1 = Math.imul(h1 ^ (h1 >>> 16), 2246822507) ^ Math.imul(h2 ^ (h2 >>> 13), 3266489909);
+  h2 = Math.imul(h2 ^ (h2 >>> 16), 2246822507) ^ Math.imul(h1 ^ (h1 >>> 13), 3266489909);
+  const hash = 4294967296 * (2097151 & h2) + (h1 >>> 0);
+  return `${isBytes ? 'b' : 's'}${data.length}:${hash.toString(36)}`;
+};
+
+/**
+ * Hashes a run function input: stdin data or a map of parameter files.
+ * @param {string|Uint8Array|Blob|Object} input
+ * @returns {string}
+ */
+const hashInput = (input) => {
+  if (input === undefined || input === null) return hashData('');
+  if (isBlob(input)) return blobKey(input);
+  if (typeof input === 'object' && !(input instanceof Uint8Array)) {
+    return Object.keys(input)
+      .sort()
+      .map((param) => `${param}=${input[param].name}:${hashInput(input[param].data)}`)
+      .join('|');
+  }
+  return hashData(input);
+};
+
+const sizeOf = (value) => {
+  if (value === undefined || value === null) return 0;
+  if (value instanceof Uint8Array) return value.byteLength;
+  if (isBlob(value)) return value.size;
+  return value.length ?? 0;
+};
+
+/**
+ * Approximate size of a run function result, counting one byte per character.
+ */
+const resultSize = (result) => {
+  let size = sizeOf(result.stdout) + sizeOf(result.stdoutBytes) + sizeOf(result.stderr);
+  if (result.outputs) {
+    for (const content of Object.values(result.outputs)) size += sizeOf(content);
+  }
+  return size;
+};
+
+export class StepResultCache {
+  constructor(maxBytes = DEFAULT_STEP_CACHE_BYTES) {
+    this.maxBytes = maxBytes;
+    this.entries = new Map(); // key -> { result, size }, least recently used first
+    this.pending = new Map(); // key -> Promise of a run in progress
+    this.bytes = 0;
+    this.stats = { hits: 0, misses: 0, bypasses: 0, evictions: 0 };
+  }
+
+  /**
+   * Updates the byte budget, evicting entries if needed.
+   * @param {Object} config - { maxBytes }
+   */
+  configure({ maxBytes } = {}) {
+    if (maxBytes !== undefined) this.maxBytes = maxBytes;
+    this.evict();
+  }
+
+  /**
+   * Wraps a run function so its results are served from the cache.
+   * @param {string} toolName - Tool name without the 'gto_' prefix.
+   * @param {Function} runFunction - (input, args, options) => Promise<result>
+   * @param {boolean} cacheable - False for steps that must always run (see isDeterministicStep).
+   * @returns {Function} - A function with the same signature as runFunction.
+   */
+  wrap(toolName, runFunction, cacheable = true) {
+    if (!cacheable) {
+      return (input, args = [], options = {}) => {
+        this.stats.bypasses++;
+        return runFunction(input, args, options);
+      };
+    }
+    return (input, args = [], options = {}) => this.run(toolName, input, args, options, runFunction);
+  }
+
+  async run(toolName, input, args, options, runFunction) {
+    // Extra files given to the run (e.g. the index of a streamed input) are keyed by their hash
+    const { files, ...runOptions } = options;
+    const filesKey = files
+      ? Object.keys(files).sort().map((name) => `${name}:${hashData(files[name])}`).join('|')
+      : '';
+    const key = `${toolName}\u0000${JSON.stringify(args)}\u0000${JSON.stringify(runOptions)}\u0000${filesKey}\u0000${hashInput(input)}`;
+
+    const entry = this.entries.get(key);
+    if (entry) {
+      // Move to the most recently used position
+      this.entries.delete(key);
+      this.entries.set(key, entry);
+      this.stats.hits++;
+      return entry.result;
+    }
+
+    // Identical runs already in progress share their result
+    if (this.pending.has(key)) {
+      this.stats.hits++;
+      return this.pending.get(key);
+    }
+
+    this.stats.misses++;
+    const promise = runFunction(input, args, options);
+    this.pending.set(key, promise);
+    try {
+      const result = await promise;
+      this.store(key, result);
+      return result;
+    } finally {
+      this.pending.delete(key);
+    }
+  }
+
+  store(key, result) {
+    const size = resultSize(result);
+    if (size > this.maxBytes) return;
+    this.entries.set(key, { result, size });
+    this.bytes += size;
+    this.evict();
+  }
+
+  evict() {
+    for (const [key, entry] of this.entries) {
+      if (this.bytes <= this.maxBytes) break;
+      this.entries.delete(key);
+      this.bytes -= entry.size;
+      this.stats.evictions++;
+    }
+  }
+
+  clear() {
+    this.entries.clear();
+    this.bytes = 0;
+  }
+
+  /**
+   * @returns {Object} - hits, misses, bypasses, evictions, entries and bytes.
+   */
+  getStats() {
+    return { ...this.stats, entries: this.entries.size, bytes: this.bytes };
+  }
+}
+
+// Shared by every component that executes workflow steps
+export const stepResultCache = new StepResultCache();
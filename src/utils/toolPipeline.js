@@ -0,0 +1,39 @@
+/**
+ * Detection of workflow steps that can run as an in-process pipeline.
+ *
+ * Consecutive tools that read stdin and write a single stdout stream are connected by
+ * pipes and run concurrently (see runToolPipeline in src/gtoWasm.js), instead of each
+ * step waiting for the previous output to be complete.
+ */
+import description from '../../description.json';
+
+/**
+ * Checks if a tool reads stdin and writes its result only to stdout.
+ * @param {Object} toolConfig - Tool entry from description.json.
+ * @returns {boolean}
+ */
+export const isPipeableTool = (toolConfig) =>
+  !!toolConfig &&
+  toolConfig.input?.type === 'stdin' &&
+  toolConfig.output?.type === 'stdout' &&
+  !toolConfig.is_multi_output &&
+  !toolConfig.is_multi_type_output &&
+  // Takes its input from an earlier fasta_split_streams step (see fastaMergeStreamsHandler.js)
+  toolConfig.name !== 'gto_fasta_merge_streams';
+
+/**
+ * Returns the pipeable steps of a workflow starting at an index.
+ * @param {Array<Object>} workflow - Workflow steps ({ id, toolName, params }).
+ * @param {number} start - Index of the first step.
+ * @param {number} end - Index of the last step that may be included.
+ * @returns {Array<Object>} - The steps, empty if the step at `start` is not pipeable.
+ */
+export const getPipelineRun = (workflow, start, end = workflow.length - 1) => {
+  const run = [];
+  for (let i = start; i <= end && i < workflow.length; i++) {
+    const toolConfig = description.tools.find((t) => t.name === `gto_${workflow[i].toolName}`);
+    if (!isPipeableTool(toolConfig)) break;
+    run.push(workflow[i]);
+  }
+  return run;
+};
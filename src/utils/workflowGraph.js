@@ -0,0 +1,175 @@
+/**
+ * Dependency graph of workflows.
+ *
+ * A workflow is kept as a list of steps, each reading the output of the step before it.
+ * compileWorkflow makes the dependencies of the steps explicit, with one node per step
+ * and input:
+ * - a step depends on the step before it, through the selected stream when that step
+ *   is a multi-type output tool (e.g. fasta_split_streams);
+ * - a fasta_merge_streams step also depends on its fasta_split_streams step, for the
+ *   streams that were not processed in between. Split and merge steps pair like brackets;
+ * - the steps of different inputs do not depend on each other.
+ * Multi-output steps fan out inside their node: the files they get run concurrently.
+ *
+ * runGraph runs the nodes once their dependencies are done, the ready ones concurrently,
+ * and getStaleNodes finds the nodes to run again after a change: the nodes that changed
+ * and the nodes downstream of them.
+ */
+import description from '../../description.json';
+
+const SPLIT_TOOL = 'fasta_split_streams';
+const MERGE_TOOL = 'fasta_merge_streams';
+
+/**
+ * Returns the id of the node of a step for an input.
+ * @param {string} inputId - Input id ("ManualInput" or a file id).
+ * @param {string} stepId - Workflow step id.
+ * @returns {string}
+ */
+export const getNodeId = (inputId, stepId) => JSON.stringify([inputId, stepId]);
+
+/**
+ * Compiles a workflow into its dependency graph.
+ * @param {Array<Object>} workflow - Workflow steps ({ id, toolName, params }).
+ * @param {Array<string>} inputIds - Inputs the workflow runs on.
+ * @param {Object} selectedOutputTypes - Selected stream of the multi-type output steps, by step id.
+ * @returns {Object} - { nodes, byId }: nodes in execution order, each
+ *   { id, input, step, index, toolConfig, source, stream, split, dependencies, dependents, signature }.
+ *   source is the node whose output the step reads (null for the input), stream the output
+ *   it takes from it (null for all of it), and split, for merge steps, the split node and
+ *   its selected stream ({ id, stream }).
+ */
+export const compileWorkflow = (workflow, inputIds, selectedOutputTypes = {}) => {
+  const nodes = [];
+  const byId = new Map();
+
+  for (const inputId of inputIds) {
+    const openSplits = []; // Split nodes waiting for their merge step
+    let previous = null;
+
+    workflow.forEach((step, index) => {
+      const toolConfig = description.tools.find((t) => t.name === `gto_${step.toolName}`);
+      const node = {
+        id: getNodeId(inputId, step.id),
+        input: inputId,
+        step,
+        index,
+        toolConfig,
+        source: previous ? previous.id : null,
+        // Only the selected output of a multi-type output step goes on
+        stream: previous?.toolConfig?.is_multi_type_output ? selectedOutputTypes[previous.step.id] ?? null : null,
+        split: null,
+        dependencies: previous ? [previous.id] : [],
+        dependents: [],
+      };
+
+      let split = null;
+      if (step.toolName === MERGE_TOOL && openSplits.length > 0) {
+        split = openSplits.pop();
+        node.split = { id: split.id, stream: selectedOutputTypes[split.step.id] ?? null };
+        if (split !== previous) node.dependencies.push(split.id);
+      } else if (step.toolName === SPLIT_TOOL) {
+        openSplits.push(node);
+      }
+
+      // Everything the output of the node depends on, apart from its input data
+      node.signature = JSON.stringify([
+        step.toolName,
+        step.params ?? {},
+        previous ? previous.step.id : null,
+        node.stream,
+        split && [split.step.id, node.split.stream],
+      ]);
+
+      nodes.push(node);
+      byId.set(node.id, node);
+      previous = node;
+    });
+  }
+
+  nodes.forEach((node) => {
+    node.dependencies.forEach((dependency) => byId.get(dependency).dependents.push(node.id));
+  });
+  return { nodes, byId };
+};
+
+/**
+ * Returns the nodes to run again: the nodes that are not up to date and the nodes
+ * downstream of them, along with the up-to-date nodes they depend on whose output was
+ * not kept (e.g. piped to the next step).
+ * @param {Object} graph - Graph from compileWorkflow.
+ * @param {Function} isUpToDate - (node) => whether the node ran with its current signature.
+ * @param {Function} hasOutput - (node) => whether the output of the node is available.
+ * @returns {Set<string>} - Node ids.
+ */
+export const getStaleNodes = (graph, isUpToDate, hasOutput) => {
+  const stale = new Set();
+  for (const node of graph.nodes) {
+    if (!isUpToDate(node) || node.dependencies.some((dependency) => stale.has(dependency))) {
+      stale.add(node.id);
+    }
+  }
+
+  // Dependencies come before their dependents, so one backward pass finds them all
+  for (let i = graph.nodes.length - 1; i >= 0; i--) {
+    const node = graph.nodes[i];
+    if (!stale.has(node.id)) continue;
+    node.dependencies.forEach((dependency) => {
+      if (!stale.has(dependency) && !hasOutput(graph.byId.get(dependency))) stale.add(dependency);
+    });
+  }
+  return stale;
+};
+
+/**
+ * Runs the nodes of a graph, each once the nodes it depends on are done. Nodes that are
+ * ready at the same time (e.g. the steps of different inputs) run concurrently.
+ * @param {Object} graph - Graph from compileWorkflow.
+ * @param {Function} runNode - async (node, results) => Map of node id -> output, with the
+ *   output of the node and of any later node it ran along (e.g. the steps of a pipeline),
+ *   or null if the node failed, which stops the nodes downstream of it.
+ * @param {Map} results - Outputs of the nodes that are done already, by node id; the
+ *   outputs of the nodes that run are added to it.
+ * @returns {Promise<Map>} - The results.
+ */
+export const runGraph = async (graph, runNode, results = new Map()) => {
+  const running = new Map();
+  const stopped = new Set();
+
+  const stop = (id) => {
+    if (stopped.has(id)) return;
+    stopped.add(id);
+    graph.byId.get(id).dependents.forEach(stop);
+  };
+
+  const startReadyNodes = () => {
+    for (const node of graph.nodes) {
+      if (results.has(node.id) || running.has(node.id) || stopped.has(node.id)) continue;
+      if (!node.dependencies.every((dependency) => results.has(dependency))) continue;
+
+      const run = Promise.resolve()
+        .then(() => runNode(node, results))
+        .then((outputs) => {
+          if (!outputs) {
+            stop(node.id);
+            return;
+          }
+          outputs.forEach((output, id) => results.set(id, output));
+          if (!results.has(node.id)) stop(node.id);
+        })
+        .catch((error) => {
+          console.error(`Failed to run step ${node.step.toolName}:`, error);
+          stop(node.id);
+        })
+        .finally(() => running.delete(node.id));
+      running.set(node.id, run);
+    }
+  };
+
+  startReadyNodes();
+  while (running.size > 0) {
+    await Promise.race(running.values());
+    startReadyNodes();
+  }
+  return results;
+};
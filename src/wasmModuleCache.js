@@ -0,0 +1,85 @@
+/**
+ * Persistent cache of the GTO WebAssembly binaries, shared by all sessions.
+ *
+ * Binaries are kept in Cache Storage under their URL versioned by the content hash listed
+ * in /wasm/gto_modules.json (written at build time by generate_wrapper.py), so a returning
+ * user compiles them without a network round trip, and a rebuilt binary replaces the stale
+ * copy. Compiling from a cached Response with WebAssembly.compileStreaming also lets the
+ * browser reuse its own cache of the compiled code. Compiled WebAssembly.Module objects
+ * themselves can no longer be stored in IndexedDB, hence the bytes.
+ * Cache Storage is available in Web Workers too, so every worker shares the same copies.
+ */
+
+const CACHE_NAME = 'gto-wasm';
+const MANIFEST_URL = '/wasm/gto_modules.json';
+
+let moduleHashes = null;
+
+/**
+ * Reads the content hash of every binary from the build manifest, once.
+ * @returns {Promise<Object>} - moduleName -> hash; empty when the manifest is missing.
+ */
+export const loadModuleHashes = () => {
+  if (!moduleHashes) {
+    moduleHashes = (async () => {
+      try {
+        // Revalidated on every load, as it tells which cached binaries are current
+        const response = await fetch(MANIFEST_URL, { cache: 'no-cache' });
+        if (!response.ok) return {};
+        return (await response.json()).modules || {};
+      } catch (error) {
+        // No manifest (the development server answers unknown paths with index.html)
+        return {};
+      }
+    })();
+  }
+  return moduleHashes;
+};
+
+const openCache = async () => {
+  if (typeof caches === 'undefined') return null;
+  try {
+    return await caches.open(CACHE_NAME);
+  } catch (error) {
+    // Cache Storage is unavailable in some contexts (e.g. private browsing, insecure origins)
+    return null;
+  }
+};
+
+/**
+ * Removes the copies of a binary cached for other versions.
+ */
+const deleteStaleVersions = async (cache, url, currentKey) => {
+  for (const request of await cache.keys()) {
+    const cachedUrl = new URL(request.url);
+    if (cachedUrl.pathname === url && request.url !== new URL(currentKey, cachedUrl).href) {
+      await cache.delete(request);
+    }
+  }
+};
+
+/**
+ * Fetches a .wasm binary, from Cache Storage when the current version is there.
+ * @param {string} url - URL of the binary (e.g. /wasm/fasta_complement.wasm).
+ * @param {string} moduleName - Module name, as listed in the manifest.
+ * @returns {Promise<Response>}
+ */
+export const fetchWasm = async (url, moduleName) => {
+  const hash = (await loadModuleHashes())[moduleName];
+  const cache = hash ? await openCache() : null;
+  if (!cache) return fetch(url);
+
+  const key = `${url}?v=${hash}`;
+  const cached = await cache.match(key);
+  if (cached) return cached;
+
+  const response = await fetch(url);
+  if (response.ok) {
+    // Not awaited: cache.put reads the whole body, and the caller compiles the response
+    // while it downloads
+    cache.put(key, response.clone())
+      .then(() => deleteStaleVersions(cache, url, key))
+      .catch((error) => console.warn(`Failed to cache ${url}:`, error));
+  }
+  return response;
+};
@@ -0,0 +1,551 @@
+/**
+ * Shared runtime used by the generated GTO wrappers.
+ *
+ * Keeps a per-tool cache of compiled WebAssembly.Module objects and a small pool of
+ * instantiated Emscripten modules, so that repeated executions of the same tool skip
+ * both compilation and instantiation.
+ *
+ * Instances built with the GTO pre-js (see compile-all-gto.sh) keep their runtime alive
+ * after callMain and are reset between runs: open streams closed, MEMFS cleared, stdout and
+ * stderr rebound, and linear memory and stack restored to the post-initialization snapshot.
+ * Instances from older builds exit after a single run; for those the pool instantiates a
+ * replacement from the cached compiled module in the background, so the next run is warm.
+ *
+ * When the multi-call bundle was built (compile-all-gto.sh --bundle), the tools it lists
+ * run from that single module, so a session downloads and compiles one binary.
+ * Binaries are fetched through a persistent cache shared across sessions (see
+ * src/wasmModuleCache.js).
+ *
+ * Modules built with a SIMD variant (<module>.simd.wasm, with the vectorized kernels of
+ * gto/src/simd.c) load that variant where the browser supports WebAssembly SIMD. Both
+ * variants share the module's JS glue, so only the binary changes.
+ */
+
+import { fetchWasm, loadModuleHashes } from './wasmModuleCache';
+
+import {
+  ByteSink,
+  ChunkedSink,
+  TeeSink,
+  canStreamInput,
+  isBlob,
+  isPipeReader,
+  mountBlobInput,
+  mountPipeInput,
+  redirectOutput,
+} from './wasmStreams';
+
+export const DEFAULT_POOL_CONFIG = {
+  maxInstancesPerTool: 2, // Idle instances kept per tool
+  memoryBudgetBytes: 256 * 1024 * 1024, // Linear memory plus snapshots held by idle instances
+  prewarm: true, // Instantiate a replacement in the background when an instance cannot be reused
+  useBundle: true, // Run tools from the multi-call bundle when it is available
+  useSimd: true, // Load the SIMD variant of a module when it was built and the browser supports it
+};
+
+// Multi-call module with every tool (see gto/src/multicall.c)
+export const BUNDLE_MODULE = 'gto_bundle';
+
+const noop = () => { };
+
+// Directories whose contents are restored to their post-initialization state between runs
+const TRACKED_DIRECTORIES = ['/', '/tmp'];
+
+/**
+ * Resolves the URL of the .wasm binary for a module.
+ * @param {string} moduleName - Module name (tool name without the 'gto_' prefix).
+ * @returns {string} - The URL of the binary.
+ */
+export const wasmUrlFor = (moduleName) => `/wasm/${moduleName}.wasm`;
+
+// Smallest module with a SIMD instruction (i8x16.popcnt): it validates where SIMD is supported
+const SIMD_TEST_MODULE = new Uint8Array([
+  0, 97, 115, 109, 1, 0, 0, 0, 1, 5, 1, 96, 0, 1, 123, 3, 2, 1, 0, 10, 10, 1, 8, 0, 65, 0, 253, 15, 253, 98, 11,
+]);
+
+let simdSupported = null;
+
+/**
+ * Checks whether the browser supports WebAssembly SIMD (fixed-width, 128-bit), once.
+ * @returns {boolean}
+ */
+export const supportsWasmSimd = () => {
+  if (simdSupported === null) {
+    try {
+      simdSupported = WebAssembly.validate(SIMD_TEST_MODULE);
+    } catch (error) {
+      simdSupported = false;
+    }
+  }
+  return simdSupported;
+};
+
+/**
+ * Finds the linear memory exported by a WebAssembly instance.
+ * @param {WebAssembly.Instance} instance - The instance.
+ * @returns {WebAssembly.Memory|undefined}
+ */
+const findMemory = (instance) =>
+  Object.values(instance.exports).find((value) => value instanceof WebAssembly.Memory);
+
+/**
+ * Returns the length of a buffer once its trailing zero bytes are dropped,
+ * rounded up to a whole 32-bit word.
+ * @param {ArrayBuffer} buffer - The buffer to scan.
+ * @returns {number}
+ */
+const usedLength = (buffer) => {
+  const words = new Uint32Array(buffer, 0, buffer.byteLength >>> 2);
+  let i = words.length - 1;
+  while (i >= 0 && words[i] === 0) i--;
+  return (i + 1) * 4;
+};
+
+/**
+ * Removes a path from the Emscripten filesystem, recursing into directories.
+ * @param {Object} FS - The module's FS object.
+ * @param {string} path - Absolute path to remove.
+ */
+const removePath = (FS, path) => {
+  const { mode } = FS.lstat(path);
+  if (FS.isDir(mode)) {
+    for (const entry of FS.readdir(path)) {
+      if (entry !== '.' && entry !== '..') removePath(FS, `${path}/${entry}`);
+    }
+    FS.rmdir(path);
+  } else {
+    FS.unlink(path);
+  }
+};
+
+const joinPath = (dir, entry) => (dir === '/' ? `/${entry}` : `${dir}/${entry}`);
+
+/**
+ * A single Emscripten module instance owned by the pool.
+ */
+class PooledInstance {
+  constructor(toolName) {
+    this.toolName = toolName;
+    this.module = null;
+    this.memory = null;
+    this.snapshot = null;
+    this.stackPointer = null;
+    this.baseline = null;
+    this.exited = false;
+    this.lastUsed = 0;
+    this.print = noop;
+    this.printErr = noop;
+    this.restoreOutput = null;
+    this.compileTime = 0;
+    this.instantiateTime = 0;
+  }
+
+  /**
+   * Records the post-initialization state the instance is reset to after every run.
+   */
+  attach(module) {
+    this.module = module;
+    if (!module.runtimeReusable || !this.memory || typeof module.stackSave !== 'function') {
+      return;
+    }
+
+    const buffer = this.memory.buffer;
+    this.snapshot = new Uint8Array(buffer.slice(0, usedLength(buffer)));
+    this.stackPointer = module.stackSave();
+
+    const { FS } = module;
+    const directories = [...new Set([...TRACKED_DIRECTORIES, FS.cwd()])];
+    this.baseline = directories
+      .filter((dir) => FS.analyzePath(dir).exists)
+      .map((dir) => ({ dir, entries: new Set(FS.readdir(dir)) }));
+  }
+
+  get reusable() {
+    return !!this.snapshot && !this.exited;
+  }
+
+  get byteSize() {
+    return (this.memory ? this.memory.buffer.byteLength : 0) + (this.snapshot ? this.snapshot.byteLength : 0);
+  }
+
+  /**
+   * Flushes partial lines still buffered in the stdout/stderr TTYs into the bound callbacks.
+   * Instances that exited have already been flushed by the Emscripten runtime.
+   */
+  flush() {
+    const FS = this.module?.FS;
+    if (!FS || !FS.streams) return;
+    for (const fd of [1, 2]) {
+      const stream = FS.streams[fd];
+      if (stream && stream.tty && stream.tty.ops.fsync) {
+        stream.tty.ops.fsync(stream.tty);
+      }
+    }
+  }
+
+  /**
+   * Restores the instance to the state recorded by attach().
+   */
+  reset() {
+    const { FS } = this.module;
+
+    // Close streams left open by the tool
+    FS.streams.forEach((stream, fd) => {
+      if (stream && fd > 2) FS.close(stream);
+    });
+
+    // Remove everything the run created in the tracked directories
+    for (const { dir, entries } of this.baseline) {
+      for (const entry of FS.readdir(dir)) {
+        if (!entries.has(entry)) removePath(FS, joinPath(dir, entry));
+      }
+    }
+
+    // Release the heap and reset C globals and the stack pointer
+    const heap = new Uint8Array(this.memory.buffer);
+    heap.set(this.snapshot);
+    heap.fill(0, this.snapshot.length);
+    this.module.stackRestore(this.stackPointer);
+  }
+}
+
+/**
+ * Cache of compiled modules and pool of warm instances, shared by all wrappers.
+ */
+export class WasmInstancePool {
+  constructor(config = {}) {
+    this.config = { ...DEFAULT_POOL_CONFIG, ...config };
+    this.compiledModules = new Map(); // moduleName -> Promise<WebAssembly.Module>
+    this.idle = new Map(); // toolName -> PooledInstance[]
+    this.factories = new Map(); // toolName -> { factory, options }
+    this.pendingWarmups = new Set();
+    this.bundleTools = null; // Promise<Set<string>> of the tools in the bundle
+    this.clock = 0;
+    this.stats = { compiles: 0, simdCompiles: 0, instantiations: 0, warmHits: 0, reuses: 0, evictions: 0 };
+  }
+
+  /**
+   * Updates the pool configuration and evicts instances that no longer fit.
+   * @param {Object} config - Partial configuration (see DEFAULT_POOL_CONFIG).
+   */
+  configure(config = {}) {
+    this.config = { ...this.config, ...config };
+    if ('useBundle' in config) this.bundleTools = null;
+    if ('useSimd' in config) this.compiledModules.clear();
+    for (const [toolName, instances] of this.idle) {
+      while (instances.length > this.config.maxInstancesPerTool) {
+        instances.shift();
+        this.stats.evictions++;
+      }
+      if (instances.length === 0) this.idle.delete(toolName);
+    }
+    this.enforceBudget();
+  }
+
+  /**
+   * Resolves the module that runs a tool: the multi-call bundle when it is available and
+   * includes the tool, else the tool's own module.
+   * @param {string} toolName - Tool name without the 'gto_' prefix.
+   * @returns {Promise<{moduleName: string, args: Array<string>}>} - The module and the
+   *   leading arguments that select the tool in it.
+   */
+  async resolveModule(toolName) {
+    const bundleTools = await this.getBundleTools();
+    if (bundleTools.has(toolName)) {
+      return { moduleName: BUNDLE_MODULE, args: [toolName] };
+    }
+    return { moduleName: toolName, args: [] };
+  }
+
+  /**
+   * Reads the list of tools in the bundle from its manifest, once.
+   * @returns {Promise<Set<string>>} - Empty when the bundle was not built or is disabled.
+   */
+  getBundleTools() {
+    if (!this.bundleTools) {
+      this.bundleTools = (async () => {
+        if (!this.config.useBundle) return new Set();
+        try {
+          const response = await fetch(`/wasm/${BUNDLE_MODULE}.json`);
+          if (!response.ok) return new Set();
+          const manifest = await response.json();
+          return new Set(manifest.tools || []);
+        } catch (error) {
+          // No manifest (the development server answers unknown paths with index.html)
+          return new Set();
+        }
+      })();
+    }
+    return this.bundleTools;
+  }
+
+  /**
+   * Resolves the binary of a module: its SIMD variant when it was built (it is then listed
+   * in the build manifest) and the browser supports WebAssembly SIMD, else the module itself.
+   * @param {string} moduleName - Module name (tool name without the 'gto_' prefix).
+   * @returns {Promise<string>} - The name of the binary, as listed in the manifest.
+   */
+  async resolveBinary(moduleName) {
+    if (!this.config.useSimd || !supportsWasmSimd()) return moduleName;
+    const variant = `${moduleName}.simd`;
+    return variant in (await loadModuleHashes()) ? variant : moduleName;
+  }
+
+  /**
+   * Returns the compiled WebAssembly.Module for a tool, compiling it on first use.
+   * @param {string} moduleName - Module name (tool name without the 'gto_' prefix).
+   * @returns {Promise<WebAssembly.Module>}
+   */
+  getCompiledModule(moduleName) {
+    if (!this.compiledModules.has(moduleName)) {
+      const compiled = (async () => {
+        const binary = await this.resolveBinary(moduleName);
+        const url = wasmUrlFor(binary);
+        this.stats.compiles++;
+        if (binary !== moduleName) this.stats.simdCompiles++;
+        if (typeof WebAssembly.compileStreaming === 'function') {
+          try {
+            return await WebAssembly.compileStreaming(fetchWasm(url, binary));
+          } catch (error) {
+            // Servers that do not send application/wasm break streaming compilation
+            console.warn(`Streaming compilation failed for ${binary}, retrying:`, error);
+          }
+        }
+        const response = await fetchWasm(url, binary);
+        if (!response.ok) {
+          throw new Error(`Failed to fetch ${url}: ${response.status}`);
+        }
+        return WebAssembly.compile(await response.arrayBuffer());
+      })();
+
+      // Do not cache failures, so a later call can retry
+      compiled.catch(() => this.compiledModules.delete(moduleName));
+      this.compiledModules.set(moduleName, compiled);
+    }
+    return this.compiledModules.get(moduleName);
+  }
+
+  /**
+   * Compiles the modules that run the given tools ahead of their first run.
+   * @param {Array<string>} toolNames - Tool names without the 'gto_' prefix.
+   * @returns {Promise<void>}
+   */
+  async prefetch(toolNames) {
+    const targets = await Promise.all(toolNames.map((toolName) => this.resolveModule(toolName)));
+    const moduleNames = [...new Set(targets.map((target) => target.moduleName))];
+    await Promise.all(
+      moduleNames.map((moduleName) =>
+        this.getCompiledModule(moduleName).catch((error) => {
+          console.warn(`Failed to prefetch ${moduleName}:`, error);
+        })
+      )
+    );
+  }
+
+  /**
+   * Creates a new instance of a tool from its cached compiled module.
+   */
+  async instantiate(toolName, factory, options) {
+    const compileStart = performance.now();
+    const compiled = await this.getCompiledModule(toolName);
+    const slot = new PooledInstance(toolName);
+    // Time spent waiting for the compiled module (0 when it was already cached)
+    slot.compileTime = performance.now() - compileStart;
+    const instantiateStart = performance.now();
+
+    let rejectInstantiation;
+    const instantiationFailed = new Promise((resolve, reject) => {
+      rejectInstantiation = reject;
+    });
+
+    const module = await Promise.race([
+      factory({
+        ...options,
+        reuseRuntime: true,
+        print: (text) => slot.print(text),
+        printErr: (text) => slot.printErr(text),
+        onExit: () => {
+          slot.exited = true;
+        },
+        instantiateWasm: (imports, receiveInstance) => {
+          WebAssembly.instantiate(compiled, imports)
+            .then((instance) => {
+              slot.memory = findMemory(instance);
+              receiveInstance(instance, compiled);
+            })
+            .catch(rejectInstantiation);
+          return {};
+        },
+      }),
+      instantiationFailed,
+    ]);
+
+    slot.attach(module);
+    slot.instantiateTime = performance.now() - instantiateStart;
+    this.stats.instantiations++;
+    return slot;
+  }
+
+  /**
+   * Takes an instance of a tool from the pool, instantiating one if none is idle.
+   * @param {string} toolName - Module name (tool name without the 'gto_' prefix).
+   * @param {Function} factory - The Emscripten module factory.
+   * @param {Object} options - Module options (print/printErr are bound per run via the lease).
+   * @returns {Promise<Object>} A lease with the module and bindOutput/flush/release methods,
+   *   plus streamInput/captureStdout for streaming runs (see src/wasmStreams.js), and the
+   *   warm/compileTime/instantiateTime/heapBytes metrics of the run.
+   */
+  async acquire(toolName, factory, options = {}) {
+    this.factories.set(toolName, { factory, options });
+
+    const instances = this.idle.get(toolName);
+    let slot = instances && instances.length > 0 ? instances.pop() : null;
+    const warm = !!slot;
+    if (slot) {
+      this.stats.warmHits++;
+    } else {
+      slot = await this.instantiate(toolName, factory, options);
+    }
+
+    return {
+      module: slot.module,
+      warm,
+      compileTime: warm ? 0 : slot.compileTime,
+      instantiateTime: warm ? 0 : slot.instantiateTime,
+      heapBytes: () => (slot.memory ? slot.memory.buffer.byteLength : 0),
+      bindOutput: (print, printErr) => {
+        slot.print = print || noop;
+        slot.printErr = printErr || noop;
+      },
+      flush: () => slot.flush(),
+      // Mounts a Blob or pipe as an input file; false if the source cannot be streamed here
+      // (Blobs cannot be read synchronously on the main thread)
+      streamInput: (path, source) => {
+        if (isPipeReader(source)) {
+          mountPipeInput(slot.module.FS, path, source);
+          return true;
+        }
+        if (isBlob(source) && canStreamInput()) {
+          mountBlobInput(slot.module.FS, path, source);
+          return true;
+        }
+        return false;
+      },
+      // Captures stdout as bytes: a Blob built in chunks when streaming, else a single buffer.
+      // With a pipe, output goes to the next tool and is only collected if `keep` is set.
+      captureStdout: (streaming = false, pipe = null, keep = true) => {
+        let sink;
+        if (pipe) sink = new TeeSink(pipe, keep);
+        else sink = streaming ? new ChunkedSink() : new ByteSink();
+        slot.restoreOutput = redirectOutput(slot.module.FS, 1, sink);
+        return sink;
+      },
+      release: () => this.release(slot),
+    };
+  }
+
+  /**
+   * Returns an instance to the pool after a run.
+   */
+  release(slot) {
+    slot.flush();
+    slot.print = noop;
+    slot.printErr = noop;
+    if (slot.restoreOutput) {
+      slot.restoreOutput();
+      slot.restoreOutput = null;
+    }
+
+    if (slot.reusable) {
+      try {
+        slot.reset();
+        this.stats.reuses++;
+        this.park(slot);
+        return;
+      } catch (error) {
+        console.warn(`Could not reset ${slot.toolName} instance, discarding it:`, error);
+      }
+    }
+    this.prewarm(slot.toolName);
+  }
+
+  /**
+   * Keeps an idle instance, respecting the per-tool limit and the memory budget.
+   */
+  park(slot) {
+    const instances = this.idle.get(slot.toolName) || [];
+    if (instances.length >= this.config.maxInstancesPerTool) {
+      this.stats.evictions++;
+      return;
+    }
+    slot.lastUsed = ++this.clock;
+    instances.push(slot);
+    this.idle.set(slot.toolName, instances);
+    this.enforceBudget();
+  }
+
+  /**
+   * Instantiates an idle instance of a tool in the background.
+   * The tool must have been acquired at least once, so its factory is known.
+   * @param {string} toolName - Module name (tool name without the 'gto_' prefix).
+   */
+  prewarm(toolName) {
+    const entry = this.factories.get(toolName);
+    const idleCount = this.idle.get(toolName)?.length || 0;
+    if (!this.config.prewarm || !entry || this.pendingWarmups.has(toolName) ||
+      idleCount >= this.config.maxInstancesPerTool) {
+      return;
+    }
+
+    this.pendingWarmups.add(toolName);
+    const schedule = typeof requestIdleCallback === 'function' ? requestIdleCallback : (cb) => setTimeout(cb, 0);
+    schedule(() => {
+      this.instantiate(toolName, entry.factory, entry.options)
+        .then((slot) => this.park(slot))
+        .catch((error) => console.warn(`Failed to prewarm ${toolName}:`, error))
+        .finally(() => this.pendingWarmups.delete(toolName));
+    });
+  }
+
+  /**
+   * Evicts least recently used idle instances until the memory budget is met.
+   */
+  enforceBudget() {
+    let total = this.idleBytes();
+    while (total > this.config.memoryBudgetBytes) {
+      let victim = null;
+      for (const instances of this.idle.values()) {
+        for (const slot of instances) {
+          if (!victim || slot.lastUsed < victim.lastUsed) victim = slot;
+        }
+      }
+      if (!victim) break;
+
+      const instances = this.idle.get(victim.toolName);
+      instances.splice(instances.indexOf(victim), 1);
+      if (instances.length === 0) this.idle.delete(victim.toolName);
+      total -= victim.byteSize;
+      this.stats.evictions++;
+    }
+  }
+
+  /**
+   * @returns {number} Bytes held by idle instances.
+   */
+  idleBytes() {
+    let total = 0;
+    for (const instances of this.idle.values()) {
+      for (const slot of instances) total += slot.byteSize;
+    }
+    return total;
+  }
+
+  /**
+   * Drops all idle instances and, optionally, the compiled modules.
+   * @param {boolean} includeCompiled - Also forget compiled modules.
+   */
+  clear(includeCompiled = false) {
+    this.idle.clear();
+    if (includeCompiled) this.compiledModules.clear();
+  }
+}
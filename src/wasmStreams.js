@@ -0,0 +1,245 @@
+/**
+ * Streaming and byte-level I/O for the generated GTO wrappers.
+ *
+ * Large inputs are not copied into MEMFS: the tool's input file is a character device
+ * that reads the source Blob in blocks on demand. Stdout is captured as bytes, in a
+ * growable buffer or, for streamed runs, in a chunked sink, instead of being accumulated
+ * line by line in a string. Reading a Blob synchronously needs FileReaderSync, so input
+ * streaming is only available in Web Workers (see src/workers/gtoWorker.js). In a
+ * pipeline, stdin and stdout are connected to pipes shared with the neighbouring workers.
+ */
+
+// Files larger than this are streamed to the tools instead of loaded as text
+export const STREAMING_THRESHOLD_BYTES = 1 * 1024 * 1024;
+
+const READ_BLOCK_BYTES = 1 * 1024 * 1024; // Read-ahead of the input device
+const SINK_BLOCK_BYTES = 1 * 1024 * 1024; // Size of the blocks output is copied into
+const SINK_SPILL_BYTES = 16 * 1024 * 1024; // Blocks are folded into a Blob past this size
+
+// Device number used for streamed inputs (majors 1, 5 and 6 are taken by Emscripten)
+const INPUT_DEVICE_MAJOR = 64;
+const SEEK_CUR = 1;
+const SEEK_END = 2;
+const EINVAL = 28; // errno of the WASM libc (musl)
+
+/**
+ * @returns {boolean} - True if Blobs can be read synchronously (Web Workers only).
+ */
+export const canStreamInput = () => typeof FileReaderSync !== 'undefined';
+
+/**
+ * @param {*} value
+ * @returns {boolean} - True if the value is a Blob (or File) to be streamed.
+ */
+export const isBlob = (value) => typeof Blob !== 'undefined' && value instanceof Blob;
+
+/**
+ * @param {*} value
+ * @returns {boolean} - True if the value is tool data that is not text: bytes or a Blob.
+ */
+export const isRawData = (value) => value instanceof Uint8Array || isBlob(value);
+
+const INITIAL_BUFFER_BYTES = 64 * 1024;
+
+/**
+ * Collects output bytes in a single buffer that doubles in size when full.
+ */
+export class ByteSink {
+  constructor() {
+    this.buffer = new Uint8Array(INITIAL_BUFFER_BYTES);
+    this.size = 0;
+  }
+
+  /**
+   * Copies bytes into the sink (the source may be the module's heap, which is reused).
+   * @param {Uint8Array} bytes
+   */
+  write(bytes) {
+    const required = this.size + bytes.length;
+    if (required > this.buffer.length) {
+      let capacity = this.buffer.length * 2;
+      while (capacity < required) capacity *= 2;
+      const grown = new Uint8Array(capacity);
+      grown.set(this.buffer.subarray(0, this.size));
+      this.buffer = grown;
+    }
+    this.buffer.set(bytes, this.size);
+    this.size = required;
+  }
+
+  /**
+   * @returns {Uint8Array} - A view of everything written so far (not a copy).
+   */
+  toBytes() {
+    return this.buffer.subarray(0, this.size);
+  }
+}
+
+/**
+ * Collects output bytes in fixed-size blocks, periodically folding them into a Blob so
+ * the browser can keep large outputs out of the JavaScript heap.
+ */
+export class ChunkedSink {
+  constructor(type = 'text/plain') {
+    this.type = type;
+    this.parts = []; // Blobs and full blocks, in order
+    this.pendingBytes = 0; // Bytes in full blocks not yet folded into a Blob
+    this.block = null;
+    this.used = 0;
+    this.size = 0;
+  }
+
+  /**
+   * Copies bytes into the sink (the source may be the module's heap, which is reused).
+   * @param {Uint8Array} bytes
+   */
+  write(bytes) {
+    let offset = 0;
+    while (offset < bytes.length) {
+      if (!this.block) {
+        this.block = new Uint8Array(SINK_BLOCK_BYTES);
+        this.used = 0;
+      }
+      const count = Math.min(bytes.length - offset, this.block.length - this.used);
+      this.block.set(bytes.subarray(offset, offset + count), this.used);
+      this.used += count;
+      offset += count;
+
+      if (this.used === this.block.length) {
+        this.parts.push(this.block);
+        this.pendingBytes += this.block.length;
+        this.block = null;
+        if (this.pendingBytes >= SINK_SPILL_BYTES) this.spill();
+      }
+    }
+    this.size += bytes.length;
+  }
+
+  spill() {
+    this.parts = [new Blob(this.parts, { type: this.type })];
+    this.pendingBytes = 0;
+  }
+
+  /**
+   * @returns {Blob} - Everything written so far.
+   */
+  toBlob() {
+    const parts = this.block ? [...this.parts, this.block.subarray(0, this.used)] : this.parts;
+    return new Blob(parts, { type: this.type });
+  }
+}
+
+/**
+ * Creates a character device at `path` whose contents are read from a Blob on demand.
+ * The node is removed with the rest of the run's files when the instance is reset.
+ * @param {Object} FS - The module's FS object.
+ * @param {string} path - Path of the input file (e.g. 'input.txt').
+ * @param {Blob} blob - The input.
+ */
+export const mountBlobInput = (FS, path, blob) => {
+  const reader = new FileReaderSync();
+  let blockStart = 0;
+  let block = new Uint8Array(0);
+
+  const device = FS.makedev(INPUT_DEVICE_MAJOR, 0);
+  FS.registerDevice(device, {
+    open(stream) {
+      stream.seekable = true;
+    },
+    // Seeking lets the tools given an index (-x) skip to the records they extract
+    llseek(stream, offset, whence) {
+      const origin = whence === SEEK_END ? blob.size : whence === SEEK_CUR ? stream.position : 0;
+      const position = origin + offset;
+      if (position < 0) throw new FS.ErrnoError(EINVAL);
+      return position;
+    },
+    read(stream, buffer, offset, length, position) {
+      if (position >= blob.size) return 0;
+      if (position < blockStart || position >= blockStart + block.length) {
+        blockStart = position;
+        block = new Uint8Array(reader.readAsArrayBuffer(blob.slice(position, position + READ_BLOCK_BYTES)));
+      }
+      const start = position - blockStart;
+      const count = Math.min(length, block.length - start);
+      buffer.set(block.subarray(start, start + count), offset);
+      return count;
+    },
+  });
+  FS.mkdev(path, device);
+};
+
+/**
+ * @param {*} value
+ * @returns {boolean} - True if the value is the reading end of a pipe (see src/workers/pipe.js).
+ */
+export const isPipeReader = (value) =>
+  value !== null && typeof value === 'object' && typeof value.readSync === 'function';
+
+/**
+ * Creates a character device at `path` whose contents are read from a pipe, blocking
+ * until the tool upstream writes or closes it.
+ * @param {Object} FS - The module's FS object.
+ * @param {string} path - Path of the input file (e.g. 'input.txt').
+ * @param {{readSync: function(Uint8Array, number, number): number}} pipe - The reading end.
+ */
+export const mountPipeInput = (FS, path, pipe) => {
+  const device = FS.makedev(INPUT_DEVICE_MAJOR, 1);
+  FS.registerDevice(device, {
+    open(stream) {
+      stream.seekable = false;
+    },
+    read(stream, buffer, offset, length) {
+      return pipe.readSync(buffer, offset, length);
+    },
+  });
+  FS.mkdev(path, device);
+};
+
+/**
+ * Forwards output to a pipe, keeping a copy only if the output is wanted as a result.
+ */
+export class TeeSink {
+  /**
+   * @param {{write: function(Uint8Array)}} pipe - The writing end of a pipe.
+   * @param {boolean} keep - Whether to also collect the output in a ByteSink.
+   */
+  constructor(pipe, keep = true) {
+    this.pipe = pipe;
+    this.copy = keep ? new ByteSink() : null;
+  }
+
+  write(bytes) {
+    this.pipe.write(bytes);
+    if (this.copy) this.copy.write(bytes);
+  }
+
+  /**
+   * @returns {Uint8Array} - The collected output, empty if it was not kept.
+   */
+  toBytes() {
+    return this.copy ? this.copy.toBytes() : new Uint8Array(0);
+  }
+}
+
+/**
+ * Sends everything written to a file descriptor (1 for stdout) to a sink, bypassing the
+ * line-oriented TTY print callbacks.
+ * @param {Object} FS - The module's FS object.
+ * @param {number} fd - The file descriptor.
+ * @param {{write: function(Uint8Array)}} sink
+ * @returns {Function} - Restores the original stream operations.
+ */
+export const redirectOutput = (FS, fd, sink) => {
+  const stream = FS.streams[fd];
+  const original = stream.stream_ops;
+  stream.stream_ops = {
+    ...original,
+    write(stream, buffer, offset, length) {
+      sink.write(new Uint8Array(buffer.buffer, buffer.byteOffset + offset, length));
+      return length;
+    },
+  };
+  return () => {
+    stream.stream_ops = original;
+  };
+};
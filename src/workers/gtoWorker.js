@@ -0,0 +1,85 @@
+/**
+ * Web Worker that executes GTO tools off the main thread.
+ *
+ * Loads the generated wrappers and the /wasm/*.js module factories with importScripts and
+ * keeps its own compiled-module cache and instance pool (see src/wasmRuntime.js).
+ */
+import { WasmInstancePool } from '../wasmRuntime';
+import { packResult, unpackInput } from './messages';
+import { PipeReader, PipeWriter } from './pipe';
+
+// The wrappers and the Emscripten glue publish their functions on window
+self.window = self;
+self.gtoWasmRuntime = new WasmInstancePool();
+
+// Script with every wrapper (see generate_wrapper.py --all), loaded on the first run
+let wrapperBundleLoaded = false;
+
+/**
+ * Loads the wrapper of a tool and returns its run function.
+ * @param {string} toolName - Tool name without the 'gto_' prefix.
+ * @returns {Function}
+ */
+const loadRunFunction = (toolName) => {
+  const runFunctionName = `run_${toolName}`;
+  if (!wrapperBundleLoaded) {
+    wrapperBundleLoaded = true;
+    try {
+      importScripts('/wasm/gto_wrappers.js');
+    } catch (error) {
+      console.warn('Wrapper bundle not available, loading wrappers one by one:', error);
+    }
+  }
+  if (typeof self[runFunctionName] !== 'function') {
+    importScripts(`/wasm/${toolName}_wrapper.js`);
+  }
+  if (typeof self[runFunctionName] !== 'function') {
+    throw new Error(`Function ${runFunctionName} not found in worker.`);
+  }
+  return self[runFunctionName];
+};
+
+self.onmessage = async ({ data }) => {
+  const { id, type } = data;
+
+  if (type === 'configure') {
+    self.gtoWasmRuntime.configure(data.config);
+    return;
+  }
+
+  if (type === 'prefetch') {
+    for (const toolName of data.toolNames) {
+      try {
+        loadRunFunction(toolName);
+      } catch (error) {
+        console.warn(`Failed to load the wrapper of ${toolName}:`, error);
+      }
+    }
+    self.gtoWasmRuntime.prefetch(data.toolNames);
+    return;
+  }
+
+  // Pipeline stages read stdin from and write stdout to pipes shared with the other stages
+  const { inputPipe, outputPipe, ...options } = data.options || {};
+  const reader = inputPipe ? new PipeReader(inputPipe) : null;
+  const writer = outputPipe ? new PipeWriter(outputPipe) : null;
+
+  try {
+    const runFunction = loadRunFunction(data.toolName);
+    // Outputs stay bytes in the worker and are decoded, if needed, on the receiving side
+    const result = await runFunction(reader || unpackInput(data.input), data.args, {
+      ...options,
+      outputPipe: writer,
+      binaryOutput: true,
+    });
+    if (writer && options.keepOutput === false) result.piped = true;
+    const { payload, transfer } = packResult(result);
+    self.postMessage({ id, result: payload }, transfer);
+  } catch (error) {
+    self.postMessage({ id, error: error?.message || String(error) });
+  } finally {
+    // Signal end of file downstream, and stop the stage upstream if this one failed early
+    if (writer) writer.close();
+    if (reader) reader.close();
+  }
+};
@@ -0,0 +1,113 @@
+/**
+ * Packing of tool inputs and results for postMessage.
+ *
+ * Text is encoded to bytes so every payload moves between threads as a transferable
+ * ArrayBuffer instead of being copied by the structured clone algorithm.
+ */
+
+const encoder = new TextEncoder();
+const decoder = new TextDecoder('utf-8', { fatal: false });
+
+const isBlob = (value) => typeof Blob !== 'undefined' && value instanceof Blob;
+
+const toBytes = (value) => (value instanceof Uint8Array ? value : encoder.encode(value ?? ''));
+
+/**
+ * Encodes a value, transferring only buffers created here: byte arrays owned by the
+ * caller are copied, so its references stay usable.
+ */
+const packBytes = (value, transfer) => {
+  if (isBlob(value)) return value;
+  const bytes = toBytes(value);
+  if (!(value instanceof Uint8Array)) transfer.push(bytes.buffer);
+  return bytes;
+};
+
+/**
+ * Packs the input of a run function: stdin data or a map of parameter files.
+ * Blobs are passed by reference, so streamed inputs are never read on this thread.
+ * @param {string|Blob|Object.<string,{name:string,data:(string|Uint8Array)}>} input - The input.
+ * @returns {{payload: Object, transfer: ArrayBuffer[]}}
+ */
+export const packInput = (input) => {
+  const transfer = [];
+
+  if (isBlob(input)) {
+    return { payload: { kind: 'blob', blob: input }, transfer };
+  }
+
+  if (input !== null && typeof input === 'object' && !(input instanceof Uint8Array)) {
+    const files = {};
+    for (const [param, file] of Object.entries(input)) {
+      const bytes = packBytes(file.data, transfer);
+      files[param] = { name: file.name, bytes, isText: !(file.data instanceof Uint8Array) };
+    }
+    return { payload: { kind: 'files', files }, transfer };
+  }
+
+  const bytes = packBytes(input, transfer);
+  return { payload: { kind: 'stdin', bytes, isText: !(input instanceof Uint8Array) }, transfer };
+};
+
+/**
+ * Restores an input packed with packInput.
+ * @param {Object} payload - The packed input.
+ * @returns {string|Uint8Array|Blob|Object} - The input in the shape the run functions expect.
+ */
+export const unpackInput = (payload) => {
+  if (payload.kind === 'blob') {
+    return payload.blob;
+  }
+  if (payload.kind === 'files') {
+    const files = {};
+    for (const [param, file] of Object.entries(payload.files)) {
+      const { bytes } = file;
+      files[param] = { name: file.name, data: file.isText && !isBlob(bytes) ? decoder.decode(bytes) : bytes };
+    }
+    return files;
+  }
+  return payload.isText ? decoder.decode(payload.bytes) : payload.bytes;
+};
+
+/**
+ * Packs the result of a run function ({ stdout, stderr, outputs?, file? }).
+ * @param {Object} result - The result.
+ * @returns {{payload: Object, transfer: ArrayBuffer[]}}
+ */
+export const packResult = (result) => {
+  // The result belongs to the worker, so all of its buffers can be transferred
+  const transfer = new Set();
+  const pack = (value) => {
+    if (isBlob(value)) return value;
+    const bytes = toBytes(value);
+    transfer.add(bytes.buffer);
+    return bytes;
+  };
+
+  const payload = { ...result, stdout: pack(result.stdout) };
+  if (result.outputs) {
+    payload.outputs = {};
+    for (const [name, content] of Object.entries(result.outputs)) {
+      payload.outputs[name] = pack(content);
+    }
+  }
+  return { payload, transfer: [...transfer] };
+};
+
+/**
+ * Restores a result packed with packResult.
+ * @param {Object} payload - The packed result.
+ * @param {boolean} binary - Keep stdout and output files as bytes instead of decoding them.
+ * @returns {Object} - { stdout, stderr, outputs?, file? } (streamed stdout stays a Blob).
+ */
+export const unpackResult = (payload, binary = false) => {
+  const decode = (value) => (binary || isBlob(value) ? value : decoder.decode(value));
+  const result = { ...payload, stdout: decode(payload.stdout) };
+  if (payload.outputs) {
+    result.outputs = {};
+    for (const [name, bytes] of Object.entries(payload.outputs)) {
+      result.outputs[name] = decode(bytes);
+    }
+  }
+  return result;
+};
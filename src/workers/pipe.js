@@ -0,0 +1,118 @@
+/**
+ * Bounded byte pipe between two workers, over a SharedArrayBuffer.
+ *
+ * One worker writes a tool's stdout into the pipe while another reads it as the next
+ * tool's stdin; each side blocks with Atomics.wait when the pipe is full or empty, so a
+ * pipeline holds at most the pipe capacity of every intermediate output.
+ * SharedArrayBuffer needs a cross-origin isolated page (see devServer.headers in
+ * webpack.config.js).
+ */
+
+export const DEFAULT_PIPE_BYTES = 1 * 1024 * 1024;
+
+// Control words at the start of the buffer
+const USED = 0; // Bytes written and not yet read
+const WRITER_CLOSED = 1;
+const READER_CLOSED = 2;
+const CONTROL_BYTES = 16;
+
+// Waits are bounded so a close notified between a check and a wait is not missed
+const WAIT_MS = 50;
+
+/**
+ * @returns {boolean} - True if pipes can be shared between workers in this page.
+ */
+export const pipesSupported = () =>
+  typeof SharedArrayBuffer !== 'undefined' &&
+  typeof Atomics !== 'undefined' &&
+  (typeof crossOriginIsolated === 'undefined' || crossOriginIsolated);
+
+/**
+ * Creates the shared buffer of a pipe, to be posted to both workers.
+ * @param {number} capacity - Bytes the pipe holds before the writer blocks.
+ * @returns {SharedArrayBuffer}
+ */
+export const createPipe = (capacity = DEFAULT_PIPE_BYTES) => new SharedArrayBuffer(CONTROL_BYTES + capacity);
+
+/**
+ * Marks both ends of a pipe closed, waking a worker blocked on it.
+ * Used when the worker on the other side fails. Safe to call from the main thread.
+ * @param {SharedArrayBuffer} buffer
+ */
+export const abandonPipe = (buffer) => {
+  const control = new Int32Array(buffer, 0, CONTROL_BYTES >> 2);
+  Atomics.store(control, WRITER_CLOSED, 1);
+  Atomics.store(control, READER_CLOSED, 1);
+  Atomics.notify(control, USED);
+};
+
+class PipeEnd {
+  constructor(buffer) {
+    this.control = new Int32Array(buffer, 0, CONTROL_BYTES >> 2);
+    this.data = new Uint8Array(buffer, CONTROL_BYTES);
+    this.position = 0; // Offset of the next byte to write or read in the ring
+  }
+}
+
+export class PipeWriter extends PipeEnd {
+  /**
+   * Copies bytes into the pipe, blocking while it is full. Bytes written after the
+   * reader closed are discarded, like writes to a closed pipe.
+   * @param {Uint8Array} bytes
+   */
+  write(bytes) {
+    let offset = 0;
+    while (offset < bytes.length) {
+      if (Atomics.load(this.control, READER_CLOSED)) return;
+
+      const used = Atomics.load(this.control, USED);
+      const free = this.data.length - used;
+      if (free === 0) {
+        Atomics.wait(this.control, USED, used, WAIT_MS);
+        continue;
+      }
+
+      const count = Math.min(free, bytes.length - offset, this.data.length - this.position);
+      this.data.set(bytes.subarray(offset, offset + count), this.position);
+      this.position = (this.position + count) % this.data.length;
+      offset += count;
+      Atomics.add(this.control, USED, count);
+      Atomics.notify(this.control, USED);
+    }
+  }
+
+  close() {
+    Atomics.store(this.control, WRITER_CLOSED, 1);
+    Atomics.notify(this.control, USED);
+  }
+}
+
+export class PipeReader extends PipeEnd {
+  /**
+   * Reads up to `length` bytes into `target`, blocking until data is available.
+   * @param {Uint8Array|Int8Array} target
+   * @param {number} offset - Offset in target.
+   * @param {number} length - Maximum number of bytes.
+   * @returns {number} - Bytes read, 0 once the writer closed and the pipe is drained.
+   */
+  readSync(target, offset, length) {
+    for (;;) {
+      const used = Atomics.load(this.control, USED);
+      if (used > 0) {
+        const count = Math.min(used, length, this.data.length - this.position);
+        target.set(this.data.subarray(this.position, this.position + count), offset);
+        this.position = (this.position + count) % this.data.length;
+        Atomics.sub(this.control, USED, count);
+        Atomics.notify(this.control, USED);
+        return count;
+      }
+      if (Atomics.load(this.control, WRITER_CLOSED)) return 0;
+      Atomics.wait(this.control, USED, 0, WAIT_MS);
+    }
+  }
+
+  close() {
+    Atomics.store(this.control, READER_CLOSED, 1);
+    Atomics.notify(this.control, USED);
+  }
+}
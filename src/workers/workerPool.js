@@ -0,0 +1,219 @@
+/**
+ * Pool of GTO Web Workers (see gtoWorker.js).
+ *
+ * Jobs are queued and dispatched to idle workers, preferring a worker that already ran the
+ * same tool so its compiled module and warm instances are reused. Consecutive stdin/stdout
+ * tools can run as a pipeline, one worker per stage, connected by pipes (see pipe.js).
+ */
+import { packInput, unpackResult } from './messages';
+import { abandonPipe, createPipe, pipesSupported } from './pipe';
+
+export const DEFAULT_POOL_SIZE = (typeof navigator !== 'undefined' && navigator.hardwareConcurrency) || 4;
+
+/**
+ * @returns {boolean} - True if tools can run in Web Workers in this environment.
+ */
+export const workersSupported = () => typeof Worker !== 'undefined';
+
+export class GtoWorkerPool {
+  constructor(size = DEFAULT_POOL_SIZE) {
+    this.size = Math.max(1, size);
+    this.workers = []; // { worker, job, tools: Set<string> }
+    this.queue = []; // Jobs waiting for a worker
+    this.nextJobId = 0;
+    this.runtimeConfig = null;
+  }
+
+  /**
+   * Runs a tool in a worker.
+   * @param {string} toolName - Tool name without the 'gto_' prefix.
+   * @param {string|Object} input - Stdin data or a map of parameter files.
+   * @param {Array<string>} args - CLI arguments.
+   * @param {Object} options - Run options (e.g. { streamOutput, binaryOutput }).
+   * @returns {Promise<Object>} - The run function's result ({ stdout, stderr, outputs?, file? }).
+   */
+  run(toolName, input, args = [], options = {}) {
+    return new Promise((resolve, reject) => {
+      this.queue.push({ id: this.nextJobId++, toolName, input, args, options, resolve, reject });
+      this.dispatch();
+    });
+  }
+
+  /**
+   * Runs tools as a pipeline, each stage reading the previous stage's stdout as stdin.
+   * Stages run concurrently in as many workers, so intermediate outputs are never held in
+   * full unless a stage asks to keep its output. Longer pipelines are split into segments of
+   * at most the pool size; the last stage of a segment keeps its output to feed the next.
+   * Without pipe support, the stages run one after the other.
+   * @param {Array<{toolName: string, args: Array<string>, keepOutput: boolean, streamOutput: boolean}>} stages
+   * @param {string|Uint8Array|Blob} input - Stdin data of the first stage.
+   * @returns {Promise<Array<Object>>} - One result per stage, with stdout as bytes (empty
+   *   and `piped` set for stages whose output was not kept).
+   */
+  async runPipeline(stages, input) {
+    const results = [];
+    let data = input;
+    const segmentSize = pipesSupported() ? this.size : 1;
+    for (let start = 0; start < stages.length; start += segmentSize) {
+      const segment = stages.slice(start, start + segmentSize);
+      const segmentResults = await this.runSegment(segment, data);
+      results.push(...segmentResults);
+      data = segmentResults[segmentResults.length - 1].stdout;
+    }
+    return results;
+  }
+
+  runSegment(segment, input) {
+    if (segment.length === 1) {
+      const [{ toolName, args, streamOutput }] = segment;
+      return this.run(toolName, input, args, { binaryOutput: true, streamOutput: !!streamOutput }).then((result) => [
+        result,
+      ]);
+    }
+
+    const pipes = segment.slice(1).map(() => createPipe());
+    const last = segment.length - 1;
+    const jobs = segment.map((stage, index) => ({
+      id: this.nextJobId++,
+      toolName: stage.toolName,
+      input: index === 0 ? input : '',
+      args: stage.args,
+      options: {
+        binaryOutput: true,
+        streamOutput: index === last && !!stage.streamOutput,
+        keepOutput: index === last || !!stage.keepOutput,
+        inputPipe: index > 0 ? pipes[index - 1] : undefined,
+        outputPipe: index < last ? pipes[index] : undefined,
+      },
+    }));
+    const promises = jobs.map(
+      (job) =>
+        new Promise((resolve, reject) => {
+          job.resolve = resolve;
+          job.reject = reject;
+        })
+    );
+    // All stages are dispatched together, as a stage blocks until its neighbours run
+    this.queue.push({ group: jobs });
+    this.dispatch();
+    return Promise.all(promises);
+  }
+
+  /**
+   * Loads the wrappers and compiles the modules of tools in the workers ahead of their first
+   * run, spawning a worker if none is running.
+   * @param {Array<string>} toolNames - Tool names without the 'gto_' prefix.
+   */
+  prefetch(toolNames) {
+    if (this.workers.length === 0) this.spawn();
+    for (const entry of this.workers) {
+      entry.worker.postMessage({ type: 'prefetch', toolNames });
+      toolNames.forEach((toolName) => entry.tools.add(toolName));
+    }
+  }
+
+  /**
+   * Forwards instance pool settings to every worker, current and future.
+   * @param {Object} config - See DEFAULT_POOL_CONFIG in src/wasmRuntime.js.
+   */
+  configure(config) {
+    this.runtimeConfig = { ...this.runtimeConfig, ...config };
+    for (const entry of this.workers) {
+      entry.worker.postMessage({ type: 'configure', config: this.runtimeConfig });
+    }
+  }
+
+  dispatch() {
+    while (this.queue.length > 0) {
+      const jobs = this.queue[0].group || [this.queue[0]];
+      const entries = [];
+      for (const job of jobs) {
+        const entry = this.pickWorker(job.toolName, entries);
+        if (!entry) return;
+        entries.push(entry);
+      }
+
+      this.queue.shift();
+      jobs.forEach((job, index) => this.send(entries[index], job));
+    }
+  }
+
+  send(entry, job) {
+    entry.job = job;
+    entry.tools.add(job.toolName);
+
+    const { payload, transfer } = packInput(job.input);
+    entry.worker.postMessage(
+      { id: job.id, toolName: job.toolName, input: payload, args: job.args, options: job.options },
+      transfer
+    );
+  }
+
+  /**
+   * Picks an idle worker, preferring one that already ran the tool, and spawns one (if
+   * allowed) only when none is idle: a started worker loads a module sooner than a new one.
+   * @param {string} toolName
+   * @param {Array<Object>} taken - Workers already picked for the same pipeline.
+   */
+  pickWorker(toolName, taken = []) {
+    const idle = this.workers.filter((entry) => !entry.job && !taken.includes(entry));
+    const warm = idle.find((entry) => entry.tools.has(toolName));
+    if (warm) return warm;
+    if (idle.length > 0) return idle[0];
+    return this.workers.length < this.size ? this.spawn() : null;
+  }
+
+  spawn() {
+    const worker = new Worker(new URL('./gtoWorker.js', import.meta.url));
+    const entry = { worker, job: null, tools: new Set() };
+
+    worker.onmessage = ({ data }) => {
+      const job = entry.job;
+      entry.job = null;
+      if (job && job.id === data.id) {
+        if (data.error) {
+          job.reject(new Error(data.error));
+        } else {
+          job.resolve(unpackResult(data.result, !!job.options?.binaryOutput));
+        }
+      }
+      this.dispatch();
+    };
+
+    worker.onerror = (event) => {
+      // The worker is unusable: fail its job and replace it on the next dispatch
+      console.error('GTO worker failed:', event.message);
+      const job = entry.job;
+      this.workers = this.workers.filter((other) => other !== entry);
+      worker.terminate();
+      if (job) {
+        // Unblock the neighbouring stages of a pipeline
+        if (job.options?.inputPipe) abandonPipe(job.options.inputPipe);
+        if (job.options?.outputPipe) abandonPipe(job.options.outputPipe);
+        job.reject(new Error(event.message || 'GTO worker failed'));
+      }
+      this.dispatch();
+    };
+
+    if (this.runtimeConfig) {
+      worker.postMessage({ type: 'configure', config: this.runtimeConfig });
+    }
+    this.workers.push(entry);
+    return entry;
+  }
+
+  /**
+   * Terminates all workers and rejects queued jobs.
+   */
+  terminate() {
+    for (const entry of this.workers) {
+      entry.worker.terminate();
+      if (entry.job) entry.job.reject(new Error('GTO worker pool terminated'));
+    }
+    for (const queued of this.queue) {
+      for (const job of queued.group || [queued]) job.reject(new Error('GTO worker pool terminated'));
+    }
+    this.workers = [];
+    this.queue = [];
+  }
+}
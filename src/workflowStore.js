@@ -0,0 +1,309 @@
+/**
+ * Persistent storage of the workflow page state in IndexedDB.
+ *
+ * Inputs and step outputs can be megabytes of text, too much for localStorage (about 5 MB,
+ * written synchronously on the main thread). Here each saved value is stored with its
+ * contents (strings, byte arrays and Blobs) replaced by references to content records:
+ * a content is split in 1 MB chunks, and contents and chunks are keyed by their SHA-256
+ * hash, so identical outputs (and identical parts of outputs) are stored once. Writes are
+ * debounced per key and run asynchronously; contents no saved value references any more
+ * are removed after each write.
+ *
+ * Values load with their references, so large contents are read only when needed
+ * (see resolveContents).
+ */
+import { hashData } from './utils/stepResultCache';
+
+const DB_NAME = 'gto-workflow';
+const DB_VERSION = 1;
+const STATE_STORE = 'state';
+const CONTENT_STORE = 'contents';
+const CHUNK_STORE = 'chunks';
+
+export const CHUNK_BYTES = 1024 * 1024;
+export const SAVE_DELAY_MS = 500;
+
+const REF_KEY = '$gtoContent';
+
+let database = null;
+const pendingSaves = new Map(); // key -> value waiting for its debounce delay
+const saveTimers = new Map();
+let writeQueue = Promise.resolve(); // Writes run one at a time, in order
+
+const request = (req) =>
+  new Promise((resolve, reject) => {
+    req.onsuccess = () => resolve(req.result);
+    req.onerror = () => reject(req.error);
+  });
+
+const transactionDone = (transaction) =>
+  new Promise((resolve, reject) => {
+    transaction.oncomplete = () => resolve();
+    transaction.onerror = () => reject(transaction.error);
+    transaction.onabort = () => reject(transaction.error);
+  });
+
+const openDatabase = () => {
+  if (!database) {
+    database = new Promise((resolve) => {
+      if (typeof indexedDB === 'undefined') {
+        resolve(null);
+        return;
+      }
+      const open = indexedDB.open(DB_NAME, DB_VERSION);
+      open.onupgradeneeded = () => {
+        const db = open.result;
+        db.createObjectStore(STATE_STORE);
+        db.createObjectStore(CONTENT_STORE, { keyPath: 'hash' });
+        db.createObjectStore(CHUNK_STORE);
+      };
+      open.onsuccess = () => resolve(open.result);
+      open.onerror = () => {
+        // IndexedDB is unavailable in some contexts (e.g. some private browsing modes)
+        console.warn('Workflow storage not available:', open.error);
+        resolve(null);
+      };
+    });
+  }
+  return database;
+};
+
+const isBlob = (value) => typeof Blob !== 'undefined' && value instanceof Blob;
+
+const isPlainObject = (value) =>
+  value !== null && typeof value === 'object' && Object.getPrototypeOf(value) === Object.prototype;
+
+export const isContentRef = (value) => isPlainObject(value) && typeof value[REF_KEY] === 'string';
+
+const toHex = (buffer) => Array.from(new Uint8Array(buffer), (byte) => byte.toString(16).padStart(2, '0')).join('');
+
+// SHA-256 where Web Crypto is available (secure contexts), else the step cache hash
+const hashBytes = async (bytes) =>
+  typeof crypto !== 'undefined' && crypto.subtle
+    ? toHex(await crypto.subtle.digest('SHA-256', bytes))
+    : hashData(bytes);
+
+/**
+ * Splits a content in hashed chunks.
+ * @param {string|Uint8Array|Blob} value
+ * @returns {Promise<Object>} - The content record ({ hash, kind, size, chunks }) and the chunk data.
+ */
+const chunkContent = async (value) => {
+  let kind;
+  let bytes;
+  if (typeof value === 'string') {
+    kind = 'text';
+    bytes = new TextEncoder().encode(value);
+  } else if (isBlob(value)) {
+    kind = 'blob';
+    bytes = new Uint8Array(await value.arrayBuffer());
+  } else {
+    kind = 'bytes';
+    bytes = value;
+  }
+
+  const chunks = [];
+  // An empty content still has one (empty) chunk
+  for (let offset = 0; offset === 0 || offset < bytes.length; offset += CHUNK_BYTES) {
+    const data = bytes.subarray(offset, offset + CHUNK_BYTES);
+    chunks.push({ hash: await hashBytes(data), data });
+  }
+  // The content is keyed by the hashes of its chunks, so it is hashed once
+  const hash = `${kind}:${await hashBytes(new TextEncoder().encode(chunks.map((chunk) => chunk.hash).join(',')))}`;
+  return { record: { hash, kind, size: bytes.length, chunks: chunks.map((chunk) => chunk.hash) }, chunks };
+};
+
+/**
+ * Replaces the contents of a value by references, collecting the contents to store.
+ */
+const extractContents = async (value, contents) => {
+  if (typeof value === 'string' || value instanceof Uint8Array || isBlob(value)) {
+    if (typeof value === 'string' && value === '') return value;
+    const content = await chunkContent(value);
+    contents.set(content.record.hash, content);
+    return { [REF_KEY]: content.record.hash };
+  }
+  if (isContentRef(value)) return value;
+  if (Array.isArray(value)) {
+    return Promise.all(value.map((item) => extractContents(item, contents)));
+  }
+  if (isPlainObject(value)) {
+    const result = {};
+    for (const [key, item] of Object.entries(value)) {
+      result[key] = await extractContents(item, contents);
+    }
+    return result;
+  }
+  return value;
+};
+
+const collectRefs = (value, refs) => {
+  if (isContentRef(value)) {
+    refs.add(value[REF_KEY]);
+  } else if (Array.isArray(value)) {
+    value.forEach((item) => collectRefs(item, refs));
+  } else if (isPlainObject(value)) {
+    Object.values(value).forEach((item) => collectRefs(item, refs));
+  }
+  return refs;
+};
+
+/**
+ * Removes the contents and chunks no saved value references.
+ */
+const collectGarbage = async (db) => {
+  const transaction = db.transaction([STATE_STORE, CONTENT_STORE, CHUNK_STORE], 'readwrite');
+  const done = transactionDone(transaction);
+  const refs = new Set();
+  for (const value of await request(transaction.objectStore(STATE_STORE).getAll())) {
+    collectRefs(value, refs);
+  }
+
+  const contentStore = transaction.objectStore(CONTENT_STORE);
+  const usedChunks = new Set();
+  for (const record of await request(contentStore.getAll())) {
+    if (refs.has(record.hash)) {
+      record.chunks.forEach((chunk) => usedChunks.add(chunk));
+    } else {
+      contentStore.delete(record.hash);
+    }
+  }
+  const chunkStore = transaction.objectStore(CHUNK_STORE);
+  for (const chunk of await request(chunkStore.getAllKeys())) {
+    if (!usedChunks.has(chunk)) chunkStore.delete(chunk);
+  }
+  await done;
+};
+
+const writeState = async (key, value) => {
+  const db = await openDatabase();
+  if (!db) return;
+  const contents = new Map();
+  const stored = await extractContents(value, contents);
+
+  // Everything is hashed before the transaction, which would commit while awaiting other work
+  const transaction = db.transaction([STATE_STORE, CONTENT_STORE, CHUNK_STORE], 'readwrite');
+  const done = transactionDone(transaction);
+  const contentStore = transaction.objectStore(CONTENT_STORE);
+  const chunkStore = transaction.objectStore(CHUNK_STORE);
+  for (const { record, chunks } of contents.values()) {
+    if (await request(contentStore.getKey(record.hash)) !== undefined) continue; // Stored already
+    for (const chunk of chunks) {
+      if (await request(chunkStore.getKey(chunk.hash)) === undefined) {
+        chunkStore.put(new Blob([chunk.data]), chunk.hash);
+      }
+    }
+    contentStore.put(record);
+  }
+  transaction.objectStore(STATE_STORE).put(stored, key);
+  await done;
+  await collectGarbage(db);
+};
+
+const flushKey = (key) => {
+  clearTimeout(saveTimers.get(key));
+  saveTimers.delete(key);
+  if (!pendingSaves.has(key)) return writeQueue;
+  const value = pendingSaves.get(key);
+  pendingSaves.delete(key);
+  writeQueue = writeQueue
+    .then(() => writeState(key, value))
+    .catch((error) => console.warn(`Failed to save ${key}:`, error));
+  return writeQueue;
+};
+
+/**
+ * Saves a value after SAVE_DELAY_MS without a newer value for the same key.
+ * @param {string} key - State name (e.g. 'inputData', 'outputMap').
+ * @param {*} value - Structured-cloneable value; its contents may be content references.
+ */
+export const saveState = (key, value) => {
+  pendingSaves.set(key, value);
+  clearTimeout(saveTimers.get(key));
+  saveTimers.set(key, setTimeout(() => flushKey(key), SAVE_DELAY_MS));
+};
+
+/**
+ * Writes the pending saves now.
+ * @returns {Promise<void>}
+ */
+export const flushState = () => {
+  [...pendingSaves.keys()].forEach(flushKey);
+  return writeQueue;
+};
+
+if (typeof window !== 'undefined') {
+  // Best effort: the page may close before the writes complete
+  window.addEventListener('pagehide', () => flushState());
+}
+
+/**
+ * Loads a saved value, with its contents as references. Values saved in localStorage by
+ * earlier versions are moved here.
+ * @param {string} key - State name.
+ * @param {string} legacyFormat - How the localStorage value was saved: 'json' or 'text'.
+ * @returns {Promise<*>} - The value, or undefined.
+ */
+export const loadState = async (key, legacyFormat = 'json') => {
+  if (pendingSaves.has(key)) return pendingSaves.get(key);
+
+  const legacy = typeof localStorage !== 'undefined' ? localStorage.getItem(key) : null;
+  if (legacy !== null) {
+    localStorage.removeItem(key);
+    try {
+      const value = legacyFormat === 'json' ? JSON.parse(legacy) : legacy;
+      saveState(key, value);
+      return value;
+    } catch (error) {
+      console.warn(`Invalid saved ${key}:`, error);
+    }
+  }
+
+  const db = await openDatabase();
+  if (!db) return undefined;
+  try {
+    return await request(db.transaction(STATE_STORE).objectStore(STATE_STORE).get(key));
+  } catch (error) {
+    console.warn(`Failed to load ${key}:`, error);
+    return undefined;
+  }
+};
+
+/**
+ * Reads a stored content.
+ * @param {Object} ref - Content reference.
+ * @returns {Promise<string|Uint8Array|Blob|undefined>} - The content, undefined if it is gone.
+ */
+export const loadContent = async (ref) => {
+  const db = await openDatabase();
+  if (!db) return undefined;
+  const transaction = db.transaction([CONTENT_STORE, CHUNK_STORE]);
+  const record = await request(transaction.objectStore(CONTENT_STORE).get(ref[REF_KEY]));
+  if (!record) return undefined;
+  const chunkStore = transaction.objectStore(CHUNK_STORE);
+  const chunks = await Promise.all(record.chunks.map((chunk) => request(chunkStore.get(chunk))));
+  if (chunks.some((chunk) => chunk === undefined)) return undefined;
+
+  const blob = new Blob(chunks);
+  if (record.kind === 'text') return blob.text();
+  if (record.kind === 'bytes') return new Uint8Array(await blob.arrayBuffer());
+  return blob;
+};
+
+/**
+ * Replaces the content references of a value by the contents.
+ * @param {*} value - A loaded value, or part of it.
+ * @returns {Promise<*>}
+ */
+export const resolveContents = async (value) => {
+  if (isContentRef(value)) return loadContent(value);
+  if (Array.isArray(value)) return Promise.all(value.map(resolveContents));
+  if (isPlainObject(value)) {
+    const result = {};
+    for (const [key, item] of Object.entries(value)) {
+      result[key] = await resolveContents(item);
+    }
+    return result;
+  }
+  return value;
+};
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+"""Per-tool benchmark of the GTO tools, native and WebAssembly, across input sizes.
+
+Enumerates the stdin tools of description.json, generates inputs of each size in the input
+format of every tool (from gto_genomic_gen_random_dna), and times each tool natively
+(gto/bin) and as WebAssembly under Node (public/wasm, through wasm_runner.mjs). Results are
+written in the schema of tests/local_test/gto_performance_local.json, one entry per
+tool, size and runtime, and can be compared against a baseline to flag regressions.
+
+Usage:
+    python benchmark_tools.py run [--tools fasta_complement,...] [--sizes 1M,10M,100M,1G]
+                                  [--runtimes native,wasm] [--iterations 3] [--baseline old.json]
+    python benchmark_tools.py compare baseline.json current.json [--threshold 0.1]
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+REPO_DIR = os.path.dirname(os.path.dirname(BENCHMARK_DIR))
+sys.path.insert(0, REPO_DIR)
+
+import run_recipe  # noqa: E402
+
+WASM_DIR = os.path.join(REPO_DIR, 'public', 'wasm')
+WASM_RUNNER = os.path.join(BENCHMARK_DIR, 'wasm_runner.mjs')
+DATA_DIR = os.path.join(BENCHMARK_DIR, 'data')
+RESULTS_FILE = os.path.join(BENCHMARK_DIR, 'gto_performance_tools.json')
+
+DEFAULT_SIZES = '1M,10M,100M,1G'
+SIZE_UNITS = {'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+RUNTIMES = ['native', 'wasm']
+SEED = 7
+
+# Multi-FASTA inputs: bases per record
+RECORD_BASES = 100000
+LINE_SIZE = 80
+
+# Input formats that can be generated, by the format names of description.json
+FORMAT_GENERATORS = {
+    'DNA': 'dna',
+    'SEQ': 'dna',
+    'TEXT': 'dna',
+    'text': 'dna',
+    'FASTA': 'fasta',
+    'Multi-FASTA': 'multi_fasta',
+    'FASTQ': 'fastq',
+    'RNA': 'rna',
+    'AminoAcids': 'amino_acids',
+    'NUM': 'num',
+}
+
+# Regressions are changes above the threshold and above these absolute differences
+MIN_RUNTIME_DELTA = 0.01  # seconds
+MIN_MEMORY_DELTA = 1.0  # MB
+
+
+def parse_size(text):
+    text = text.strip().upper().rstrip('B')
+    if text and text[-1] in SIZE_UNITS:
+        return int(float(text[:-1]) * SIZE_UNITS[text[-1]])
+    return int(text)
+
+
+def size_label(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= SIZE_UNITS[unit] and size % SIZE_UNITS[unit] == 0:
+            return f"{size // SIZE_UNITS[unit]}{unit}B"
+    return f"{size}B"
+
+
+def select_tools(names=None):
+    """Tools reading stdin, with the generator of their input format."""
+    with open(run_recipe.DESCRIPTION_FILE) as f:
+        tools = json.load(f)['tools']
+
+    selected = []
+    for tool in tools:
+        name = tool['name'][len('gto_'):]
+        if names and name not in names:
+            continue
+        if tool['input']['type'] != 'stdin':
+            continue
+        formats = [f.strip() for f in tool['input']['format'].split(',') if f.strip()]
+        generator = next((FORMAT_GENERATORS[f] for f in formats if f in FORMAT_GENERATORS), None)
+        if generator is None:
+            print(f"Skipping {name}: no generator for {tool['input']['format']} inputs")
+            continue
+        selected.append((name, generator))
+    return selected
+
+
+def run_piped(commands, out_path):
+    """Run commands connected by pipes, the last one writing out_path."""
+    processes = []
+    with open(out_path, 'wb') as out:
+        stdin = subprocess.DEVNULL
+        for index, command in enumerate(commands):
+            stdout = out if index == len(commands) - 1 else subprocess.PIPE
+            process = subprocess.Popen(command, stdin=stdin, stdout=stdout)
+            if index > 0:
+                stdin.close()
+            stdin = process.stdout
+            processes.append(process)
+    for process in processes:
+        if process.wait() != 0:
+            raise RuntimeError(f"{' '.join(process.args)} exited with code {process.returncode}")
+
+
+def transform_file(source, out_path, transform):
+    with open(source, 'rb') as src, open(out_path, 'wb') as out:
+        while True:
+            chunk = src.read(1 << 20)
+            if not chunk:
+                break
+            out.write(transform(chunk))
+
+
+def write_multi_fasta(source, out_path):
+    with open(source, 'rb') as src, open(out_path, 'wb') as out:
+        record = 0
+        while True:
+            sequence = src.read(RECORD_BASES)
+            if not sequence:
+                break
+            record += 1
+            out.write(b'>benchmark_%d\n' % record)
+            for start in range(0, len(sequence), LINE_SIZE):
+                out.write(sequence[start:start + LINE_SIZE] + b'\n')
+
+
+def write_numbers(out_path, size):
+    rng = random.Random(SEED)
+    with open(out_path, 'w') as out:
+        written = 0
+        while written < size:
+            line = ' '.join(f"{rng.uniform(0, 1000):.3f}" for _ in range(8)) + '\n'
+            out.write(line)
+            written += len(line)
+
+
+def generate_input(generator, size, data_dir, bin_dir):
+    """Path of an input of about `size` bytes, generated once per format and size."""
+    path = os.path.join(data_dir, f"{generator}_{size_label(size)}.txt")
+    if os.path.exists(path):
+        return path
+    os.makedirs(data_dir, exist_ok=True)
+    tool = lambda name: os.path.join(bin_dir, f"gto_{name}")  # noqa: E731
+    random_dna = lambda bases: [tool('genomic_gen_random_dna'), '-s', str(SEED), '-n', str(bases)]  # noqa: E731
+
+    print(f"Generating {os.path.basename(path)}")
+    partial = path + '.partial'
+    if generator == 'dna':
+        run_piped([random_dna(size)], partial)
+    elif generator == 'fasta':
+        run_piped([random_dna(size), [tool('fasta_from_seq'), '-l', str(LINE_SIZE), '-n', 'benchmark']], partial)
+    elif generator == 'fastq':
+        # Quality scores double the size
+        run_piped([random_dna(size // 2), [tool('fastq_from_seq'), '-l', '100', '-n', 'benchmark']], partial)
+    elif generator == 'amino_acids':
+        # One amino acid per codon
+        run_piped([random_dna(size * 3), [tool('amino_acid_from_seq')]], partial)
+    elif generator == 'num':
+        write_numbers(partial, size)
+    else:
+        dna = generate_input('dna', size, data_dir, bin_dir)
+        if generator == 'multi_fasta':
+            write_multi_fasta(dna, partial)
+        else:
+            transform_file(dna, partial, lambda chunk: chunk.translate(bytes.maketrans(b'Tt', b'Uu')))
+    os.replace(partial, path)
+    return path
+
+
+def run_native(step, input_path, iterations, timeout):
+    """Run a tool natively, returning the runs (runtime in s, memory in MB) or an error."""
+    runs = []
+    for _ in range(iterations):
+        with tempfile.TemporaryDirectory() as work_dir, open(input_path, 'rb') as stdin:
+            metrics = {}
+            started = time.monotonic()
+            # Output files of the multi-output tools go to the working directory
+            process = subprocess.Popen(step.command, stdin=stdin, stdout=subprocess.DEVNULL,
+                                       stderr=subprocess.DEVNULL, cwd=work_dir)
+            timer = threading.Timer(timeout, process.kill)
+            timer.start()
+            run_recipe.wait_step(process, metrics, started)
+            timer.cancel()
+        if metrics['elapsed'] >= timeout:
+            return runs, f"timed out after {timeout}s"
+        if metrics['exit_code'] != 0:
+            return runs, f"exited with code {metrics['exit_code']}"
+        # Short runs fall back to ru_maxrss, which includes the RSS of the forked interpreter
+        runs.append({'runtime': metrics['elapsed'], 'memory': metrics['max_rss_kb'] / 1024})
+    return runs, None
+
+
+def run_wasm(tool, args, input_path, iterations, timeout, wasm_dir):
+    """Run a tool as WebAssembly under Node, returning the runs, the compile time and an error."""
+    if not os.path.exists(os.path.join(wasm_dir, f"{tool}.wasm")):
+        return [], None, "no WebAssembly module"
+    command = ['node', '--expose-gc', WASM_RUNNER, wasm_dir, tool, input_path, str(iterations)] + args
+    try:
+        result = subprocess.run(command, capture_output=True, text=True, timeout=timeout * iterations)
+    except subprocess.TimeoutExpired:
+        return [], None, f"timed out after {timeout}s per run"
+    if result.returncode != 0:
+        return [], None, result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "node failed"
+    report = json.loads(result.stdout)
+    failed = next((run for run in report['runs'] if run['exit_code'] != 0), None)
+    if failed:
+        return [], report['compile_time'], f"exited with code {failed['exit_code']}"
+    return report['runs'], report['compile_time'], None
+
+
+def summarize_runs(runs):
+    """Statistics of the runs, with the keys of gto_performance_local.json."""
+    stats = {}
+    for metric in ('runtime', 'memory'):
+        values = [run[metric] for run in runs if run[metric] is not None]
+        if not values:
+            if runs:
+                # Keep the keys of the schema; compare skips the null values
+                print(f"Warning: no {metric} measured")
+                stats.update({f"{stat}_{metric}": None for stat in ('mean', 'std', 'min', 'max')})
+            continue
+        stats[f"mean_{metric}"] = statistics.mean(values)
+        stats[f"std_{metric}"] = statistics.stdev(values) if len(values) > 1 else 0.0
+        stats[f"min_{metric}"] = min(values)
+        stats[f"max_{metric}"] = max(values)
+    return stats
+
+
+def run_benchmarks(args):
+    tools = select_tools(set(args.tools.split(',')) if args.tools else None)
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    runtimes = args.runtimes.split(',')
+    if 'wasm' in runtimes and not shutil.which('node'):
+        print("Error: node is required for the WebAssembly runs")
+        sys.exit(1)
+
+    results = {}
+    for size in sizes:
+        for name, generator in tools:
+            try:
+                step = run_recipe.resolve_steps({'tools': [{'toolName': name, 'params': {}}]}, args.bin_dir)[0]
+            except run_recipe.RecipeError as e:
+                print(f"Skipping {name}: {e}")
+                continue
+            input_path = generate_input(generator, size, args.data_dir, args.bin_dir)
+
+            for runtime in runtimes:
+                key = f"{name}:{size_label(size)}:{runtime}"
+                entry = {'tool': name, 'runtime': runtime, 'input_file': os.path.basename(input_path),
+                         'input_bytes': os.path.getsize(input_path), 'iterations': args.iterations}
+                if runtime == 'native':
+                    runs, error = run_native(step, input_path, args.iterations, args.timeout)
+                else:
+                    runs, compile_time, error = run_wasm(name, step.args, input_path, args.iterations,
+                                                         args.timeout, args.wasm_dir)
+                    if compile_time is not None:
+                        entry['compile_time'] = compile_time
+                entry.update(summarize_runs(runs))
+                if error:
+                    entry['error'] = error
+                    print(f"  {key:<48} {error}")
+                else:
+                    print(f"  {key:<48} {entry['mean_runtime']:9.3f}s ± {entry['std_runtime']:.3f}"
+                          f"  {entry.get('mean_memory') or 0:8.1f} MB")
+                results[key] = entry
+
+    return {
+        'metadata': {
+            'timestamp': datetime.datetime.now().isoformat(),
+            'platform': 'local_machine',
+            'description': f"Per-tool GTO benchmark, {args.iterations} iterations per tool, size and runtime",
+            'tools': [name for name, _ in tools],
+            'sizes': [size_label(size) for size in sizes],
+            'runtimes': runtimes,
+            'measurement_method': 'wait4 and /proc VmHWM (native), Node performance.now and linear memory size (wasm)',
+        },
+        'results': results,
+    }
+
+
+def compare_results(baseline, current, threshold):
+    """Entries of current slower or larger than in baseline beyond the threshold."""
+    regressions = []
+    for key, entry in sorted(current['results'].items()):
+        base = baseline['results'].get(key)
+        if not base:
+            continue
+        # The minimum runtime is the least sensitive to noise
+        checks = [('min_runtime', 's', MIN_RUNTIME_DELTA), ('mean_memory', 'MB', MIN_MEMORY_DELTA)]
+        for metric, unit, min_delta in checks:
+            if base.get(metric) is None or entry.get(metric) is None:
+                continue
+            old, new = base[metric], entry[metric]
+            if new > old * (1 + threshold) and new - old > min_delta:
+                regressions.append((key, metric, old, new, unit))
+        if 'error' in entry and 'error' not in base:
+            regressions.append((key, 'error', None, entry['error'], ''))
+    return regressions
+
+
+def report_regressions(regressions, threshold):
+    if not regressions:
+        print(f"\nNo regressions beyond {threshold:.0%}")
+        return
+    print(f"\n{len(regressions)} regression(s) beyond {threshold:.0%}:")
+    for key, metric, old, new, unit in regressions:
+        if metric == 'error':
+            print(f"  {key:<48} now fails: {new}")
+        else:
+            print(f"  {key:<48} {metric}: {old:.3f} -> {new:.3f} {unit} (+{(new - old) / old:.0%})")
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the GTO tools, native and WebAssembly.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Run the benchmarks")
+    run_parser.add_argument('--tools', help="Comma-separated tools (default: every stdin tool)")
+    run_parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma-separated input sizes (e.g. 1M,10M,1G)")
+    run_parser.add_argument('--runtimes', default=','.join(RUNTIMES), help="native, wasm or both")
+    run_parser.add_argument('--iterations', type=int, default=3, help="Runs per tool, size and runtime")
+    run_parser.add_argument('--timeout', type=float, default=600, help="Seconds allowed per run")
+    run_parser.add_argument('--output', default=RESULTS_FILE, help="Results JSON file")
+    run_parser.add_argument('--baseline', help="Results JSON to compare against")
+    run_parser.add_argument('--threshold', type=float, default=0.1, help="Relative change flagged as a regression")
+    run_parser.add_argument('--data-dir', default=DATA_DIR, help="Directory of the generated inputs")
+    run_parser.add_argument('--bin-dir', default=run_recipe.NATIVE_BIN_DIR, help="Directory of the native gto_* tools")
+    run_parser.add_argument('--wasm-dir', default=WASM_DIR, help="Directory of the WebAssembly modules")
+
+    compare_parser = subparsers.add_parser('compare', help="Compare results against a baseline")
+    compare_parser.add_argument('baseline', help="Baseline results JSON")
+    compare_parser.add_argument('current', help="Current results JSON")
+    compare_parser.add_argument('--threshold', type=float, default=0.1, help="Relative change flagged as a regression")
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        regressions = compare_results(load_results(args.baseline), load_results(args.current), args.threshold)
+        report_regressions(regressions, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+    results = run_benchmarks(args)
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults saved to: {args.output}")
+
+    if args.baseline:
+        regressions = compare_results(load_results(args.baseline), results, args.threshold)
+        report_regressions(regressions, args.threshold)
+        sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+// Runs a GTO WebAssembly module under Node and reports the time and memory of each run.
+// Used by benchmark_tools.py:
+//   node wasm_runner.mjs <wasm_dir> <tool> <input_file> <iterations> [args...]
+// Prints one JSON object: { compile_time, runs: [{ runtime, memory, exit_code, output_bytes }] }.
+//
+// The modules are built for web and worker environments only (compile-all-gto.sh), so they
+// get an empty `window` object and their binary through instantiateWasm, as in
+// src/wasmRuntime.js. Each run uses a fresh instance of the compiled module.
+import { readFileSync } from 'fs';
+
+const [wasmDir, tool, inputFile, iterationsArg, ...args] = process.argv.slice(2);
+const iterations = Number(iterationsArg) || 1;
+
+const source = readFileSync(`${wasmDir}/${tool}.js`, 'utf8');
+const factory = new Function('window', `${source}\nreturn ${tool};`)({});
+
+const compileStart = performance.now();
+const wasmModule = await WebAssembly.compile(readFileSync(`${wasmDir}/${tool}.wasm`));
+const compileTime = (performance.now() - compileStart) / 1000;
+
+const input = inputFile ? readFileSync(inputFile) : null;
+
+const runOnce = async () => {
+  let outputBytes = 0;
+  const start = performance.now();
+  const instance = await factory({
+    noInitialRun: true,
+    thisProgram: `./${tool}`,
+    print: (text) => { outputBytes += text.length + 1; },
+    printErr: () => {},
+    instantiateWasm: (imports, receiveInstance) => {
+      WebAssembly.instantiate(wasmModule, imports).then((wasmInstance) => receiveInstance(wasmInstance, wasmModule));
+      return {};
+    },
+  });
+  if (input) {
+    instance.FS.writeFile('input.txt', input);
+  }
+  let exitCode;
+  try {
+    exitCode = instance.callMain(args);
+  } catch (error) {
+    exitCode = error.status ?? 1;
+  }
+  const runtime = (performance.now() - start) / 1000;
+  return { runtime, memory: instance.HEAP8.length / 1024 / 1024, exit_code: exitCode, output_bytes: outputBytes };
+};
+
+const runs = [];
+for (let i = 0; i < iterations; i++) {
+  if (typeof gc === 'function') gc();
+  runs.push(await runOnce());
+}
+process.stdout.write(JSON.stringify({ compile_time: compileTime, runs }));
@@ -6,6 +6,7 @@ import json
 import os
 import statistics
 import sys
+import tempfile
 import threading
 import time
 from datetime import datetime
@@ -19,6 +20,21 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
 
+PLATFORM_TEST_DIR = Path(__file__).parent
+sys.path.insert(0, str(PLATFORM_TEST_DIR.parent / "benchmark"))
+
+import benchmark_tools  # noqa: E402
+import run_recipe  # noqa: E402
+
+# Scaling mode: synthesized recipes of FASTA -> FASTA tools, repeated up to the number of steps
+SCALING_TOOLS = "fasta_complement,fasta_reverse"
+SCALING_SIZES = "1M,4M,16M"
+SCALING_STEPS = "1,2,4,8"
+SCALING_BASE_SIZE = "4M"  # Input size of the steps curve
+SCALING_BASE_STEPS = 2  # Number of steps of the input size curve
+SCALING_TIMEOUT = 600  # seconds
+POLL_INTERVAL = 0.05  # seconds
+
 
 class WorkflowSeleniumTest:
     def __init__(self, headless=False):
@@ -32,7 +48,7 @@ class WorkflowSeleniumTest:
     def setup_driver(self):
         chrome_options = Options()
         if self.headless:
-            chrome_options.add_argument("--headless")
+            chrome_options.add_argument("--headless=new")
         chrome_options.add_argument("--no-sandbox")
         chrome_options.add_argument("--disable-dev-shm-usage")
         
@@ -199,16 +215,47 @@ class WorkflowSeleniumTest:
         
     def clear_localStorage_and_refresh(self):
         """Clear localStorage and refresh the page"""
-        print("Clearing localStorage...")
-        self.driver.execute_script("localStorage.clear();")
+        print("Clearing localStorage and the workflow store...")
+        self.driver.execute_script("localStorage.clear(); indexedDB.deleteDatabase('gto-workflow');")
         
         print("Refreshing page...")
         self.driver.refresh()
         
         # Wait for page to reload
         self.wait.until(EC.presence_of_element_located((By.TAG_NAME, "body")))
+        self.wait_until_app_ready()
         print("Page refreshed and reloaded")
 
+    def wait_until_app_ready(self):
+        """Wait for the page to finish loading and the workflow engine to be mounted"""
+        self.wait.until(lambda driver: driver.execute_script(
+            "return document.readyState === 'complete' && !!window.gtoStepMetrics;"
+        ))
+
+    def enable_cdp_metrics(self):
+        """Enable the Chrome DevTools Protocol performance metrics of the page"""
+        self.driver.execute_cdp_cmd("Performance.enable", {"timeDomain": "timeTicks"})
+
+    def get_cdp_metrics(self):
+        """Current CDP performance metrics of the page (JSHeapUsedSize, TaskDuration, ...)"""
+        metrics = self.driver.execute_cdp_cmd("Performance.getMetrics", {})["metrics"]
+        return {metric["name"]: metric["value"] for metric in metrics}
+
+    def wait_for_steps(self, step_ids, timeout=SCALING_TIMEOUT):
+        """Wait until every step has recorded a run in window.gtoStepMetrics, sampling the
+        peak JS heap meanwhile. Return the recorded entries and the peak JSHeapUsedSize."""
+        peak_heap = 0
+
+        def steps_recorded(driver):
+            nonlocal peak_heap
+            peak_heap = max(peak_heap, self.get_cdp_metrics().get("JSHeapUsedSize", 0))
+            entries = driver.execute_script("return window.gtoStepMetrics.getEntries();")
+            recorded = {entry["stepId"] for entry in entries}
+            return entries if recorded.issuperset(step_ids) else False
+
+        entries = WebDriverWait(self.driver, timeout, poll_frequency=POLL_INTERVAL).until(steps_recorded)
+        return entries, peak_heap
+
     def teardown_driver(self):
         if self.driver:
             self.driver.quit()
@@ -223,21 +270,14 @@ class WorkflowSeleniumTest:
         try:
             self.setup_driver()  # This now sets baseline memory
             
-            # Execute all steps up to final import button click
+            # Execute all steps up to final import button click; each click waits for its
+            # button to be clickable
             self.access_workflow_page()
-            time.sleep(1)
-            
+            self.wait_until_app_ready()
             self.click_import_button()
-            time.sleep(1)
-            
             self.click_config_modal_button()
-            time.sleep(1)
-            
             self.click_upload_modal_button()
-            time.sleep(1)
-            
             self.upload_file(file_path)
-            time.sleep(1)
             
             # NOW start monitoring memory growth for WORKFLOW EXECUTION ONLY
             print("  Starting workflow memory monitoring...")
@@ -253,7 +293,6 @@ class WorkflowSeleniumTest:
             runtime = end_time - start_time
             
             self.clear_localStorage_and_refresh()
-            time.sleep(1)
             
             success = True
             print(f"  Workflow completed successfully!")
@@ -276,9 +315,61 @@ class WorkflowSeleniumTest:
             'max_memory_growth_mb': memory_stats.get('max_memory_growth_mb', 0)
         }
 
+    def run_scaling_workflow(self, file_path, step_ids, timeout=SCALING_TIMEOUT):
+        """Run a synthesized recipe, measuring it with the CDP metrics of the page and the
+        per-step metrics of the workflow engine instead of sampling the Chrome processes.
+
+        The run ends when every step has recorded its metrics. Memory is the peak JS heap
+        growth of the page plus the WASM heap of the steps: the WASM memories are not part of
+        the JS heap, and the Web Workers running the tools have heaps of their own.
+        """
+        result = {'runtime': 0, 'memory': None, 'success': False, 'error': ""}
+        try:
+            self.setup_driver()
+            self.access_workflow_page()
+            self.wait_until_app_ready()
+            self.enable_cdp_metrics()
+            self.click_import_button()
+            self.click_config_modal_button()
+            self.click_upload_modal_button()
+            self.upload_file(file_path)
+
+            before = self.get_cdp_metrics()
+            start_time = time.monotonic()
+            self.click_final_import_button()
+            entries, peak_heap = self.wait_for_steps(step_ids, timeout)
+            runtime = time.monotonic() - start_time
+            after = self.get_cdp_metrics()
 
+            js_heap_mb = max(peak_heap - before.get("JSHeapUsedSize", 0), 0) / 1024 / 1024
+            wasm_heap_mb = wasm_heap_bytes(entries) / 1024 / 1024
+            result.update({
+                'runtime': runtime,
+                'memory': js_heap_mb + wasm_heap_mb,
+                'js_heap_mb': js_heap_mb,
+                'wasm_heap_mb': wasm_heap_mb,
+                'task_duration': after.get("TaskDuration", 0) - before.get("TaskDuration", 0),
+                'script_duration': after.get("ScriptDuration", 0) - before.get("ScriptDuration", 0),
+                'steps': entries,
+                'success': True,
+            })
+        except Exception as e:
+            result['error'] = str(e)
+            print(f"  Error during scaling run: {result['error']}")
+        finally:
+            self.teardown_driver()
+        return result
+
+
+def wasm_heap_bytes(entries):
+    """Peak WASM heap of a run: the stages of a pipeline run together, other steps one at a time"""
+    pipelined = sum(entry.get('heapBytes') or 0 for entry in entries if entry.get('pipelined'))
+    single = max((entry.get('heapBytes') or 0 for entry in entries if not entry.get('pipelined')), default=0)
+    return max(pipelined, single)
 
-def run_performance_tests(test_mode="vs_local"):
+
+
+def run_performance_tests(test_mode="vs_local", headless=False):
     """Run performance tests for specified JSON files based on test mode"""
     # Define test files based on mode
     if test_mode == "vs_local":
@@ -319,7 +410,7 @@ def run_performance_tests(test_mode="vs_local"):
         for run in range(1, 4):
             print(f"Run {run}/3:")
             
-            test = WorkflowSeleniumTest(headless=False)
+            test = WorkflowSeleniumTest(headless=headless)
             result = test.run_complete_workflow_with_timing(file_path)
 
             # Store results
@@ -338,9 +429,6 @@ def run_performance_tests(test_mode="vs_local"):
             
             if not result['success']:
                 print(f"  Run {run} failed: {result['error']}")
-            
-            # Small delay between runs
-            time.sleep(2)
     
     return results
 
@@ -506,21 +594,194 @@ def display_summary(results):
         else:
             print(f"\n{file}: All runs failed")
 
+def synthesize_recipe(input_path, tools, steps, recipe_path):
+    """Write a recipe of `steps` steps cycling through `tools`, with the input embedded.
+    Return the step ids."""
+    with open(input_path) as f:
+        content = f.read()
+    name = os.path.basename(input_path)
+    tool_steps = [
+        {"id": f"{tools[index % len(tools)]}-scaling-{index}", "toolName": tools[index % len(tools)], "params": {}}
+        for index in range(steps)
+    ]
+    recipe = {
+        "name": f"scaling_{steps}_steps",
+        "created_at": datetime.now().isoformat(),
+        "workflow": {
+            "input": {
+                "format": "FASTA",
+                "files": [{
+                    "id": name,
+                    "name": name,
+                    "type": "file",
+                    "fileType": "FASTA",
+                    "content": content,
+                    "size": len(content),
+                    "relativePath": name,
+                }],
+            },
+            "tools": tool_steps,
+        },
+    }
+    with open(recipe_path, 'w') as f:
+        json.dump(recipe, f)
+    return [step["id"] for step in tool_steps]
+
+
+def run_native_baseline(recipe_path, input_path, iterations, bin_dir):
+    """Run a recipe with the native tools (run_recipe.py), as one pipe of processes.
+    Memory is the sum of the peak RSS of the steps, which run concurrently."""
+    steps = run_recipe.resolve_steps(run_recipe.load_recipe(recipe_path), bin_dir)
+    runs = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for _ in range(iterations):
+            report = run_recipe.run_pipeline(steps, input_path, os.path.join(work_dir, "output.txt"))
+            if report['status'] != 'ok':
+                return {'error': report['error']}
+            peaks = [step['max_rss_kb'] for step in report['steps'] if step['max_rss_kb'] is not None]
+            runs.append({'runtime': report['elapsed'], 'memory': sum(peaks) / 1024 if peaks else None})
+    return benchmark_tools.summarize_runs(runs)
+
+
+def run_biochef_scaling(recipe_path, step_ids, iterations, headless, timeout):
+    """Run a recipe in BioChef `iterations` times, each in a fresh browser"""
+    runs = []
+    for run in range(1, iterations + 1):
+        print(f"  BioChef run {run}/{iterations}")
+        test = WorkflowSeleniumTest(headless=headless)
+        result = test.run_scaling_workflow(recipe_path, step_ids, timeout)
+        if not result['success']:
+            return {'error': result['error']}
+        runs.append(result)
+    stats = benchmark_tools.summarize_runs(runs)
+    for metric in ('js_heap_mb', 'wasm_heap_mb', 'task_duration', 'script_duration'):
+        stats[f"mean_{metric}"] = statistics.mean(run[metric] for run in runs)
+    return stats
+
+
+def run_scaling_tests(args):
+    """Measure BioChef and the native tools on synthesized recipes of growing input size
+    (with --base-steps steps) and of growing number of steps (on a --base-size input)."""
+    tools = [name.strip() for name in args.tools.split(',') if name.strip()]
+    sizes = [benchmark_tools.parse_size(size) for size in args.sizes.split(',')]
+    step_counts = [int(steps) for steps in args.steps.split(',')]
+    base_size = benchmark_tools.parse_size(args.base_size)
+
+    curves = {
+        "input_size": {"steps": args.base_steps, "points": []},
+        "steps": {"input_mb": base_size / 1024 / 1024, "points": []},
+    }
+    points = [("input_size", size, args.base_steps) for size in sizes]
+    points += [("steps", base_size, steps) for steps in step_counts]
+
+    print(f"Starting Selenium Workflow Scaling Tests ({', '.join(tools)})")
+    print("=" * 60)
+    with tempfile.TemporaryDirectory() as work_dir:
+        for curve, size, steps in points:
+            input_path = benchmark_tools.generate_input('fasta', size, benchmark_tools.DATA_DIR, args.bin_dir)
+            input_mb = os.path.getsize(input_path) / 1024 / 1024
+            recipe_path = os.path.join(work_dir, f"scaling_{benchmark_tools.size_label(size)}_{steps}.json")
+            step_ids = synthesize_recipe(input_path, tools, steps, recipe_path)
+
+            print(f"\n{curve}: {input_mb:.2f} MB, {steps} step(s)")
+            print("-" * 40)
+            curves[curve]["points"].append({
+                "input_mb": round(input_mb, 3),
+                "steps": steps,
+                "biochef": run_biochef_scaling(recipe_path, step_ids, args.iterations, args.headless, args.timeout),
+                "native": run_native_baseline(recipe_path, input_path, args.iterations, args.bin_dir),
+            })
+    return curves
+
+
+def save_scaling_results(curves, args):
+    """Save the scaling curves to platform_performance_scaling.json (see plots/scaling_plots.py)"""
+    json_path = PLATFORM_TEST_DIR / "platform_performance_scaling.json"
+    json_data = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "platform": "web_browser_selenium_scaling",
+            "description": "Runtime and memory of synthesized recipes vs input size and vs number of steps, "
+                           "in BioChef and with the native tools",
+            "tools": args.tools,
+            "iterations": args.iterations,
+            "headless": args.headless,
+            "measurement_method": "cdp_performance_metrics_and_gto_step_metrics",
+            "memory_note": "BioChef memory is the peak JS heap growth of the page plus the WASM heap of the steps; "
+                           "native memory is the sum of the peak RSS of the piped steps",
+        },
+        "results": curves,
+    }
+    with open(json_path, 'w') as jsonfile:
+        json.dump(json_data, jsonfile, indent=2)
+    print(f"\nScaling results saved to: {json_path}")
+    return json_path
+
+
+def display_scaling_summary(curves):
+    """Display the scaling curves"""
+    print("\n" + "=" * 60)
+    print("SCALING RESULTS SUMMARY")
+    print("=" * 60)
+    for curve, data in curves.items():
+        print(f"\n{curve}:")
+        for point in data["points"]:
+            label = f"{point['input_mb']:.2f} MB, {point['steps']} step(s)"
+            for platform in ("biochef", "native"):
+                stats = point[platform]
+                if 'error' in stats:
+                    print(f"  {label} {platform}: failed ({stats['error']})")
+                else:
+                    memory = stats.get('mean_memory')
+                    memory_text = f"{memory:.2f}MB" if memory is not None else "n/a"
+                    print(f"  {label} {platform}: {stats['mean_runtime']:.3f}s, {memory_text}")
+
+
 def main():
     """Main function to run the performance tests"""
     parser = argparse.ArgumentParser(description="Selenium Workflow Performance Test")
     parser.add_argument(
         "--mode", 
-        choices=["vs_local", "vs_galaxy"], 
+        choices=["vs_local", "vs_galaxy", "scaling"], 
         default="vs_local",
-        help="Test mode: 'vs_local' uses AllMis_2400.json, BraLanc_464.json, HomoSapiens_3300.json, HydCol_1000.json; 'vs_galaxy' uses BraLanc_464_Galaxy.json"
+        help="Test mode: 'vs_local' uses AllMis_2400.json, BraLanc_464.json, HomoSapiens_3300.json, HydCol_1000.json; 'vs_galaxy' uses BraLanc_464_Galaxy.json; 'scaling' synthesizes recipes of growing input size and number of steps"
     )
+    parser.add_argument(
+        "--headless",
+        action=argparse.BooleanOptionalAction,
+        default=None,
+        help="Run Chrome headless (default: on in scaling mode, off otherwise)"
+    )
+    parser.add_argument("--tools", default=SCALING_TOOLS,
+                        help="Scaling mode: FASTA -> FASTA tools cycled through the steps of the recipes")
+    parser.add_argument("--sizes", default=SCALING_SIZES,
+                        help="Scaling mode: input sizes of the input size curve (K, M, G suffixes)")
+    parser.add_argument("--steps", default=SCALING_STEPS,
+                        help="Scaling mode: numbers of steps of the steps curve")
+    parser.add_argument("--base-size", default=SCALING_BASE_SIZE,
+                        help="Scaling mode: input size of the steps curve")
+    parser.add_argument("--base-steps", type=int, default=SCALING_BASE_STEPS,
+                        help="Scaling mode: number of steps of the input size curve")
+    parser.add_argument("--iterations", type=int, default=3, help="Scaling mode: runs per point")
+    parser.add_argument("--timeout", type=float, default=SCALING_TIMEOUT,
+                        help="Scaling mode: seconds to wait for a recipe to finish")
+    parser.add_argument("--bin-dir", default=run_recipe.NATIVE_BIN_DIR,
+                        help="Scaling mode: directory of the native GTO tools (the baseline)")
     
     args = parser.parse_args()
     
     try:
+        if args.mode == "scaling":
+            if args.headless is None:
+                args.headless = True
+            curves = run_scaling_tests(args)
+            save_scaling_results(curves, args)
+            display_scaling_summary(curves)
+            print("\nScaling tests completed!")
+            return 0
+
         # Run performance tests with specified mode
-        results = run_performance_tests(test_mode=args.mode)
+        results = run_performance_tests(test_mode=args.mode, headless=bool(args.headless))
         
         # Save results in GTO format
         save_results_gto_format(results, test_mode=args.mode)
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+
+import json
+
+import matplotlib.pyplot as plt
+
+
+def load_results():
+    """Load the scaling results (selenium_workflow_test.py --mode scaling)"""
+    with open('../platform_test/platform_performance_scaling.json', 'r') as f:
+        return json.load(f)
+
+
+def curve_values(points, platform, metric):
+    """Mean values of a metric along a curve, None where the runs failed"""
+    return [point[platform].get(f'mean_{metric}') for point in points]
+
+
+def plot_curve(ax, x, points, metric, xlabel, ylabel, title):
+    """Plot BioChef next to the native baseline"""
+    ax.plot(x, curve_values(points, 'native', metric), 'o-', label='Native', linewidth=2, markersize=8, color='blue')
+    ax.plot(x, curve_values(points, 'biochef', metric), 's-', label='BioChef', linewidth=2, markersize=8, color='red')
+    ax.set_xlabel(xlabel)
+    ax.set_ylabel(ylabel)
+    ax.set_title(title)
+    ax.legend()
+    ax.grid(True, alpha=0.3)
+
+
+def create_scaling_plots():
+    """Create runtime and memory curves vs input size and vs number of steps"""
+    data = load_results()
+    by_size = data['results']['input_size']
+    by_steps = data['results']['steps']
+
+    size_points = by_size['points']
+    step_points = by_steps['points']
+    sizes = [point['input_mb'] for point in size_points]
+    steps = [point['steps'] for point in step_points]
+
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 10))
+
+    size_label = f"Input Size (MB), {by_size['steps']} step(s)"
+    plot_curve(ax1, sizes, size_points, 'runtime', size_label, 'Runtime (seconds)', 'Runtime vs Input Size')
+    plot_curve(ax2, sizes, size_points, 'memory', size_label, 'Memory Usage (MB)', 'Memory vs Input Size')
+
+    steps_label = f"Number of Steps, {by_steps['input_mb']:.0f}MB input"
+    plot_curve(ax3, steps, step_points, 'runtime', steps_label, 'Runtime (seconds)', 'Runtime vs Number of Steps')
+    plot_curve(ax4, steps, step_points, 'memory', steps_label, 'Memory Usage (MB)', 'Memory vs Number of Steps')
+    for ax in (ax3, ax4):
+        ax.set_xticks(steps)
+
+    plt.tight_layout()
+    plt.savefig('scaling_curves.png', dpi=300, bbox_inches='tight')
+    plt.show()
+
+    # Print summary statistics
+    print("\nSCALING SUMMARY")
+    print("=" * 50)
+    for name, points in (('Input size', size_points), ('Steps', step_points)):
+        print(f"\n{name.upper()}:")
+        for point in points:
+            native = point['native'].get('mean_runtime')
+            biochef = point['biochef'].get('mean_runtime')
+            if native and biochef:
+                print(f"  {point['input_mb']:.2f}MB, {point['steps']} step(s): "
+                      f"Native {native:.3f}s vs BioChef {biochef:.3f}s ({biochef / native:.1f}x slower)")
+            else:
+                print(f"  {point['input_mb']:.2f}MB, {point['steps']} step(s): failed")
+
+
+def main():
+    """Main function to create the scaling plots"""
+    print("Creating scaling plots...")
+
+    try:
+        create_scaling_plots()
+
+        print("\nPlot saved:")
+        print("- scaling_curves.png")
+
+    except Exception as e:
+        print(f"Error creating plots: {e}")
+        print("Make sure the scaling results exist:")
+        print("- ../platform_test/platform_performance_scaling.json")
+
+
+if __name__ == "__main__":
+    main()
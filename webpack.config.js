@@ -88,6 +88,11 @@ module.exports = {
     port: 8082,            // Changed the port to 8082
     historyApiFallback: true,
     open: true,
+    // Cross-origin isolation enables SharedArrayBuffer, used by the tool pipelines (src/workers/pipe.js)
+    headers: {
+      'Cross-Origin-Opener-Policy': 'same-origin',
+      'Cross-Origin-Embedder-Policy': 'require-corp',
+    },
   },
   optimization: {
     splitChunks: {